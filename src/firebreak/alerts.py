@@ -0,0 +1,358 @@
+"""Alert dispatch — batched, deduplicated delivery of policy alerts."""
+
+import abc
+import json
+import logging.handlers
+import smtplib
+import threading
+import urllib.request
+from datetime import datetime
+from email.message import EmailMessage
+
+from firebreak.interceptor import FirebreakInterceptor
+from firebreak.models import Alert, EvaluationResult
+
+
+def alert_to_record(alert: Alert) -> dict:
+    """Serialize an alert to a JSON-compatible record.
+
+    Args:
+        alert: The Alert to serialize.
+
+    Returns:
+        A dict suitable for json.dumps().
+    """
+    return {
+        "target": alert.target,
+        "rule_id": alert.rule_id,
+        "rule_description": alert.rule_description,
+        "intent_category": alert.intent_category,
+        "decision": alert.decision.value,
+        "count": alert.count,
+        "first_seen": alert.first_seen.isoformat(),
+        "last_seen": alert.last_seen.isoformat(),
+    }
+
+
+def _summary(alert: Alert) -> str:
+    """Format an alert as one line of text.
+
+    Args:
+        alert: The Alert to describe.
+
+    Returns:
+        A short human-readable summary.
+    """
+    times = "time" if alert.count == 1 else "times"
+    return (
+        f"{alert.decision.value} {alert.rule_id} ({alert.intent_category})"
+        f" {alert.count} {times} between {alert.first_seen:%Y-%m-%d %H:%M:%S}"
+        f" and {alert.last_seen:%Y-%m-%d %H:%M:%S}: {alert.rule_description}"
+    )
+
+
+class AlertSink(abc.ABC):
+    """Destination for alert batches.
+
+    Subclasses implement send(). A send that raises is retried by the
+    dispatcher, so it should either deliver the whole batch or raise.
+    """
+
+    @abc.abstractmethod
+    def send(self, target: str, alerts: list[Alert]) -> None:
+        """Deliver a batch of alerts for one target.
+
+        Args:
+            target: The notification target.
+            alerts: Aggregated alerts for the target.
+        """
+
+    def close(self) -> None:
+        """Release any resources held by the sink."""
+
+
+class FileSink(AlertSink):
+    """Appends alerts to a JSON Lines file.
+
+    Attributes:
+        path: Path of the file.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the sink.
+
+        Args:
+            path: Path of the JSON Lines file to append to.
+        """
+        self.path = path
+
+    def send(self, target: str, alerts: list[Alert]) -> None:
+        """Append one line per alert."""
+        with open(self.path, "a", encoding="utf-8") as f:
+            for alert in alerts:
+                f.write(json.dumps(alert_to_record(alert)) + "\n")
+
+
+class WebhookSink(AlertSink):
+    """POSTs each batch to a URL as JSON.
+
+    The body is {"target": ..., "alerts": [...]}. Any non-2xx response
+    raises and is retried.
+
+    Attributes:
+        url: The webhook URL.
+        timeout: Seconds to wait for the request.
+    """
+
+    def __init__(self, url: str, timeout: float = 10.0) -> None:
+        """Initialize the sink.
+
+        Args:
+            url: The webhook URL.
+            timeout: Seconds to wait for the request.
+        """
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, target: str, alerts: list[Alert]) -> None:
+        """POST the batch."""
+        body = json.dumps(
+            {"target": target, "alerts": [alert_to_record(a) for a in alerts]}
+        ).encode()
+        request = urllib.request.Request(
+            self.url,
+            data=body,
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+class SyslogSink(AlertSink):
+    """Sends one syslog message per alert.
+
+    Attributes:
+        address: Syslog socket path or (host, port) pair.
+    """
+
+    def __init__(self, address: str | tuple[str, int] = "/dev/log") -> None:
+        """Initialize the sink.
+
+        Args:
+            address: Syslog socket path or (host, port) pair.
+        """
+        self.address = address
+        self._handler = logging.handlers.SysLogHandler(
+            address=address,
+            facility=logging.handlers.SysLogHandler.LOG_AUTH,
+        )
+
+    def send(self, target: str, alerts: list[Alert]) -> None:
+        """Emit one warning-level message per alert."""
+        for alert in alerts:
+            record = logging.LogRecord(
+                "firebreak",
+                logging.WARNING,
+                __file__,
+                0,
+                "firebreak[%s]: %s",
+                (target, _summary(alert)),
+                None,
+            )
+            self._handler.emit(record)
+
+    def close(self) -> None:
+        """Close the syslog socket."""
+        self._handler.close()
+
+
+class SMTPSink(AlertSink):
+    """Emails each batch through an SMTP relay.
+
+    Attributes:
+        host: SMTP server host.
+        port: SMTP server port.
+        sender: From address.
+        recipients: Address per target; targets without one use default.
+        default: Fallback recipient address, or None to skip them.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 25,
+        sender: str = "firebreak@localhost",
+        recipients: dict[str, str] | None = None,
+        default: str | None = None,
+    ) -> None:
+        """Initialize the sink.
+
+        Args:
+            host: SMTP server host.
+            port: SMTP server port.
+            sender: From address.
+            recipients: Address per target.
+            default: Recipient for targets not in recipients.
+        """
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = recipients or {}
+        self.default = default
+
+    def send(self, target: str, alerts: list[Alert]) -> None:
+        """Send one email listing every alert in the batch."""
+        recipient = self.recipients.get(target, self.default)
+        if recipient is None:
+            return
+        total = sum(alert.count for alert in alerts)
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = recipient
+        message["Subject"] = f"[Firebreak] {total} alert(s) for {target}"
+        message.set_content("\n".join(_summary(alert) for alert in alerts) + "\n")
+        with smtplib.SMTP(self.host, self.port, timeout=10) as smtp:
+            smtp.send_message(message)
+
+
+class AlertDispatcher:
+    """Delivers alert events to sinks without touching the request path.
+
+    submit() only folds the alert into the pending batch under a lock.
+    A background thread wakes every window seconds and sends one batch
+    per target to each sink, so a storm of identical alerts (same
+    target, rule and category) becomes a single alert with a count,
+    and each sink sees at most one batch per target per window. Failed
+    sends are retried with exponential backoff; a batch that still fails
+    is counted and dropped.
+
+    Attributes:
+        sinks: Destinations for every target's batches.
+        window: Seconds to aggregate alerts before sending.
+        max_retries: Retries per sink after a failed send.
+        backoff: Delay before the first retry, doubled for each next one.
+        received: Alert events submitted.
+        sent: Batches delivered, summed over all sinks (a batch sent to
+            two sinks counts twice).
+        failed: Batches abandoned after all retries.
+    """
+
+    def __init__(
+        self,
+        sinks: list[AlertSink],
+        window: float = 60.0,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+    ) -> None:
+        """Initialize the dispatcher and start its sender thread.
+
+        Args:
+            sinks: Destinations for every target's batches.
+            window: Seconds to aggregate alerts before sending.
+            max_retries: Retries per sink after a failed send.
+            backoff: Delay in seconds before the first retry.
+        """
+        self.sinks = sinks
+        self.window = window
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.received = 0
+        self.sent = 0
+        self.failed = 0
+        self._pending: dict[tuple[str, str, str], Alert] = {}
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sender = threading.Thread(
+            target=self._run, name="firebreak-alerts", daemon=True
+        )
+        self._sender.start()
+
+    def register(self, interceptor: FirebreakInterceptor) -> None:
+        """Subscribe to an interceptor's alert events.
+
+        Args:
+            interceptor: The FirebreakInterceptor to subscribe to.
+        """
+        interceptor.on("alert", self.submit, "alerts")
+
+    def submit(self, alert_data: dict) -> None:
+        """Add one alert event to the pending batch.
+
+        Args:
+            alert_data: Dict with "target" and "evaluation" keys, as
+                emitted by the interceptor.
+        """
+        target: str = alert_data["target"]
+        evaluation: EvaluationResult = alert_data["evaluation"]
+        category = evaluation.classification.intent_category
+        key = (target, evaluation.matched_rule_id, category)
+        now = datetime.now()
+        with self._lock:
+            self.received += 1
+            alert = self._pending.get(key)
+            if alert is None:
+                self._pending[key] = Alert(
+                    target=target,
+                    rule_id=evaluation.matched_rule_id,
+                    rule_description=evaluation.rule_description,
+                    intent_category=category,
+                    decision=evaluation.decision,
+                    first_seen=now,
+                    last_seen=now,
+                )
+            else:
+                alert.count += 1
+                alert.last_seen = now
+
+    def flush(self) -> None:
+        """Send everything pending now, retrying failed sends."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        batches: dict[str, list[Alert]] = {}
+        for alert in pending.values():
+            batches.setdefault(alert.target, []).append(alert)
+        with self._send_lock:
+            for target, alerts in batches.items():
+                for sink in self.sinks:
+                    self._deliver(sink, target, alerts)
+
+    def close(self) -> None:
+        """Stop the sender thread, send what is pending and close sinks."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._sender.join()
+        self.flush()
+        for sink in self.sinks:
+            sink.close()
+
+    def _run(self) -> None:
+        """Sender loop: flush once per window until stopped."""
+        while not self._stop.wait(self.window):
+            self.flush()
+
+    def _deliver(self, sink: AlertSink, target: str, alerts: list[Alert]) -> None:
+        """Send one batch to one sink with retries.
+
+        Args:
+            sink: The destination.
+            target: The notification target.
+            alerts: The batch to send.
+        """
+        delay = self.backoff
+        for attempt in range(self.max_retries + 1):
+            try:
+                sink.send(target, alerts)
+            except Exception:
+                if attempt == self.max_retries:
+                    self.failed += 1
+                    return
+                # Returns early once close() is called, so shutdown is
+                # not held up by backoff.
+                self._stop.wait(delay)
+                delay *= 2
+            else:
+                self.sent += 1
+                return
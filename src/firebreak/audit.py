@@ -1,18 +1,99 @@
 """Append-only audit log for policy evaluation records."""
 
-from firebreak.models import AuditEntry, ClassificationResult, EvaluationResult
+import gzip
+import json
+import math
+import os
+import queue
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime
+
+from firebreak.audit_segments import (
+    SegmentSummary,
+    apply_retention,
+    load_manifest,
+    manifest_entry,
+    open_segment,
+    save_manifest,
+    seal,
+)
+from firebreak.blobs import BlobIntegrityError, BlobStore, blob_digest
+from firebreak.integrity import GENESIS_HASH, chain_record, iter_records, merkle_root
+from firebreak.models import (
+    AuditEntry,
+    AuditLevel,
+    ClassificationResult,
+    Decision,
+    EvaluationResult,
+)
+
+TAIL_READ_BYTES = 64 * 1024
+
+
+class AuditWriteError(OSError):
+    """The audit writer thread failed, so entries no longer reach disk."""
+
+
+@dataclass
+class AuditPage:
+    """One page of audit query results.
+
+    Attributes:
+        entries: Matching entries in log order.
+        next_cursor: Cursor for the following page, or None if this is
+            the last page.
+    """
+
+    entries: list[AuditEntry]
+    next_cursor: int | None = None
 
 
 class AuditLog:
     """Append-only log of policy evaluation audit entries.
 
+    Every entry is assigned a sequence number. Secondary indexes map
+    decision, matched rule, intent category and alert target to sorted
+    arrays of sequence numbers, and a timestamp array maps time ranges
+    to sequence ranges, so query() never scans the whole log.
+
     Attributes:
-        entries: The ordered list of audit entries.
+        entries: The ordered list of audit entries held in memory.
+        max_entries: Maximum entries kept in memory, or None for no
+            limit. Older entries are trimmed in chunks once exceeded.
     """
 
-    def __init__(self) -> None:
-        """Initialize an empty audit log."""
+    def __init__(self, max_entries: int | None = None) -> None:
+        """Initialize an empty audit log.
+
+        Args:
+            max_entries: Optional cap on entries kept in memory.
+        """
         self.entries: list[AuditEntry] = []
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._next_seq = 0
+        # Sequence number of entries[0].
+        self._base_seq = 0
+        # Sequence number of _timestamps[0]; the oldest indexed entry.
+        self._index_base = 0
+        self._timestamps = array("d")
+        # Latest sequence number whose timestamp is earlier than its
+        # predecessor's (relayed entries can arrive out of order). Time
+        # bounds are bisected only once it has left the index.
+        self._unordered_seq = -1
+        self._postings: dict[tuple[str, object], array] = {}
+
+    def _start_at(self, seq: int) -> None:
+        """Continue numbering from seq (for logs resumed from disk).
+
+        Args:
+            seq: Sequence number of the next entry.
+        """
+        self._next_seq = self._base_seq = self._index_base = seq
 
     def log(
         self,
@@ -30,14 +111,132 @@ class AuditLog:
         Returns:
             The newly created AuditEntry.
         """
+        if classification.raw_prompt == prompt:
+            # Keep one copy of the text per entry.
+            prompt = classification.raw_prompt
         entry = AuditEntry(
             prompt_text=prompt,
             classification=classification,
             evaluation=evaluation,
         )
-        self.entries.append(entry)
+        self.append(entry)
         return entry
 
+    def append(self, entry: AuditEntry) -> None:
+        """Append an existing entry, keeping its id and timestamp.
+
+        Used to collect entries created elsewhere, e.g. by server
+        worker processes, into one ordered log.
+
+        Args:
+            entry: The entry to append.
+        """
+        with self._lock:
+            seq = self._next_seq
+            self._next_seq += 1
+            self.entries.append(entry)
+            self._index(seq, entry)
+            self._appended(seq, entry)
+            self._trim()
+
+    @property
+    def healthy(self) -> bool:
+        """Whether appended entries are reaching the log's storage.
+
+        Always True for a log held in this process; logs that deliver
+        entries elsewhere report False while delivery is failing.
+        """
+        return True
+
+    def _appended(self, seq: int, entry: AuditEntry) -> None:
+        """Hook called under the lock after an entry is appended.
+
+        Args:
+            seq: The entry's sequence number.
+            entry: The appended entry.
+        """
+
+    def _index(self, seq: int, entry: AuditEntry) -> None:
+        """Add an entry to the secondary indexes.
+
+        Args:
+            seq: The entry's sequence number.
+            entry: The entry to index.
+        """
+        e = entry.evaluation
+        keys = [
+            ("decision", e.decision.value),
+            ("rule_id", e.matched_rule_id),
+            ("category", entry.classification.intent_category),
+        ]
+        keys.extend(("alert", target) for target in e.alerts)
+        if e.alerts:
+            keys.append(("alerted", True))
+        for key in keys:
+            posting = self._postings.get(key)
+            if posting is None:
+                posting = self._postings[key] = array("q")
+            posting.append(seq)
+        timestamp = entry.timestamp.timestamp()
+        if self._timestamps and timestamp < self._timestamps[-1]:
+            self._unordered_seq = seq
+        self._timestamps.append(timestamp)
+
+    def _trim(self) -> None:
+        """Drop the oldest in-memory entries once max_entries is exceeded.
+
+        Trimming waits for a quarter of max_entries of slack so the cost
+        of shifting the list is amortized across many appends.
+        """
+        if self.max_entries is None:
+            return
+        excess = len(self.entries) - self.max_entries
+        if excess > max(1, self.max_entries // 4):
+            del self.entries[:excess]
+            self._base_seq += excess
+            self._evict(self._base_seq)
+
+    def _evict(self, base: int) -> None:
+        """Drop index entries for entries trimmed from memory.
+
+        Args:
+            base: The oldest sequence number still held in memory.
+        """
+        self._drop_index(base)
+
+    def _drop_index(self, base: int) -> None:
+        """Drop index entries for sequence numbers below base.
+
+        Must be called with the lock held.
+
+        Args:
+            base: The oldest sequence number to keep indexed.
+        """
+        del self._timestamps[: base - self._index_base]
+        self._index_base = base
+        for key, posting in list(self._postings.items()):
+            cut = bisect_left(posting, base)
+            if cut:
+                del posting[:cut]
+            if not posting:
+                del self._postings[key]
+
+    def _unindex(self, seqs: set[int]) -> None:
+        """Drop sequence numbers from the secondary indexes.
+
+        Must be called with the lock held. The timestamp array stays
+        positional, so time ranges still map to sequence ranges.
+
+        Args:
+            seqs: Sequence numbers to drop.
+        """
+        for key, posting in list(self._postings.items()):
+            kept = array("q", (seq for seq in posting if seq not in seqs))
+            if kept:
+                self._postings[key] = kept
+            else:
+                del self._postings[key]
+
     def get_entries(self) -> list[AuditEntry]:
         """Return all audit entries.
 
@@ -50,6 +249,1133 @@ class AuditLog:
         """Return only audit entries that triggered alerts.
 
         Returns:
-            Entries where the evaluation result has non-empty alerts.
+            In-memory entries where the evaluation result has non-empty
+            alerts.
+        """
+        with self._lock:
+            posting = self._postings.get(("alerted", True), array("q"))
+            start = bisect_left(posting, self._base_seq)
+            return [self.entries[seq - self._base_seq] for seq in posting[start:]]
+
+    def query(
+        self,
+        decision: Decision | None = None,
+        rule_id: str | None = None,
+        category: str | None = None,
+        alert: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        cursor: int | None = None,
+        limit: int = 100,
+    ) -> AuditPage:
+        """Find entries matching every given filter, in log order.
+
+        The shortest matching index drives the scan; other filters are
+        checked by binary search, so cost is proportional to the
+        smallest index rather than the size of the log.
+
+        Args:
+            decision: Only entries with this decision.
+            rule_id: Only entries that matched this rule.
+            category: Only entries classified into this intent category.
+            alert: Only entries that alerted this target.
+            since: Only entries logged at or after this time.
+            until: Only entries logged before this time.
+            cursor: next_cursor from a previous page.
+            limit: Maximum entries per page.
+
+        Returns:
+            An AuditPage of matching entries.
+
+        Raises:
+            ValueError: If limit is less than 1.
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        filters = {
+            "decision": decision.value if decision is not None else None,
+            "rule_id": rule_id,
+            "category": category,
+            "alert": alert,
+        }
+        found = self._collect(filters, since, until, cursor, limit + 1)
+        next_cursor = None
+        if len(found) > limit:
+            found = found[:limit]
+            next_cursor = found[-1][0]
+        return AuditPage(entries=[entry for _, entry in found], next_cursor=next_cursor)
+
+    def _collect(
+        self,
+        filters: dict[str, object],
+        since: datetime | None,
+        until: datetime | None,
+        cursor: int | None,
+        limit: int,
+    ) -> list[tuple[int, AuditEntry]]:
+        """Gather up to limit matching entries after cursor, in log order.
+
+        Args:
+            filters: Index name to required value; None values are
+                ignored.
+            since: Inclusive lower time bound.
+            until: Exclusive upper time bound.
+            cursor: Only entries after this sequence number.
+            limit: Maximum entries to return.
+
+        Returns:
+            (seq, entry) pairs in ascending sequence order.
+        """
+        # Entries removed by retention are indexed but no longer
+        # readable, so keep matching until the page is full.
+        found: list[tuple[int, AuditEntry]] = []
+        while len(found) < limit:
+            want = limit - len(found)
+            with self._lock:
+                seqs = self._match(filters, since, until, cursor, want)
+            found.extend(self._fetch(seqs))
+            if len(seqs) < want:
+                break
+            cursor = seqs[-1]
+        return found
+
+    def _match(
+        self,
+        filters: dict[str, object],
+        since: datetime | None,
+        until: datetime | None,
+        cursor: int | None,
+        limit: int,
+    ) -> list[int]:
+        """Find up to limit sequence numbers matching the filters.
+
+        Must be called with the lock held.
+
+        Args:
+            filters: Index name to required value; None values are
+                ignored.
+            since: Inclusive lower time bound.
+            until: Exclusive upper time bound.
+            cursor: Only sequence numbers after this one.
+            limit: Maximum sequence numbers to return.
+
+        Returns:
+            Matching sequence numbers in ascending order.
+        """
+        lo = self._index_base
+        if cursor is not None:
+            lo = max(lo, cursor + 1)
+        hi = self._next_seq
+        window = None
+        if self._unordered_seq > self._index_base:
+            # Timestamps are not sorted, so check each entry's instead.
+            if since is not None or until is not None:
+                window = (
+                    since.timestamp() if since is not None else -math.inf,
+                    until.timestamp() if until is not None else math.inf,
+                )
+        else:
+            if since is not None:
+                lo = max(lo, self._seq_at(since))
+            if until is not None:
+                hi = min(hi, self._seq_at(until))
+        if lo >= hi:
+            return []
+
+        postings = []
+        for name, value in filters.items():
+            if value is None:
+                continue
+            posting = self._postings.get((name, value))
+            if posting is None:
+                return []
+            postings.append(posting)
+        if not postings and window is None:
+            return list(range(lo, min(hi, lo + limit)))
+
+        if postings:
+            postings.sort(key=len)
+            driver, others = postings[0], postings[1:]
+            candidates = driver[bisect_left(driver, lo) :]
+        else:
+            candidates, others = range(lo, hi), []
+        matched: list[int] = []
+        for seq in candidates:
+            if seq >= hi:
+                break
+            if window is not None and not (
+                window[0] <= self._timestamps[seq - self._index_base] < window[1]
+            ):
+                continue
+            if all(_contains(p, seq) for p in others):
+                matched.append(seq)
+                if len(matched) >= limit:
+                    break
+        return matched
+
+    def _seq_at(self, when: datetime) -> int:
+        """Map a time to the first sequence number logged at or after it.
+
+        Only valid while the indexed timestamps are in order.
+
+        Args:
+            when: The time to look up.
+
+        Returns:
+            A sequence number.
+        """
+        return self._index_base + bisect_left(self._timestamps, when.timestamp())
+
+    def _fetch(self, seqs: list[int]) -> list[tuple[int, AuditEntry]]:
+        """Resolve sequence numbers to entries.
+
+        Args:
+            seqs: Sequence numbers in ascending order.
+
+        Returns:
+            (seq, entry) pairs for the entries still held in memory.
+        """
+        with self._lock:
+            base = self._base_seq
+            return [(seq, self.entries[seq - base]) for seq in seqs if seq >= base]
+
+
+def _contains(posting: array, seq: int) -> bool:
+    """Check whether a sorted posting array contains seq."""
+    i = bisect_left(posting, seq)
+    return i < len(posting) and posting[i] == seq
+
+
+def entry_to_record(entry: AuditEntry) -> dict:
+    """Serialize an audit entry to a JSON-compatible record.
+
+    Args:
+        entry: The AuditEntry to serialize.
+
+    Returns:
+        A dict suitable for json.dumps().
+    """
+    c = entry.classification
+    e = entry.evaluation
+    return {
+        "id": entry.id,
+        "timestamp": entry.timestamp.isoformat(),
+        "prompt": entry.prompt_text,
+        "classification": {
+            "intent_category": c.intent_category,
+            "confidence": c.confidence,
+            "timestamp": c.timestamp.isoformat(),
+            "error": c.error,
+        },
+        "evaluation": {
+            "decision": e.decision.value,
+            "matched_rule_id": e.matched_rule_id,
+            "rule_description": e.rule_description,
+            "audit_level": e.audit_level.value,
+            "alerts": list(e.alerts),
+            "constraints": list(e.constraints),
+            "color": e.color,
+            "note": e.note,
+            "llm_response": e.llm_response,
+            "speculative": e.speculative,
+            "upstream_error": e.upstream_error,
+        },
+    }
+
+
+def entry_from_record(record: dict) -> AuditEntry:
+    """Rebuild an audit entry from a record written by entry_to_record().
+
+    Args:
+        record: The deserialized record.
+
+    Returns:
+        The reconstructed AuditEntry.
+    """
+    c = record["classification"]
+    e = record["evaluation"]
+    classification = ClassificationResult(
+        intent_category=c["intent_category"],
+        confidence=c["confidence"],
+        raw_prompt=record["prompt"],
+        timestamp=datetime.fromisoformat(c["timestamp"]),
+        error=c.get("error"),
+    )
+    evaluation = EvaluationResult(
+        decision=Decision(e["decision"]),
+        matched_rule_id=e["matched_rule_id"],
+        rule_description=e["rule_description"],
+        audit_level=AuditLevel(e["audit_level"]),
+        alerts=tuple(e["alerts"]),
+        constraints=tuple(e["constraints"]),
+        color=e.get("color", ""),
+        note=e["note"],
+        classification=classification,
+        llm_response=e["llm_response"],
+        speculative=e["speculative"],
+        upstream_error=e.get("upstream_error"),
+    )
+    return AuditEntry(
+        prompt_text=record["prompt"],
+        classification=classification,
+        evaluation=evaluation,
+        id=record["id"],
+        timestamp=datetime.fromisoformat(record["timestamp"]),
+    )
+
+
+class FileAuditLog(AuditLog):
+    """Audit log that also appends every entry to a JSON Lines file.
+
+    log() only enqueues the entry; a background writer thread
+    serializes queued entries, writes them in batches and fsyncs at most
+    once per fsync_interval (group commit), so requests never wait on
+    disk I/O. Only the most recent max_entries are kept in memory.
+
+    The most recent max_indexed entries are indexed in memory, including
+    entries trimmed from memory: the writer records each record's byte
+    offset, so query() reads them back from disk. Older entries, and
+    entries written before the log was opened, are found by scanning
+    sealed segments and the active file. Each manifest entry lists the
+    values in its segment's footer index, and the scan skips segments
+    that cannot match.
+
+    Each record carries a sequence number and a SHA-256 hash chained to
+    the previous record. Every checkpoint_interval records (and on
+    close) a checkpoint record commits to the Merkle root of the records
+    since the last checkpoint. Hashing happens on the writer thread.
+
+    When the active file reaches max_segment_bytes or max_segment_age,
+    it is sealed with a footer record indexing the segment, compressed
+    to ``<path>.<first_seq>.gz`` and replaced by a fresh active file.
+    Sealed segments are then subject to per-level retention.
+
+    With a BlobStore, prompt and response bodies of at least
+    blob_threshold characters are stored once by SHA-256 digest and
+    records carry "prompt_blob" / "llm_response_blob" references. The
+    chained record hash covers the digest and every body read back is
+    checked against it, so the trail stays tamper-evident.
+
+    Attributes:
+        path: Path of the active JSON Lines file.
+        fsync_interval: Maximum seconds between fsyncs of written data.
+        batch_size: Maximum entries written per batch.
+        checkpoint_interval: Records covered by each Merkle checkpoint.
+        max_segment_bytes: Size that triggers rotation, or None.
+        max_segment_age: Seconds after its first entry that a segment
+            is rotated, or None.
+        retention: Seconds to keep each audit level; levels that are
+            absent or None are kept forever.
+        blobs: Content-addressed store for large bodies, or None.
+        blob_threshold: Minimum body length moved to the blob store.
+        max_indexed: Most recent entries kept in the in-memory index, or
+            None for no limit.
+        corrupt_blobs: Blob-stored bodies read back that no longer match
+            their digest; their entries are left out of query results.
+        error: The exception that stopped the writer thread, or None
+            while it runs. Once set, the log reports itself unhealthy,
+            new entries stay in memory only and flush() raises.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fsync_interval: float = 1.0,
+        batch_size: int = 512,
+        max_entries: int | None = 10_000,
+        checkpoint_interval: int = 1024,
+        max_segment_bytes: int | None = None,
+        max_segment_age: float | None = None,
+        retention: dict[AuditLevel, float | None] | None = None,
+        blobs: BlobStore | None = None,
+        blob_threshold: int = 256,
+        max_indexed: int | None = 100_000,
+    ) -> None:
+        """Open the log file for appending and start the writer thread.
+
+        An existing log is resumed: the chain continues from its last
+        record, a torn final line left by a crash is truncated, and a
+        segment that was footed but not sealed before a crash is sealed.
+
+        Args:
+            path: Path of the active JSON Lines file; created if missing.
+            fsync_interval: Seconds between fsyncs. 0 fsyncs every batch.
+            batch_size: Maximum entries written per batch.
+            max_entries: Cap on entries kept in memory.
+            checkpoint_interval: Records covered by each Merkle checkpoint.
+            max_segment_bytes: Rotate the active file at this size.
+            max_segment_age: Rotate the active file this many seconds
+                after its first entry.
+            retention: Seconds to keep each audit level.
+            blobs: Content-addressed store for prompt and response
+                bodies, or None to keep bodies inline.
+            blob_threshold: Bodies shorter than this many characters
+                stay inline.
+            max_indexed: Most recent entries kept in the in-memory
+                index; older ones are found by scanning the files.
+        """
+        super().__init__(max_entries=max_entries)
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.batch_size = batch_size
+        self.checkpoint_interval = checkpoint_interval
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age = max_segment_age
+        self.retention = retention or {}
+        self.blobs = blobs
+        self.blob_threshold = blob_threshold
+        self.max_indexed = max_indexed
+        self.corrupt_blobs = 0
+        self.error: BaseException | None = None
+        # Guards the segment list against rotation and retention while
+        # query() reads segments.
+        self._files_lock = threading.Lock()
+        self._segments = load_manifest(path)
+        self._segment = SegmentSummary()
+        next_seq, self._prev_hash = self._recover()
+        # Entries already on disk are found by scanning, not indexed.
+        self._start_at(next_seq)
+        self._last_seq = next_seq - 1
+        self._leaves: list[str] = []
+        # Byte offset of each record within its segment, indexed by
+        # seq - _offsets_base. Trimmed by the writer to follow the index.
+        self._offsets = array("q")
+        self._offsets_base = next_seq
+        self._file = open(path, "ab")
+        self._offset = self._file.seek(0, os.SEEK_END)
+        self._queue: queue.Queue = queue.Queue()
+        self._last_fsync = time.monotonic()
+        self._closed = False
+        self._writer = threading.Thread(
+            target=self._run, name="firebreak-audit-writer", daemon=True
+        )
+        self._writer.start()
+
+    def _recover(self) -> tuple[int, str]:
+        """Resume the chain from the active file or the last sealed segment.
+
+        Returns:
+            The next sequence number and the hash of the last record.
         """
-        return [e for e in self.entries if e.evaluation.alerts]
+        if self._segments:
+            last = self._segments[-1]
+            next_seq, prev_hash = last["last_seq"] + 1, last["hash"]
+        else:
+            next_seq, prev_hash = 0, GENESIS_HASH
+        tail = _resume(self.path)
+        if tail is None:
+            return next_seq, prev_hash
+        seq, hash_, record_type = tail
+        if seq < next_seq:
+            # Crashed after sealing but before removing the active file.
+            os.remove(self.path)
+            return next_seq, prev_hash
+        if self._rotates() or record_type == "footer":
+            with open(self.path, encoding="utf-8") as f:
+                for _, record in iter_records(f):
+                    if record.get("type") == "entry":
+                        self._segment.add(record)
+        if record_type == "footer":
+            self._prev_hash = hash_
+            self._seal()
+        return seq + 1, hash_
+
+    def _retention_policy(self) -> dict[str, float | None]:
+        """The retention policy as recorded in segment footers."""
+        return {level.value: seconds for level, seconds in self.retention.items()}
+
+    def _rotates(self) -> bool:
+        """Whether size- or age-based rotation is configured."""
+        return self.max_segment_bytes is not None or self.max_segment_age is not None
+
+    @property
+    def healthy(self) -> bool:
+        """Whether the writer thread is still writing entries to disk."""
+        return self.error is None
+
+    def _appended(self, seq: int, entry: AuditEntry) -> None:
+        """Queue an appended entry for the writer thread.
+
+        Nothing is queued once the writer has failed.
+
+        Args:
+            seq: The entry's sequence number.
+            entry: The appended entry.
+        """
+        if self.error is None:
+            self._queue.put((seq, entry))
+
+    def _evict(self, base: int) -> None:
+        """Keep index entries for trimmed entries; they are read from disk.
+
+        The index is bounded by max_indexed instead; see _index().
+
+        Args:
+            base: The oldest sequence number still held in memory.
+        """
+
+    def _index(self, seq: int, entry: AuditEntry) -> None:
+        """Index an entry, dropping the oldest once max_indexed is exceeded.
+
+        Like trimming, eviction waits for a quarter of max_indexed of
+        slack. Evicted entries are still found by _scan().
+
+        Args:
+            seq: The entry's sequence number.
+            entry: The entry to index.
+        """
+        super()._index(seq, entry)
+        if self.max_indexed is None:
+            return
+        excess = seq + 1 - self._index_base - self.max_indexed
+        if excess > max(1, self.max_indexed // 4):
+            self._drop_index(self._index_base + excess)
+
+    def _collect(
+        self,
+        filters: dict[str, object],
+        since: datetime | None,
+        until: datetime | None,
+        cursor: int | None,
+        limit: int,
+    ) -> list[tuple[int, AuditEntry]]:
+        """Gather matching entries from the files, then from the index.
+
+        Sequence numbers below the index base are scanned on disk; the
+        rest are answered from the in-memory index.
+
+        Args:
+            filters: Index name to required value; None values are
+                ignored.
+            since: Inclusive lower time bound.
+            until: Exclusive upper time bound.
+            cursor: Only entries after this sequence number.
+            limit: Maximum entries to return.
+
+        Returns:
+            (seq, entry) pairs in ascending sequence order.
+        """
+        after = -1 if cursor is None else cursor
+        found: list[tuple[int, AuditEntry]] = []
+        while len(found) < limit:
+            want = limit - len(found)
+            with self._lock:
+                base = self._index_base
+                seqs = None
+                if after + 1 >= base:
+                    seqs = self._match(filters, since, until, after, want)
+            if seqs is None:
+                # The range below the index base; if eviction moves the
+                # base meanwhile, the next pass scans the gap.
+                found.extend(self._scan(filters, since, until, after, base, want))
+                after = base - 1 if len(found) < limit else found[-1][0]
+                continue
+            found.extend(self._fetch(seqs))
+            if len(seqs) < want:
+                break
+            after = seqs[-1]
+        return found
+
+    def _scan(
+        self,
+        filters: dict[str, object],
+        since: datetime | None,
+        until: datetime | None,
+        after: int,
+        before: int,
+        limit: int,
+    ) -> list[tuple[int, AuditEntry]]:
+        """Find matching entries on disk between two sequence numbers.
+
+        Args:
+            filters: Index name to required value; None values are
+                ignored.
+            since: Inclusive lower time bound.
+            until: Exclusive upper time bound.
+            after: Only entries after this sequence number.
+            before: Only entries before this sequence number.
+            limit: Maximum entries to return.
+
+        Returns:
+            (seq, entry) pairs in ascending sequence order.
+        """
+        if before - 1 > self._last_seq:
+            self.flush()
+        lo = since.timestamp() if since is not None else None
+        hi = until.timestamp() if until is not None else None
+        directory = os.path.dirname(self.path)
+        with self._files_lock:
+            segments = list(self._segments)
+            # Opened under the lock so rotation cannot seal it between
+            # listing the segments and reading it.
+            try:
+                active = open(self.path, encoding="utf-8")
+            except FileNotFoundError:
+                active = None
+        names = [
+            os.path.join(directory, segment["file"])
+            for segment in segments
+            if segment["last_seq"] > after
+            and segment["first_seq"] < before
+            and not segment.get("anchor")
+            and _may_match(segment, filters, lo, hi)
+        ]
+        found: list[tuple[int, AuditEntry]] = []
+        try:
+            for name in names:
+                try:
+                    f = open_segment(name)
+                except FileNotFoundError:
+                    continue
+                with f:
+                    self._scan_file(f, filters, lo, hi, after, before, limit, found)
+                if len(found) >= limit:
+                    return found
+            if active is not None:
+                self._scan_file(active, filters, lo, hi, after, before, limit, found)
+        finally:
+            if active is not None:
+                active.close()
+        return found
+
+    def _scan_file(
+        self,
+        f,
+        filters: dict[str, object],
+        lo: float | None,
+        hi: float | None,
+        after: int,
+        before: int,
+        limit: int,
+        found: list[tuple[int, AuditEntry]],
+    ) -> None:
+        """Append matching entries from one open segment to found.
+
+        Args:
+            f: The segment, open for reading text.
+            filters: Index name to required value; None values are
+                ignored.
+            lo: Inclusive lower epoch time bound, or None.
+            hi: Exclusive upper epoch time bound, or None.
+            after: Only entries after this sequence number.
+            before: Only entries before this sequence number.
+            limit: Stop once found holds this many entries.
+            found: Receives (seq, entry) pairs.
+        """
+        for line in f:
+            if not line.endswith("\n"):
+                # Still being written.
+                return
+            record = json.loads(line)
+            if record.get("type") != "entry" or record["seq"] <= after:
+                continue
+            if record["seq"] >= before:
+                return
+            if not _record_matches(record, filters, lo, hi):
+                continue
+            if self._internalize(record):
+                found.append((record["seq"], entry_from_record(record)))
+                if len(found) >= limit:
+                    return
+
+    def _fetch(self, seqs: list[int]) -> list[tuple[int, AuditEntry]]:
+        """Resolve sequence numbers to entries, reading trimmed ones from disk.
+
+        Entries removed by retention are skipped.
+
+        Args:
+            seqs: Sequence numbers in ascending order.
+
+        Returns:
+            (seq, entry) pairs in the same order.
+        """
+        with self._lock:
+            base = self._base_seq
+            held = {seq: self.entries[seq - base] for seq in seqs if seq >= base}
+        missing = [seq for seq in seqs if seq not in held]
+        if missing:
+            if missing[-1] - self._offsets_base >= len(self._offsets):
+                self.flush()
+            held.update(self._read(missing))
+        return [(seq, held[seq]) for seq in seqs if seq in held]
+
+    def _read(self, seqs: list[int]) -> dict[int, AuditEntry]:
+        """Read entries from the active file or sealed segments.
+
+        Args:
+            seqs: Sequence numbers in ascending order.
+
+        Returns:
+            Entries by sequence number, omitting any that were redacted
+            or deleted by retention.
+        """
+        found: dict[int, AuditEntry] = {}
+        directory = os.path.dirname(self.path)
+        with self._files_lock:
+            starts = [segment["first_seq"] for segment in self._segments]
+            sealed_up_to = self._segments[-1]["last_seq"] if self._segments else -1
+            by_file: dict[str, list[int]] = {}
+            for seq in seqs:
+                if seq > sealed_up_to:
+                    name = self.path
+                else:
+                    i = bisect_right(starts, seq) - 1
+                    segment = self._segments[i] if i >= 0 else None
+                    if (
+                        segment is None
+                        or seq > segment["last_seq"]
+                        or segment.get("anchor")
+                    ):
+                        continue
+                    name = os.path.join(directory, self._segments[i]["file"])
+                by_file.setdefault(name, []).append(seq)
+            for name, wanted in by_file.items():
+                opener = gzip.open if name.endswith(".gz") else open
+                try:
+                    with opener(name, "rb") as f:
+                        for seq in wanted:
+                            i = seq - self._offsets_base
+                            if i < 0:
+                                # Evicted from the index since matching.
+                                continue
+                            f.seek(self._offsets[i])
+                            record = json.loads(f.readline())
+                            if record.get("type") == "entry" and self._internalize(
+                                record
+                            ):
+                                found[seq] = entry_from_record(record)
+                except FileNotFoundError:
+                    continue
+        return found
+
+    def apply_retention(self, now: float | None = None) -> None:
+        """Enforce the retention policy on sealed segments.
+
+        Runs automatically after each rotation and when the log opens.
+
+        Args:
+            now: Current epoch time; defaults to time.time().
+        """
+        if not self.retention:
+            return
+        with self._files_lock:
+            self._segments = apply_retention(
+                self.path,
+                self._segments,
+                self.retention,
+                time.time() if now is None else now,
+                release=self.blobs.release if self.blobs is not None else None,
+                rewritten=self._rewritten,
+            )
+            save_manifest(self.path, self._segments)
+
+    def _rewritten(self, offsets: dict[int, int], removed: list[int]) -> None:
+        """Follow a segment rewritten or deleted by retention.
+
+        Records move when expired entries become tombstones, so their
+        offsets are updated; removed entries leave the indexes.
+
+        Args:
+            offsets: New byte offset per sequence number in the segment.
+            removed: Sequence numbers of the entries removed.
+        """
+        for seq, offset in offsets.items():
+            i = seq - self._offsets_base
+            if 0 <= i < len(self._offsets):
+                self._offsets[i] = offset
+        if removed:
+            with self._lock:
+                self._unindex(set(removed))
+
+    def flush(self) -> None:
+        """Block until every queued entry is written and fsynced.
+
+        Raises:
+            AuditWriteError: If the writer thread has failed.
+        """
+        done = threading.Event()
+        with self._lock:
+            # Under the lock so a failing writer cannot drain the queue
+            # between the check and the put.
+            self._raise_if_failed()
+            self._queue.put(done)
+        done.wait()
+        self._raise_if_failed()
+
+    def close(self) -> None:
+        """Write and fsync queued entries, then close the file and blob store."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        try:
+            self._file.close()
+        except OSError:
+            if self.error is None:
+                raise
+        if self.blobs is not None:
+            self.blobs.close()
+
+    def _raise_if_failed(self) -> None:
+        """Raise AuditWriteError if the writer thread has failed."""
+        if self.error is not None:
+            raise AuditWriteError(f"audit writer failed: {self.error}") from self.error
+
+    def _run(self) -> None:
+        """Run the writer loop, recording the error that stops it.
+
+        A failed write, fsync, checkpoint or rotation stops the writer.
+        The error is kept, the log turns unhealthy and every waiting
+        flush() is woken to raise it.
+        """
+        waiters: list[threading.Event] = []
+        try:
+            self._write(waiters)
+        except BaseException as exc:
+            with self._lock:
+                self.error = exc
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if isinstance(item, threading.Event):
+                        waiters.append(item)
+            for waiter in waiters:
+                waiter.set()
+
+    def _write(self, waiters: list[threading.Event]) -> None:
+        """Writer loop: drain the queue in batches with group commit.
+
+        Args:
+            waiters: Collects the flush() events of the current batch,
+                which are set once the batch is on disk.
+        """
+        self.apply_retention()
+        dirty = False
+        while True:
+            try:
+                if dirty:
+                    wait = self._last_fsync + self.fsync_interval - time.monotonic()
+                    item = self._queue.get(timeout=max(0.0, wait))
+                else:
+                    item = self._queue.get()
+            except queue.Empty:
+                self._sync()
+                dirty = False
+                continue
+            pending: list[tuple[int, AuditEntry]] = []
+            stop = False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    pending.append(item)
+                if stop or len(pending) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            lines = self._encode(pending)
+            if stop and self._leaves:
+                lines.append(self._checkpoint())
+            if lines:
+                self._file.write(b"".join(lines))
+                self._file.flush()
+                dirty = True
+                self._trim_offsets()
+            due = time.monotonic() - self._last_fsync >= self.fsync_interval
+            if dirty and (due or waiters or stop):
+                self._sync()
+                dirty = False
+            if not stop and self._rotation_due():
+                self._rotate()
+                dirty = False
+            for waiter in waiters:
+                waiter.set()
+            waiters.clear()
+            if stop:
+                return
+
+    def _trim_offsets(self) -> None:
+        """Drop byte offsets of entries no longer in the index.
+
+        Waits for a quarter of the array in slack, like trimming.
+        """
+        drop = min(self._index_base - self._offsets_base, len(self._offsets))
+        if drop > max(1, len(self._offsets) // 4):
+            with self._files_lock:
+                del self._offsets[:drop]
+                self._offsets_base += drop
+
+    def _rotation_due(self) -> bool:
+        """Whether the active segment has reached its size or age limit."""
+        if self._segment.first_seq is None:
+            return False
+        if self.max_segment_bytes is not None and (
+            self._offset >= self.max_segment_bytes
+        ):
+            return True
+        return self.max_segment_age is not None and (
+            time.time() - self._segment.first_timestamp >= self.max_segment_age
+        )
+
+    def _rotate(self) -> None:
+        """Foot, seal and compress the active segment, then start a new one."""
+        lines = [self._checkpoint()] if self._leaves else []
+        lines.append(self._line(self._segment.footer(self._retention_policy())))
+        self._file.write(b"".join(lines))
+        self._file.flush()
+        self._sync()
+        self._file.close()
+        self._seal()
+        self._file = open(self.path, "ab")
+        self._offset = 0
+        self.apply_retention()
+
+    def _seal(self) -> None:
+        """Compress the footed active file and record it in the manifest."""
+        footer = self._segment.footer(self._retention_policy())
+        footer["hash"] = self._prev_hash
+        sealed = seal(self.path, self._segment.first_seq)
+        with self._files_lock:
+            self._segments.append(manifest_entry(footer, os.path.basename(sealed)))
+            save_manifest(self.path, self._segments)
+            os.remove(self.path)
+            self._segment = SegmentSummary()
+
+    def _encode(self, pending: list[tuple[int, AuditEntry]]) -> list[bytes]:
+        """Serialize and chain a batch of entries.
+
+        Large bodies are moved to the blob store in one transaction
+        before any record referring to them is written.
+
+        Args:
+            pending: (seq, entry) pairs in sequence order.
+
+        Returns:
+            The lines to write.
+        """
+        records = [(seq, entry_to_record(entry)) for seq, entry in pending]
+        if self.blobs is not None:
+            bodies: list[str] = []
+            for _, record in records:
+                self._externalize(record, bodies)
+            if bodies:
+                self.blobs.put_many(bodies)
+        lines: list[bytes] = []
+        for seq, record in records:
+            lines.extend(self._chain(seq, record))
+        return lines
+
+    def _externalize(self, record: dict, bodies: list[str]) -> None:
+        """Replace large bodies in a record with blob digests.
+
+        Args:
+            record: The serialized entry, modified in place.
+            bodies: Receives the bodies to store.
+        """
+        prompt = record["prompt"]
+        if len(prompt) >= self.blob_threshold:
+            record["prompt_blob"] = blob_digest(prompt)
+            del record["prompt"]
+            bodies.append(prompt)
+        evaluation = record["evaluation"]
+        response = evaluation["llm_response"]
+        if response is not None and len(response) >= self.blob_threshold:
+            evaluation["llm_response_blob"] = blob_digest(response)
+            del evaluation["llm_response"]
+            bodies.append(response)
+
+    def _internalize(self, record: dict) -> bool:
+        """Restore blob-stored bodies into a record read from disk.
+
+        Each body is checked against its digest, which the record hash
+        covers, so an edited blob is never returned as audit content.
+
+        Args:
+            record: The entry record, modified in place.
+
+        Returns:
+            False if a referenced body is missing from the blob store or
+            does not match its digest.
+        """
+        evaluation = record["evaluation"]
+        for holder, field in ((record, "prompt"), (evaluation, "llm_response")):
+            digest = holder.pop(f"{field}_blob", None)
+            if digest is None:
+                continue
+            try:
+                body = self.blobs.get(digest) if self.blobs is not None else None
+            except BlobIntegrityError:
+                self.corrupt_blobs += 1
+                return False
+            if body is None:
+                return False
+            holder[field] = body
+        return True
+
+    def _chain(self, seq: int, record: dict) -> list[bytes]:
+        """Sequence and chain one entry record.
+
+        Args:
+            seq: The entry's sequence number.
+            record: The serialized entry.
+
+        Returns:
+            The lines to write: the entry, plus a checkpoint if due.
+        """
+        record["type"] = "entry"
+        record["seq"] = seq
+        self._last_seq = seq
+        self._offsets.append(self._offset)
+        lines = [self._line(record)]
+        self._leaves.append(record["hash"])
+        if self._rotates():
+            self._segment.add(record)
+        if len(self._leaves) >= self.checkpoint_interval:
+            lines.append(self._checkpoint())
+        return lines
+
+    def _checkpoint(self) -> bytes:
+        """Commit the records since the last checkpoint to a Merkle root.
+
+        Returns:
+            The checkpoint line to write.
+        """
+        record = {
+            "type": "checkpoint",
+            "first_seq": self._last_seq - len(self._leaves) + 1,
+            "last_seq": self._last_seq,
+            "merkle_root": merkle_root(self._leaves),
+        }
+        self._leaves = []
+        return self._line(record)
+
+    def _line(self, record: dict) -> bytes:
+        """Chain a record and encode it as one line.
+
+        Args:
+            record: The record to chain.
+
+        Returns:
+            The encoded line, including its newline.
+        """
+        line = (chain_record(record, self._prev_hash) + "\n").encode()
+        self._prev_hash = record["hash"]
+        self._offset += len(line)
+        return line
+
+    def _sync(self) -> None:
+        """Flush written records to stable storage."""
+        os.fsync(self._file.fileno())
+        self._last_fsync = time.monotonic()
+
+
+def _may_match(
+    segment: dict,
+    filters: dict[str, object],
+    lo: float | None,
+    hi: float | None,
+) -> bool:
+    """Check a manifest entry for a segment that could hold matches.
+
+    Args:
+        segment: The segment's manifest entry.
+        filters: Index name to required value; None values are ignored.
+        lo: Inclusive lower epoch time bound, or None.
+        hi: Exclusive upper epoch time bound, or None.
+
+    Returns:
+        False if the segment's time range or footer index rules it out.
+    """
+    if lo is not None and segment["last_timestamp"] < lo:
+        return False
+    if hi is not None and segment["first_timestamp"] >= hi:
+        return False
+    keys = segment.get("keys", {})
+    return all(
+        value is None or name not in keys or value in keys[name]
+        for name, value in filters.items()
+    )
+
+
+def _record_matches(
+    record: dict,
+    filters: dict[str, object],
+    lo: float | None,
+    hi: float | None,
+) -> bool:
+    """Check an entry record read from disk against query filters.
+
+    Args:
+        record: The entry record.
+        filters: Index name to required value; None values are ignored.
+        lo: Inclusive lower epoch time bound, or None.
+        hi: Exclusive upper epoch time bound, or None.
+
+    Returns:
+        True if the record satisfies every filter.
+    """
+    e = record["evaluation"]
+    values = {
+        "decision": e["decision"],
+        "rule_id": e["matched_rule_id"],
+        "category": record["classification"]["intent_category"],
+    }
+    for name, value in filters.items():
+        if value is None:
+            continue
+        if name == "alert":
+            if value not in e["alerts"]:
+                return False
+        elif values[name] != value:
+            return False
+    if lo is None and hi is None:
+        return True
+    ts = datetime.fromisoformat(record["timestamp"]).timestamp()
+    return (lo is None or ts >= lo) and (hi is None or ts < hi)
+
+
+def _resume(path: str) -> tuple[int, str, str] | None:
+    """Find where an existing active audit file's chain left off.
+
+    A final line without a trailing newline is a torn write from a crash
+    and is truncated so new records start on a clean line.
+
+    Args:
+        path: Path of the active JSON Lines file.
+
+    Returns:
+        The last record's sequence number, hash and type, or None if
+        the file is missing, empty or predates hash chaining.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        chunk = TAIL_READ_BYTES
+        while True:
+            start = max(0, size - chunk)
+            f.seek(start)
+            tail = f.read()
+            if tail.count(b"\n") >= 2 or start == 0:
+                break
+            chunk *= 2
+        if tail and not tail.endswith(b"\n"):
+            cut = tail.rfind(b"\n") + 1
+            f.truncate(start + cut)
+            tail = tail[:cut]
+    lines = tail.splitlines()
+    if not lines:
+        return None
+    last = json.loads(lines[-1])
+    if "hash" not in last:
+        return None
+    seq = last["seq"] if last["type"] == "entry" else last["last_seq"]
+    return seq, last["hash"], last["type"]
@@ -0,0 +1,161 @@
+"""Command-line tools for inspecting Firebreak audit logs."""
+
+import argparse
+import json
+import sys
+
+from firebreak.audit_segments import iter_log_lines
+from firebreak.blobs import BlobStore
+from firebreak.integrity import prove_record, verify_records
+from firebreak.models import AuditLevel
+
+
+def retention_arg(value: str) -> tuple[AuditLevel, float | None]:
+    """Parse a retention value such as "standard=90" or "critical=forever".
+
+    Args:
+        value: LEVEL=DAYS, where DAYS may be "forever".
+
+    Returns:
+        The audit level and its retention in seconds (None for forever).
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is malformed.
+    """
+    level, _, days = value.partition("=")
+    try:
+        audit_level = AuditLevel(level.strip().lower())
+        if days.strip().lower() == "forever":
+            return audit_level, None
+        return audit_level, float(days) * 86400
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected LEVEL=DAYS or LEVEL=forever, got {value!r}"
+        ) from None
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Args:
+        argv: Argument list, or None to use sys.argv.
+
+    Returns:
+        Parsed argument namespace.
+    """
+    parser = argparse.ArgumentParser(
+        prog="firebreak-audit",
+        description="Firebreak — audit log tools",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    verify = commands.add_parser(
+        "verify", help="Verify the hash chain and Merkle checkpoints"
+    )
+    verify.add_argument("path", help="Audit log (active path or one .gz segment)")
+    verify.add_argument(
+        "--retain",
+        type=retention_arg,
+        action="append",
+        default=[],
+        metavar="LEVEL=DAYS",
+        help="Check removals against this retention instead of the one"
+        " recorded when each segment was sealed (repeatable)",
+    )
+    verify.add_argument(
+        "--blobs",
+        default=None,
+        metavar="PATH",
+        help="Blob store the log was written with; checks every stored body",
+    )
+
+    prove = commands.add_parser(
+        "prove", help="Print a Merkle inclusion proof for one record"
+    )
+    prove.add_argument("path", help="Audit log (active path or one .gz segment)")
+    prove.add_argument("seq", type=int, help="Sequence number of the record")
+    return parser.parse_args(argv)
+
+
+def _verify(
+    path: str,
+    retain: list[tuple[AuditLevel, float | None]],
+    blobs_path: str | None = None,
+) -> int:
+    """Verify an audit log, streaming it in constant memory.
+
+    Sealed segments are read in order before the active file. Segments
+    deleted by retention are crossed through their anchors.
+
+    Args:
+        path: Path of the audit log.
+        retain: Retention per level overriding the recorded policy;
+            empty to use the policy in each segment's footer.
+        blobs_path: Blob store to check bodies against, or None.
+
+    Returns:
+        The process exit code.
+    """
+    retention = {level.value: seconds for level, seconds in retain} or None
+    blobs = BlobStore(blobs_path) if blobs_path is not None else None
+    try:
+        report = verify_records(
+            iter_log_lines(path),
+            anchor=None,
+            retention=retention,
+            blobs=blobs.get if blobs is not None else None,
+        )
+    finally:
+        if blobs is not None:
+            blobs.close()
+    if not report.ok:
+        print(f"FAILED at line {report.line}: {report.error}", file=sys.stderr)
+        return 1
+    print(
+        f"OK: {report.records} records, {report.checkpoints} checkpoints,"
+        f" {report.redacted} redacted, {report.expired} expired,"
+        f" from seq {report.start_seq},"
+        f" head {report.last_hash}"
+    )
+    return 0
+
+
+def _prove(path: str, seq: int) -> int:
+    """Print the inclusion proof for one record as JSON.
+
+    Args:
+        path: Path of the audit log.
+        seq: Sequence number of the record.
+
+    Returns:
+        The process exit code.
+    """
+    proof = prove_record(iter_log_lines(path), seq)
+    if proof is None:
+        print(f"No checkpoint covers record {seq}", file=sys.stderr)
+        return 1
+    print(json.dumps(proof, indent=2))
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the firebreak-audit command.
+
+    Args:
+        argv: Argument list, or None to use sys.argv.
+
+    Returns:
+        The process exit code.
+    """
+    args = _parse_args(argv)
+    try:
+        if args.command == "verify":
+            return _verify(args.path, args.retain, args.blobs)
+        return _prove(args.path, args.seq)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,436 @@
+"""Audit relay — one ordered audit trail for many server processes.
+
+Worker processes cannot share a FileAuditLog: each would keep its own
+hash chain and sequence numbers. Instead, the supervising process runs
+an AuditRelay on a Unix socket in front of the one real log, and each
+worker logs through a RemoteAuditLog that forwards entries (and
+/v1/audit queries) to it. The relay appends entries in arrival order,
+so the trail keeps a single chain and sequence.
+
+The wire format is one JSON object per line. Workers send
+{"op": "log", "record": ...} without a reply, and {"op": "query",
+"filters": ...} or {"op": "sync"}, each answered by one line. A log
+line the relay cannot apply is counted, never answered, so replies
+stay paired with the requests that expect them.
+"""
+
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+
+from firebreak.audit import AuditLog, AuditPage, entry_from_record, entry_to_record
+from firebreak.models import AuditEntry, Decision
+
+
+class _RelayHandler(socketserver.StreamRequestHandler):
+    """Serves one worker connection."""
+
+    server: "_RelayServer"
+
+    def setup(self) -> None:
+        """Count the connection as open."""
+        super().setup()
+        with self.server.connections:
+            self.server.open_connections += 1
+
+    def finish(self) -> None:
+        """Count the connection as closed."""
+        try:
+            super().finish()
+        finally:
+            with self.server.connections:
+                self.server.open_connections -= 1
+                self.server.connections.notify_all()
+
+    def handle(self) -> None:
+        """Apply each request line in order, replying where needed."""
+        audit_log = self.server.audit_log
+        for line in self.rfile:
+            if not line.endswith(b"\n"):
+                # Cut off by a worker whose connection broke mid-line;
+                # the worker resends it on its next connection.
+                break
+            try:
+                message = json.loads(line)
+                op = message["op"]
+            except (KeyError, TypeError, ValueError):
+                self.server.reject()
+                continue
+            if op == "log":
+                try:
+                    audit_log.append(entry_from_record(message["record"]))
+                except (KeyError, TypeError, ValueError):
+                    self.server.reject()
+                continue
+            try:
+                if op == "query":
+                    reply = _page_to_reply(
+                        audit_log.query(**_filters_from_wire(message["filters"]))
+                    )
+                elif op == "sync":
+                    reply = {}
+                else:
+                    reply = {"error": f"unknown op: {op}"}
+            except (KeyError, TypeError, ValueError) as exc:
+                reply = {"error": str(exc)}
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+            self.wfile.flush()
+
+
+class _RelayServer(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server holding the relay's audit log.
+
+    Attributes:
+        audit_log: The log relayed entries are appended to.
+        open_connections: Worker connections being served.
+        connections: Condition notified when a connection closes.
+        rejected: Lines that could not be parsed or appended.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path: str, audit_log: AuditLog) -> None:
+        """Bind the socket.
+
+        Args:
+            path: Path of the Unix socket.
+            audit_log: The log relayed entries are appended to.
+        """
+        super().__init__(path, _RelayHandler)
+        self.audit_log = audit_log
+        self.open_connections = 0
+        self.connections = threading.Condition()
+        self.rejected = 0
+
+    def reject(self) -> None:
+        """Count a line that could not be applied."""
+        with self.connections:
+            self.rejected += 1
+
+
+class AuditRelay:
+    """Accepts audit entries from worker processes over a Unix socket.
+
+    Attributes:
+        audit_log: The log every relayed entry is appended to.
+        path: Path of the Unix socket.
+    """
+
+    def __init__(self, audit_log: AuditLog, path: str) -> None:
+        """Bind the socket and start serving in a daemon thread.
+
+        A stale socket file left by a previous run is replaced.
+
+        Args:
+            audit_log: The log to append relayed entries to.
+            path: Path of the Unix socket to listen on.
+        """
+        self.audit_log = audit_log
+        self.path = path
+        if os.path.exists(path):
+            os.unlink(path)
+        self._server = _RelayServer(path, audit_log)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="firebreak-audit-relay",
+            daemon=True,
+        )
+        self._thread.start()
+
+    @property
+    def rejected(self) -> int:
+        """Lines from workers that could not be parsed or appended."""
+        return self._server.rejected
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop accepting connections and remove the socket file.
+
+        Waits for connected workers to disconnect, so that everything
+        they sent is in the log; call it after closing or stopping them.
+        The audit log itself is left open for its owner to close.
+
+        Args:
+            timeout: Most seconds to wait for workers to disconnect.
+        """
+        self._server.shutdown()
+        with self._server.connections:
+            self._server.connections.wait_for(
+                lambda: self._server.open_connections == 0, timeout
+            )
+        self._server.server_close()
+        self._thread.join()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class RemoteAuditLog(AuditLog):
+    """Audit log that forwards entries to an AuditRelay.
+
+    log() keeps the entry in memory as usual and queues it for a
+    background sender thread, so requests never wait on the socket.
+    query() is answered by the relay, so it sees entries from every
+    worker; it is sent on the same connection after the entries already
+    queued, so a worker always finds its own entries.
+
+    If the connection breaks, the sender reconnects with exponential
+    backoff and resends the entry it was delivering; entries logged
+    meanwhile wait in the queue. The log reports itself unhealthy while
+    it is disconnected or its backlog exceeds max_backlog, so the server
+    can stop accepting requests it could not audit.
+
+    Attributes:
+        path: Path of the relay's Unix socket.
+        timeout: Seconds to wait for a query reply, and for queued
+            entries to be delivered on close.
+        max_backlog: Undelivered entries tolerated before the log
+            reports itself unhealthy.
+        connected: Whether the sender holds a working connection.
+        reconnects: Times the connection was re-established.
+        failed: Entries that could not be delivered to the relay before
+            close() gave up.
+    """
+
+    retry_delay = 0.05
+    """Seconds before the first reconnection attempt."""
+
+    max_retry_delay = 2.0
+    """Longest wait between reconnection attempts."""
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int | None = 1000,
+        timeout: float = 10.0,
+        max_backlog: int = 10_000,
+    ) -> None:
+        """Connect to the relay and start the sender thread.
+
+        Args:
+            path: Path of the relay's Unix socket.
+            max_entries: Cap on entries kept in this process's memory.
+            timeout: Seconds to wait for a query reply, and for queued
+                entries to be delivered on close.
+            max_backlog: Undelivered entries tolerated before the log
+                reports itself unhealthy.
+
+        Raises:
+            OSError: If the relay is not listening.
+        """
+        super().__init__(max_entries=max_entries)
+        self.path = path
+        self.timeout = timeout
+        self.max_backlog = max_backlog
+        self.connected = False
+        self.reconnects = 0
+        self.failed = 0
+        self._connect()
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._giving_up = threading.Event()
+        self._sender = threading.Thread(
+            target=self._run, name="firebreak-audit-sender", daemon=True
+        )
+        self._sender.start()
+
+    @property
+    def healthy(self) -> bool:
+        """Whether entries are being delivered to the relay."""
+        return self.connected and self._queue.qsize() <= self.max_backlog
+
+    def _appended(self, seq: int, entry: AuditEntry) -> None:
+        """Queue an appended entry for the relay.
+
+        Args:
+            seq: The entry's local sequence number.
+            entry: The appended entry.
+        """
+        self._queue.put({"op": "log", "record": entry_to_record(entry)})
+
+    def query(
+        self,
+        decision: Decision | None = None,
+        rule_id: str | None = None,
+        category: str | None = None,
+        alert: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        cursor: int | None = None,
+        limit: int = 100,
+    ) -> AuditPage:
+        """Query the relay's log; see AuditLog.query().
+
+        Raises:
+            ValueError: If limit is less than 1, or the relay rejected
+                the query.
+            OSError: If the relay could not be reached.
+            TimeoutError: If the relay did not answer in time.
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        filters = {
+            "decision": decision.value if decision is not None else None,
+            "rule_id": rule_id,
+            "category": category,
+            "alert": alert,
+            "since": since.isoformat() if since is not None else None,
+            "until": until.isoformat() if until is not None else None,
+            "cursor": cursor,
+            "limit": limit,
+        }
+        reply = self._request({"op": "query", "filters": filters})
+        if "error" in reply:
+            raise ValueError(reply["error"])
+        return AuditPage(
+            entries=[entry_from_record(record) for record in reply["entries"]],
+            next_cursor=reply["next_cursor"],
+        )
+
+    def flush(self) -> None:
+        """Block until the relay has applied every queued entry."""
+        self._request({"op": "sync"})
+
+    def close(self) -> None:
+        """Deliver queued entries, then close the connection.
+
+        Waits up to timeout seconds for the relay to accept what is
+        queued; entries still undelivered after that are counted in
+        failed.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._sender.join(self.timeout)
+        if self._sender.is_alive():
+            self._giving_up.set()
+            self._sender.join()
+        self._disconnect()
+
+    def _request(self, message: dict) -> dict:
+        """Send a message in order with queued entries and await the reply.
+
+        Args:
+            message: The request to send.
+
+        Returns:
+            The relay's reply.
+        """
+        reply: Future = Future()
+        self._queue.put((message, reply))
+        return reply.result(timeout=self.timeout)
+
+    def _run(self) -> None:
+        """Sender loop: write queued entries and requests to the relay."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if isinstance(item, dict):
+                self._deliver(json.dumps(item).encode() + b"\n")
+                continue
+            message, reply = item
+            if not self.connected and not self._reconnect():
+                reply.set_exception(ConnectionError("audit relay is unreachable"))
+                continue
+            try:
+                self._socket.sendall(json.dumps(message).encode() + b"\n")
+                line = self._reader.readline()
+                if not line:
+                    raise ConnectionError("audit relay closed the connection")
+                reply.set_result(json.loads(line))
+            except (OSError, ValueError) as exc:
+                reply.set_exception(exc)
+                # The reply stream can no longer be trusted.
+                self._disconnect()
+
+    def _deliver(self, data: bytes) -> None:
+        """Send one entry, reconnecting until it is sent or close() gives up.
+
+        Args:
+            data: The encoded log line.
+        """
+        while self.connected or self._reconnect():
+            try:
+                self._socket.sendall(data)
+                return
+            except OSError:
+                self._disconnect()
+        self.failed += 1
+
+    def _connect(self) -> None:
+        """Open a connection to the relay.
+
+        Raises:
+            OSError: If the relay is not listening.
+        """
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        self._socket = sock
+        self._reader = sock.makefile("rb")
+        self.connected = True
+
+    def _disconnect(self) -> None:
+        """Close the current connection, if any."""
+        self.connected = False
+        self._reader.close()
+        self._socket.close()
+
+    def _reconnect(self) -> bool:
+        """Reconnect to the relay, backing off between attempts.
+
+        Returns:
+            True once connected, or False if close() gave up first.
+        """
+        delay = self.retry_delay
+        while not self._giving_up.is_set():
+            try:
+                self._connect()
+            except OSError:
+                self._giving_up.wait(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+                continue
+            self.reconnects += 1
+            return True
+        return False
+
+
+def _filters_from_wire(filters: dict) -> dict:
+    """Convert query filters received from a worker to query() arguments.
+
+    Args:
+        filters: The filters as sent by RemoteAuditLog.query().
+
+    Returns:
+        Keyword arguments for AuditLog.query().
+    """
+    args = dict(filters)
+    if args.get("decision") is not None:
+        args["decision"] = Decision(args["decision"])
+    for name in ("since", "until"):
+        if args.get(name) is not None:
+            args[name] = datetime.fromisoformat(args[name])
+    return args
+
+
+def _page_to_reply(page: AuditPage) -> dict:
+    """Serialize a query result for the wire.
+
+    Args:
+        page: The page returned by the relay's log.
+
+    Returns:
+        A JSON-compatible reply.
+    """
+    return {
+        "entries": [entry_to_record(entry) for entry in page.entries],
+        "next_cursor": page.next_cursor,
+    }
@@ -0,0 +1,469 @@
+"""Segment rotation, compression and retention for the audit log.
+
+The active segment is the audit log path itself. Sealed segments are
+gzip-compressed copies named ``<path>.<first_seq>.gz`` whose last record
+is a chained footer indexing the segment. A JSON manifest next to the
+log caches each sealed segment's footer summary so retention never has
+to decompress a segment to decide whether it has expired.
+
+A segment deleted by retention is replaced by an anchor: a one-line
+segment holding the hash that preceded it and its chained footer, so
+the chain can be verified across the gap.
+"""
+
+import glob
+import gzip
+import json
+import os
+import shutil
+from collections.abc import Callable, Iterator
+from datetime import datetime
+
+from firebreak.integrity import canonical_json, tombstone
+from firebreak.models import AuditLevel
+
+INDEX_FIELDS = ("decision", "rule_id", "category", "alert")
+
+
+def sealed_path(path: str, first_seq: int) -> str:
+    """Return the file name for a sealed segment.
+
+    Args:
+        path: The active audit log path.
+        first_seq: Sequence number of the segment's first entry.
+
+    Returns:
+        The sealed segment path.
+    """
+    return f"{path}.{first_seq:012d}.gz"
+
+
+def manifest_path(path: str) -> str:
+    """Return the manifest path for an audit log.
+
+    Args:
+        path: The active audit log path.
+
+    Returns:
+        The manifest path.
+    """
+    return f"{path}.segments.json"
+
+
+def segment_files(path: str) -> list[str]:
+    """List an audit log's segments, oldest first.
+
+    Args:
+        path: The active audit log path.
+
+    Returns:
+        Sealed segment paths in sequence order, then the active path if
+        it exists.
+    """
+    files = sorted(glob.glob(f"{glob.escape(path)}.*.gz"))
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def iter_log_lines(path: str) -> Iterator[str]:
+    """Stream the lines of every segment of an audit log in order.
+
+    A path ending in .gz is read as a single sealed segment.
+
+    Args:
+        path: The active audit log path, or one sealed segment.
+
+    Yields:
+        Each JSON line.
+    """
+    files = [path] if path.endswith(".gz") else segment_files(path)
+    if not files:
+        raise FileNotFoundError(f"No audit log segments at {path}")
+    for name in files:
+        with open_segment(name) as f:
+            yield from f
+
+
+def open_segment(path: str):
+    """Open a plain or gzip-compressed segment for reading text.
+
+    Args:
+        path: The segment path.
+
+    Returns:
+        A text file object.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def _epoch(iso: str) -> float:
+    """Convert a record's ISO timestamp to seconds since the epoch."""
+    return datetime.fromisoformat(iso).timestamp()
+
+
+class SegmentSummary:
+    """Accumulates the footer index of the segment being written.
+
+    Attributes:
+        first_seq: Sequence number of the first entry, or None if empty.
+        last_seq: Sequence number of the last entry.
+        first_timestamp: Earliest entry epoch time. Entries relayed
+            from several workers can arrive out of time order, so this
+            is a minimum rather than the first entry's time.
+        last_timestamp: Latest entry epoch time.
+        levels: Per audit level: entry count and oldest/newest epoch
+            times.
+        index: Per indexed field: value to the entry sequence numbers.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty summary."""
+        self.first_seq: int | None = None
+        self.last_seq = -1
+        self.first_timestamp = 0.0
+        self.last_timestamp = 0.0
+        self.levels: dict[str, dict] = {}
+        self.index: dict[str, dict[str, list[int]]] = {f: {} for f in INDEX_FIELDS}
+
+    def add(self, record: dict) -> None:
+        """Account for one entry record.
+
+        Args:
+            record: A serialized entry with its "seq" set.
+        """
+        seq = record["seq"]
+        ts = _epoch(record["timestamp"])
+        if self.first_seq is None:
+            self.first_seq = seq
+            self.first_timestamp = self.last_timestamp = ts
+        self.last_seq = seq
+        self.first_timestamp = min(self.first_timestamp, ts)
+        self.last_timestamp = max(self.last_timestamp, ts)
+
+        e = record["evaluation"]
+        level = self.levels.setdefault(
+            e["audit_level"], {"count": 0, "oldest": ts, "newest": ts}
+        )
+        level["count"] += 1
+        level["oldest"] = min(level["oldest"], ts)
+        level["newest"] = max(level["newest"], ts)
+
+        values = {
+            "decision": [e["decision"]],
+            "rule_id": [e["matched_rule_id"]],
+            "category": [record["classification"]["intent_category"]],
+            "alert": e["alerts"],
+        }
+        for name, keys in values.items():
+            for key in keys:
+                self.index[name].setdefault(key, []).append(seq)
+
+    def footer(self, retention: dict[str, float | None]) -> dict:
+        """Build the footer record that seals the segment.
+
+        Args:
+            retention: Seconds to keep each audit level (by value) when
+                the segment is sealed; verify checks removals against it.
+
+        Returns:
+            An unchained footer record.
+        """
+        return {
+            "type": "footer",
+            "retention": retention,
+            "first_seq": self.first_seq,
+            "last_seq": self.last_seq,
+            "first_timestamp": self.first_timestamp,
+            "last_timestamp": self.last_timestamp,
+            "levels": self.levels,
+            "index": self.index,
+        }
+
+
+def manifest_entry(footer: dict, file: str) -> dict:
+    """Summarize a chained footer record for the manifest.
+
+    Args:
+        footer: The footer record, including its "hash".
+        file: Base name of the sealed segment.
+
+    Returns:
+        The manifest entry. Its "keys" lists, per indexed field, the
+        values that occur in the segment, so queries can skip segments
+        without opening them.
+    """
+    return {
+        "file": file,
+        "first_seq": footer["first_seq"],
+        "last_seq": footer["last_seq"],
+        "first_timestamp": footer["first_timestamp"],
+        "last_timestamp": footer["last_timestamp"],
+        "levels": footer["levels"],
+        "keys": {
+            name: sorted(values) for name, values in footer.get("index", {}).items()
+        },
+        "hash": footer["hash"],
+    }
+
+
+def load_manifest(path: str) -> list[dict]:
+    """Load the sealed-segment manifest, rebuilding it if missing.
+
+    Args:
+        path: The active audit log path.
+
+    Returns:
+        Manifest entries in sequence order.
+    """
+    try:
+        with open(manifest_path(path), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        pass
+    segments = []
+    for name in sorted(glob.glob(f"{glob.escape(path)}.*.gz")):
+        footer = None
+        with open_segment(name) as f:
+            for line in f:
+                footer = line
+        if footer is None:
+            continue
+        record = json.loads(footer)
+        if record.get("type") == "anchor":
+            entry = manifest_entry(record["footer"], os.path.basename(name))
+            entry.update(levels={}, anchor=True)
+        else:
+            entry = manifest_entry(record, os.path.basename(name))
+        segments.append(entry)
+    if segments:
+        save_manifest(path, segments)
+    return segments
+
+
+def save_manifest(path: str, segments: list[dict]) -> None:
+    """Atomically replace the manifest.
+
+    Args:
+        path: The active audit log path.
+        segments: Manifest entries in sequence order.
+    """
+    target = manifest_path(path)
+    tmp = f"{target}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(segments, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, target)
+
+
+def seal(path: str, first_seq: int) -> str:
+    """Compress the active segment into a sealed segment.
+
+    The active file is left in place; the caller removes it once the
+    manifest records the sealed copy.
+
+    Args:
+        path: The active audit log path.
+        first_seq: Sequence number of the segment's first entry.
+
+    Returns:
+        The sealed segment path.
+    """
+    target = sealed_path(path, first_seq)
+    _write_gzip(target, lambda dst: _copy_file(path, dst))
+    return target
+
+
+def _copy_file(source: str, dst) -> None:
+    with open(source, "rb") as src:
+        shutil.copyfileobj(src, dst)
+
+
+def _write_gzip(target: str, write) -> None:
+    """Write a gzip file durably via a temporary file and rename.
+
+    Args:
+        target: Destination path.
+        write: Callable that writes uncompressed bytes to a file object.
+    """
+    tmp = f"{target}.tmp"
+    with open(tmp, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as dst:
+            write(dst)
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp, target)
+
+
+def blob_refs(record: dict) -> list[str]:
+    """Return the blob digests an entry record refers to.
+
+    Args:
+        record: An entry record.
+
+    Returns:
+        Digests of externally stored bodies, possibly empty.
+    """
+    refs = [record.get("prompt_blob"), record["evaluation"].get("llm_response_blob")]
+    return [ref for ref in refs if ref is not None]
+
+
+def apply_retention(
+    path: str,
+    segments: list[dict],
+    retention: dict[AuditLevel, float | None],
+    now: float,
+    release: Callable[[list[str]], None] | None = None,
+    rewritten: Callable[[dict[int, int], list[int]], None] | None = None,
+) -> list[dict]:
+    """Enforce per-level retention on sealed segments.
+
+    A segment whose every level has expired is replaced by an anchor
+    (see make_anchor()) and kept in the manifest with no levels and
+    "anchor" set. Otherwise,
+    expired entries are rewritten as tombstones that keep their sequence
+    number and chain hashes, so the hash chain and Merkle checkpoints of
+    the remaining records still verify.
+
+    Args:
+        path: The active audit log path.
+        segments: Manifest entries in sequence order.
+        retention: Seconds to keep each level; None or absent keeps
+            entries forever.
+        now: Current epoch time.
+        release: Called with the blob digests referenced by removed
+            entries, after the segment has been rewritten or deleted.
+        rewritten: Called after each segment is rewritten or deleted,
+            with the new byte offset of every record that has a sequence
+            number (empty for a deleted segment) and the sequence
+            numbers of the entries removed.
+
+    Returns:
+        The updated manifest entries.
+    """
+    cutoffs = {
+        level.value: now - seconds
+        for level, seconds in retention.items()
+        if seconds is not None
+    }
+    directory = os.path.dirname(path)
+    kept = []
+    for segment in segments:
+        levels = segment["levels"]
+        expired = [
+            name
+            for name, info in levels.items()
+            if name in cutoffs
+            and info["oldest"] is not None
+            and info["oldest"] < cutoffs[name]
+        ]
+        if not expired:
+            kept.append(segment)
+            continue
+        file = os.path.join(directory, segment["file"])
+        released: list[str] = []
+        offsets: dict[int, int] = {}
+        removed: list[int] = []
+        if all(
+            name in cutoffs and info["newest"] < cutoffs[name]
+            for name, info in levels.items()
+        ):
+            prev_hash = footer = None
+            with open_segment(file) as f:
+                for line in f:
+                    record = json.loads(line)
+                    if prev_hash is None:
+                        prev_hash = record["prev_hash"]
+                    if record.get("type") == "entry":
+                        released.extend(blob_refs(record))
+                    footer = record
+            anchor = make_anchor(prev_hash, footer)
+            _write_gzip(file, lambda dst: dst.write(anchor.encode()))
+            segment.update(levels={}, anchor=True)
+            kept.append(segment)
+            removed = list(range(segment["first_seq"], segment["last_seq"] + 1))
+        else:
+            segment["levels"] = _redact(
+                file, levels, cutoffs, released, offsets, removed
+            )
+            kept.append(segment)
+        if release is not None and released:
+            release(released)
+        if rewritten is not None:
+            rewritten(offsets, removed)
+    return kept
+
+
+def make_anchor(prev_hash: str, footer: dict) -> str:
+    """Build the line that stands in for a deleted segment.
+
+    The footer pins the deleted range: its hash is the prev_hash of the
+    next segment's first record, so it cannot be altered, and it still
+    summarizes the levels and times of the entries it covered.
+
+    Args:
+        prev_hash: Hash of the record before the segment.
+        footer: The segment's chained footer record.
+
+    Returns:
+        The anchor line, with its newline.
+    """
+    anchor = {
+        "type": "anchor",
+        "first_seq": footer["first_seq"],
+        "last_seq": footer["last_seq"],
+        "prev_hash": prev_hash,
+        "footer": footer,
+    }
+    return canonical_json(anchor) + "\n"
+
+
+def _redact(
+    file: str,
+    levels: dict,
+    cutoffs: dict[str, float],
+    released: list[str],
+    offsets: dict[int, int],
+    removed: list[int],
+) -> dict:
+    """Replace expired entries in a sealed segment with tombstones.
+
+    Args:
+        file: The sealed segment path.
+        levels: The segment's manifest level summary.
+        cutoffs: Per level, the epoch time before which entries expire.
+        released: Receives the blob digests of redacted entries.
+        offsets: Receives the rewritten byte offset of each record that
+            has a sequence number.
+        removed: Receives the sequence numbers of redacted entries.
+
+    Returns:
+        The updated level summary, where "oldest" is the oldest entry
+        still unredacted (None when every entry of that level is gone).
+    """
+    oldest: dict[str, float | None] = {name: None for name in levels}
+    with open_segment(file) as f:
+        lines = f.readlines()
+    out = []
+    offset = 0
+    for line in lines:
+        record = json.loads(line)
+        if record.get("type") == "entry":
+            name = record["evaluation"]["audit_level"]
+            ts = _epoch(record["timestamp"])
+            if name in cutoffs and ts < cutoffs[name]:
+                released.extend(blob_refs(record))
+                removed.append(record["seq"])
+                line = canonical_json(tombstone(record)) + "\n"
+            elif oldest[name] is None or ts < oldest[name]:
+                oldest[name] = ts
+        if "seq" in record:
+            offsets[record["seq"]] = offset
+        encoded = line.encode()
+        offset += len(encoded)
+        out.append(encoded)
+    _write_gzip(file, lambda dst: dst.writelines(out))
+    return {name: {**info, "oldest": oldest[name]} for name, info in levels.items()}
@@ -0,0 +1,140 @@
+"""Content-addressed storage for audit prompt and response bodies."""
+
+import hashlib
+import sqlite3
+import threading
+import zlib
+from collections import Counter
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS blobs ("
+    " digest TEXT PRIMARY KEY,"
+    " data BLOB NOT NULL,"
+    " refs INTEGER NOT NULL"
+    ")"
+)
+
+
+class BlobIntegrityError(ValueError):
+    """A stored body does not match the digest it is stored under."""
+
+
+def blob_digest(text: str) -> str:
+    """Compute the content address of a body.
+
+    Args:
+        text: The body text.
+
+    Returns:
+        The hex SHA-256 digest of the UTF-8 encoded text.
+    """
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class BlobStore:
+    """SQLite store that keeps each distinct body once.
+
+    Bodies are keyed by their SHA-256 digest and stored zlib-compressed.
+    Each put() of an existing body only bumps its reference count, so
+    templated traffic that repeats the same large prompt writes it once.
+    release() drops references and deletes bodies nobody refers to.
+
+    Attributes:
+        path: Filesystem path to the SQLite database.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Open (or create) the blob database.
+
+        Args:
+            path: Filesystem path to the SQLite database.
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def put_many(self, bodies: list[str]) -> list[str]:
+        """Store bodies, adding one reference per occurrence.
+
+        All bodies are written in a single transaction. Bodies already
+        stored are not rewritten.
+
+        Args:
+            bodies: Body texts; duplicates are allowed.
+
+        Returns:
+            The digest of each body, in order.
+        """
+        digests = [blob_digest(body) for body in bodies]
+        counts = Counter(digests)
+        first = dict(zip(digests, bodies, strict=True))
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO blobs (digest, data, refs) VALUES (?, ?, ?)"
+                " ON CONFLICT(digest) DO UPDATE SET refs = refs + excluded.refs",
+                [
+                    (digest, zlib.compress(first[digest].encode()), n)
+                    for digest, n in counts.items()
+                ],
+            )
+            self._conn.commit()
+        return digests
+
+    def get(self, digest: str) -> str | None:
+        """Fetch a body by digest, checking it still matches the digest.
+
+        Args:
+            digest: The content address.
+
+        Returns:
+            The body text, or None if it is not stored.
+
+        Raises:
+            BlobIntegrityError: If the stored body was altered.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM blobs WHERE digest = ?", (digest,)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            body = zlib.decompress(row[0]).decode()
+        except (zlib.error, UnicodeDecodeError):
+            body = None
+        if body is None or blob_digest(body) != digest:
+            raise BlobIntegrityError(f"blob {digest} does not match its digest")
+        return body
+
+    def release(self, digests: list[str]) -> None:
+        """Drop one reference per digest and delete unreferenced bodies.
+
+        Args:
+            digests: Digests whose referencing records were removed.
+        """
+        if not digests:
+            return
+        counts = Counter(digests)
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE blobs SET refs = refs - ? WHERE digest = ?",
+                [(n, digest) for digest, n in counts.items()],
+            )
+            self._conn.executemany(
+                "DELETE FROM blobs WHERE digest = ? AND refs <= 0",
+                [(digest,) for digest in counts],
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        """Return the number of distinct bodies stored."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
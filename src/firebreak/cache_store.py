@@ -0,0 +1,227 @@
+"""SQLite-backed persistent store for classifier cache entries."""
+
+import queue
+import sqlite3
+import threading
+import time
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS classifications ("
+    " key TEXT PRIMARY KEY,"
+    " category TEXT NOT NULL,"
+    " confidence REAL NOT NULL,"
+    " created_at REAL NOT NULL"
+    ")"
+)
+
+CREATED_INDEX = (
+    "CREATE INDEX IF NOT EXISTS classifications_created ON classifications (created_at)"
+)
+
+
+class SQLiteCacheStore:
+    """Persistent classification store with asynchronous write-back.
+
+    Lookups are point queries against SQLite, so nothing is loaded at
+    startup. Writes are queued and committed in batches by a background
+    thread, so callers never wait on disk I/O. Queued rows remain
+    visible to get() until they are committed.
+
+    Reads use their own connection. In WAL mode they never wait for the
+    writer's transaction, and the writer never holds the lock that
+    get() takes. The writer also prunes rows older than max_age and,
+    beyond max_rows, the oldest rows, every prune_interval seconds.
+
+    Attributes:
+        path: Filesystem path to the SQLite database.
+        flush_interval: Maximum seconds a queued write waits before
+            being committed.
+        batch_size: Maximum rows committed per transaction.
+        max_age: Seconds a row is kept, or None to keep rows until
+            max_rows pushes them out.
+        max_rows: Most rows kept, or None for no limit.
+        prune_interval: Seconds between prunes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = 0.5,
+        batch_size: int = 256,
+        max_age: float | None = None,
+        max_rows: int | None = 1_000_000,
+        prune_interval: float = 300.0,
+    ) -> None:
+        """Open (or create) the database and start the writer thread.
+
+        Args:
+            path: Filesystem path to the SQLite database.
+            flush_interval: Seconds between write-back commits.
+            batch_size: Maximum rows per commit.
+            max_age: Seconds a row is kept; match the cache's ttl.
+            max_rows: Most rows kept; the oldest are deleted first.
+            prune_interval: Seconds between prunes.
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_age = max_age
+        self.max_rows = max_rows
+        self.prune_interval = prune_interval
+        # The write connection is used only by the writer thread once
+        # it starts.
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(SCHEMA)
+        self._conn.execute(CREATED_INDEX)
+        self._conn.commit()
+        self._reader = sqlite3.connect(path, check_same_thread=False)
+        self._read_lock = threading.Lock()
+        # Guards _pending and _closed.
+        self._lock = threading.Lock()
+        self._pending: dict[str, tuple[str, float, float]] = {}
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._writer = threading.Thread(
+            target=self._run, name="firebreak-cache-writer", daemon=True
+        )
+        self._writer.start()
+
+    def get(self, key: str) -> tuple[str, float, float] | None:
+        """Look up a stored classification.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            A (category, confidence, created_at) tuple, or None if the
+            key is not stored.
+        """
+        with self._lock:
+            pending = self._pending.get(key)
+        if pending is not None:
+            return pending
+        with self._read_lock:
+            row = self._reader.execute(
+                "SELECT category, confidence, created_at"
+                " FROM classifications WHERE key = ?",
+                (key,),
+            ).fetchone()
+        return tuple(row) if row is not None else None
+
+    def put(self, key: str, category: str, confidence: float) -> None:
+        """Queue a classification for write-back.
+
+        Writes after close() are dropped.
+
+        Args:
+            key: The cache key.
+            category: The classified intent category.
+            confidence: The classifier confidence.
+        """
+        row = (category, confidence, time.time())
+        with self._lock:
+            if self._closed:
+                return
+            self._pending[key] = row
+            self._queue.put((key, row))
+
+    def flush(self) -> None:
+        """Block until every queued write has been committed.
+
+        Returns at once after close(), which has committed everything.
+        """
+        done = threading.Event()
+        with self._lock:
+            if self._closed:
+                return
+            self._queue.put(done)
+        done.wait()
+
+    def close(self) -> None:
+        """Commit queued writes, stop the writer thread and close the database."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._writer.join()
+        self._conn.close()
+        with self._read_lock:
+            self._reader.close()
+
+    def _run(self) -> None:
+        """Writer loop: collect queued rows and commit them in batches."""
+        self._prune()
+        last_prune = time.monotonic()
+        while True:
+            item = self._queue.get()
+            batch: dict[str, tuple[str, float, float]] = {}
+            waiters: list[threading.Event] = []
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is None:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                key, row = item
+                batch[key] = row
+                if len(batch) >= self.batch_size:
+                    break
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._commit(batch)
+            if time.monotonic() - last_prune >= self.prune_interval:
+                self._prune()
+                last_prune = time.monotonic()
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+
+    def _commit(self, batch: dict[str, tuple[str, float, float]]) -> None:
+        """Write a batch of rows in one transaction.
+
+        Args:
+            batch: Rows keyed by cache key.
+        """
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO classifications"
+            " (key, category, confidence, created_at) VALUES (?, ?, ?, ?)",
+            [(key, *row) for key, row in batch.items()],
+        )
+        self._conn.commit()
+        # Committed rows are visible to the read connection from here.
+        with self._lock:
+            for key, row in batch.items():
+                if self._pending.get(key) == row:
+                    del self._pending[key]
+
+    def _prune(self) -> None:
+        """Delete rows past max_age, then the oldest rows past max_rows."""
+        if self.max_age is not None:
+            self._conn.execute(
+                "DELETE FROM classifications WHERE created_at < ?",
+                (time.time() - self.max_age,),
+            )
+        if self.max_rows is not None:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM classifications"
+            ).fetchone()
+            if count > self.max_rows:
+                self._conn.execute(
+                    "DELETE FROM classifications WHERE key IN (SELECT key"
+                    " FROM classifications ORDER BY created_at LIMIT ?)",
+                    (count - self.max_rows,),
+                )
+        self._conn.commit()
@@ -1,11 +1,22 @@
 """Intent classifier using Claude API to categorize prompts."""
 
+import asyncio
+import hashlib
 import json
+import math
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Collection
+from concurrent.futures import Future
+from dataclasses import dataclass
 from datetime import datetime
 
-import anthropic
-
-from firebreak.models import ClassificationResult
+from firebreak.cache_store import SQLiteCacheStore
+from firebreak.models import ClassificationResult, FastPathRule, Policy
+from firebreak.upstream import UpstreamClients, UpstreamUnavailable
 
 SYSTEM_PROMPT_TEMPLATE = (
     "You are an intent classifier for an AI deployment"
@@ -19,27 +30,124 @@ SYSTEM_PROMPT_TEMPLATE = (
     ' "confidence": <float_between_0_and_1>}}'
 )
 
+BATCH_SYSTEM_PROMPT_TEMPLATE = (
+    "You are an intent classifier for an AI deployment"
+    " policy system.\n\n"
+    "The user message is a JSON array of prompts. Classify each"
+    " prompt into exactly ONE of these categories:\n"
+    "{categories}\n\n"
+    "Respond with ONLY a JSON array with one object per prompt,"
+    " in the same order, no other text:\n"
+    '[{{"index": <position_in_input>, "category": "<category_name>",'
+    ' "confidence": <float_between_0_and_1>}}, ...]'
+)
+
+
+# Rough per-entry overhead (result object, timestamp, bookkeeping) used
+# when estimating cache memory; prompt text is measured separately.
+ENTRY_OVERHEAD_BYTES = 400
+
+
+def cache_namespace(policy_version: str, categories: list[str], model: str) -> str:
+    """Describe the classification context that cached results depend on.
+
+    Args:
+        policy_version: Version string of the active policy.
+        categories: The policy's intent categories.
+        model: The classifier model identifier.
+
+    Returns:
+        A short string that changes whenever the policy version, the
+        category set, or the classifier model changes.
+    """
+    digest = hashlib.blake2b(
+        "\n".join([model, *sorted(categories)]).encode(), digest_size=8
+    ).hexdigest()
+    return f"{policy_version}:{digest}"
+
+
+def make_cache_key(prompt: str, namespace: str = "") -> str:
+    """Build the compact cache key for a prompt within a namespace.
+
+    Args:
+        prompt: The raw prompt text.
+        namespace: The classification context (see cache_namespace()).
+
+    Returns:
+        A 32-character hex digest of the namespace and the normalized
+        (stripped, lowercased) prompt.
+    """
+    normalized = prompt.strip().lower()
+    return hashlib.blake2b(
+        f"{namespace}\0{normalized}".encode(), digest_size=16
+    ).hexdigest()
+
 
 class ClassifierCache:
-    """Cache for pre-computed intent classifications.
+    """Bounded cache for intent classifications.
 
-    Stores classification results keyed by normalized prompt text
-    (stripped and lowercased). Optionally loads pre-computed results
-    from a JSON file on disk.
+    Stores classification results keyed by a hash of the normalized
+    prompt text (stripped and lowercased) and a namespace describing the
+    policy version, category set and classifier model, so one cache can
+    serve several policies and stays correct across policy updates.
+    Optionally loads pre-computed results from a JSON file on disk.
+    When limits are configured, the least recently used entries are
+    evicted once the entry count or estimated size is exceeded, and
+    entries older than the TTL are dropped on lookup. With a persistent
+    store, new results are written back to disk and memory misses are
+    read through from it, so hot prompts survive restarts.
 
     Attributes:
-        _cache: Internal dictionary mapping normalized prompts
-            to results.
+        max_entries: Maximum number of entries, or None for no limit.
+        max_bytes: Maximum estimated size in bytes, or None for no limit.
+        ttl: Seconds an entry stays valid, or None to never expire.
+        hits: Number of lookups that returned a result.
+        misses: Number of lookups that found nothing usable.
+        evictions: Number of entries removed to stay within limits.
+        expirations: Number of entries dropped because their TTL elapsed.
+        store: Optional persistent backend.
+        namespace: Default namespace for lookups that do not name one,
+            including entries loaded from the JSON file.
+        _cache: Internal ordered mapping of cache keys to
+            (result, expiry, size) tuples, least recently used first.
     """
 
-    def __init__(self, cache_path: str | None = None) -> None:
+    def __init__(
+        self,
+        cache_path: str | None = None,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+        store: SQLiteCacheStore | None = None,
+        namespace: str = "",
+    ) -> None:
         """Initialize the cache, optionally loading from a JSON file.
 
         Args:
             cache_path: Path to a JSON file with pre-computed
                 classifications. If None, starts with an empty cache.
+            max_entries: Maximum number of cached entries.
+            max_bytes: Maximum estimated memory used by cached entries.
+            ttl: Lifetime of an entry in seconds.
+            store: Optional persistent store for write-back and
+                read-through of results.
+            namespace: Default namespace for get()/set() calls that do
+                not pass one. Pre-computed JSON entries are stored here.
         """
-        self._cache: dict[str, ClassificationResult] = {}
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.store = store
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[str, tuple[ClassificationResult, float, int]] = (
+            OrderedDict()
+        )
         if cache_path is not None:
             self._load_from_file(cache_path)
 
@@ -58,42 +166,341 @@ class ClassifierCache:
                 raw_prompt=prompt_key,
                 timestamp=datetime.now(),
             )
-            self._cache[prompt_key] = result
+            with self._lock:
+                self._insert(make_cache_key(prompt_key, self.namespace), result)
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._cache)
 
-    def get(self, prompt: str) -> ClassificationResult | None:
+    @property
+    def size_bytes(self) -> int:
+        """Estimated memory used by cached entries, in bytes."""
+        return self._bytes
+
+    def get(
+        self,
+        prompt: str,
+        namespace: str | None = None,
+        fallback_categories: Collection[str] | None = None,
+    ) -> ClassificationResult | None:
         """Look up a cached classification result.
 
+        With fallback_categories, a miss in namespace falls back to an
+        in-memory entry in the cache's default namespace (pre-computed
+        entries) whose category is one of those given. The lookup is
+        still counted once and reads the persistent store at most once.
+
+        Args:
+            prompt: The raw prompt text to look up.
+            namespace: The classification context, or None for the
+                cache's default namespace.
+            fallback_categories: Categories accepted from the default
+                namespace, or None for no fallback.
+
+        Returns:
+            The cached ClassificationResult if found and not expired,
+            or None on a miss.
+        """
+        if namespace is None:
+            namespace = self.namespace
+        key = make_cache_key(prompt, namespace)
+        with self._lock:
+            result = self._held(key)
+            if result is not None:
+                self.hits += 1
+                return result
+
+        result = self._read_through(prompt, key)
+        with self._lock:
+            if result is not None:
+                self._insert(key, result)
+            elif fallback_categories is not None and namespace != self.namespace:
+                result = self._held(make_cache_key(prompt, self.namespace))
+                if result is not None and (
+                    result.intent_category not in fallback_categories
+                ):
+                    result = None
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return result
+
+    def _held(self, key: str) -> ClassificationResult | None:
+        """Return an unexpired in-memory entry, dropping an expired one.
+
+        Caller holds the lock. A returned entry becomes the most
+        recently used.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            The cached ClassificationResult, or None.
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        result, expires_at, _ = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            return None
+        self._cache.move_to_end(key)
+        return result
+
+    def holds(self, prompt: str, namespace: str | None = None) -> bool:
+        """Check for an unexpired in-memory entry without touching the store.
+
+        Counters and recency are left alone; a True result means get()
+        will answer without reading the persistent store.
+
         Args:
             prompt: The raw prompt text to look up.
+            namespace: The classification context, or None for the
+                cache's default namespace.
 
         Returns:
-            The cached ClassificationResult if found, or None
-            on a miss.
+            True if the entry is held in memory and unexpired.
         """
-        key = prompt.strip().lower()
-        return self._cache.get(key)
+        key = make_cache_key(prompt, self.namespace if namespace is None else namespace)
+        with self._lock:
+            entry = self._cache.get(key)
+        return entry is not None and entry[1] >= time.monotonic()
+
+    def _read_through(self, prompt: str, key: str) -> ClassificationResult | None:
+        """Load a result from the persistent store, if one is configured.
 
-    def set(self, prompt: str, result: ClassificationResult) -> None:
+        Args:
+            prompt: The raw prompt text being looked up.
+            key: The cache key.
+
+        Returns:
+            The stored ClassificationResult, or None if absent or expired.
+        """
+        if self.store is None:
+            return None
+        row = self.store.get(key)
+        if row is None:
+            return None
+        category, confidence, created_at = row
+        if self.ttl is not None and created_at + self.ttl < time.time():
+            return None
+        return ClassificationResult(
+            intent_category=category,
+            confidence=confidence,
+            raw_prompt=prompt,
+            timestamp=datetime.fromtimestamp(created_at),
+        )
+
+    def set(
+        self,
+        prompt: str,
+        result: ClassificationResult,
+        namespace: str | None = None,
+    ) -> None:
         """Store a classification result in the cache.
 
         Args:
             prompt: The raw prompt text to use as the cache key.
             result: The ClassificationResult to cache.
+            namespace: The classification context, or None for the
+                cache's default namespace.
+        """
+        key = make_cache_key(prompt, self.namespace if namespace is None else namespace)
+        with self._lock:
+            self._insert(key, result)
+        if self.store is not None:
+            self.store.put(key, result.intent_category, result.confidence)
+
+    def close(self) -> None:
+        """Flush pending write-backs and close the persistent store."""
+        if self.store is not None:
+            self.store.close()
+
+    def _insert(self, key: str, result: ClassificationResult) -> None:
+        """Add an entry to memory and evict as needed. Caller holds the lock.
+
+        Args:
+            key: The cache key.
+            result: The ClassificationResult to cache.
+        """
+        expires_at = math.inf if self.ttl is None else time.monotonic() + self.ttl
+        size = (
+            sys.getsizeof(key) + sys.getsizeof(result.raw_prompt) + ENTRY_OVERHEAD_BYTES
+        )
+        if key in self._cache:
+            self._remove(key)
+        self._cache[key] = (result, expires_at, size)
+        self._bytes += size
+        self._evict()
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry and release its size. Caller holds the lock.
+
+        Args:
+            key: The cache key to remove.
+        """
+        _, _, size = self._cache.pop(key)
+        self._bytes -= size
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until within limits.
+
+        Caller holds the lock. The most recently inserted entry is never
+        evicted, even if it alone exceeds max_bytes.
+        """
+        while len(self._cache) > 1 and (
+            (self.max_entries is not None and len(self._cache) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            self._remove(next(iter(self._cache)))
+            self.evictions += 1
+
+
+class RuleClassifier:
+    """Local keyword/regex classifier used as a fast path ahead of the LLM.
+
+    Each rule maps a set of regular expressions to one intent category.
+    A prompt is classified only when rules for exactly one category
+    match; prompts matching several categories are treated as ambiguous
+    and left for the LLM classifier.
+
+    Attributes:
+        rules: The fast-path rules this classifier evaluates.
+    """
+
+    def __init__(self, rules: list[FastPathRule]) -> None:
+        """Compile the rule patterns.
+
+        Args:
+            rules: Fast-path rules, typically from Policy.fast_path_rules.
+        """
+        self.rules = rules
+        self._compiled = [
+            (rule, [re.compile(p, re.IGNORECASE) for p in rule.patterns])
+            for rule in rules
+        ]
+
+    @classmethod
+    def from_policy(cls, policy: Policy) -> "RuleClassifier":
+        """Build a rule classifier from a policy's fast_path section.
+
+        Args:
+            policy: The loaded Policy.
+
+        Returns:
+            A RuleClassifier over the policy's fast-path rules.
+        """
+        return cls(policy.fast_path_rules)
+
+    def classify(self, prompt: str) -> ClassificationResult | None:
+        """Classify a prompt using local rules only.
+
+        Args:
+            prompt: The user prompt text to classify.
+
+        Returns:
+            A ClassificationResult if rules for exactly one category
+            matched, or None if nothing (or more than one category)
+            matched.
+        """
+        matched: dict[str, float] = {}
+        for rule, patterns in self._compiled:
+            if any(p.search(prompt) for p in patterns):
+                matched[rule.category] = max(
+                    rule.confidence, matched.get(rule.category, 0.0)
+                )
+
+        if len(matched) != 1:
+            return None
+
+        ((category, confidence),) = matched.items()
+        return ClassificationResult(
+            intent_category=category,
+            confidence=confidence,
+            raw_prompt=prompt,
+        )
+
+
+@dataclass
+class TierStats:
+    """Hit and latency counters for one classification tier.
+
+    Attributes:
+        lookups: Number of prompts that reached this tier.
+        hits: Number of prompts this tier answered.
+        total_seconds: Cumulative time spent in this tier.
+    """
+
+    lookups: int = 0
+    hits: int = 0
+    total_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered by this tier."""
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    @property
+    def mean_latency_ms(self) -> float:
+        """Mean time per lookup in milliseconds."""
+        return 1000 * self.total_seconds / self.lookups if self.lookups else 0.0
+
+    def record(self, hit: bool, started: float) -> None:
+        """Record one lookup.
+
+        Args:
+            hit: Whether this tier answered the prompt.
+            started: The time.perf_counter() value when the lookup began.
         """
-        key = prompt.strip().lower()
-        self._cache[key] = result
+        self.lookups += 1
+        self.hits += hit
+        self.total_seconds += time.perf_counter() - started
+
+
+@dataclass(frozen=True, slots=True)
+class _PolicyView:
+    """The policy-derived state an IntentClassifier classifies against.
+
+    Built in full before it is published, so a policy reload swaps every
+    field at once and no call sees categories from one policy and a
+    namespace or fast path from another.
+    """
+
+    categories: list[str]
+    policy_version: str
+    namespace: str
+    fast_path: RuleClassifier | None
+    fast_path_threshold: float
 
 
 class IntentClassifier:
     """Classifies prompts into intent categories via the Claude API.
 
     Uses an Anthropic model to determine which predefined category a
-    prompt belongs to. Results are cached to avoid redundant API calls.
+    prompt belongs to. Prompts are tried against tiers in order — the
+    cache, then an optional local fast path, then the LLM — and the
+    first tier that answers wins.
 
     Attributes:
         categories: Valid intent categories for classification.
         cache: Optional cache for storing/retrieving results.
         model: The Anthropic model identifier to use.
+        fast_path: Optional local classifier tried before the LLM.
+        fast_path_threshold: Minimum fast-path confidence to accept.
+        policy_version: Version of the policy the categories came from.
+        namespace: Cache namespace derived from the policy version,
+            categories and model.
+        stats: Per-tier counters keyed by "cache", "local" and "llm".
+        coalesced: Number of calls that shared another caller's
+            in-flight upstream classification.
+        upstream_calls: Number of classification requests sent to the
+            Anthropic API.
+        batch_window: Seconds classify_async() waits to collect prompts
+            into one upstream request, or 0 to disable batching.
+        max_batch_size: Maximum prompts per batched request.
     """
 
     def __init__(
@@ -101,6 +508,12 @@ class IntentClassifier:
         categories: list[str],
         cache: ClassifierCache | None = None,
         model: str = "claude-sonnet-4-6",
+        fast_path: RuleClassifier | None = None,
+        fast_path_threshold: float = 0.9,
+        policy_version: str = "",
+        batch_window: float = 0.0,
+        max_batch_size: int = 16,
+        clients: UpstreamClients | None = None,
     ) -> None:
         """Initialize the classifier.
 
@@ -109,70 +522,550 @@ class IntentClassifier:
             cache: Optional ClassifierCache for caching results.
             model: Anthropic model identifier to use for
                 classification.
+            fast_path: Optional local classifier. Any object with a
+                classify(prompt) method returning a ClassificationResult
+                or None can be used.
+            fast_path_threshold: Fast-path results below this confidence
+                fall through to the LLM classifier.
+            policy_version: Version of the policy that defines the
+                categories; part of the cache namespace.
+            batch_window: If positive, classify_async() collects prompts
+                arriving within this many seconds (up to max_batch_size)
+                and classifies them in a single upstream request.
+            max_batch_size: Batch size that triggers an immediate flush.
+            clients: Shared upstream clients, or None to create clients
+                with default settings. Calls are bounded by the clients'
+                classify_deadline, retried and circuit-broken by them.
         """
-        self.categories = categories
         self.cache = cache
         self.model = model
-        self._client = anthropic.Anthropic()
+        self._view = _PolicyView(
+            categories=categories,
+            policy_version=policy_version,
+            namespace=cache_namespace(policy_version, categories, model),
+            fast_path=fast_path,
+            fast_path_threshold=fast_path_threshold,
+        )
+        self.stats = {tier: TierStats() for tier in ("cache", "local", "llm")}
+        self.coalesced = 0
+        self.upstream_calls = 0
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self._batcher = (
+            _ClassificationBatcher(self, batch_window, max_batch_size)
+            if batch_window > 0
+            else None
+        )
+        self._inflight: dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._inflight_async: dict[str, asyncio.Task] = {}
+        self.upstream = clients if clients is not None else UpstreamClients()
+        self._client = self.upstream.client
+        self._async_client = self.upstream.async_client
 
-    def classify(self, prompt: str) -> ClassificationResult:
-        """Classify a prompt into one of the configured categories.
+    @property
+    def categories(self) -> list[str]:
+        """Valid intent categories for classification."""
+        return self._view.categories
+
+    @property
+    def policy_version(self) -> str:
+        """Version of the policy the categories came from."""
+        return self._view.policy_version
 
-        Checks the cache first. On a cache miss, calls the Anthropic
-        API to classify the prompt. On any error (API, parsing, invalid
-        category), returns an "unclassified" result with confidence 0.0.
+    @property
+    def namespace(self) -> str:
+        """Cache namespace for the current policy and model."""
+        return self._view.namespace
+
+    @property
+    def fast_path(self) -> RuleClassifier | None:
+        """Local classifier tried before the LLM, or None."""
+        return self._view.fast_path
+
+    @property
+    def fast_path_threshold(self) -> float:
+        """Minimum fast-path confidence to accept."""
+        return self._view.fast_path_threshold
+
+    def prepare_policy(self, policy: Policy) -> _PolicyView:
+        """Build the classifier state for a policy without switching to it.
+
+        A RuleClassifier fast path (or none at all) is rebuilt from the
+        policy's fast-path rules, so a reload can add, change or remove
+        them. Any other fast-path object was supplied by the caller and
+        is kept.
+
+        Args:
+            policy: The policy to classify against.
+
+        Returns:
+            The state to pass to publish_policy().
+        """
+        fast_path = self._view.fast_path
+        threshold = self._view.fast_path_threshold
+        if fast_path is None or isinstance(fast_path, RuleClassifier):
+            fast_path = (
+                RuleClassifier.from_policy(policy) if policy.fast_path_rules else None
+            )
+            threshold = policy.fast_path_threshold
+        return _PolicyView(
+            categories=policy.categories,
+            policy_version=policy.version,
+            namespace=cache_namespace(policy.version, policy.categories, self.model),
+            fast_path=fast_path,
+            fast_path_threshold=threshold,
+        )
+
+    def publish_policy(self, view: _PolicyView) -> None:
+        """Switch to state built by prepare_policy() in one assignment.
+
+        Args:
+            view: The prepared classifier state.
+        """
+        self._view = view
+
+    def update_policy(self, policy: Policy) -> None:
+        """Switch to a reloaded policy's categories and fast-path rules.
+
+        The cache namespace changes with the policy version and category
+        set, so results cached under the previous policy are not reused.
+
+        Args:
+            policy: The newly loaded Policy.
+        """
+        self.publish_policy(self.prepare_policy(policy))
+
+    def _classify_locally(self, prompt: str) -> ClassificationResult | None:
+        """Try the cache and fast-path tiers without calling upstream.
 
         Args:
             prompt: The user prompt text to classify.
 
         Returns:
-            A ClassificationResult with the determined category
-            and confidence.
+            A ClassificationResult from the first tier that answered, or
+            None if the LLM classifier is needed.
         """
         if self.cache is not None:
-            cached = self.cache.get(prompt)
+            started = time.perf_counter()
+            cached = self._lookup_cache(prompt)
+            self.stats["cache"].record(cached is not None, started)
             if cached is not None:
                 return cached
 
+        view = self._view
+        if view.fast_path is not None:
+            started = time.perf_counter()
+            result = view.fast_path.classify(prompt)
+            hit = result is not None and result.confidence >= view.fast_path_threshold
+            self.stats["local"].record(hit, started)
+            if hit:
+                return result
+
+        return None
+
+    def _lookup_cache(self, prompt: str) -> ClassificationResult | None:
+        """Look a prompt up in this classifier's cache namespace.
+
+        Falls back to the cache's default namespace (pre-computed
+        entries), accepting a result there only if its category is one
+        of this classifier's categories.
+
+        Args:
+            prompt: The user prompt text to look up.
+
+        Returns:
+            The cached ClassificationResult, or None on a miss.
+        """
+        view = self._view
+        return self.cache.get(prompt, view.namespace, view.categories)
+
+    def _system_prompt(self) -> str:
+        """Build the classification system prompt for the current categories.
+
+        Returns:
+            The system prompt listing every valid category.
+        """
+        return SYSTEM_PROMPT_TEMPLATE.format(categories="\n".join(self.categories))
+
+    def _parse_response(self, prompt: str, response_text: str) -> ClassificationResult:
+        """Turn the classifier's raw JSON reply into a result.
+
+        Args:
+            prompt: The prompt that was classified.
+            response_text: The text content returned by the model.
+
+        Returns:
+            A ClassificationResult, or an "unclassified" result if the
+            model named a category outside the configured list.
+
+        Raises:
+            ValueError: If the reply is not valid JSON.
+            KeyError: If the reply is missing a required field.
+        """
+        return self._to_result(prompt, json.loads(response_text))
+
+    def _to_result(self, prompt: str, parsed: dict) -> ClassificationResult:
+        """Validate one parsed classification and cache it.
+
+        Args:
+            prompt: The prompt that was classified.
+            parsed: The decoded JSON object for this prompt.
+
+        Returns:
+            A ClassificationResult, or an "unclassified" result if the
+            model named a category outside the configured list.
+
+        Raises:
+            KeyError: If the object is missing a required field.
+        """
+        category = parsed["category"]
+        confidence = float(parsed["confidence"])
+
+        view = self._view
+        if category not in view.categories:
+            return _unclassified(prompt)
+
+        result = ClassificationResult(
+            intent_category=category,
+            confidence=confidence,
+            raw_prompt=prompt,
+        )
+
+        if self.cache is not None:
+            self.cache.set(prompt, result, view.namespace)
+
+        return result
+
+    def _call_upstream(self, prompt: str) -> ClassificationResult:
+        """Classify a prompt with the LLM and record tier stats.
+
+        Args:
+            prompt: The user prompt text to classify.
+
+        Returns:
+            The classification, or "unclassified" on any error, with
+            the reason set when the upstream call itself failed.
+        """
+        started = time.perf_counter()
+        self.upstream_calls += 1
         try:
-            system_prompt = SYSTEM_PROMPT_TEMPLATE.format(
-                categories="\n".join(self.categories)
+            response = self.upstream.call(
+                lambda timeout: self._client.messages.create(
+                    model=self.model,
+                    max_tokens=256,
+                    system=self._system_prompt(),
+                    messages=[{"role": "user", "content": prompt}],
+                    timeout=timeout,
+                ),
+                self.upstream.config.classify_deadline,
             )
+            result = self._parse_response(prompt, response.content[0].text)
+        except UpstreamUnavailable as exc:
+            result = _unclassified(prompt, exc.reason)
+        except Exception:
+            result = _unclassified(prompt)
+        self.stats["llm"].record(result.intent_category != "unclassified", started)
+        return result
+
+    async def _call_upstream_async(self, prompt: str) -> ClassificationResult:
+        """Classify a prompt with the async LLM client and record tier stats.
 
-            response = self._client.messages.create(
-                model=self.model,
-                max_tokens=256,
-                system=system_prompt,
-                messages=[{"role": "user", "content": prompt}],
+        Args:
+            prompt: The user prompt text to classify.
+
+        Returns:
+            The classification, or "unclassified" on any error, with
+            the reason set when the upstream call itself failed.
+        """
+        started = time.perf_counter()
+        self.upstream_calls += 1
+        try:
+            response = await self.upstream.acall(
+                lambda timeout: self._async_client.messages.create(
+                    model=self.model,
+                    max_tokens=256,
+                    system=self._system_prompt(),
+                    messages=[{"role": "user", "content": prompt}],
+                    timeout=timeout,
+                ),
+                self.upstream.config.classify_deadline,
             )
+            result = self._parse_response(prompt, response.content[0].text)
+        except UpstreamUnavailable as exc:
+            result = _unclassified(prompt, exc.reason)
+        except Exception:
+            result = _unclassified(prompt)
+        self.stats["llm"].record(result.intent_category != "unclassified", started)
+        return result
 
-            response_text = response.content[0].text
-            parsed = json.loads(response_text)
+    async def _classify_batch_async(
+        self, batch: list[tuple[str, asyncio.Future]]
+    ) -> None:
+        """Classify several prompts in one upstream request.
 
-            category = parsed["category"]
-            confidence = float(parsed["confidence"])
+        Results are delivered through each prompt's future. Entries the
+        model omits or gets wrong, or any failure of the whole request,
+        resolve to "unclassified". Each reply item is validated on its
+        own, so a malformed item costs only its own prompt. If the call
+        is interrupted (for example cancelled), every future still
+        pending gets that exception instead.
 
-            if category not in self.categories:
-                return ClassificationResult(
-                    intent_category="unclassified",
-                    confidence=0.0,
-                    raw_prompt=prompt,
+        Args:
+            batch: (prompt, future) pairs collected by the batcher.
+        """
+        prompts = [prompt for prompt, _ in batch]
+        results: list[ClassificationResult | None] = [None] * len(prompts)
+        error = None
+        failure: BaseException | None = None
+        started = time.perf_counter()
+        self.upstream_calls += 1
+        try:
+            response = await self.upstream.acall(
+                lambda timeout: self._async_client.messages.create(
+                    model=self.model,
+                    max_tokens=min(4096, 64 * len(prompts) + 64),
+                    system=BATCH_SYSTEM_PROMPT_TEMPLATE.format(
+                        categories="\n".join(self.categories)
+                    ),
+                    messages=[{"role": "user", "content": json.dumps(prompts)}],
+                    timeout=timeout,
+                ),
+                self.upstream.config.classify_deadline,
+            )
+            parsed = json.loads(response.content[0].text)
+            if not isinstance(parsed, list):
+                raise ValueError("batch reply is not a JSON array")
+            for position, item in enumerate(parsed):
+                if not isinstance(item, dict):
+                    continue
+                try:
+                    index = int(item.get("index", position))
+                    if 0 <= index < len(prompts) and results[index] is None:
+                        results[index] = self._to_result(prompts[index], item)
+                except (KeyError, TypeError, ValueError):
+                    continue
+        except UpstreamUnavailable as exc:
+            error = exc.reason
+        except Exception:
+            pass
+        except BaseException as exc:
+            failure = exc
+            raise
+        finally:
+            if failure is not None:
+                _fail_pending(batch, failure)
+            for (prompt, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if result is None:
+                    result = _unclassified(prompt, error)
+                self.stats["llm"].record(
+                    result.intent_category != "unclassified", started
                 )
+                future.set_result(result)
 
-            result = ClassificationResult(
-                intent_category=category,
-                confidence=confidence,
-                raw_prompt=prompt,
-            )
+    def classify(self, prompt: str) -> ClassificationResult:
+        """Classify a prompt into one of the configured categories.
 
-            if self.cache is not None:
-                self.cache.set(prompt, result)
+        Checks the cache and the local fast path first. If neither
+        answers, calls the Anthropic API to classify the prompt. On any
+        error (API, parsing, invalid category), returns an
+        "unclassified" result with confidence 0.0.
 
-            return result
+        Concurrent calls for the same prompt (same cache key) share a
+        single upstream call: the first caller makes it and the others
+        wait for and return its result.
 
-        except Exception:
-            return ClassificationResult(
-                intent_category="unclassified",
-                confidence=0.0,
-                raw_prompt=prompt,
-            )
+        Args:
+            prompt: The user prompt text to classify.
+
+        Returns:
+            A ClassificationResult with the determined category
+            and confidence.
+        """
+        local = self._classify_locally(prompt)
+        if local is not None:
+            return local
+
+        key = make_cache_key(prompt, self.namespace)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(self._call_upstream(prompt))
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+        return future.result()
+
+    async def classify_async(self, prompt: str) -> ClassificationResult:
+        """Classify a prompt without blocking the event loop.
+
+        Behaves exactly like classify(), but the upstream call is made
+        with the async Anthropic client so other requests can proceed
+        while this one waits on the network. The shared upstream call
+        runs as its own task, so a caller that is cancelled does not
+        cancel it for the others waiting on the same prompt.
+
+        Args:
+            prompt: The user prompt text to classify.
+
+        Returns:
+            A ClassificationResult with the determined category
+            and confidence.
+        """
+        cache = self.cache
+        if (
+            cache is not None
+            and cache.store is not None
+            and not cache.holds(prompt, self.namespace)
+        ):
+            # A memory miss reads through to SQLite; keep that off the
+            # event loop.
+            local = await asyncio.to_thread(self._classify_locally, prompt)
+        else:
+            local = self._classify_locally(prompt)
+        if local is not None:
+            return local
+
+        key = make_cache_key(prompt, self.namespace)
+        task = self._inflight_async.get(key)
+        if task is None:
+            if self._batcher is not None:
+                upstream = self._batcher.submit(prompt)
+            else:
+                upstream = self._call_upstream_async(prompt)
+            task = asyncio.ensure_future(upstream)
+            self._inflight_async[key] = task
+            task.add_done_callback(lambda _: self._inflight_async.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+
+class _ClassificationBatcher:
+    """Collects prompts for a short window and classifies them together.
+
+    Attributes:
+        classifier: The IntentClassifier that performs batch calls.
+        window: Seconds to wait for more prompts after the first.
+        max_size: Batch size that triggers an immediate flush.
+    """
+
+    def __init__(
+        self, classifier: IntentClassifier, window: float, max_size: int
+    ) -> None:
+        """Initialize an empty batcher.
+
+        Args:
+            classifier: The IntentClassifier that performs batch calls.
+            window: Seconds to wait for more prompts after the first.
+            max_size: Batch size that triggers an immediate flush.
+        """
+        self.classifier = classifier
+        self.window = window
+        self.max_size = max_size
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, prompt: str) -> ClassificationResult:
+        """Queue a prompt and wait for its batched classification.
+
+        Args:
+            prompt: The user prompt text to classify.
+
+        Returns:
+            The prompt's ClassificationResult.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((prompt, future))
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        """Send the pending prompts as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._dispatch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        """Classify a flushed batch, skipping the batch format for one prompt.
+
+        Every future in the batch is resolved before this returns: one
+        left pending by an interrupted call gets that call's exception.
+
+        Args:
+            batch: (prompt, future) pairs to classify.
+        """
+        failure: BaseException = RuntimeError("classification batch ended early")
+        try:
+            if len(batch) > 1:
+                await self.classifier._classify_batch_async(batch)
+                return
+            prompt, future = batch[0]
+            result = await self.classifier._call_upstream_async(prompt)
+            if not future.done():
+                future.set_result(result)
+        except BaseException as exc:
+            failure = exc
+            raise
+        finally:
+            _fail_pending(batch, failure)
+
+
+def _fail_pending(batch: list[tuple[str, asyncio.Future]], exc: BaseException) -> None:
+    """Resolve every still-pending future in a batch with an exception.
+
+    Args:
+        batch: (prompt, future) pairs.
+        exc: The exception to deliver; cancellation cancels the futures.
+    """
+    for _, future in batch:
+        if future.done():
+            continue
+        if isinstance(exc, asyncio.CancelledError):
+            future.cancel()
+        else:
+            future.set_exception(exc)
+
+
+def _unclassified(prompt: str, error: str | None = None) -> ClassificationResult:
+    """Build the fallback result used when classification fails.
+
+    Args:
+        prompt: The prompt that could not be classified.
+        error: Why the upstream call failed, or None if the model
+            answered but its answer was unusable.
+
+    Returns:
+        An "unclassified" ClassificationResult with confidence 0.0.
+    """
+    return ClassificationResult(
+        intent_category="unclassified",
+        confidence=0.0,
+        raw_prompt=prompt,
+        error=error,
+    )
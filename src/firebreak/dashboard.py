@@ -66,13 +66,25 @@ class FirebreakDashboard:
     def register_callbacks(self, interceptor: FirebreakInterceptor) -> None:
         """Subscribe to interceptor events for live updates.
 
+        All callbacks share one event bus subscriber so they apply in
+        the order the events were emitted.
+
         Args:
             interceptor: The FirebreakInterceptor to subscribe to.
         """
-        interceptor.on("prompt_received", self.update_prompt)
-        interceptor.on("classified", self.update_classification)
-        interceptor.on("evaluated", self.update_evaluation)
-        interceptor.on("alert", self._add_alert)
+        interceptor.on("prompt_received", self.update_prompt, "dashboard")
+        interceptor.on("classified", self.update_classification, "dashboard")
+        interceptor.on("evaluated", self.update_evaluation, "dashboard")
+        interceptor.on("alert", self._add_alert, "dashboard")
+        interceptor.on("policy_reloaded", self.update_policy, "dashboard")
+
+    def update_policy(self, policy: Policy) -> None:
+        """Show a newly reloaded policy in the policy panel.
+
+        Args:
+            policy: The Policy now in effect.
+        """
+        self.policy = policy
 
     def update_prompt(self, prompt: str) -> None:
         """Set the current prompt and clear prior state.
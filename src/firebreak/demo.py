@@ -1,6 +1,8 @@
 """Demo runner — main entry point for the Firebreak demonstration."""
 
 import argparse
+import atexit
+import os
 import threading
 import time
 
@@ -9,11 +11,22 @@ from rich.console import Console
 from rich.live import Live
 
 from firebreak.audit import AuditLog
-from firebreak.classifier import ClassifierCache, IntentClassifier
+from firebreak.cache_store import SQLiteCacheStore
+from firebreak.classifier import ClassifierCache, IntentClassifier, RuleClassifier
 from firebreak.dashboard import FirebreakDashboard
 from firebreak.interceptor import FirebreakInterceptor
 from firebreak.models import DemoScenario
-from firebreak.policy import PolicyEngine
+from firebreak.options import (
+    add_alert_options,
+    add_audit_options,
+    add_cache_options,
+    add_upstream_options,
+    alert_dispatcher,
+    open_audit_log,
+    upstream_config,
+)
+from firebreak.policy import PolicyEngine, PolicyWatcher
+from firebreak.upstream import UpstreamClients
 
 DEFAULT_POLICY = "policies/defense-standard.yaml"
 DEFAULT_SCENARIOS = "demo/scenarios.yaml"
@@ -62,6 +75,16 @@ def _parse_args() -> argparse.Namespace:
         default=8080,
         help="Server listen port (default: 8080)",
     )
+    parser.add_argument(
+        "--watch-policy",
+        action="store_true",
+        help="Reload the policy file automatically when it changes (server mode)",
+    )
+    parser.add_argument(
+        "--speculative",
+        action="store_true",
+        help="Start the LLM call while classifying (server mode; cancelled on BLOCK)",
+    )
     parser.add_argument(
         "--interactive",
         action="store_true",
@@ -82,6 +105,63 @@ def _parse_args() -> argparse.Namespace:
         default=DEFAULT_CACHE,
         help=f"Path to classifier cache JSON (default: {DEFAULT_CACHE})",
     )
+    parser.add_argument(
+        "--batch-window-ms",
+        type=float,
+        default=0.0,
+        help="Batch classifications arriving within this window (server mode)",
+    )
+    parser.add_argument(
+        "--cache-db",
+        default=None,
+        help="SQLite file that persists classifications across restarts",
+    )
+    add_cache_options(parser)
+    add_audit_options(parser)
+    add_upstream_options(parser)
+    parser.add_argument(
+        "--concurrency-limit",
+        type=int,
+        default=20,
+        help="Starting limit on concurrent proxy requests; adapts to upstream"
+        " latency (default: 20)",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=200,
+        help="Highest the adaptive concurrency limit may rise (default: 200)",
+    )
+    parser.add_argument(
+        "--max-queue",
+        type=int,
+        default=100,
+        help="Requests allowed to wait for a slot before shedding (default: 100)",
+    )
+    parser.add_argument(
+        "--queue-timeout",
+        type=float,
+        default=5.0,
+        help="Seconds a request waits for a slot before a 503 (default: 5)",
+    )
+    parser.add_argument(
+        "--clients",
+        default=None,
+        help="YAML registry of client API keys and per-client rate limits",
+    )
+    parser.add_argument(
+        "--client-rps",
+        type=float,
+        default=10.0,
+        help="Default requests per second per client (default: 10)",
+    )
+    parser.add_argument(
+        "--client-tpm",
+        type=float,
+        default=100_000.0,
+        help="Default upstream tokens per minute per client (default: 100000)",
+    )
+    add_alert_options(parser)
     return parser.parse_args()
 
 
@@ -147,21 +227,51 @@ def _run_server(
     """Start the proxy server with a live TUI dashboard.
 
     Args:
-        args: Parsed CLI arguments (needs .port).
+        args: Parsed CLI arguments (needs .port and the concurrency
+            and client rate limit options).
         console: Rich console for output.
         interceptor: The configured interceptor pipeline.
         dashboard: The dashboard instance.
     """
     import uvicorn
 
-    from firebreak.server import create_app
+    from firebreak.limiter import ConcurrencyLimiter
+    from firebreak.ratelimit import ClientLimits, RateLimiter, load_clients
+    from firebreak.server import ADMIN_KEY_ENV, create_app
 
     with Live(
         dashboard,
         console=console,
         refresh_per_second=4,
     ) as live:
-        app = create_app(interceptor, dashboard, live)
+        limiter = ConcurrencyLimiter(
+            initial_limit=args.concurrency_limit,
+            max_limit=args.max_concurrency,
+            max_queue=args.max_queue,
+            queue_timeout=args.queue_timeout,
+        )
+        if args.clients:
+            rate_limiter = load_clients(args.clients)
+        else:
+            rate_limiter = RateLimiter(
+                default_limits=ClientLimits(
+                    requests_per_second=args.client_rps,
+                    request_burst=max(1, int(args.client_rps * 2)),
+                    tokens_per_minute=args.client_tpm,
+                )
+            )
+        # The dashboard follows requests through interceptor callbacks
+        # and Live redraws it on its own timer, off the request path.
+        app = create_app(
+            interceptor,
+            policy_path=args.policy,
+            limiter=limiter,
+            rate_limiter=rate_limiter,
+            admin_key=os.environ.get(ADMIN_KEY_ENV),
+        )
+
+        if args.watch_policy:
+            PolicyWatcher(args.policy, interceptor.reload_policy).start()
 
         dashboard.update_narration(
             f"[bold green]Server listening on"
@@ -200,22 +310,56 @@ def main() -> None:
     engine.load(args.policy)
     policy = engine.policy
 
+    # One connection pool and circuit breaker for classification and
+    # forwarding
+    clients = UpstreamClients(upstream_config(args))
+    atexit.register(clients.close)
+
     # Initialize classifier
     cache = None
     if not args.no_cache:
-        cache = ClassifierCache(cache_path=args.cache)
+        store = None
+        if args.cache_db:
+            store = SQLiteCacheStore(args.cache_db, max_age=args.cache_ttl)
+        cache = ClassifierCache(
+            cache_path=args.cache,
+            max_entries=args.cache_max_entries,
+            ttl=args.cache_ttl,
+            store=store,
+        )
+        atexit.register(cache.close)
+    fast_path = None
+    if policy.fast_path_rules:
+        fast_path = RuleClassifier.from_policy(policy)
     classifier = IntentClassifier(
         categories=policy.categories,
         cache=cache,
+        fast_path=fast_path,
+        fast_path_threshold=policy.fast_path_threshold,
+        policy_version=policy.version,
+        batch_window=args.batch_window_ms / 1000,
+        clients=clients,
     )
 
     # Initialize audit log and interceptor
-    audit_log = AuditLog()
+    audit_log = open_audit_log(args)
+    if audit_log is not None:
+        atexit.register(audit_log.close)
+    else:
+        audit_log = AuditLog()
     interceptor = FirebreakInterceptor(
         policy_engine=engine,
         classifier=classifier,
         audit_log=audit_log,
+        speculative=args.speculative,
+        clients=clients,
     )
+    dispatcher = alert_dispatcher(args)
+    if dispatcher is not None:
+        dispatcher.register(interceptor)
+        atexit.register(dispatcher.close)
+    # Registered last so it runs first: queued alerts reach the dispatcher.
+    atexit.register(interceptor.events.close)
 
     # Initialize dashboard
     dashboard = FirebreakDashboard(policy)
@@ -259,6 +403,7 @@ def main() -> None:
 
             # Run through the interceptor pipeline
             interceptor.evaluate_request(scenario.prompt)
+            interceptor.events.flush()
             live.update(dashboard)
 
         # Interactive proxy mode
@@ -293,6 +438,7 @@ def main() -> None:
 
                 # Run through the full pipeline
                 interceptor.evaluate_request(prompt.strip())
+                interceptor.events.flush()
                 live.update(dashboard)
 
         # Wait for presenter to exit
@@ -0,0 +1,234 @@
+"""Event bus that delivers interceptor events off the request path."""
+
+import queue
+import threading
+from collections import defaultdict
+from collections.abc import Callable
+from enum import Enum
+from typing import Any
+
+# Queue item that stops a subscriber's worker thread.
+_STOP = object()
+
+
+class Overflow(Enum):
+    """What publish() does when a subscriber's queue is full."""
+
+    DROP = "drop"
+    BLOCK = "block"
+
+
+class Subscriber:
+    """One consumer of bus events with its own queue and worker thread.
+
+    Callbacks registered on the same subscriber run on one thread in
+    publish order, so a consumer that keeps state across events (like
+    the dashboard) sees them in sequence. Exceptions raised by a
+    callback are counted and never reach the publisher.
+
+    Attributes:
+        name: Subscriber name, unique per bus.
+        max_queue: Maximum events waiting for delivery.
+        overflow: Whether a full queue drops new events or makes the
+            publisher wait for room.
+        delivered: Number of events handed to callbacks.
+        dropped: Number of events discarded because the queue was full.
+        errors: Number of callbacks that raised.
+        handlers: Callbacks registered per event name.
+    """
+
+    def __init__(self, name: str, max_queue: int, overflow: Overflow) -> None:
+        """Create the subscriber and start its worker thread.
+
+        Args:
+            name: Subscriber name, unique per bus.
+            max_queue: Maximum events waiting for delivery.
+            overflow: Full-queue policy.
+        """
+        self.name = name
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.handlers: dict[str, list[Callable]] = defaultdict(list)
+        self._stopped = False
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._worker = threading.Thread(
+            target=self._run, name=f"firebreak-events-{name}", daemon=True
+        )
+        self._worker.start()
+
+    def offer(self, event: str, data: Any) -> bool:
+        """Queue an event for delivery if this subscriber handles it.
+
+        Args:
+            event: Event name.
+            data: Data to pass to each callback.
+
+        Returns:
+            False if the event was dropped, True otherwise.
+        """
+        if event not in self.handlers:
+            return True
+        if self._stopped:
+            self.dropped += 1
+            return False
+        if self.overflow is Overflow.BLOCK:
+            self._queue.put((event, data))
+            return True
+        try:
+            self._queue.put_nowait((event, data))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    @property
+    def queued(self) -> int:
+        """Number of events waiting for delivery."""
+        return self._queue.qsize()
+
+    def join(self) -> None:
+        """Wait until every queued event has been delivered."""
+        self._queue.join()
+
+    def stop(self) -> None:
+        """Deliver queued events, then stop the worker thread."""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._queue.put(_STOP)
+        self._worker.join()
+
+    def _run(self) -> None:
+        """Worker loop: hand each queued event to its callbacks."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                event, data = item
+                for callback in list(self.handlers.get(event, [])):
+                    try:
+                        callback(data)
+                    except Exception:
+                        self.errors += 1
+                self.delivered += 1
+            finally:
+                self._queue.task_done()
+
+
+class EventBus:
+    """Publishes events to subscribers on background threads.
+
+    publish() only enqueues, so slow or failing callbacks add no latency
+    to the request that emitted the event. Each subscriber has a bounded
+    queue; when it falls behind, new events are either dropped (and
+    counted) or the publisher blocks until there is room.
+
+    Attributes:
+        max_queue: Default queue bound for new subscribers.
+        overflow: Default full-queue policy for new subscribers.
+        subscribers: Subscribers by name.
+    """
+
+    def __init__(
+        self, max_queue: int = 1024, overflow: Overflow = Overflow.DROP
+    ) -> None:
+        """Initialize an empty bus.
+
+        Args:
+            max_queue: Default queue bound for new subscribers.
+            overflow: Default full-queue policy for new subscribers.
+        """
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.subscribers: dict[str, Subscriber] = {}
+        self._lock = threading.Lock()
+
+    def subscriber(
+        self,
+        name: str,
+        max_queue: int | None = None,
+        overflow: Overflow | None = None,
+    ) -> Subscriber:
+        """Return the named subscriber, creating it on first use.
+
+        Args:
+            name: Subscriber name.
+            max_queue: Queue bound, or None for the bus default. Only
+                used when the subscriber is created.
+            overflow: Full-queue policy, or None for the bus default.
+                Only used when the subscriber is created.
+
+        Returns:
+            The Subscriber.
+        """
+        with self._lock:
+            sub = self.subscribers.get(name)
+            if sub is None:
+                sub = Subscriber(
+                    name,
+                    self.max_queue if max_queue is None else max_queue,
+                    self.overflow if overflow is None else overflow,
+                )
+                self.subscribers[name] = sub
+            return sub
+
+    def on(self, event: str, callback: Callable, subscriber: str = "default") -> None:
+        """Register a callback for an event.
+
+        Args:
+            event: Event name.
+            callback: Function called with the event data.
+            subscriber: Name of the subscriber whose thread runs the
+                callback. Callbacks that must see events in order should
+                share a subscriber.
+        """
+        self.subscriber(subscriber).handlers[event].append(callback)
+
+    def publish(self, event: str, data: Any) -> None:
+        """Queue an event for every subscriber that handles it.
+
+        Args:
+            event: Event name.
+            data: Data to pass to each callback.
+        """
+        for sub in list(self.subscribers.values()):
+            sub.offer(event, data)
+
+    @property
+    def dropped(self) -> int:
+        """Total events dropped across all subscribers."""
+        return sum(sub.dropped for sub in self.subscribers.values())
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Return delivery counters per subscriber.
+
+        Returns:
+            Per subscriber name, its delivered, dropped, errors and
+            queued counts.
+        """
+        return {
+            name: {
+                "delivered": sub.delivered,
+                "dropped": sub.dropped,
+                "errors": sub.errors,
+                "queued": sub.queued,
+            }
+            for name, sub in list(self.subscribers.items())
+        }
+
+    def flush(self) -> None:
+        """Wait until every published event has been delivered."""
+        for sub in list(self.subscribers.values()):
+            sub.join()
+
+    def close(self) -> None:
+        """Deliver queued events and stop all worker threads.
+
+        Counters stay readable; events published afterwards are dropped.
+        """
+        for sub in list(self.subscribers.values()):
+            sub.stop()
@@ -0,0 +1,504 @@
+"""Hash chaining and Merkle checkpoints for tamper-evident audit records."""
+
+import hashlib
+import json
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+
+GENESIS_HASH = "0" * 64
+
+# Domain-separation prefixes so a leaf can never be passed off as an
+# interior node (and vice versa).
+_LEAF_PREFIX = b"\x00"
+_NODE_PREFIX = b"\x01"
+
+
+def canonical_json(record: dict) -> str:
+    """Serialize a record deterministically.
+
+    Args:
+        record: A JSON-compatible dict.
+
+    Returns:
+        Compact JSON with sorted keys.
+    """
+    return json.dumps(record, sort_keys=True, separators=(",", ":"))
+
+
+# Entry fields hashed in the header rather than the body, so that a
+# retention tombstone can keep them and still reproduce the hash.
+_ENTRY_HEADER = ("type", "seq", "prev_hash", "hash")
+
+
+def body_hash(record: dict) -> str:
+    """Compute the digest of an entry's content.
+
+    Args:
+        record: An entry record.
+
+    Returns:
+        The hex SHA-256 digest of every field outside the header.
+    """
+    body = {k: v for k, v in record.items() if k not in _ENTRY_HEADER}
+    return hashlib.sha256(canonical_json(body).encode()).hexdigest()
+
+
+def tombstone(record: dict) -> dict:
+    """Build the retention tombstone that replaces an entry.
+
+    The tombstone drops the content but keeps the entry's sequence
+    number, timestamp, audit level and content digest, so its hash can
+    still be recomputed and verify can check it was due for removal.
+
+    Args:
+        record: The chained entry record.
+
+    Returns:
+        The tombstone record, with the entry's hashes.
+    """
+    return {
+        "type": "redacted",
+        "seq": record["seq"],
+        "timestamp": record["timestamp"],
+        "audit_level": record["evaluation"]["audit_level"],
+        "body_hash": body_hash(record),
+        "prev_hash": record["prev_hash"],
+        "hash": record["hash"],
+    }
+
+
+def record_hash(record: dict) -> str:
+    """Compute the chain hash of a record.
+
+    The hash covers every field except "hash" itself, including the
+    record's "prev_hash", which links it to its predecessor. An entry
+    is hashed as a header (seq, prev_hash, timestamp, audit level) plus
+    the digest of its content, which its tombstone hashes the same way.
+
+    Args:
+        record: The audit record.
+
+    Returns:
+        The hex SHA-256 digest.
+    """
+    kind = record.get("type")
+    if kind == "entry":
+        body = {
+            "seq": record["seq"],
+            "prev_hash": record["prev_hash"],
+            "timestamp": record["timestamp"],
+            "audit_level": record["evaluation"]["audit_level"],
+            "body_hash": body_hash(record),
+        }
+    elif kind == "redacted":
+        body = {
+            "seq": record["seq"],
+            "prev_hash": record["prev_hash"],
+            "timestamp": record["timestamp"],
+            "audit_level": record["audit_level"],
+            "body_hash": record["body_hash"],
+        }
+    else:
+        body = {k: v for k, v in record.items() if k != "hash"}
+    return hashlib.sha256(canonical_json(body).encode()).hexdigest()
+
+
+def chain_record(record: dict, prev_hash: str) -> str:
+    """Link a record to its predecessor and return its serialized form.
+
+    Sets "prev_hash" and "hash" on the record in place.
+
+    Args:
+        record: The audit record to chain.
+        prev_hash: Hash of the preceding record, or GENESIS_HASH.
+
+    Returns:
+        The canonical JSON line (without trailing newline).
+    """
+    record["prev_hash"] = prev_hash
+    record["hash"] = record_hash(record)
+    return canonical_json(record)
+
+
+def _leaf(value: str) -> bytes:
+    return hashlib.sha256(_LEAF_PREFIX + bytes.fromhex(value)).digest()
+
+
+def _node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(_NODE_PREFIX + left + right).digest()
+
+
+def _next_level(level: list[bytes]) -> list[bytes]:
+    """Combine adjacent pairs; an odd trailing node is promoted as-is."""
+    paired = [_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+    if len(level) % 2:
+        paired.append(level[-1])
+    return paired
+
+
+def merkle_root(leaves: list[str]) -> str:
+    """Compute the Merkle root over a list of record hashes.
+
+    Args:
+        leaves: Hex record hashes in sequence order.
+
+    Returns:
+        The hex root digest.
+
+    Raises:
+        ValueError: If leaves is empty.
+    """
+    if not leaves:
+        raise ValueError("Cannot compute a Merkle root over no leaves")
+    level = [_leaf(h) for h in leaves]
+    while len(level) > 1:
+        level = _next_level(level)
+    return level[0].hex()
+
+
+def merkle_proof(leaves: list[str], index: int) -> list[tuple[str, str]]:
+    """Build an inclusion proof for one leaf.
+
+    Args:
+        leaves: Hex record hashes in sequence order.
+        index: Position of the leaf to prove.
+
+    Returns:
+        A list of (side, sibling_hex) pairs from leaf to root, where side
+        is "L" or "R" for the sibling's position.
+
+    Raises:
+        IndexError: If index is out of range.
+    """
+    if not 0 <= index < len(leaves):
+        raise IndexError(f"Leaf index {index} out of range")
+    level = [_leaf(h) for h in leaves]
+    proof: list[tuple[str, str]] = []
+    while len(level) > 1:
+        sibling = index ^ 1
+        if sibling < len(level):
+            side = "L" if sibling < index else "R"
+            proof.append((side, level[sibling].hex()))
+        level = _next_level(level)
+        index //= 2
+    return proof
+
+
+def verify_merkle_proof(leaf: str, proof: list[tuple[str, str]], root: str) -> bool:
+    """Check an inclusion proof in O(log n) hashes.
+
+    Args:
+        leaf: Hex hash of the record being proven.
+        proof: Proof from merkle_proof().
+        root: The trusted checkpoint root.
+
+    Returns:
+        True if the proof links the leaf to the root.
+    """
+    digest = _leaf(leaf)
+    for side, sibling in proof:
+        other = bytes.fromhex(sibling)
+        digest = _node(other, digest) if side == "L" else _node(digest, other)
+    return digest.hex() == root
+
+
+@dataclass
+class VerificationReport:
+    """Outcome of verifying an audit log.
+
+    Attributes:
+        records: Number of entry records checked.
+        checkpoints: Number of Merkle checkpoints checked.
+        redacted: Number of retention tombstones passed over.
+        expired: Number of records in segments that retention deleted
+            and replaced by anchors.
+        start_seq: Sequence number verification started from; non-zero
+            when retention has deleted the oldest segments.
+        last_hash: Hash of the last record read.
+        error: Description of the first failure, or None.
+        line: Line number of the first failure, or None.
+    """
+
+    records: int = 0
+    checkpoints: int = 0
+    redacted: int = 0
+    expired: int = 0
+    start_seq: int = 0
+    last_hash: str = GENESIS_HASH
+    error: str | None = None
+    line: int | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether verification passed."""
+        return self.error is None
+
+
+def iter_records(lines: Iterable[str]) -> Iterator[tuple[int, dict]]:
+    """Parse JSON Lines, yielding (line_number, record) pairs.
+
+    Args:
+        lines: An iterable of text lines, e.g. an open file.
+
+    Yields:
+        (line_number, record) for each non-blank line.
+
+    Raises:
+        ValueError: If a line is not valid JSON, with its line number.
+    """
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"line {number}: invalid JSON ({e.msg})") from e
+
+
+def verify_records(
+    lines: Iterable[str],
+    anchor: str | None = GENESIS_HASH,
+    retention: dict[str, float | None] | None = None,
+    now: float | None = None,
+    blobs: Callable[[str], str | None] | None = None,
+) -> VerificationReport:
+    """Verify the hash chain and Merkle checkpoints of an audit log.
+
+    Streams the input once. Memory is bounded by the checkpoint interval
+    because only the leaf hashes since the last checkpoint are held.
+
+    Retention tombstones ("redacted" records) keep the entry's header
+    and content digest, so their hash is recomputed like any other. A
+    segment deleted by retention must be replaced by an anchor: its
+    footer's hash is recomputed and the chain continues from it, so the
+    gap is accepted only where an anchor covers it.
+
+    Removals must also have been due. A tombstone must sit in a sealed
+    segment, and its audit level must have a finite retention that its
+    timestamp is older than; an anchor's footer must show every level
+    it covered as expired. The policy is the retention argument if
+    given, else the one recorded in the segment's footer at sealing.
+
+    Args:
+        lines: An iterable of JSON Lines, e.g. an open file.
+        anchor: Expected prev_hash of the first record. None accepts the
+            first record's prev_hash, for logs whose oldest segments were
+            removed by retention; a log that starts at sequence 0 must
+            still start from GENESIS_HASH.
+        retention: Seconds to keep each audit level (by value), to check
+            removals against instead of the policy in the footers.
+        now: Epoch time removals are checked at; defaults to now.
+        blobs: Fetches a blob-stored body by digest, to check every
+            body an entry refers to is present and matches its digest;
+            None skips the blob check.
+
+    Returns:
+        A VerificationReport; report.ok is False on the first failure.
+    """
+    report = VerificationReport()
+    leaves: list[tuple[int, str]] = []
+    prev_hash = anchor
+    now = time.time() if now is None else now
+    # Tombstones of the current segment, checked against its footer.
+    pending: list[tuple[int, dict]] = []
+    try:
+        for number, record in iter_records(lines):
+            report.line = number
+            kind = record.get("type")
+            if prev_hash is None:
+                first = record["first_seq"] if kind == "anchor" else record["seq"]
+                report.start_seq = first
+                prev_hash = GENESIS_HASH if first == 0 else record["prev_hash"]
+            if kind == "anchor":
+                prev_hash = _cross_anchor(
+                    record, prev_hash, leaves, retention, now, report
+                )
+                if prev_hash is None:
+                    return report
+                continue
+            if record.get("prev_hash") != prev_hash:
+                report.error = "chain broken: prev_hash does not match"
+                return report
+            if record_hash(record) != record.get("hash"):
+                report.error = "record hash mismatch"
+                return report
+            prev_hash = record["hash"]
+
+            if kind == "entry" and blobs is not None:
+                report.error = _check_blobs(record, blobs)
+                if report.error is not None:
+                    return report
+            elif kind == "redacted":
+                pending.append((number, record))
+            elif kind == "footer":
+                policy = retention if retention is not None else record["retention"]
+                for line, tomb in pending:
+                    if not _expired(
+                        tomb["audit_level"], _epoch(tomb["timestamp"]), policy, now
+                    ):
+                        report.line = line
+                        report.error = "redacted record was not due for removal"
+                        return report
+                pending = []
+
+            if kind == "checkpoint":
+                first, last = record["first_seq"], record["last_seq"]
+                covered = [h for seq, h in leaves if first <= seq <= last]
+                if len(covered) != last - first + 1:
+                    report.error = "checkpoint covers missing records"
+                    return report
+                if merkle_root(covered) != record["merkle_root"]:
+                    report.error = "checkpoint Merkle root mismatch"
+                    return report
+                leaves = []
+                report.checkpoints += 1
+            elif kind in ("entry", "redacted"):
+                leaves.append((record["seq"], record["hash"]))
+                if kind == "redacted":
+                    report.redacted += 1
+                else:
+                    report.records += 1
+    except KeyError as e:
+        report.error = f"missing field {e}"
+        return report
+    except ValueError as e:
+        report.error = str(e)
+        return report
+
+    if pending:
+        report.line = pending[0][0]
+        report.error = "redacted record outside a sealed segment"
+        return report
+    report.last_hash = prev_hash or GENESIS_HASH
+    report.line = None
+    return report
+
+
+def _check_blobs(record: dict, blobs: Callable[[str], str | None]) -> str | None:
+    """Check the blob-stored bodies of an entry.
+
+    Args:
+        record: The entry record.
+        blobs: Fetches a body by digest.
+
+    Returns:
+        A description of the first problem, or None.
+    """
+    refs = [record.get("prompt_blob"), record["evaluation"].get("llm_response_blob")]
+    for digest in refs:
+        if digest is None:
+            continue
+        body = blobs(digest)
+        if body is None:
+            return f"blob {digest} is missing"
+        if hashlib.sha256(body.encode()).hexdigest() != digest:
+            return f"blob {digest} does not match its digest"
+    return None
+
+
+def _epoch(iso: str) -> float:
+    """Convert a record's ISO timestamp to seconds since the epoch."""
+    return datetime.fromisoformat(iso).timestamp()
+
+
+def _expired(
+    level: str, timestamp: float, policy: dict[str, float | None], now: float
+) -> bool:
+    """Whether a record of this level and time was due for removal.
+
+    Args:
+        level: The record's audit level value.
+        timestamp: The record's epoch time.
+        policy: Seconds to keep each level; absent or None is forever.
+        now: Current epoch time.
+
+    Returns:
+        True if the level has a finite retention the record outlived.
+    """
+    seconds = policy.get(level)
+    return seconds is not None and timestamp < now - seconds
+
+
+def _cross_anchor(
+    anchor: dict,
+    prev_hash: str,
+    leaves: list,
+    retention: dict[str, float | None] | None,
+    now: float,
+    report: VerificationReport,
+) -> str | None:
+    """Check an anchor standing in for a deleted segment.
+
+    Args:
+        anchor: The anchor record.
+        prev_hash: Hash of the last record before it.
+        leaves: Leaf hashes not yet covered by a checkpoint.
+        retention: Policy overriding the one in the footer, or None.
+        now: Epoch time removals are checked at.
+        report: Receives the error or the count of expired records.
+
+    Returns:
+        The footer hash to continue the chain from, or None on failure.
+    """
+    footer = anchor["footer"]
+    if anchor["prev_hash"] != prev_hash:
+        report.error = "chain broken: anchor prev_hash does not match"
+    elif leaves:
+        report.error = "anchor follows records not covered by a checkpoint"
+    elif footer.get("type") != "footer" or record_hash(footer) != footer["hash"]:
+        report.error = "anchor footer hash mismatch"
+    elif (footer["first_seq"], footer["last_seq"]) != (
+        anchor["first_seq"],
+        anchor["last_seq"],
+    ):
+        report.error = "anchor range does not match its footer"
+    else:
+        policy = retention if retention is not None else footer["retention"]
+        if not all(
+            _expired(level, info["newest"], policy, now)
+            for level, info in footer["levels"].items()
+        ):
+            report.error = "anchor covers records that were not due for removal"
+    if report.error is not None:
+        return None
+    report.expired += footer["last_seq"] - footer["first_seq"] + 1
+    return footer["hash"]
+
+
+def prove_record(lines: Iterable[str], seq: int) -> dict | None:
+    """Build an inclusion proof for one record against its checkpoint.
+
+    Streams the log until the checkpoint covering seq is found. The
+    result lets a verifier holding a trusted checkpoint root confirm the
+    record with O(log n) hashes instead of re-hashing the whole log.
+
+    Args:
+        lines: An iterable of JSON Lines, e.g. an open file.
+        seq: Sequence number of the record to prove.
+
+    Returns:
+        A dict with seq, hash, merkle_root and proof, or None if no
+        checkpoint covers seq.
+    """
+    leaves: list[tuple[int, str]] = []
+    for _, record in iter_records(lines):
+        kind = record.get("type")
+        if kind in ("entry", "redacted"):
+            leaves.append((record["seq"], record["hash"]))
+            continue
+        if kind != "checkpoint":
+            continue
+        first, last = record["first_seq"], record["last_seq"]
+        if first <= seq <= last:
+            covered = [h for s, h in leaves if first <= s <= last]
+            index = seq - first
+            return {
+                "seq": seq,
+                "hash": covered[index],
+                "merkle_root": record["merkle_root"],
+                "proof": merkle_proof(covered, index),
+            }
+        leaves = []
+    return None
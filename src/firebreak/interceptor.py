@@ -1,14 +1,84 @@
 """Request interceptor — orchestrates classification, evaluation, and response."""
 
-from collections import defaultdict
+import asyncio
+import contextlib
+from collections.abc import AsyncGenerator
 from typing import Any, Callable
 
 import anthropic
 
 from firebreak.audit import AuditLog
 from firebreak.classifier import IntentClassifier
-from firebreak.models import Decision, EvaluationResult
+from firebreak.events import EventBus
+from firebreak.models import ClassificationResult, Decision, EvaluationResult, Policy
 from firebreak.policy import PolicyEngine
+from firebreak.upstream import Permit, UpstreamClients, UpstreamUnavailable
+
+# Response text recorded when an allowed prompt could not be forwarded.
+LLM_CALL_FAILED = "[LLM call failed]"
+
+
+def _usage_tokens(message: Any) -> int:
+    """Count the input plus output tokens reported for a message.
+
+    Args:
+        message: An Anthropic Message (or stream snapshot).
+
+    Returns:
+        The token count, or 0 if the message carries no usage.
+    """
+    usage = getattr(message, "usage", None)
+    if usage is None:
+        return 0
+    return int(usage.input_tokens or 0) + int(usage.output_tokens or 0)
+
+
+class ResponseStream:
+    """Text deltas of an allowed, streamed LLM response.
+
+    Iterate to receive the deltas. The request is finished (its events
+    and audit entry written) exactly once: when the deltas run out, or
+    when aclose() is called, even if nothing was read. The server
+    closes every stream after its response, so a client that goes away
+    early still leaves an audit record.
+    """
+
+    def __init__(
+        self, deltas: AsyncGenerator[str, None], finish: Callable[[], None]
+    ) -> None:
+        """Wrap a delta generator.
+
+        Args:
+            deltas: Yields the response text deltas.
+            finish: Finishes the request; called once.
+        """
+        self._deltas = deltas
+        self._finish = finish
+        self._finished = False
+
+    def __aiter__(self) -> "ResponseStream":
+        return self
+
+    async def __anext__(self) -> str:
+        try:
+            return await self._deltas.__anext__()
+        except BaseException:
+            # Exhausted, failed or cancelled: the generator is done.
+            self._done()
+            raise
+
+    async def aclose(self) -> None:
+        """Stop reading from the upstream and finish the request."""
+        try:
+            await self._deltas.aclose()
+        finally:
+            self._done()
+
+    def _done(self) -> None:
+        """Finish the request unless that already happened."""
+        if not self._finished:
+            self._finished = True
+            self._finish()
 
 
 class FirebreakInterceptor:
@@ -16,13 +86,18 @@ class FirebreakInterceptor:
 
     Classifies prompts, evaluates them against policy, calls the LLM
     for allowed requests, and emits events for dashboard consumption.
+    Events are delivered by an EventBus on background threads, so
+    callbacks never slow down or fail a request.
 
     Attributes:
         policy_engine: The loaded policy engine.
         classifier: The intent classifier.
         audit_log: The audit log.
         llm_model: Model ID for LLM calls on allowed requests.
-        callbacks: Registered event callbacks.
+        llm_max_tokens: Output token budget for forwarded LLM calls.
+        speculative: Whether the async pipeline starts the LLM call
+            concurrently with classification.
+        events: The bus that delivers emitted events to callbacks.
     """
 
     def __init__(
@@ -31,6 +106,10 @@ class FirebreakInterceptor:
         classifier: IntentClassifier,
         audit_log: AuditLog,
         llm_model: str = "claude-sonnet-4-6",
+        llm_max_tokens: int = 1024,
+        speculative: bool = False,
+        events: EventBus | None = None,
+        clients: UpstreamClients | None = None,
     ) -> None:
         """Initialize the interceptor.
 
@@ -39,32 +118,266 @@ class FirebreakInterceptor:
             classifier: An IntentClassifier for prompt classification.
             audit_log: An AuditLog for recording evaluations.
             llm_model: Anthropic model ID for allowed LLM calls.
+            llm_max_tokens: Maximum output tokens for allowed LLM calls.
+            speculative: If True, evaluate_request_async() forwards the
+                prompt to the LLM while it is still being classified,
+                holds the output until the policy decision is known, and
+                cancels the call on BLOCK. This trades the guarantee that
+                blocked prompts never reach the LLM for lower latency on
+                allowed ones, so it is off by default.
+            events: Event bus for callbacks, or None for a default bus.
+            clients: Shared upstream clients, or None to create clients
+                with default settings. Pass the classifier's clients to
+                reuse its connections and circuit breaker. Forwarded
+                calls are bounded by their forward_deadline.
         """
         self.policy_engine = policy_engine
         self.classifier = classifier
         self.audit_log = audit_log
         self.llm_model = llm_model
-        self.callbacks: dict[str, list[Callable]] = defaultdict(list)
-        self._client = anthropic.Anthropic()
+        self.llm_max_tokens = llm_max_tokens
+        self.speculative = speculative
+        self.events = events if events is not None else EventBus()
+        self.upstream = clients if clients is not None else UpstreamClients()
+        self._client = self.upstream.client
+        self._async_client = self.upstream.async_client
 
-    def on(self, event: str, callback: Callable) -> None:
+    def on(self, event: str, callback: Callable, subscriber: str = "default") -> None:
         """Register a callback for an event.
 
         Args:
             event: Event name (e.g. "prompt_received", "classified").
             callback: Function to call when the event fires.
+            subscriber: Event bus subscriber that runs the callback.
+                Callbacks on one subscriber see events in order.
         """
-        self.callbacks[event].append(callback)
+        self.events.on(event, callback, subscriber)
 
     def _emit(self, event: str, data: Any) -> None:
-        """Fire all callbacks registered for an event.
+        """Queue an event for its callbacks without waiting for them.
 
         Args:
             event: Event name.
             data: Data to pass to each callback.
         """
-        for callback in self.callbacks.get(event, []):
-            callback(data)
+        self.events.publish(event, data)
+
+    def reload_policy(self, path: str) -> Policy:
+        """Parse a policy file and swap it in without interrupting requests.
+
+        The compiled policy and the classifier's categories, cache
+        namespace and fast path are all built before anything changes,
+        so on error the running policy is kept. The swap then takes two
+        steps, each a single reference assignment: the classifier's view
+        is published first, then the compiled policy is installed in the
+        engine. The two are not swapped together, so a request that
+        overlaps a reload may be classified under one policy and
+        evaluated under the other; a category the evaluating policy does
+        not name gets its default decision. Requests already past
+        evaluation finish against the old policy.
+
+        Args:
+            path: Filesystem path to the YAML policy file.
+
+        Returns:
+            The newly active Policy.
+
+        Raises:
+            PolicyError: If the new policy file is invalid.
+        """
+        compiled = self.policy_engine.compile(path)
+        view = self.classifier.prepare_policy(compiled.policy)
+        self.classifier.publish_policy(view)
+        self.policy_engine.install(compiled)
+        policy = compiled.policy
+        self._emit("policy_reloaded", policy)
+        return policy
+
+    def _evaluate(
+        self, classification: ClassificationResult, metadata: dict | None
+    ) -> EvaluationResult:
+        """Evaluate a classification against policy and emit events.
+
+        Args:
+            classification: The intent classification for the prompt.
+            metadata: Optional metadata dict.
+
+        Returns:
+            The EvaluationResult from the policy engine.
+        """
+        self._emit("classified", classification)
+
+        evaluation = self.policy_engine.evaluate(
+            classification.intent_category, classification, metadata
+        )
+
+        self._emit("evaluated", evaluation)
+        return evaluation
+
+    def _forward(self, prompt: str) -> Any:
+        """Send an allowed prompt to the LLM.
+
+        Args:
+            prompt: The user prompt to forward.
+
+        Returns:
+            The LLM response message.
+
+        Raises:
+            Exception: If the call failed; UpstreamUnavailable says why.
+        """
+        return self.upstream.call(
+            lambda timeout: self._client.messages.create(
+                model=self.llm_model,
+                max_tokens=self.llm_max_tokens,
+                messages=[{"role": "user", "content": prompt}],
+                timeout=timeout,
+            ),
+            self.upstream.config.forward_deadline,
+        )
+
+    async def _forward_async(self, prompt: str) -> Any:
+        """Send an allowed prompt to the LLM without blocking the loop.
+
+        Args:
+            prompt: The user prompt to forward.
+
+        Returns:
+            The LLM response message.
+
+        Raises:
+            Exception: If the call failed; UpstreamUnavailable says why.
+        """
+        return await self.upstream.acall(
+            lambda timeout: self._async_client.messages.create(
+                model=self.llm_model,
+                max_tokens=self.llm_max_tokens,
+                messages=[{"role": "user", "content": prompt}],
+                timeout=timeout,
+            ),
+            self.upstream.config.forward_deadline,
+        )
+
+    @staticmethod
+    def _forwarded(evaluation: EvaluationResult, response: Any) -> None:
+        """Attach a forwarded call's response text and token usage.
+
+        Args:
+            evaluation: The allowed evaluation that was forwarded.
+            response: The LLM response message.
+        """
+        evaluation.llm_response = response.content[0].text
+        evaluation.upstream_tokens = _usage_tokens(response)
+
+    @staticmethod
+    def _forward_failed(evaluation: EvaluationResult, exc: Exception) -> None:
+        """Mark an evaluation whose LLM call failed.
+
+        Args:
+            evaluation: The allowed evaluation that was being forwarded.
+            exc: The error raised by the forward.
+        """
+        evaluation.llm_response = LLM_CALL_FAILED
+        evaluation.upstream_error = (
+            exc.reason if isinstance(exc, UpstreamUnavailable) else "error"
+        )
+
+    async def _forward_stream(
+        self,
+        prompt: str,
+        evaluation: EvaluationResult,
+        permit: Permit,
+        parts: list[str],
+    ) -> AsyncGenerator[str, None]:
+        """Stream an allowed prompt's LLM response.
+
+        Text deltas are yielded as they arrive and collected in parts;
+        the ResponseStream around this generator finishes the request.
+        The outcome is recorded on the shared circuit breaker; a stream
+        that ends without one gives its permit back when it finishes.
+
+        Args:
+            prompt: The user prompt to forward.
+            evaluation: The ALLOW/ALLOW_CONSTRAINED evaluation result.
+            permit: The circuit breaker's permit for the call.
+            parts: Collects the deltas sent so far.
+
+        Yields:
+            Response text deltas from the LLM.
+        """
+        breaker = self.upstream.breaker
+        try:
+            # Streams are not retried, since text may already have been
+            # sent, and the deadline bounds each read rather than the
+            # whole stream: a cancel scope cannot span the yields.
+            async with self._async_client.messages.stream(
+                model=self.llm_model,
+                max_tokens=self.llm_max_tokens,
+                messages=[{"role": "user", "content": prompt}],
+                timeout=self.upstream.config.forward_deadline,
+            ) as stream:
+                async for text in stream.text_stream:
+                    parts.append(text)
+                    yield text
+                evaluation.upstream_tokens = _usage_tokens(
+                    stream.current_message_snapshot
+                )
+            breaker.record(permit, True)
+        except Exception as exc:
+            breaker.record_error(permit, exc)
+            timed_out = isinstance(exc, (TimeoutError, anthropic.APITimeoutError))
+            evaluation.upstream_error = "timeout" if timed_out else "error"
+            if not parts:
+                parts.append(LLM_CALL_FAILED)
+                yield parts[0]
+
+    def _finish_stream(
+        self,
+        prompt: str,
+        classification: ClassificationResult,
+        evaluation: EvaluationResult,
+        permit: Permit,
+        parts: list[str],
+    ) -> None:
+        """Finish a streamed request with the text sent so far.
+
+        Runs even when the stream was closed before it was read, so a
+        trial permit taken for it is never left outstanding.
+
+        Args:
+            prompt: The user prompt that was evaluated.
+            classification: The intent classification for the prompt.
+            evaluation: The ALLOW/ALLOW_CONSTRAINED evaluation result.
+            permit: The circuit breaker's permit for the call.
+            parts: The response text deltas that were sent.
+        """
+        self.upstream.breaker.release(permit)
+        evaluation.llm_response = "".join(parts)
+        self._finish(prompt, classification, evaluation)
+
+    def _finish(
+        self,
+        prompt: str,
+        classification: ClassificationResult,
+        evaluation: EvaluationResult,
+    ) -> None:
+        """Emit decision and alert events, then write the audit entry.
+
+        Args:
+            prompt: The user prompt that was evaluated.
+            classification: The intent classification for the prompt.
+            evaluation: The completed evaluation result.
+        """
+        if evaluation.decision in (Decision.ALLOW, Decision.ALLOW_CONSTRAINED):
+            self._emit("response", evaluation)
+        else:
+            self._emit("blocked", evaluation)
+
+        # Emit alerts for any decision that has them
+        for target in evaluation.alerts:
+            self._emit("alert", {"target": target, "evaluation": evaluation})
+
+        self.audit_log.log(prompt, classification, evaluation)
 
     def evaluate_request(
         self, prompt: str, metadata: dict | None = None
@@ -89,44 +402,132 @@ class FirebreakInterceptor:
         Returns:
             The EvaluationResult from the policy engine.
         """
-        # 1. Prompt received
         self._emit("prompt_received", prompt)
 
-        # 2. Classify
         classification = self.classifier.classify(prompt)
+        evaluation = self._evaluate(classification, metadata)
 
-        # 3. Emit classification
-        self._emit("classified", classification)
+        if evaluation.decision in (Decision.ALLOW, Decision.ALLOW_CONSTRAINED):
+            try:
+                self._forwarded(evaluation, self._forward(prompt))
+            except Exception as exc:
+                self._forward_failed(evaluation, exc)
 
-        # 4. Evaluate against policy
-        evaluation = self.policy_engine.evaluate(
-            classification.intent_category, classification, metadata
-        )
+        self._finish(prompt, classification, evaluation)
+        return evaluation
 
-        # 5. Emit evaluation
-        self._emit("evaluated", evaluation)
+    async def evaluate_request_async(
+        self, prompt: str, metadata: dict | None = None
+    ) -> EvaluationResult:
+        """Run a prompt through the pipeline without blocking the event loop.
+
+        Same steps and events as evaluate_request(), but classification
+        and the forwarded LLM call use the async Anthropic client, so a
+        single server worker can hold many requests in flight at once.
+
+        Args:
+            prompt: The user prompt to evaluate.
+            metadata: Optional metadata dict.
+
+        Returns:
+            The EvaluationResult from the policy engine.
+        """
+        self._emit("prompt_received", prompt)
+
+        if self.speculative:
+            return await self._evaluate_speculative(prompt, metadata)
+
+        classification = await self.classifier.classify_async(prompt)
+        evaluation = self._evaluate(classification, metadata)
 
-        # 6/7. Handle decision
         if evaluation.decision in (Decision.ALLOW, Decision.ALLOW_CONSTRAINED):
             try:
-                response = self._client.messages.create(
-                    model=self.llm_model,
-                    max_tokens=1024,
-                    messages=[{"role": "user", "content": prompt}],
-                )
-                evaluation.llm_response = response.content[0].text
-            except Exception:
-                evaluation.llm_response = "[LLM call failed]"
-            self._emit("response", evaluation)
-        else:
-            self._emit("blocked", evaluation)
+                self._forwarded(evaluation, await self._forward_async(prompt))
+            except Exception as exc:
+                self._forward_failed(evaluation, exc)
 
-        # Emit alerts for any decision that has them
-        for target in evaluation.alerts:
-            self._emit("alert", {"target": target, "evaluation": evaluation})
+        self._finish(prompt, classification, evaluation)
+        return evaluation
 
-        # 8. Log to audit
-        self.audit_log.log(prompt, classification, evaluation)
+    async def _evaluate_speculative(
+        self, prompt: str, metadata: dict | None
+    ) -> EvaluationResult:
+        """Classify and forward concurrently, releasing output only on ALLOW.
+
+        The LLM call is started as a task before classification. Its
+        result is attached only once the policy engine has allowed the
+        request; on BLOCK the task is cancelled and its output discarded.
+
+        Args:
+            prompt: The user prompt to evaluate.
+            metadata: Optional metadata dict.
+
+        Returns:
+            The EvaluationResult, marked as speculative.
+        """
+        forward = asyncio.create_task(self._forward_async(prompt))
+        try:
+            classification = await self.classifier.classify_async(prompt)
+            evaluation = self._evaluate(classification, metadata)
+        except BaseException:
+            forward.cancel()
+            raise
 
-        # 9. Return
+        evaluation.speculative = True
+        if evaluation.decision in (Decision.ALLOW, Decision.ALLOW_CONSTRAINED):
+            try:
+                self._forwarded(evaluation, await forward)
+            except Exception as exc:
+                self._forward_failed(evaluation, exc)
+        else:
+            forward.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await forward
+
+        self._finish(prompt, classification, evaluation)
         return evaluation
+
+    async def stream_request_async(
+        self, prompt: str, metadata: dict | None = None
+    ) -> tuple[EvaluationResult, ResponseStream | None]:
+        """Evaluate a prompt and stream the LLM response if it is allowed.
+
+        Classification and policy evaluation complete before anything is
+        returned, so no model output is released for a blocked prompt.
+        Blocked requests are finished and audited immediately; allowed
+        requests are audited when the returned stream is exhausted or
+        closed, so callers must close a stream they stop reading.
+
+        Args:
+            prompt: The user prompt to evaluate.
+            metadata: Optional metadata dict.
+
+        Returns:
+            A tuple of the EvaluationResult and a ResponseStream of
+            response text deltas, or None for the stream when the
+            request was blocked or the upstream circuit is open (then
+            upstream_error is set).
+        """
+        self._emit("prompt_received", prompt)
+
+        classification = await self.classifier.classify_async(prompt)
+        evaluation = self._evaluate(classification, metadata)
+
+        if evaluation.decision not in (Decision.ALLOW, Decision.ALLOW_CONSTRAINED):
+            self._finish(prompt, classification, evaluation)
+            return evaluation, None
+
+        permit = self.upstream.breaker.allow()
+        if permit is None:
+            evaluation.llm_response = LLM_CALL_FAILED
+            evaluation.upstream_error = "circuit_open"
+            self._finish(prompt, classification, evaluation)
+            return evaluation, None
+
+        parts: list[str] = []
+        return evaluation, ResponseStream(
+            self._forward_stream(prompt, evaluation, permit, parts),
+            lambda: self._finish_stream(
+                prompt, classification, evaluation, permit, parts
+            ),
+        )
@@ -0,0 +1,206 @@
+"""Adaptive concurrency limiting for the proxy server."""
+
+import asyncio
+import contextlib
+import math
+from collections import deque
+
+
+class Overloaded(Exception):
+    """A request was shed because the proxy is saturated.
+
+    Attributes:
+        retry_after: Suggested seconds before the client retries.
+        reason: "queue_full" if the wait queue was full, or
+            "queue_timeout" if no slot freed up in time.
+    """
+
+    def __init__(self, reason: str, retry_after: int) -> None:
+        """Create the error.
+
+        Args:
+            reason: "queue_full" or "queue_timeout".
+            retry_after: Suggested seconds before retrying.
+        """
+        super().__init__(f"proxy overloaded: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """Caps in-flight requests at a limit that tracks upstream latency.
+
+    The limit adapts by AIMD on a latency gradient: a short-term average
+    of request latency is compared with a long-term one, so requests
+    that are slow by nature (long completions) do not look like
+    overload, while a general slowdown from queuing upstream does. When
+    the short-term average exceeds tolerance times the long-term one,
+    or a request fails upstream, the limit is cut by the backoff factor.
+    A healthy request made while the limiter was full raises the limit
+    by 1/limit, about one slot per round of requests. Requests over the
+    limit wait in a bounded FIFO queue; when the queue is full or the
+    wait times out, they are shed with Overloaded so clients back off
+    instead of piling on.
+
+    Not thread-safe: use one limiter per event loop.
+
+    Attributes:
+        limit: Current concurrency limit (fractional; slots are its floor).
+        min_limit: Lowest the limit can fall.
+        max_limit: Highest the limit can rise.
+        max_queue: Most requests allowed to wait for a slot.
+        queue_timeout: Seconds a request waits before it is shed.
+        tolerance: Ratio of short-term to long-term latency treated as
+            overload.
+        backoff: Factor applied to the limit on overload.
+        in_flight: Requests holding a slot.
+        baseline: Long-term average latency in seconds, or None before
+            the first sample.
+        latency: Short-term average latency in seconds, or None.
+        admitted: Requests given a slot.
+        rejected: Requests shed.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        max_queue: int = 100,
+        queue_timeout: float = 5.0,
+        tolerance: float = 2.0,
+        backoff: float = 0.9,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            initial_limit: Starting concurrency limit.
+            min_limit: Lowest the limit can fall.
+            max_limit: Highest the limit can rise.
+            max_queue: Most requests allowed to wait for a slot.
+            queue_timeout: Seconds a request waits before it is shed.
+            tolerance: Ratio of short-term to long-term latency
+                treated as overload.
+            backoff: Factor applied to the limit on overload.
+        """
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.in_flight = 0
+        self.baseline: float | None = None
+        self.latency: float | None = None
+        self.admitted = 0
+        self.rejected = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        """Number of requests waiting for a slot."""
+        return len(self._waiters)
+
+    @property
+    def retry_after(self) -> int:
+        """Suggested whole seconds before a shed client retries."""
+        return max(1, math.ceil(self.latency or 1.0))
+
+    async def acquire(self) -> None:
+        """Wait for a slot.
+
+        Raises:
+            Overloaded: If the wait queue is full or no slot frees up
+                within queue_timeout.
+        """
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise Overloaded("queue_full", self.retry_after)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await waiter
+        except (TimeoutError, asyncio.CancelledError) as exc:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot just as the wait ended: pass it on.
+                self.in_flight -= 1
+                self.admitted -= 1
+                self._wake()
+            with contextlib.suppress(ValueError):
+                self._waiters.remove(waiter)
+            if isinstance(exc, TimeoutError):
+                self.rejected += 1
+                raise Overloaded("queue_timeout", self.retry_after) from None
+            raise
+
+    def release(self, latency: float | None = None, failed: bool = False) -> None:
+        """Free a slot and adapt the limit to how the request went.
+
+        Args:
+            latency: Seconds the request took upstream, or None to free
+                the slot without adapting (e.g. a request rejected
+                before it reached the upstream).
+            failed: Whether the upstream failed the request.
+        """
+        saturated = self.in_flight >= int(self.limit)
+        self.in_flight -= 1
+        if failed:
+            self._decrease()
+        elif latency is not None:
+            self._observe(latency, saturated)
+        self._wake()
+
+    def stats(self) -> dict[str, float | int | None]:
+        """Return the limiter's current state.
+
+        Returns:
+            The limit, in_flight, queued, admitted, rejected and
+            latency figures.
+        """
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "latency": self.latency,
+            "baseline": self.baseline,
+        }
+
+    def _observe(self, latency: float, saturated: bool) -> None:
+        """Fold a latency sample into the estimates and the limit.
+
+        Args:
+            latency: Seconds the request took.
+            saturated: Whether every slot was taken when it finished.
+        """
+        if self.baseline is None or self.latency is None:
+            self.baseline = self.latency = latency
+        else:
+            self.baseline += (latency - self.baseline) * 0.01
+            self.latency += (latency - self.latency) * 0.2
+        if self.latency > self.baseline * self.tolerance:
+            self._decrease()
+        elif saturated:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def _decrease(self) -> None:
+        """Cut the limit multiplicatively."""
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+
+    def _wake(self) -> None:
+        """Hand free slots to waiting requests in arrival order."""
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            self.admitted += 1
+            waiter.set_result(None)
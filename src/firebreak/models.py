@@ -1,6 +1,8 @@
 """Data models for Firebreak policy enforcement.
 
 Pure data structures — no business logic, no imports beyond stdlib.
+Models use slots, and per-request results share immutable tuples and
+the request's prompt string rather than copying them.
 """
 
 from dataclasses import dataclass, field
@@ -25,7 +27,7 @@ class AuditLevel(Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+@dataclass(slots=True)
 class PolicyRule:
     """A single rule within a deployment policy.
 
@@ -54,7 +56,22 @@ class PolicyRule:
     note: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
+class FastPathRule:
+    """A local keyword/regex rule for the fast-path classifier tier.
+
+    Attributes:
+        category: Intent category assigned when a pattern matches.
+        patterns: Regular expressions searched case-insensitively.
+        confidence: Confidence reported for a match (0.0-1.0).
+    """
+
+    category: str
+    patterns: list[str]
+    confidence: float = 0.95
+
+
+@dataclass(slots=True)
 class Policy:
     """A complete deployment policy loaded from YAML.
 
@@ -65,6 +82,10 @@ class Policy:
         signatories: Signing parties (e.g. {"ai_provider": "Anthropic"}).
         rules: Ordered list of policy rules.
         categories: Valid intent categories defined by this policy.
+        fast_path_rules: Local classification rules tried before the
+            LLM classifier.
+        fast_path_threshold: Minimum confidence for a fast-path match
+            to be used without consulting the LLM classifier.
     """
 
     name: str
@@ -73,9 +94,11 @@ class Policy:
     signatories: dict[str, str]
     rules: list[PolicyRule]
     categories: list[str]
+    fast_path_rules: list[FastPathRule] = field(default_factory=list)
+    fast_path_threshold: float = 0.9
 
 
-@dataclass
+@dataclass(slots=True)
 class ClassificationResult:
     """Result of classifying a prompt's intent.
 
@@ -84,15 +107,18 @@ class ClassificationResult:
         confidence: Classifier confidence score (0.0-1.0).
         raw_prompt: The original prompt text.
         timestamp: When the classification was performed.
+        error: Why the classifier could not reach the upstream model
+            ("circuit_open", "timeout" or "error"), or None.
     """
 
     intent_category: str
     confidence: float
     raw_prompt: str
     timestamp: datetime = field(default_factory=datetime.now)
+    error: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class EvaluationResult:
     """Result of evaluating a classified prompt against policy.
 
@@ -101,34 +127,47 @@ class EvaluationResult:
         matched_rule_id: ID of the rule that matched.
         rule_description: Human-readable description of the matched rule.
         audit_level: Audit logging level for this evaluation.
-        alerts: Notification targets triggered by this evaluation.
-        constraints: Operational constraints applied to the request.
+        alerts: Notification targets triggered by this evaluation,
+            shared with the matched rule.
+        constraints: Operational constraints applied to the request,
+            shared with the matched rule.
         color: Display color for the dashboard.
         note: Optional note displayed alongside the decision.
         classification: The classification that triggered this evaluation.
         llm_response: The LLM response text, if the request was forwarded.
+        speculative: Whether the LLM call was started before the policy
+            decision was known.
+        upstream_error: Why classification or forwarding failed to reach
+            the upstream model ("circuit_open", "timeout" or "error"),
+            or None.
+        upstream_tokens: Input plus output tokens used by the forwarded
+            LLM call.
     """
 
     decision: Decision
     matched_rule_id: str
     rule_description: str
     audit_level: AuditLevel
-    alerts: list[str]
-    constraints: list[str]
+    alerts: tuple[str, ...]
+    constraints: tuple[str, ...]
     color: str
     note: str
     classification: ClassificationResult
     llm_response: str | None = None
+    speculative: bool = False
+    upstream_error: str | None = None
+    upstream_tokens: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class AuditEntry:
     """An immutable record in the audit log.
 
     Attributes:
         id: Unique entry identifier (UUID4).
         timestamp: When the entry was created.
-        prompt_text: The original prompt text.
+        prompt_text: The original prompt text; the same object as
+            classification.raw_prompt whenever the two are equal.
         classification: The intent classification result.
         evaluation: The policy evaluation result.
     """
@@ -140,7 +179,35 @@ class AuditEntry:
     timestamp: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True)
+class Alert:
+    """An aggregated notification for one alert target.
+
+    Repeated alerts for the same target, rule and category within a
+    dispatch window are folded into one Alert with a count.
+
+    Attributes:
+        target: Notification target (e.g. "trust_safety").
+        rule_id: ID of the rule that fired.
+        rule_description: Human-readable description of the rule.
+        intent_category: The classified intent category.
+        decision: The enforcement decision.
+        count: Number of requests folded into this alert.
+        first_seen: When the first of those requests was evaluated.
+        last_seen: When the last of those requests was evaluated.
+    """
+
+    target: str
+    rule_id: str
+    rule_description: str
+    intent_category: str
+    decision: Decision
+    count: int = 1
+    first_seen: datetime = field(default_factory=datetime.now)
+    last_seen: datetime = field(default_factory=datetime.now)
+
+
+@dataclass(slots=True)
 class DemoScenario:
     """A scenario used in the demo runner.
 
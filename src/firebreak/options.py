@@ -0,0 +1,341 @@
+"""Command-line options shared by firebreak-demo and firebreak-serve.
+
+Each group has an add_*_options() function that registers its flags on
+a parser and a builder that turns the parsed flags into the object they
+configure, so both runners expose the same features the same way.
+"""
+
+import argparse
+
+from firebreak.alerts import (
+    AlertDispatcher,
+    AlertSink,
+    FileSink,
+    SMTPSink,
+    SyslogSink,
+    WebhookSink,
+)
+from firebreak.audit import FileAuditLog
+from firebreak.audit_cli import retention_arg
+from firebreak.blobs import BlobStore
+from firebreak.upstream import UpstreamConfig
+
+DEFAULT_CACHE_MAX_ENTRIES = 10_000
+
+ALERT_OPTIONS = (
+    "alert_log",
+    "alert_webhook",
+    "alert_syslog",
+    "alert_email",
+    "alert_smtp",
+    "alert_window",
+)
+"""Destinations of the --alert-* flags, for passing them between processes."""
+
+
+def add_cache_options(parser: argparse.ArgumentParser) -> None:
+    """Register the flags that bound the classifier cache.
+
+    Args:
+        parser: The parser to extend.
+    """
+    parser.add_argument(
+        "--cache-max-entries",
+        type=int,
+        default=DEFAULT_CACHE_MAX_ENTRIES,
+        help=(
+            "Maximum classifier cache entries before LRU eviction"
+            f" (default: {DEFAULT_CACHE_MAX_ENTRIES})"
+        ),
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=None,
+        help="Seconds before a cached classification expires (default: never)",
+    )
+
+
+def add_audit_options(parser: argparse.ArgumentParser) -> None:
+    """Register the --audit-* flags.
+
+    Args:
+        parser: The parser to extend.
+    """
+    parser.add_argument(
+        "--audit-log",
+        default=None,
+        help="Append audit records to this JSON Lines file",
+    )
+    parser.add_argument(
+        "--audit-fsync-interval",
+        type=float,
+        default=1.0,
+        help="Maximum seconds between audit log fsyncs (default: 1.0)",
+    )
+    parser.add_argument(
+        "--audit-segment-mb",
+        type=float,
+        default=None,
+        help="Rotate and compress the audit log at this size",
+    )
+    parser.add_argument(
+        "--audit-segment-hours",
+        type=float,
+        default=None,
+        help="Rotate and compress the audit log after this many hours",
+    )
+    parser.add_argument(
+        "--audit-retain",
+        type=retention_arg,
+        action="append",
+        default=[],
+        metavar="LEVEL=DAYS",
+        help="Retention per audit level, e.g. standard=90 or critical=forever",
+    )
+    parser.add_argument(
+        "--audit-blobs",
+        default=None,
+        help="Store audit prompt and response bodies once in this SQLite file",
+    )
+
+
+def open_audit_log(args: argparse.Namespace) -> FileAuditLog | None:
+    """Open the durable audit log configured by the --audit-* flags.
+
+    Args:
+        args: Parsed arguments, including those of add_audit_options().
+
+    Returns:
+        The log, or None when --audit-log was not given.
+    """
+    if not args.audit_log:
+        return None
+    return FileAuditLog(
+        args.audit_log,
+        fsync_interval=args.audit_fsync_interval,
+        max_segment_bytes=(
+            int(args.audit_segment_mb * 1024 * 1024) if args.audit_segment_mb else None
+        ),
+        max_segment_age=(
+            args.audit_segment_hours * 3600 if args.audit_segment_hours else None
+        ),
+        retention=dict(args.audit_retain),
+        blobs=BlobStore(args.audit_blobs) if args.audit_blobs else None,
+    )
+
+
+def add_upstream_options(parser: argparse.ArgumentParser) -> None:
+    """Register the connection pool, deadline, retry and breaker flags.
+
+    Args:
+        parser: The parser to extend.
+    """
+    defaults = UpstreamConfig()
+    parser.add_argument(
+        "--upstream-max-connections",
+        type=int,
+        default=defaults.max_connections,
+        help="Connection pool size for Anthropic API calls"
+        f" (default: {defaults.max_connections})",
+    )
+    parser.add_argument(
+        "--upstream-keepalive",
+        type=int,
+        default=defaults.max_keepalive_connections,
+        help="Idle connections kept open for reuse"
+        f" (default: {defaults.max_keepalive_connections})",
+    )
+    parser.add_argument(
+        "--upstream-http2",
+        action="store_true",
+        help="Use HTTP/2 for Anthropic API calls (needs the http2 extra)",
+    )
+    parser.add_argument(
+        "--upstream-connect-timeout",
+        type=float,
+        default=defaults.connect_timeout,
+        help="Seconds to wait for an upstream connection"
+        f" (default: {defaults.connect_timeout:g})",
+    )
+    parser.add_argument(
+        "--upstream-read-timeout",
+        type=float,
+        default=defaults.read_timeout,
+        help="Seconds to wait for upstream response data"
+        f" (default: {defaults.read_timeout:g})",
+    )
+    parser.add_argument(
+        "--classify-deadline",
+        type=float,
+        default=defaults.classify_deadline,
+        help="Seconds allowed per classification, retries included"
+        f" (default: {defaults.classify_deadline:g})",
+    )
+    parser.add_argument(
+        "--forward-deadline",
+        type=float,
+        default=defaults.forward_deadline,
+        help="Seconds per forwarded LLM call, retries included"
+        f" (default: {defaults.forward_deadline:g})",
+    )
+    parser.add_argument(
+        "--upstream-retries",
+        type=int,
+        default=defaults.max_retries,
+        help="Retries after a transient upstream error"
+        f" (default: {defaults.max_retries})",
+    )
+    parser.add_argument(
+        "--breaker-threshold",
+        type=float,
+        default=defaults.breaker_threshold,
+        help="Upstream failure ratio that opens the circuit breaker"
+        f" (default: {defaults.breaker_threshold:g})",
+    )
+    parser.add_argument(
+        "--breaker-min-calls",
+        type=int,
+        default=defaults.breaker_min_calls,
+        help="Calls seen before the circuit breaker may open"
+        f" (default: {defaults.breaker_min_calls})",
+    )
+    parser.add_argument(
+        "--breaker-window",
+        type=float,
+        default=defaults.breaker_window,
+        help="Seconds of upstream calls the circuit breaker considers"
+        f" (default: {defaults.breaker_window:g})",
+    )
+    parser.add_argument(
+        "--breaker-cooldown",
+        type=float,
+        default=defaults.breaker_cooldown,
+        help="Seconds the circuit breaker stays open before a trial call"
+        f" (default: {defaults.breaker_cooldown:g})",
+    )
+
+
+def upstream_config(args: argparse.Namespace) -> UpstreamConfig:
+    """Build the upstream settings chosen by add_upstream_options() flags.
+
+    Args:
+        args: Parsed arguments, including those of add_upstream_options().
+
+    Returns:
+        The upstream configuration.
+    """
+    return UpstreamConfig(
+        max_connections=args.upstream_max_connections,
+        max_keepalive_connections=args.upstream_keepalive,
+        http2=args.upstream_http2,
+        connect_timeout=args.upstream_connect_timeout,
+        read_timeout=args.upstream_read_timeout,
+        classify_deadline=args.classify_deadline,
+        forward_deadline=args.forward_deadline,
+        max_retries=args.upstream_retries,
+        breaker_threshold=args.breaker_threshold,
+        breaker_min_calls=args.breaker_min_calls,
+        breaker_window=args.breaker_window,
+        breaker_cooldown=args.breaker_cooldown,
+    )
+
+
+def add_alert_options(parser: argparse.ArgumentParser) -> None:
+    """Register the --alert-* sink and aggregation flags.
+
+    Args:
+        parser: The parser to extend.
+    """
+    parser.add_argument(
+        "--alert-log",
+        default=None,
+        help="Append dispatched alerts to this JSON Lines file",
+    )
+    parser.add_argument(
+        "--alert-webhook",
+        action="append",
+        default=[],
+        metavar="URL",
+        help="POST alert batches to this URL (repeatable)",
+    )
+    parser.add_argument(
+        "--alert-syslog",
+        default=None,
+        metavar="ADDRESS",
+        help="Send alerts to syslog at a socket path or HOST:PORT",
+    )
+    parser.add_argument(
+        "--alert-email",
+        default=None,
+        metavar="ADDRESS",
+        help="Email alert batches to this address via --alert-smtp",
+    )
+    parser.add_argument(
+        "--alert-smtp",
+        default="localhost:25",
+        metavar="HOST:PORT",
+        help="SMTP relay for --alert-email (default: localhost:25)",
+    )
+    parser.add_argument(
+        "--alert-window",
+        type=float,
+        default=60.0,
+        help="Seconds to aggregate alerts before dispatching (default: 60)",
+    )
+
+
+def _host_port(value: str, default_port: int) -> tuple[str, int]:
+    """Split a HOST:PORT string.
+
+    Args:
+        value: HOST or HOST:PORT.
+        default_port: Port used when none is given.
+
+    Returns:
+        The host and port.
+    """
+    host, _, port = value.rpartition(":")
+    if not host:
+        return value, default_port
+    return host, int(port)
+
+
+def alert_sinks(args: argparse.Namespace) -> list[AlertSink]:
+    """Build the alert sinks requested by the --alert-* flags.
+
+    Args:
+        args: Parsed arguments, including those of add_alert_options().
+
+    Returns:
+        The configured sinks, possibly empty.
+    """
+    sinks: list[AlertSink] = []
+    if args.alert_log:
+        sinks.append(FileSink(args.alert_log))
+    sinks.extend(WebhookSink(url) for url in args.alert_webhook)
+    if args.alert_syslog:
+        address = args.alert_syslog
+        sinks.append(
+            SyslogSink(address if "/" in address else _host_port(address, 514))
+        )
+    if args.alert_email:
+        host, port = _host_port(args.alert_smtp, 25)
+        sinks.append(SMTPSink(host, port, default=args.alert_email))
+    return sinks
+
+
+def alert_dispatcher(args: argparse.Namespace) -> AlertDispatcher | None:
+    """Build the dispatcher for the --alert-* flags.
+
+    Args:
+        args: Parsed arguments, including those of add_alert_options().
+
+    Returns:
+        A dispatcher over the configured sinks, or None if there are
+        none.
+    """
+    sinks = alert_sinks(args)
+    if not sinks:
+        return None
+    return AlertDispatcher(sinks, window=args.alert_window)
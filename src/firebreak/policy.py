@@ -1,5 +1,9 @@
 """Policy engine for loading and evaluating YAML-based deployment policies."""
 
+import re
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
 from pathlib import Path
 
 import yaml
@@ -9,31 +13,217 @@ from firebreak.models import (
     ClassificationResult,
     Decision,
     EvaluationResult,
+    FastPathRule,
     Policy,
     PolicyRule,
 )
 
 
+class PolicyError(ValueError):
+    """A policy file could not be read, parsed, validated or compiled."""
+
+
+@dataclass(frozen=True, slots=True)
+class _Outcome:
+    """Immutable evaluation template for one rule (or the default block)."""
+
+    decision: Decision
+    matched_rule_id: str
+    rule_description: str
+    audit_level: AuditLevel
+    alerts: tuple[str, ...]
+    constraints: tuple[str, ...]
+    color: str
+    note: str
+
+    @classmethod
+    def from_rule(cls, rule: PolicyRule) -> "_Outcome":
+        """Build the template for a policy rule."""
+        return cls(
+            decision=rule.decision,
+            matched_rule_id=rule.id,
+            rule_description=rule.description,
+            audit_level=rule.audit,
+            alerts=tuple(rule.alerts),
+            constraints=tuple(rule.constraints),
+            color=rule.color,
+            note=rule.note,
+        )
+
+    def result(self, classification: ClassificationResult) -> EvaluationResult:
+        """Instantiate an EvaluationResult for a classification."""
+        return EvaluationResult(
+            decision=self.decision,
+            matched_rule_id=self.matched_rule_id,
+            rule_description=self.rule_description,
+            audit_level=self.audit_level,
+            alerts=self.alerts,
+            constraints=self.constraints,
+            color=self.color,
+            note=self.note,
+            classification=classification,
+        )
+
+
+# No rule matched — default to BLOCK
+_UNKNOWN_INTENT = _Outcome(
+    decision=Decision.BLOCK,
+    matched_rule_id="unknown-intent",
+    rule_description="No matching rule for intent category",
+    audit_level=AuditLevel.CRITICAL,
+    alerts=("trust_safety",),
+    constraints=(),
+    color="red",
+    note="",
+)
+
+# The classifier could not reach its model — fail closed
+_UPSTREAM_UNAVAILABLE = _Outcome(
+    decision=Decision.BLOCK,
+    matched_rule_id="upstream-unavailable",
+    rule_description="Intent could not be classified: upstream unavailable",
+    audit_level=AuditLevel.ENHANCED,
+    alerts=(),
+    constraints=(),
+    color="red",
+    note="",
+)
+
+
+class CompiledPolicy:
+    """A policy with a precomputed category-to-outcome index.
+
+    Each category maps to the outcome of the first rule that lists it,
+    preserving the first-match semantics of the rule order, so lookups
+    cost the same regardless of how many rules the policy has.
+
+    Attributes:
+        policy: The source Policy.
+    """
+
+    def __init__(self, policy: Policy) -> None:
+        """Build the index for a policy.
+
+        Args:
+            policy: The Policy to compile.
+        """
+        self.policy = policy
+        self._outcomes: dict[str, _Outcome] = {}
+        for rule in policy.rules:
+            outcome = _Outcome.from_rule(rule)
+            for category in rule.match_categories:
+                self._outcomes.setdefault(category, outcome)
+
+    def evaluate(
+        self, intent_category: str, classification: ClassificationResult
+    ) -> EvaluationResult:
+        """Look up the outcome for an intent category.
+
+        Args:
+            intent_category: The classified intent category.
+            classification: The ClassificationResult to attach.
+
+        Returns:
+            The EvaluationResult of the first matching rule, an
+            "unknown-intent" BLOCK if no rule lists the category, or an
+            "upstream-unavailable" BLOCK if the classifier could not
+            reach its model.
+        """
+        if classification.error is not None:
+            result = _UPSTREAM_UNAVAILABLE.result(classification)
+            result.note = f"classifier {classification.error}"
+            result.upstream_error = classification.error
+            return result
+        outcome = self._outcomes.get(intent_category, _UNKNOWN_INTENT)
+        return outcome.result(classification)
+
+
 class PolicyEngine:
     """Loads YAML policy files and evaluates intent categories against rules.
 
     Attributes:
         policy: The loaded Policy object, or None if not yet loaded.
+            Assigning a Policy compiles it for evaluation.
     """
 
     def __init__(self) -> None:
         """Initialize the PolicyEngine with no policy loaded."""
-        self.policy: Policy | None = None
+        self._compiled: CompiledPolicy | None = None
+
+    @property
+    def policy(self) -> Policy | None:
+        """The loaded Policy object, or None if not yet loaded."""
+        compiled = self._compiled
+        return compiled.policy if compiled is not None else None
+
+    @policy.setter
+    def policy(self, policy: Policy | None) -> None:
+        self._compiled = CompiledPolicy(policy) if policy is not None else None
+
+    def install(self, compiled: CompiledPolicy) -> None:
+        """Switch to an already compiled policy in one assignment.
+
+        Args:
+            compiled: The CompiledPolicy returned by compile().
+        """
+        self._compiled = compiled
 
     def load(self, path: str) -> Policy:
         """Parse a YAML policy file, validate structure, and store it.
 
+        The new policy is compiled before it replaces the current one,
+        so calling load() again on a running engine is a safe reload:
+        evaluations already in progress finish against the old policy
+        and later ones see the new policy. If validation fails, the
+        current policy stays in place.
+
         Args:
             path: Filesystem path to the YAML policy file.
 
         Returns:
             The parsed and validated Policy object.
 
+        Raises:
+            PolicyError: If the file cannot be read or parsed, or the
+                policy is invalid.
+        """
+        compiled = self.compile(path)
+        self.install(compiled)
+        return compiled.policy
+
+    def compile(self, path: str) -> CompiledPolicy:
+        """Parse, validate and compile a YAML policy file without storing it.
+
+        Every failure — an unreadable file, malformed YAML, a missing
+        field or a value of the wrong type — is raised as PolicyError,
+        so callers reloading a running policy need catch only that.
+
+        Args:
+            path: Filesystem path to the YAML policy file.
+
+        Returns:
+            The compiled policy, ready for install().
+
+        Raises:
+            PolicyError: If the file cannot be read or parsed, or the
+                policy is invalid.
+        """
+        try:
+            return CompiledPolicy(self._parse(path))
+        except PolicyError:
+            raise
+        except (OSError, yaml.YAMLError, ValueError, TypeError, KeyError) as exc:
+            raise PolicyError(f"{path}: {exc}") from exc
+
+    def _parse(self, path: str) -> Policy:
+        """Parse and validate a YAML policy file.
+
+        Args:
+            path: Filesystem path to the YAML policy file.
+
+        Returns:
+            The parsed Policy object.
+
         Raises:
             ValueError: If the YAML is missing required fields such as
                 policy.name, policy.version, or rules with id/decision/
@@ -81,6 +271,10 @@ class PolicyEngine:
                     f"Rule '{raw_rule['id']}' is missing required field: "
                     "match_categories"
                 )
+            if not isinstance(raw_rule["match_categories"], list):
+                raise ValueError(
+                    f"Rule '{raw_rule['id']}' match_categories must be a list"
+                )
 
             rule = PolicyRule(
                 id=raw_rule["id"],
@@ -102,6 +296,10 @@ class PolicyEngine:
         # Build signatories
         signatories: dict[str, str] = policy_data.get("signatories", {})
 
+        fast_path_rules, fast_path_threshold = _parse_fast_path(
+            data.get("fast_path"), categories
+        )
+
         policy = Policy(
             name=policy_data["name"],
             version=str(policy_data["version"]),
@@ -109,9 +307,10 @@ class PolicyEngine:
             signatories=signatories,
             rules=rules,
             categories=categories,
+            fast_path_rules=fast_path_rules,
+            fast_path_threshold=fast_path_threshold,
         )
 
-        self.policy = policy
         return policy
 
     def evaluate(
@@ -122,8 +321,11 @@ class PolicyEngine:
     ) -> EvaluationResult:
         """Evaluate an intent category against the loaded policy rules.
 
-        Iterates rules in order and returns the first match. If no rule
-        matches, returns a BLOCK decision with "unknown-intent" rule_id.
+        Returns the outcome of the first rule (in policy order) that
+        lists the category, using the compiled category index. If no
+        rule matches, returns a BLOCK decision with "unknown-intent"
+        rule_id; if the classifier could not reach its model, returns a
+        BLOCK with "upstream-unavailable" rule_id.
 
         Args:
             intent_category: The classified intent category to evaluate.
@@ -137,32 +339,153 @@ class PolicyEngine:
         Raises:
             RuntimeError: If no policy has been loaded yet.
         """
-        if self.policy is None:
+        compiled = self._compiled
+        if compiled is None:
             raise RuntimeError("No policy loaded. Call load() first.")
 
-        for rule in self.policy.rules:
-            if intent_category in rule.match_categories:
-                return EvaluationResult(
-                    decision=rule.decision,
-                    matched_rule_id=rule.id,
-                    rule_description=rule.description,
-                    audit_level=rule.audit,
-                    alerts=list(rule.alerts),
-                    constraints=list(rule.constraints),
-                    color=rule.color,
-                    note=rule.note,
-                    classification=classification,
-                )
+        return compiled.evaluate(intent_category, classification)
 
-        # No rule matched — default to BLOCK
-        return EvaluationResult(
-            decision=Decision.BLOCK,
-            matched_rule_id="unknown-intent",
-            rule_description="No matching rule for intent category",
-            audit_level=AuditLevel.CRITICAL,
-            alerts=["trust_safety"],
-            constraints=[],
-            color="red",
-            note="",
-            classification=classification,
+
+class PolicyWatcher:
+    """Polls a policy file and reloads it when it changes.
+
+    Runs in a daemon thread so parsing and validation never happen on
+    the request path. A file that fails validation is reported through
+    on_error and the running policy is kept.
+
+    Attributes:
+        path: The watched policy file.
+        interval: Seconds between modification checks.
+        last_error: The most recent reload error, or None.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        on_change: Callable[[str], object],
+        interval: float = 2.0,
+        on_error: Callable[[Exception], object] | None = None,
+    ) -> None:
+        """Initialize the watcher without starting it.
+
+        Args:
+            path: The policy file to watch.
+            on_change: Called with the path when the file changes;
+                expected to parse and swap in the new policy, raising
+                PolicyError if the file is invalid.
+            interval: Seconds between modification checks.
+            on_error: Optional callback for reload failures.
+        """
+        self.path = path
+        self.interval = interval
+        self.last_error: Exception | None = None
+        self._on_change = on_change
+        self._on_error = on_error
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._mtime = self._current_mtime()
+
+    def _current_mtime(self) -> float | None:
+        """Return the file's modification time, or None if it is missing."""
+        try:
+            return Path(self.path).stat().st_mtime
+        except OSError:
+            return None
+
+    def check(self) -> bool:
+        """Reload the policy if the file has changed since the last check.
+
+        Returns:
+            True if a reload was attempted and succeeded.
+        """
+        mtime = self._current_mtime()
+        if mtime is None or mtime == self._mtime:
+            return False
+        self._mtime = mtime
+        try:
+            self._on_change(self.path)
+        except PolicyError as exc:
+            self.last_error = exc
+            if self._on_error is not None:
+                self._on_error(exc)
+            return False
+        self.last_error = None
+        return True
+
+    def start(self) -> None:
+        """Start polling in a background thread."""
+        self._thread = threading.Thread(
+            target=self._run, name="firebreak-policy-watcher", daemon=True
         )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling and wait for the thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        """Poll until stopped."""
+        while not self._stop.wait(self.interval):
+            self.check()
+
+
+def _parse_fast_path(
+    raw: object, categories: list[str]
+) -> tuple[list[FastPathRule], float]:
+    """Parse and validate the optional ``fast_path`` section of a policy.
+
+    Args:
+        raw: The raw ``fast_path`` mapping from YAML, or None.
+        categories: The policy's valid intent categories.
+
+    Returns:
+        A tuple of the parsed FastPathRule list and the confidence
+        threshold.
+
+    Raises:
+        ValueError: If the section is malformed, names an unknown
+            category, or contains an invalid regular expression.
+    """
+    if raw is None:
+        return [], 0.9
+    if not isinstance(raw, dict):
+        raise ValueError("'fast_path' section must be a mapping")
+
+    threshold = float(raw.get("threshold", 0.9))
+    raw_rules = raw.get("rules", [])
+    if not isinstance(raw_rules, list):
+        raise ValueError("'fast_path.rules' must be a list")
+
+    rules: list[FastPathRule] = []
+    for i, raw_rule in enumerate(raw_rules):
+        if not isinstance(raw_rule, dict):
+            raise ValueError(f"Fast-path rule at index {i} must be a mapping")
+        category = raw_rule.get("category")
+        if category not in categories:
+            raise ValueError(
+                f"Fast-path rule at index {i} has unknown category: {category!r}"
+            )
+        patterns = raw_rule.get("patterns")
+        if not isinstance(patterns, list) or len(patterns) == 0:
+            raise ValueError(
+                f"Fast-path rule at index {i} must have a non-empty 'patterns' list"
+            )
+        for pattern in patterns:
+            try:
+                re.compile(pattern)
+            except re.error as exc:
+                raise ValueError(
+                    f"Fast-path rule at index {i} has invalid pattern"
+                    f" {pattern!r}: {exc}"
+                ) from exc
+        rules.append(
+            FastPathRule(
+                category=category,
+                patterns=patterns,
+                confidence=float(raw_rule.get("confidence", 0.95)),
+            )
+        )
+
+    return rules, threshold
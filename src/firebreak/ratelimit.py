@@ -0,0 +1,581 @@
+"""Per-client rate limits and usage counters for the proxy server."""
+
+import asyncio
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import yaml
+
+# Client id used without a registry when the caller's address is unknown.
+ANONYMOUS = "anonymous"
+
+
+@dataclass(frozen=True)
+class ClientLimits:
+    """Rate limits applied to one client.
+
+    Attributes:
+        requests_per_second: Sustained request rate.
+        request_burst: Requests allowed at once after an idle spell.
+        tokens_per_minute: Sustained upstream token budget (input plus
+            output tokens of forwarded LLM calls).
+        token_burst: Tokens that may be spent at once, or None for one
+            minute's budget.
+    """
+
+    requests_per_second: float = 10.0
+    request_burst: int = 20
+    tokens_per_minute: float = 100_000.0
+    token_burst: int | None = None
+
+
+@dataclass(slots=True)
+class _Bucket:
+    """A token bucket refilled continuously at a fixed rate.
+
+    The level may go negative: token costs are only known after the
+    upstream call, so they are charged afterwards and the debt is paid
+    off by the refill before the client is admitted again.
+    """
+
+    rate: float
+    capacity: float
+    level: float
+    updated: float
+
+    def refill(self, now: float) -> None:
+        """Add the tokens earned since the last update."""
+        self.level = self.peek(now)
+        self.updated = now
+
+    def peek(self, now: float) -> float:
+        """Return the level the bucket would have after a refill."""
+        elapsed = max(0.0, now - self.updated)
+        return min(self.capacity, self.level + elapsed * self.rate)
+
+    def full_at(self) -> float:
+        """Return the time the bucket will be back at capacity."""
+        if self.level >= self.capacity:
+            return self.updated
+        if self.rate <= 0:
+            return math.inf
+        return self.updated + (self.capacity - self.level) / self.rate
+
+    def wait(self, cost: float) -> float:
+        """Seconds until the bucket holds cost tokens (0.0 if it does)."""
+        if self.level >= cost:
+            return 0.0
+        return (cost - self.level) / self.rate
+
+
+@dataclass(slots=True)
+class _Client:
+    """Buckets and usage counters for one client."""
+
+    requests: _Bucket
+    tokens: _Bucket
+    admitted: int = 0
+    rejected: int = 0
+    tokens_used: int = 0
+
+
+class MemoryRateStore:
+    """Keeps client buckets in this process, in a bounded LRU table.
+
+    Attributes:
+        max_clients: Most clients tracked at once; the least recently
+            seen is forgotten beyond that.
+        blocking: Whether updates may block on I/O (False: they only
+            take an in-process lock).
+    """
+
+    blocking = False
+
+    def __init__(self, max_clients: int = 10_000) -> None:
+        """Initialize an empty table.
+
+        Args:
+            max_clients: Most clients tracked at once.
+        """
+        self.max_clients = max_clients
+        self._clients: OrderedDict[str, _Client] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def client(self, client: str, new: Callable[[], _Client]) -> Iterator[_Client]:
+        """Hold one client's state for an atomic update.
+
+        Args:
+            client: The client id.
+            new: Builds the state of a client seen for the first time.
+
+        Yields:
+            The client's state, to be updated in place.
+        """
+        with self._lock:
+            state = self._clients.get(client)
+            if state is not None:
+                self._clients.move_to_end(client)
+            else:
+                state = self._clients[client] = new()
+                if len(self._clients) > self.max_clients:
+                    self._clients.popitem(last=False)
+            yield state
+
+    def clients(self, new: Callable[[str], _Client]) -> list[tuple[str, _Client]]:
+        """Return every tracked client's state.
+
+        Args:
+            new: Builds a client's initial state (unused here).
+
+        Returns:
+            (client id, state) pairs.
+        """
+        with self._lock:
+            return list(self._clients.items())
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+RATE_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS rate_clients ("
+    " client TEXT PRIMARY KEY,"
+    " requests REAL NOT NULL,"
+    " requests_at REAL NOT NULL,"
+    " tokens REAL NOT NULL,"
+    " tokens_at REAL NOT NULL,"
+    " admitted INTEGER NOT NULL,"
+    " rejected INTEGER NOT NULL,"
+    " tokens_used INTEGER NOT NULL,"
+    " full_at REAL NOT NULL DEFAULT 0"
+    ")"
+)
+
+
+class SQLiteRateStore:
+    """Keeps client buckets in SQLite so several processes share them.
+
+    Each check or charge is one short IMMEDIATE transaction, so updates
+    from concurrent server workers serialize on the database lock. Bucket
+    times use the system-wide monotonic clock, which all processes on a
+    host share; durability is relaxed because counters lost in a crash
+    only reset some budgets.
+
+    Each row records when both of its buckets will be full again. A
+    full bucket is what a new client gets anyway, so at most once per
+    prune_interval a transaction also deletes the rows that have been
+    full for idle_ttl seconds. Only their usage counters are lost.
+
+    Attributes:
+        path: Filesystem path to the SQLite database.
+        idle_ttl: Seconds a refilled client is kept before its row is
+            deleted.
+        prune_interval: Minimum seconds between prunes.
+        pruned: Number of rows deleted by pruning.
+        blocking: Whether updates may block on I/O (True: a transaction
+            can wait up to the busy timeout for another worker).
+    """
+
+    blocking = True
+
+    def __init__(
+        self, path: str, idle_ttl: float = 3600.0, prune_interval: float = 60.0
+    ) -> None:
+        """Open (or create) the database.
+
+        Args:
+            path: Filesystem path to the SQLite database.
+            idle_ttl: Seconds a refilled client is kept before its row
+                is deleted.
+            prune_interval: Minimum seconds between prunes.
+        """
+        self.path = path
+        self.idle_ttl = idle_ttl
+        self.prune_interval = prune_interval
+        self.pruned = 0
+        self._conn = sqlite3.connect(
+            path, timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(RATE_SCHEMA)
+        columns = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(rate_clients)")
+        }
+        if "full_at" not in columns:
+            self._conn.execute(
+                "ALTER TABLE rate_clients ADD COLUMN full_at REAL NOT NULL DEFAULT 0"
+            )
+        self._lock = threading.Lock()
+        self._next_prune = time.monotonic() + prune_interval
+
+    @contextmanager
+    def client(self, client: str, new: Callable[[], _Client]) -> Iterator[_Client]:
+        """Hold one client's row for an atomic update.
+
+        Args:
+            client: The client id.
+            new: Builds the client's state with its limits; stored
+                levels and counters are loaded into it.
+
+        Yields:
+            The client's state, written back when the block exits.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT requests, requests_at, tokens, tokens_at,"
+                    " admitted, rejected, tokens_used"
+                    " FROM rate_clients WHERE client = ?",
+                    (client,),
+                ).fetchone()
+                state = new()
+                if row is not None:
+                    _load(state, row)
+                yield state
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO rate_clients"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        client,
+                        state.requests.level,
+                        state.requests.updated,
+                        state.tokens.level,
+                        state.tokens.updated,
+                        state.admitted,
+                        state.rejected,
+                        state.tokens_used,
+                        max(state.requests.full_at(), state.tokens.full_at()),
+                    ),
+                )
+                now = time.monotonic()
+                if now >= self._next_prune:
+                    self._next_prune = now + self.prune_interval
+                    self.pruned += self._conn.execute(
+                        "DELETE FROM rate_clients WHERE full_at <= ?",
+                        (now - self.idle_ttl,),
+                    ).rowcount
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def clients(self, new: Callable[[str], _Client]) -> list[tuple[str, _Client]]:
+        """Return every stored client's state.
+
+        Args:
+            new: Builds a client's state with its limits.
+
+        Returns:
+            (client id, state) pairs.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT client, requests, requests_at, tokens, tokens_at,"
+                " admitted, rejected, tokens_used FROM rate_clients"
+            ).fetchall()
+        states = []
+        for client, *row in rows:
+            state = new(client)
+            _load(state, row)
+            states.append((client, state))
+        return states
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+
+def _load(state: _Client, row: tuple | list) -> None:
+    """Copy stored levels and counters into a client's state.
+
+    Args:
+        state: State built from the client's limits.
+        row: requests, requests_at, tokens, tokens_at, admitted,
+            rejected and tokens_used.
+    """
+    (
+        state.requests.level,
+        state.requests.updated,
+        state.tokens.level,
+        state.tokens.updated,
+        state.admitted,
+        state.rejected,
+        state.tokens_used,
+    ) = row
+
+
+class RateLimited(Exception):
+    """A client exceeded one of its rate limits.
+
+    Attributes:
+        client: The client id.
+        limit: "requests" or "tokens".
+        retry_after: Seconds until the request would be admitted.
+    """
+
+    def __init__(self, client: str, limit: str, retry_after: float) -> None:
+        """Create the error.
+
+        Args:
+            client: The client id.
+            limit: "requests" or "tokens".
+            retry_after: Seconds until the request would be admitted.
+        """
+        super().__init__(f"client {client} exceeded its {limit} rate limit")
+        self.client = client
+        self.limit = limit
+        self.retry_after = retry_after
+
+
+class UnknownClient(Exception):
+    """An API key that is not registered with the rate limiter."""
+
+
+class RateLimiter:
+    """Identifies callers by API key and enforces per-client token buckets.
+
+    Each client has two buckets, one for requests per second and one for
+    upstream tokens per minute. check() costs one request token and
+    requires the token bucket to be out of debt; charge() spends the
+    tokens an upstream call actually used. Both are O(1). By default
+    buckets live in a MemoryRateStore, an LRU table bounded by
+    max_clients; a SQLiteRateStore shares them between server processes.
+
+    Without a registry an API key proves nothing, so keys are ignored
+    and clients are told apart by remote address. A caller minting a
+    fresh key per request still draws from one bucket, and cannot push
+    other clients out of the LRU table.
+
+    Attributes:
+        keys: Client id per registered API key. When non-empty, requests
+            with any other key (or none) are refused.
+        limits: Limits per client id; others get default_limits.
+        default_limits: Limits for clients without their own.
+        store: Where client buckets and counters are kept.
+    """
+
+    def __init__(
+        self,
+        keys: dict[str, str] | None = None,
+        limits: dict[str, ClientLimits] | None = None,
+        default_limits: ClientLimits | None = None,
+        max_clients: int = 10_000,
+        store: MemoryRateStore | SQLiteRateStore | None = None,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            keys: Client id per registered API key, or None to accept
+                any key and identify clients by remote address.
+            limits: Limits per client id.
+            default_limits: Limits for clients without their own.
+            max_clients: Most clients tracked at once by the default
+                in-memory store.
+            store: Where to keep client state, or None for an in-memory
+                store.
+        """
+        self.keys = keys or {}
+        self.limits = limits or {}
+        self.default_limits = default_limits or ClientLimits()
+        self.store = store if store is not None else MemoryRateStore(max_clients)
+
+    def identify(self, authorization: str | None, address: str | None = None) -> str:
+        """Map a request's credentials to a client id.
+
+        Args:
+            authorization: The header value, e.g. "Bearer sk-...", or None.
+            address: The caller's remote address, or None if unknown.
+
+        Returns:
+            The registered client id for the key. Without a registry,
+            "addr-" plus the remote address, or ANONYMOUS if it is
+            unknown.
+
+        Raises:
+            UnknownClient: If keys are registered and this one is not.
+        """
+        if not self.keys:
+            return f"addr-{address}" if address else ANONYMOUS
+        key = None
+        if authorization:
+            scheme, _, value = authorization.partition(" ")
+            key = value.strip() if scheme.lower() == "bearer" else None
+        client = self.keys.get(key) if key else None
+        if client is None:
+            raise UnknownClient("missing or unknown API key")
+        return client
+
+    def check(self, client: str) -> None:
+        """Admit one request for a client.
+
+        Args:
+            client: The client id.
+
+        Raises:
+            RateLimited: If the client is over its request rate or still
+                in debt on its token budget.
+        """
+        now = time.monotonic()
+        with self.store.client(client, lambda: self._new(client, now)) as state:
+            state.requests.refill(now)
+            state.tokens.refill(now)
+            limit, wait = "requests", state.requests.wait(1)
+            if not wait:
+                limit, wait = "tokens", state.tokens.wait(0)
+            if wait:
+                state.rejected += 1
+            else:
+                state.requests.level -= 1
+                state.admitted += 1
+        if wait:
+            raise RateLimited(client, limit, wait)
+
+    async def check_async(self, client: str) -> None:
+        """Admit one request without blocking the event loop.
+
+        A blocking store is updated in a worker thread.
+
+        Args:
+            client: The client id.
+
+        Raises:
+            RateLimited: If the client is over one of its limits.
+        """
+        if self.store.blocking:
+            await asyncio.to_thread(self.check, client)
+        else:
+            self.check(client)
+
+    def charge(self, client: str, tokens: int) -> None:
+        """Spend upstream tokens from a client's budget.
+
+        Args:
+            client: The client id.
+            tokens: Input plus output tokens the request used.
+        """
+        if tokens <= 0:
+            return
+        now = time.monotonic()
+        with self.store.client(client, lambda: self._new(client, now)) as state:
+            state.tokens.refill(now)
+            state.tokens.level -= tokens
+            state.tokens_used += tokens
+
+    async def charge_async(self, client: str, tokens: int) -> None:
+        """Spend upstream tokens without blocking the event loop.
+
+        Args:
+            client: The client id.
+            tokens: Input plus output tokens the request used.
+        """
+        if self.store.blocking and tokens > 0:
+            await asyncio.to_thread(self.charge, client, tokens)
+        else:
+            self.charge(client, tokens)
+
+    def usage(self) -> dict[str, dict[str, float | int]]:
+        """Return usage counters per tracked client.
+
+        Returns:
+            Per client id: requests admitted and rejected, upstream
+            tokens used, and the tokens left in each bucket.
+        """
+        now = time.monotonic()
+        return {
+            client: {
+                "admitted": state.admitted,
+                "rejected": state.rejected,
+                "tokens_used": state.tokens_used,
+                "requests_available": round(state.requests.peek(now), 2),
+                "tokens_available": round(state.tokens.peek(now)),
+            }
+            for client, state in self.store.clients(
+                lambda client: self._new(client, now)
+            )
+        }
+
+    def close(self) -> None:
+        """Close the store."""
+        self.store.close()
+
+    def _new(self, client: str, now: float) -> _Client:
+        """Build the state of a client with full buckets.
+
+        Args:
+            client: The client id.
+            now: Current monotonic time.
+
+        Returns:
+            The client's initial state.
+        """
+        limits = self.limits.get(client, self.default_limits)
+        token_burst = limits.token_burst or limits.tokens_per_minute
+        return _Client(
+            requests=_Bucket(
+                limits.requests_per_second,
+                limits.request_burst,
+                limits.request_burst,
+                now,
+            ),
+            tokens=_Bucket(
+                limits.tokens_per_minute / 60, token_burst, token_burst, now
+            ),
+        )
+
+
+def load_clients(
+    path: str, store: MemoryRateStore | SQLiteRateStore | None = None
+) -> RateLimiter:
+    """Build a RateLimiter from a YAML client registry.
+
+    The file has an optional "defaults" mapping of ClientLimits fields
+    and a "clients" mapping of client id to its "keys" list plus any
+    limit overrides::
+
+        defaults:
+          requests_per_second: 5
+        clients:
+          analytics:
+            keys: [sk-analytics-1]
+            tokens_per_minute: 20000
+
+    Args:
+        path: Path to the YAML file.
+        store: Where to keep client state, or None for in memory.
+
+    Returns:
+        A RateLimiter with those keys and limits.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is malformed.
+    """
+    file_path = Path(path)
+    if not file_path.exists():
+        raise FileNotFoundError(f"Client registry not found: {path}")
+    data = yaml.safe_load(file_path.read_text()) or {}
+    if not isinstance(data, dict):
+        raise ValueError("Client registry must be a YAML mapping")
+    try:
+        defaults = ClientLimits(**(data.get("defaults") or {}))
+        keys: dict[str, str] = {}
+        limits: dict[str, ClientLimits] = {}
+        for client, entry in (data.get("clients") or {}).items():
+            entry = dict(entry or {})
+            for key in entry.pop("keys", []):
+                keys[str(key)] = str(client)
+            limits[str(client)] = replace(defaults, **entry)
+    except (TypeError, AttributeError) as exc:
+        raise ValueError(f"Invalid client registry: {exc}") from exc
+    return RateLimiter(keys=keys, limits=limits, default_limits=defaults, store=store)
@@ -0,0 +1,356 @@
+"""Production proxy server — headless, across worker processes.
+
+firebreak-serve runs the proxy without the Rich TUI, so no CPU goes to
+rendering terminal layouts; use firebreak-demo --server to watch
+requests on the dashboard.
+
+One Python process serializes classification parsing, policy
+evaluation and response handling on its GIL. This runner starts
+several uvicorn worker processes behind one listening socket and has
+them share the state that must be shared:
+
+- Classifier cache: every worker reads through to one SQLite database,
+  so a prompt classified by one worker is a hit in the others.
+- Client rate limits: buckets live in one SQLite database, so a
+  client's budget holds across workers.
+- Audit trail: the supervising process owns the only audit log and
+  runs an AuditRelay in front of it; workers log through a
+  RemoteAuditLog, keeping one hash chain and sequence.
+
+The adaptive concurrency limit, upstream circuit breaker,
+classification batcher and alert dispatcher stay per worker, so
+--concurrency-limit, --max-queue and --alert-window apply to each
+process. A POST to /admin/policy/reload would reach only the worker
+that accepted it, so the endpoint is mounted only when there is a
+single worker; use --watch-policy to reload every worker.
+"""
+
+import argparse
+import atexit
+import dataclasses
+import json
+import os
+
+from firebreak.audit import AuditLog, FileAuditLog
+from firebreak.audit_relay import AuditRelay, RemoteAuditLog
+from firebreak.cache_store import SQLiteCacheStore
+from firebreak.classifier import ClassifierCache, IntentClassifier, RuleClassifier
+from firebreak.interceptor import FirebreakInterceptor
+from firebreak.limiter import ConcurrencyLimiter
+from firebreak.options import (
+    ALERT_OPTIONS,
+    add_alert_options,
+    add_audit_options,
+    add_cache_options,
+    add_upstream_options,
+    alert_dispatcher,
+    open_audit_log,
+    upstream_config,
+)
+from firebreak.policy import PolicyEngine, PolicyWatcher
+from firebreak.ratelimit import (
+    ClientLimits,
+    RateLimiter,
+    SQLiteRateStore,
+    load_clients,
+)
+from firebreak.upstream import UpstreamClients, UpstreamConfig
+
+DEFAULT_POLICY = "policies/defense-standard.yaml"
+DEFAULT_STATE_DIR = ".firebreak"
+
+RELAY_MAX_ENTRIES = 10_000
+"""Entries kept in memory by the supervisor when there is no --audit-log."""
+
+CONFIG_ENV = "FIREBREAK_SERVE"
+"""Environment variable carrying the worker configuration as JSON."""
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Args:
+        argv: Argument list, or None to use sys.argv.
+
+    Returns:
+        Parsed argument namespace.
+    """
+    parser = argparse.ArgumentParser(
+        prog="firebreak-serve",
+        description="Firebreak — headless OpenAI-compatible proxy server",
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Address to listen on (default: 127.0.0.1)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8080,
+        help="Port to listen on (default: 8080)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--policy",
+        default=DEFAULT_POLICY,
+        help=f"Path to policy YAML file (default: {DEFAULT_POLICY})",
+    )
+    parser.add_argument(
+        "--watch-policy",
+        action="store_true",
+        help="Reload the policy file automatically when it changes"
+        " (the only way to reload with more than one worker)",
+    )
+    parser.add_argument(
+        "--speculative",
+        action="store_true",
+        help="Start the LLM call while classifying (cancelled on BLOCK)",
+    )
+    parser.add_argument(
+        "--state-dir",
+        default=DEFAULT_STATE_DIR,
+        help="Directory for state shared between workers"
+        f" (default: {DEFAULT_STATE_DIR})",
+    )
+    parser.add_argument(
+        "--cache",
+        default=None,
+        help="Path to a classifier cache JSON to seed each worker",
+    )
+    parser.add_argument(
+        "--cache-db",
+        default=None,
+        help="SQLite file for the shared classifier cache"
+        " (default: classifier_cache.db in --state-dir)",
+    )
+    add_cache_options(parser)
+    add_audit_options(parser)
+    parser.add_argument(
+        "--concurrency-limit",
+        type=int,
+        default=20,
+        help="Starting concurrency limit per worker (default: 20)",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=200,
+        help="Highest the limit may rise per worker (default: 200)",
+    )
+    parser.add_argument(
+        "--max-queue",
+        type=int,
+        default=100,
+        help="Requests allowed to wait per worker (default: 100)",
+    )
+    parser.add_argument(
+        "--queue-timeout",
+        type=float,
+        default=5.0,
+        help="Seconds a request waits for a slot before a 503 (default: 5)",
+    )
+    parser.add_argument(
+        "--clients",
+        default=None,
+        help="YAML registry of client API keys and per-client rate limits",
+    )
+    parser.add_argument(
+        "--client-rps",
+        type=float,
+        default=10.0,
+        help="Default requests per second per client (default: 10)",
+    )
+    parser.add_argument(
+        "--client-tpm",
+        type=float,
+        default=100_000.0,
+        help="Default upstream tokens per minute per client (default: 100000)",
+    )
+    parser.add_argument(
+        "--batch-window-ms",
+        type=float,
+        default=0.0,
+        help="Batch classifications arriving within this window per worker",
+    )
+    add_upstream_options(parser)
+    add_alert_options(parser)
+    return parser.parse_args(argv)
+
+
+def _worker_config(args: argparse.Namespace, state_dir: str, audit_socket: str) -> dict:
+    """Collect what a worker needs from the supervisor's arguments.
+
+    Args:
+        args: Parsed command-line arguments.
+        state_dir: Absolute path of the shared state directory.
+        audit_socket: Path of the audit relay's Unix socket.
+
+    Returns:
+        A JSON-serializable worker configuration.
+    """
+    return {
+        "policy": os.path.abspath(args.policy),
+        "workers": args.workers,
+        "watch_policy": args.watch_policy,
+        "speculative": args.speculative,
+        "cache": os.path.abspath(args.cache) if args.cache else None,
+        "cache_db": os.path.abspath(
+            args.cache_db or os.path.join(state_dir, "classifier_cache.db")
+        ),
+        "cache_max_entries": args.cache_max_entries,
+        "cache_ttl": args.cache_ttl,
+        "rate_db": os.path.join(state_dir, "ratelimit.db"),
+        "audit_socket": audit_socket,
+        "batch_window_ms": args.batch_window_ms,
+        "concurrency_limit": args.concurrency_limit,
+        "max_concurrency": args.max_concurrency,
+        "max_queue": args.max_queue,
+        "queue_timeout": args.queue_timeout,
+        "clients": args.clients,
+        "client_rps": args.client_rps,
+        "client_tpm": args.client_tpm,
+        "upstream": dataclasses.asdict(upstream_config(args)),
+        "alerts": {name: getattr(args, name) for name in ALERT_OPTIONS},
+    }
+
+
+def create_worker_app():
+    """Build one worker's application from the supervisor's configuration.
+
+    Called by uvicorn in each worker process. The configuration is read
+    from the FIREBREAK_SERVE environment variable set by main().
+
+    Returns:
+        The worker's Starlette application.
+
+    Raises:
+        RuntimeError: If FIREBREAK_SERVE is not set.
+    """
+    from firebreak.server import ADMIN_KEY_ENV, create_app
+
+    raw = os.environ.get(CONFIG_ENV)
+    if raw is None:
+        raise RuntimeError(f"{CONFIG_ENV} is not set; start workers with main()")
+    config = json.loads(raw)
+
+    engine = PolicyEngine()
+    engine.load(config["policy"])
+    policy = engine.policy
+
+    clients = UpstreamClients(UpstreamConfig(**config["upstream"]))
+    atexit.register(clients.close)
+
+    cache = ClassifierCache(
+        cache_path=config["cache"],
+        max_entries=config["cache_max_entries"],
+        ttl=config["cache_ttl"],
+        store=SQLiteCacheStore(config["cache_db"], max_age=config["cache_ttl"]),
+    )
+    atexit.register(cache.close)
+    fast_path = None
+    if policy.fast_path_rules:
+        fast_path = RuleClassifier.from_policy(policy)
+    classifier = IntentClassifier(
+        categories=policy.categories,
+        cache=cache,
+        fast_path=fast_path,
+        fast_path_threshold=policy.fast_path_threshold,
+        policy_version=policy.version,
+        batch_window=config["batch_window_ms"] / 1000,
+        clients=clients,
+    )
+
+    audit_log = RemoteAuditLog(config["audit_socket"])
+    atexit.register(audit_log.close)
+    interceptor = FirebreakInterceptor(
+        policy_engine=engine,
+        classifier=classifier,
+        audit_log=audit_log,
+        speculative=config["speculative"],
+        clients=clients,
+    )
+    dispatcher = alert_dispatcher(argparse.Namespace(**config["alerts"]))
+    if dispatcher is not None:
+        dispatcher.register(interceptor)
+        atexit.register(dispatcher.close)
+    # Registered last so it runs first: queued alerts reach the dispatcher.
+    atexit.register(interceptor.events.close)
+
+    limiter = ConcurrencyLimiter(
+        initial_limit=config["concurrency_limit"],
+        max_limit=config["max_concurrency"],
+        max_queue=config["max_queue"],
+        queue_timeout=config["queue_timeout"],
+    )
+    store = SQLiteRateStore(config["rate_db"])
+    if config["clients"]:
+        rate_limiter = load_clients(config["clients"], store=store)
+    else:
+        rate_limiter = RateLimiter(
+            default_limits=ClientLimits(
+                requests_per_second=config["client_rps"],
+                request_burst=max(1, int(config["client_rps"] * 2)),
+                tokens_per_minute=config["client_tpm"],
+            ),
+            store=store,
+        )
+    atexit.register(rate_limiter.close)
+
+    if config["watch_policy"]:
+        PolicyWatcher(config["policy"], interceptor.reload_policy).start()
+
+    # Each worker holds its own policy, so a reload request would reach
+    # only one of them; with several, rely on --watch-policy instead.
+    return create_app(
+        interceptor,
+        policy_path=config["policy"] if config["workers"] == 1 else None,
+        limiter=limiter,
+        rate_limiter=rate_limiter,
+        admin_key=os.environ.get(ADMIN_KEY_ENV),
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the supervisor: audit relay plus uvicorn worker processes.
+
+    Args:
+        argv: Argument list, or None to use sys.argv.
+    """
+    import uvicorn
+
+    args = _parse_args(argv)
+    state_dir = os.path.abspath(args.state_dir)
+    os.makedirs(state_dir, exist_ok=True)
+
+    audit_log = open_audit_log(args)
+    if audit_log is None:
+        # Nothing is persisted; keep only the most recent entries.
+        audit_log = AuditLog(max_entries=RELAY_MAX_ENTRIES)
+    socket_path = os.path.join(state_dir, "audit.sock")
+    relay = AuditRelay(audit_log, socket_path)
+
+    os.environ[CONFIG_ENV] = json.dumps(_worker_config(args, state_dir, socket_path))
+    try:
+        uvicorn.run(
+            "firebreak.serve:create_worker_app",
+            factory=True,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            log_level="warning",
+        )
+    finally:
+        # Workers have exited, so every relayed entry is in the log.
+        relay.close()
+        if isinstance(audit_log, FileAuditLog):
+            audit_log.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,42 +2,413 @@
 
 from __future__ import annotations
 
+import asyncio
+import hmac
+import json
+import math
 import time
 import uuid
-from typing import TYPE_CHECKING
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import datetime
 
 from starlette.applications import Starlette
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response, StreamingResponse
 from starlette.routing import Route
+from starlette.types import Receive, Scope, Send
 
-from firebreak.interceptor import FirebreakInterceptor
-from firebreak.models import Decision
+from firebreak.audit import entry_to_record
+from firebreak.interceptor import FirebreakInterceptor, ResponseStream
+from firebreak.limiter import ConcurrencyLimiter, Overloaded
+from firebreak.models import Decision, EvaluationResult
+from firebreak.policy import PolicyError
+from firebreak.ratelimit import RateLimited, RateLimiter, UnknownClient
 
-if TYPE_CHECKING:
-    from rich.live import Live
 
-    from firebreak.dashboard import FirebreakDashboard
+def _policy_violation(evaluation: EvaluationResult) -> JSONResponse:
+    """Build the OpenAI-style error response for a blocked request.
+
+    Args:
+        evaluation: The BLOCK evaluation result.
+
+    Returns:
+        A 400 JSONResponse describing the violated rule.
+    """
+    return JSONResponse(
+        {
+            "error": {
+                "message": (
+                    f"Request blocked by policy:"
+                    f" {evaluation.matched_rule_id}"
+                    f" \u2014 {evaluation.rule_description}"
+                ),
+                "type": "policy_violation",
+                "param": None,
+                "code": "content_policy_violation",
+            }
+        },
+        status_code=400,
+    )
+
+
+# HTTP status per upstream failure reason; anything else is a 502.
+_UPSTREAM_STATUS = {"circuit_open": 503, "timeout": 504}
+
+
+def _upstream_unavailable(evaluation: EvaluationResult) -> JSONResponse:
+    """Build the OpenAI-style error response for a failed upstream call.
+
+    Args:
+        evaluation: The evaluation whose upstream_error is set.
+
+    Returns:
+        A 503 JSONResponse while the circuit is open, 504 after a
+        timeout, or 502 for any other upstream error.
+    """
+    reason = evaluation.upstream_error
+    return JSONResponse(
+        {
+            "error": {
+                "message": f"Upstream model unavailable: {reason}",
+                "type": "server_error",
+                "param": None,
+                "code": "upstream_unavailable",
+            }
+        },
+        status_code=_UPSTREAM_STATUS.get(reason, 502),
+    )
+
+
+def _overloaded(exc: Overloaded) -> JSONResponse:
+    """Build the OpenAI-style error response for a shed request.
+
+    Args:
+        exc: The limiter's rejection.
+
+    Returns:
+        A 503 JSONResponse with a Retry-After header.
+    """
+    return JSONResponse(
+        {
+            "error": {
+                "message": f"Firebreak is overloaded ({exc.reason}); retry later",
+                "type": "server_error",
+                "param": None,
+                "code": "overloaded",
+            }
+        },
+        status_code=503,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+def _audit_unavailable() -> JSONResponse:
+    """Build the OpenAI-style error response used while auditing is down.
+
+    Returns:
+        A 503 JSONResponse with a Retry-After header.
+    """
+    return JSONResponse(
+        {
+            "error": {
+                "message": "Audit log is unavailable; retry later",
+                "type": "server_error",
+                "param": None,
+                "code": "audit_unavailable",
+            }
+        },
+        status_code=503,
+        headers={"Retry-After": "1"},
+    )
+
+
+def _rate_limited(exc: RateLimited) -> JSONResponse:
+    """Build the OpenAI-style error response for a rate-limited client.
+
+    Args:
+        exc: The rate limiter's rejection.
+
+    Returns:
+        A 429 JSONResponse with a Retry-After header.
+    """
+    return JSONResponse(
+        {
+            "error": {
+                "message": (
+                    f"Rate limit exceeded for {exc.limit}; retry in"
+                    f" {exc.retry_after:.1f}s"
+                ),
+                "type": "rate_limit_error",
+                "param": None,
+                "code": "rate_limit_exceeded",
+            }
+        },
+        status_code=429,
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
+
+
+def _invalid_api_key() -> JSONResponse:
+    """Build the OpenAI-style error response for an unknown API key.
+
+    Returns:
+        A 401 JSONResponse.
+    """
+    return JSONResponse(
+        {
+            "error": {
+                "message": "Missing or unknown API key",
+                "type": "invalid_request_error",
+                "param": None,
+                "code": "invalid_api_key",
+            }
+        },
+        status_code=401,
+    )
+
+
+MAX_AUDIT_PAGE = 1000
+
+ADMIN_KEY_ENV = "FIREBREAK_ADMIN_KEY"
+"""Environment variable the command-line servers read the admin key from."""
+
+
+def _admin_only(
+    handler: Callable[[Request], Awaitable[Response]], admin_key: str
+) -> Callable[[Request], Awaitable[Response]]:
+    """Wrap an endpoint so it requires the admin bearer key.
+
+    Args:
+        handler: The endpoint to protect.
+        admin_key: The key callers must present.
+
+    Returns:
+        An endpoint answering 401 unless the request carries
+        "Authorization: Bearer <admin_key>".
+    """
+    expected = f"Bearer {admin_key}".encode()
+
+    async def endpoint(request: Request) -> Response:
+        presented = request.headers.get("authorization", "").encode()
+        if not hmac.compare_digest(presented, expected):
+            return _invalid_api_key()
+        return await handler(request)
+
+    return endpoint
+
+
+class _InvalidQuery(ValueError):
+    """A malformed /v1/audit query parameter."""
+
+    def __init__(self, message: str, param: str) -> None:
+        super().__init__(message)
+        self.param = param
+
+    def response(self) -> JSONResponse:
+        """Build the OpenAI-style 400 error response."""
+        return JSONResponse(
+            {
+                "error": {
+                    "message": str(self),
+                    "type": "invalid_request_error",
+                    "param": self.param,
+                    "code": "invalid_query",
+                }
+            },
+            status_code=400,
+        )
+
+
+def _audit_filters(params) -> dict:
+    """Convert /v1/audit query parameters to AuditLog.query() arguments.
+
+    Args:
+        params: The request's query parameters.
+
+    Returns:
+        Keyword arguments for AuditLog.query().
+
+    Raises:
+        _InvalidQuery: If a parameter is malformed.
+    """
+    filters: dict = {
+        "rule_id": params.get("rule_id"),
+        "category": params.get("category"),
+        "alert": params.get("alert"),
+    }
+    decision = params.get("decision")
+    if decision is not None:
+        try:
+            filters["decision"] = Decision(decision.upper())
+        except ValueError:
+            raise _InvalidQuery(f"Unknown decision: {decision}", "decision") from None
+    for name in ("since", "until"):
+        value = params.get(name)
+        if value is not None:
+            try:
+                filters[name] = datetime.fromisoformat(value)
+            except ValueError:
+                raise _InvalidQuery(f"Invalid ISO 8601 time: {value}", name) from None
+    for name, default in (("cursor", None), ("limit", 100)):
+        value = params.get(name)
+        if value is None:
+            filters[name] = default
+            continue
+        try:
+            filters[name] = int(value)
+        except ValueError:
+            raise _InvalidQuery(f"{name} must be an integer", name) from None
+    if not 1 <= filters["limit"] <= MAX_AUDIT_PAGE:
+        raise _InvalidQuery(f"limit must be between 1 and {MAX_AUDIT_PAGE}", "limit")
+    return filters
+
+
+async def _sse_chunks(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Relay LLM text deltas as OpenAI ``chat.completion.chunk`` events.
+
+    Args:
+        chunks: Async iterator of response text deltas.
+
+    Yields:
+        Server-sent event frames, terminated by ``data: [DONE]``.
+    """
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+    created = int(time.time())
+
+    def frame(delta: dict, finish_reason: str | None) -> str:
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": "firebreak-proxy",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    yield frame({"role": "assistant"}, None)
+    async for text in chunks:
+        yield frame({"content": text}, None)
+    yield frame({}, "stop")
+    yield "data: [DONE]\n\n"
+
+
+class _AfterSend(Response):
+    """Sends a response, then runs a callback.
+
+    The callback runs once the body has been sent (or the client went
+    away), so it sees the end of a streamed completion. It may return
+    an awaitable, which is awaited.
+    """
+
+    def __init__(
+        self, response: Response, callback: Callable[[], Awaitable[None] | None]
+    ) -> None:
+        self.response = response
+        self.status_code = response.status_code
+        self.callback = callback
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.response(scope, receive, send)
+        finally:
+            result = self.callback()
+            if result is not None:
+                await result
+
+
+def _completion_response(
+    evaluation: EvaluationResult, chunks: ResponseStream | None
+) -> Response:
+    """Build the chat completion response for an evaluated request.
+
+    Args:
+        evaluation: The completed (or, when streaming, started)
+            evaluation.
+        chunks: Response text deltas for a streamed request, or None.
+
+    Returns:
+        An upstream or policy error, an SSE stream, or a buffered
+        chat completion.
+    """
+    # Checked first: an unclassifiable request is blocked, but it
+    # did not violate the policy.
+    if evaluation.upstream_error is not None:
+        return _upstream_unavailable(evaluation)
+
+    if evaluation.decision == Decision.BLOCK:
+        return _policy_violation(evaluation)
+
+    if chunks is not None:
+        return StreamingResponse(
+            _sse_chunks(chunks),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+
+    # ALLOW or ALLOW_CONSTRAINED
+    content = evaluation.llm_response or ""
+    return JSONResponse(
+        {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "firebreak-proxy",
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "total_tokens": 0,
+            },
+        }
+    )
 
 
 def create_app(
     interceptor: FirebreakInterceptor,
-    dashboard: FirebreakDashboard | None = None,
-    live: Live | None = None,
+    policy_path: str | None = None,
+    limiter: ConcurrencyLimiter | None = None,
+    rate_limiter: RateLimiter | None = None,
+    admin_key: str | None = None,
 ) -> Starlette:
     """Create the Starlette ASGI application.
 
+    The app does no terminal rendering. A dashboard follows requests by
+    registering callbacks on the interceptor, which are delivered off
+    the request path.
+
     Args:
         interceptor: The FirebreakInterceptor pipeline.
-        dashboard: Optional dashboard for live TUI updates.
-        live: Optional Rich Live display to refresh after requests.
+        policy_path: Policy file to re-read on POST /admin/policy/reload.
+            The endpoint is not mounted when this or admin_key is None.
+        limiter: Adaptive concurrency limit for chat completions, or
+            None to admit every request. Shed requests get a 503 with
+            Retry-After; /health reports the limiter's state.
+        rate_limiter: Per-client rate limits for chat completions, or
+            None for no limits. Clients are identified by their bearer
+            API key, or by remote address without a key registry;
+            GET /admin/clients reports per-client usage when admin_key
+            is set.
+        admin_key: Bearer key required by the admin endpoints
+            (/admin/policy/reload, /admin/clients and /v1/audit). They
+            are not mounted when this is None, since the audit trail
+            holds every prompt and the others change or expose state.
 
     Returns:
         A configured Starlette application.
     """
 
     async def health(request: Request) -> JSONResponse:
-        return JSONResponse({"status": "ok"})
+        if not interceptor.audit_log.healthy:
+            return JSONResponse({"status": "audit_unavailable"}, status_code=503)
+        if limiter is None:
+            return JSONResponse({"status": "ok"})
+        return JSONResponse({"status": "ok", "concurrency": limiter.stats()})
 
     async def list_models(request: Request) -> JSONResponse:
         return JSONResponse(
@@ -54,7 +425,23 @@ def create_app(
             }
         )
 
-    async def chat_completions(request: Request) -> JSONResponse:
+    async def chat_completions(request: Request) -> Response:
+        # Fail closed: a request that cannot be audited is not served.
+        if not interceptor.audit_log.healthy:
+            return _audit_unavailable()
+        client = None
+        if rate_limiter is not None:
+            try:
+                client = rate_limiter.identify(
+                    request.headers.get("authorization"),
+                    request.client.host if request.client else None,
+                )
+                await rate_limiter.check_async(client)
+            except UnknownClient:
+                return _invalid_api_key()
+            except RateLimited as exc:
+                return _rate_limited(exc)
+
         try:
             body = await request.json()
         except Exception:
@@ -104,55 +491,111 @@ def create_app(
                 status_code=400,
             )
 
+        stream = body.get("stream") is True
+        if limiter is None:
+            return await _complete(prompt, stream, client)
+
+        try:
+            await limiter.acquire()
+        except Overloaded as exc:
+            return _overloaded(exc)
+        started = time.perf_counter()
+        try:
+            response = await _complete(prompt, stream, client)
+        except BaseException:
+            limiter.release()
+            raise
+        # Latency runs to the policy decision (and the whole completion
+        # when buffered); 5xx means the upstream failed the request.
+        latency = time.perf_counter() - started
+        failed = response.status_code >= 500
+        # The slot is held until the body has been sent.
+        return _AfterSend(response, lambda: limiter.release(latency, failed))
+
+    async def _complete(prompt: str, stream: bool, client: str | None) -> Response:
         # Run through the interceptor pipeline
-        evaluation = interceptor.evaluate_request(prompt)
+        chunks = None
+        if stream:
+            evaluation, chunks = await interceptor.stream_request_async(prompt)
+        else:
+            evaluation = await interceptor.evaluate_request_async(prompt)
 
-        # Refresh the TUI if connected
-        if dashboard and live:
-            live.update(dashboard)
+        response = _completion_response(evaluation, chunks)
+        if chunks is not None:
+            # Finishes (and audits) the request even if the client left
+            # before the stream was read.
+            response = _AfterSend(response, chunks.aclose)
+        if client is None:
+            return response
+        # Tokens are known once the completion (or its stream) is done.
+        return _AfterSend(
+            response,
+            lambda: rate_limiter.charge_async(client, evaluation.upstream_tokens),
+        )
 
-        if evaluation.decision == Decision.BLOCK:
+    async def reload_policy(request: Request) -> JSONResponse:
+        try:
+            policy = await asyncio.to_thread(interceptor.reload_policy, policy_path)
+        except PolicyError as exc:
             return JSONResponse(
                 {
                     "error": {
-                        "message": (
-                            f"Request blocked by policy:"
-                            f" {evaluation.matched_rule_id}"
-                            f" \u2014 {evaluation.rule_description}"
-                        ),
-                        "type": "policy_violation",
+                        "message": f"Policy reload failed: {exc}",
+                        "type": "invalid_request_error",
                         "param": None,
-                        "code": "content_policy_violation",
+                        "code": "invalid_policy",
                     }
                 },
                 status_code=400,
             )
+        return JSONResponse(
+            {"status": "reloaded", "policy": policy.name, "version": policy.version}
+        )
 
-        # ALLOW or ALLOW_CONSTRAINED
-        content = evaluation.llm_response or ""
+    async def audit(request: Request) -> JSONResponse:
+        try:
+            filters = _audit_filters(request.query_params)
+        except _InvalidQuery as exc:
+            return exc.response()
+        page = await asyncio.to_thread(interceptor.audit_log.query, **filters)
+        next_cursor = page.next_cursor
         return JSONResponse(
             {
-                "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
-                "object": "chat.completion",
-                "created": int(time.time()),
-                "model": "firebreak-proxy",
-                "choices": [
-                    {
-                        "index": 0,
-                        "message": {"role": "assistant", "content": content},
-                        "finish_reason": "stop",
-                    }
-                ],
-                "usage": {
-                    "prompt_tokens": 0,
-                    "completion_tokens": 0,
-                    "total_tokens": 0,
-                },
+                "object": "list",
+                "data": [entry_to_record(entry) for entry in page.entries],
+                "next_cursor": str(next_cursor) if next_cursor is not None else None,
             }
         )
 
+    async def clients(request: Request) -> JSONResponse:
+        usage = await asyncio.to_thread(rate_limiter.usage)
+        return JSONResponse({"object": "list", "data": usage})
+
+    admin_routes = []
+    if admin_key is not None:
+        admin_routes.append(
+            Route("/v1/audit", _admin_only(audit, admin_key), methods=["GET"])
+        )
+        if policy_path is not None:
+            admin_routes.append(
+                Route(
+                    "/admin/policy/reload",
+                    _admin_only(reload_policy, admin_key),
+                    methods=["POST"],
+                )
+            )
+        if rate_limiter is not None:
+            admin_routes.append(
+                Route(
+                    "/admin/clients",
+                    _admin_only(clients, admin_key),
+                    methods=["GET"],
+                )
+            )
+
     return Starlette(
         routes=[
+            *admin_routes,
             Route("/health", health, methods=["GET"]),
             Route("/v1/models", list_models, methods=["GET"]),
             Route(
@@ -0,0 +1,462 @@
+"""Shared, tuned Anthropic clients for every upstream call.
+
+Calls made through UpstreamClients are bounded by a deadline, retried
+with jittered backoff on transient errors, and short-circuited by a
+circuit breaker while the upstream is failing.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+import anthropic
+import httpx
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits, overload.
+RETRYABLE_STATUS = frozenset({408, 409, 429})
+
+
+class UpstreamUnavailable(Exception):
+    """An upstream call failed for good or was not attempted.
+
+    Attributes:
+        reason: "circuit_open" if the breaker refused the call,
+            "timeout" if the deadline passed, or "error" otherwise.
+    """
+
+    def __init__(self, reason: str, message: str = "") -> None:
+        """Create the error.
+
+        Args:
+            reason: "circuit_open", "timeout" or "error".
+            message: Optional detail.
+        """
+        super().__init__(message or reason)
+        self.reason = reason
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether an upstream error is transient and worth retrying.
+
+    Args:
+        exc: The exception raised by the SDK.
+
+    Returns:
+        True for connection errors, timeouts, 408/409/429 and 5xx.
+    """
+    if isinstance(exc, anthropic.APIConnectionError):
+        return True
+    if isinstance(exc, anthropic.APIStatusError):
+        return exc.status_code in RETRYABLE_STATUS or exc.status_code >= 500
+    return False
+
+
+def _counts_as_failure(exc: BaseException) -> bool:
+    """Whether an error says the upstream is unhealthy.
+
+    Client errors (bad request, auth) are the caller's fault and do not
+    trip (or close) the breaker.
+
+    Args:
+        exc: The exception raised by the SDK.
+
+    Returns:
+        False for non-retryable 4xx responses, True otherwise.
+    """
+    if isinstance(exc, anthropic.APIStatusError):
+        return is_retryable(exc)
+    return True
+
+
+@dataclass(slots=True, eq=False)
+class Permit:
+    """Leave to make one upstream call, handed out by CircuitBreaker.allow().
+
+    Permits compare by identity, so only the holder of the trial permit
+    can settle or give back the trial call.
+
+    Attributes:
+        trial: Whether this is the single trial call of a half-open
+            breaker.
+    """
+
+    trial: bool = False
+
+
+class CircuitBreaker:
+    """Fails fast while the recent upstream error rate is too high.
+
+    Outcomes are kept for a sliding window. Once at least min_calls
+    were seen and the failure ratio reaches failure_threshold, the
+    breaker opens and allow() refuses calls for cooldown seconds. It
+    then lets one trial call through: success closes the breaker,
+    failure opens it again. Each call reports its outcome with the
+    Permit that allow() returned.
+
+    Attributes:
+        failure_threshold: Failure ratio that opens the breaker.
+        min_calls: Calls in the window before the ratio is trusted.
+        window: Seconds of history considered.
+        cooldown: Seconds the breaker stays open before a trial call.
+        opened: Number of times the breaker has opened.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: float = 0.5,
+        min_calls: int = 10,
+        window: float = 30.0,
+        cooldown: float = 15.0,
+    ) -> None:
+        """Initialize a closed breaker.
+
+        Args:
+            failure_threshold: Failure ratio that opens the breaker.
+            min_calls: Calls in the window before the ratio is trusted.
+            window: Seconds of history considered.
+            cooldown: Seconds to stay open before a trial call.
+        """
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.window = window
+        self.cooldown = cooldown
+        self.opened = 0
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial: Permit | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half_open"."""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._trial or time.monotonic() - self._opened_at >= self.cooldown:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> Permit | None:
+        """Ask to make a call now.
+
+        Returns:
+            A Permit if closed, or the single trial permit after the
+            cooldown; None while open or while the trial is running.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return Permit()
+            if self._trial or time.monotonic() - self._opened_at < self.cooldown:
+                return None
+            self._trial = Permit(trial=True)
+            return self._trial
+
+    def release(self, permit: Permit) -> None:
+        """Give back a permit whose call ended without an outcome.
+
+        Used when a call is cancelled or says nothing about the
+        upstream's health, so the breaker does not wait forever for the
+        result of its trial call. Releasing any other permit, or one
+        already settled, does nothing.
+
+        Args:
+            permit: The permit returned by allow().
+        """
+        with self._lock:
+            if self._trial is permit:
+                self._trial = None
+
+    def record(self, permit: Permit, ok: bool) -> None:
+        """Record the outcome of an attempted call.
+
+        Args:
+            permit: The permit returned by allow() for the call.
+            ok: Whether the call succeeded.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._opened_at is not None:
+                # Only the trial call's outcome moves an open breaker.
+                if self._trial is not permit:
+                    return
+                self._trial = None
+                if ok:
+                    self._opened_at = None
+                    self._outcomes.clear()
+                    self._failures = 0
+                else:
+                    self._opened_at = now
+                return
+            self._outcomes.append((now, ok))
+            self._failures += not ok
+            while self._outcomes and self._outcomes[0][0] < now - self.window:
+                _, old_ok = self._outcomes.popleft()
+                self._failures -= not old_ok
+            total = len(self._outcomes)
+            if total >= self.min_calls and self._failures / total >= (
+                self.failure_threshold
+            ):
+                self._opened_at = now
+                self.opened += 1
+
+    def record_error(self, permit: Permit, exc: BaseException) -> None:
+        """Record a call that raised.
+
+        Client errors (bad request, auth) are the caller's fault, so
+        they count as neither success nor failure.
+
+        Args:
+            permit: The permit returned by allow() for the call.
+            exc: The error the call raised.
+        """
+        if _counts_as_failure(exc):
+            self.record(permit, False)
+        else:
+            self.release(permit)
+
+
+@dataclass(frozen=True)
+class UpstreamConfig:
+    """Connection pool and timeout settings for upstream API calls.
+
+    Attributes:
+        max_connections: Maximum open connections per client.
+        max_keepalive_connections: Idle connections kept open for reuse.
+        keepalive_expiry: Seconds an idle connection is kept open.
+        http2: Whether to negotiate HTTP/2 (requires the "h2" package,
+            installed by the "http2" extra).
+        connect_timeout: Seconds to wait for a connection.
+        read_timeout: Seconds to wait for response data.
+        pool_timeout: Seconds to wait for a free pooled connection.
+        classify_deadline: Total seconds for a classification call,
+            retries included.
+        forward_deadline: Total seconds for a forwarded LLM call,
+            retries included.
+        max_retries: Retries after a transient error.
+        retry_base_delay: Upper bound of the first retry's random delay;
+            doubled for each further retry.
+        retry_max_delay: Cap on any single retry delay.
+        breaker_threshold: Failure ratio that opens the circuit breaker.
+        breaker_min_calls: Calls in the window before the breaker can
+            open.
+        breaker_window: Seconds of call history the breaker considers.
+        breaker_cooldown: Seconds the breaker stays open.
+    """
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    connect_timeout: float = 5.0
+    read_timeout: float = 600.0
+    pool_timeout: float = 10.0
+    classify_deadline: float = 15.0
+    forward_deadline: float = 120.0
+    max_retries: int = 2
+    retry_base_delay: float = 0.25
+    retry_max_delay: float = 4.0
+    breaker_threshold: float = 0.5
+    breaker_min_calls: int = 10
+    breaker_window: float = 30.0
+    breaker_cooldown: float = 15.0
+
+    def timeout(self) -> anthropic.Timeout:
+        """Build the SDK timeout for these settings."""
+        return anthropic.Timeout(
+            self.read_timeout,
+            connect=self.connect_timeout,
+            pool=self.pool_timeout,
+        )
+
+    def limits(self) -> httpx.Limits:
+        """Build the connection pool limits for these settings."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+class UpstreamClients:
+    """One sync and one async Anthropic client over configured pools.
+
+    Pass a single instance to the classifier and the interceptor so
+    classification and forwarding reuse the same TLS connections, and
+    size max_connections to the proxy's expected concurrency. Requests
+    go through call() or acall(), which own retries (the SDK's own are
+    disabled), deadlines and the shared circuit breaker.
+
+    Attributes:
+        config: The pool and timeout settings in use.
+        client: Shared synchronous client.
+        async_client: Shared asynchronous client.
+        breaker: Circuit breaker shared by every call.
+        retries: Number of retried attempts.
+    """
+
+    def __init__(self, config: UpstreamConfig | None = None) -> None:
+        """Create both clients.
+
+        Args:
+            config: Pool and timeout settings, or None for defaults.
+
+        Raises:
+            ImportError: If config.http2 is set and "h2" is not installed.
+        """
+        self.config = config or UpstreamConfig()
+        options = {
+            "limits": self.config.limits(),
+            "timeout": self.config.timeout(),
+            "http2": self.config.http2,
+        }
+        self.client = anthropic.Anthropic(
+            http_client=anthropic.DefaultHttpxClient(**options), max_retries=0
+        )
+        self.async_client = anthropic.AsyncAnthropic(
+            http_client=anthropic.DefaultAsyncHttpxClient(**options), max_retries=0
+        )
+        self.breaker = CircuitBreaker(
+            failure_threshold=self.config.breaker_threshold,
+            min_calls=self.config.breaker_min_calls,
+            window=self.config.breaker_window,
+            cooldown=self.config.breaker_cooldown,
+        )
+        self.retries = 0
+
+    def call(self, request: Callable[[float], T], deadline: float) -> T:
+        """Run a synchronous upstream request with retries and the breaker.
+
+        Args:
+            request: Makes one attempt. It receives the seconds left
+                before the deadline, to pass to the SDK as its timeout.
+            deadline: Total seconds allowed, retries included.
+
+        Returns:
+            The request's result.
+
+        Raises:
+            UpstreamUnavailable: If the breaker is open, the deadline
+                passed, or the request failed for good.
+        """
+        expires = time.monotonic() + deadline
+        attempt = 0
+        while True:
+            permit, remaining = self._admit(expires)
+            try:
+                result = request(remaining)
+            except Exception as exc:
+                delay = self._failed(permit, exc, attempt, expires)
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.breaker.record(permit, True)
+            return result
+
+    async def acall(
+        self, request: Callable[[float], Awaitable[T]], deadline: float
+    ) -> T:
+        """Run an async upstream request with retries and the breaker.
+
+        Same as call(), but each attempt is also cancelled when the
+        deadline passes, whatever the SDK timeout does.
+
+        Args:
+            request: Makes one attempt, given the seconds left.
+            deadline: Total seconds allowed, retries included.
+
+        Returns:
+            The request's result.
+
+        Raises:
+            UpstreamUnavailable: If the breaker is open, the deadline
+                passed, or the request failed for good.
+        """
+        expires = time.monotonic() + deadline
+        attempt = 0
+        while True:
+            permit, remaining = self._admit(expires)
+            try:
+                async with asyncio.timeout(remaining):
+                    result = await request(remaining)
+            except asyncio.CancelledError:
+                self.breaker.release(permit)
+                raise
+            except Exception as exc:
+                delay = self._failed(permit, exc, attempt, expires)
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self.breaker.record(permit, True)
+            return result
+
+    def _admit(self, expires: float) -> tuple[Permit, float]:
+        """Check the breaker and deadline before an attempt.
+
+        Args:
+            expires: Monotonic time of the deadline.
+
+        Returns:
+            The breaker's permit for the attempt and the seconds left
+            before the deadline.
+
+        Raises:
+            UpstreamUnavailable: If the breaker refuses the call or no
+                time is left.
+        """
+        permit = self.breaker.allow()
+        if permit is None:
+            raise UpstreamUnavailable("circuit_open", "upstream circuit is open")
+        remaining = expires - time.monotonic()
+        if remaining <= 0:
+            # The attempt was never made, so its permit is given back.
+            self.breaker.release(permit)
+            raise UpstreamUnavailable("timeout", "upstream deadline exceeded")
+        return permit, remaining
+
+    def _failed(
+        self, permit: Permit, exc: Exception, attempt: int, expires: float
+    ) -> float:
+        """Record a failed attempt and decide whether to retry.
+
+        Args:
+            permit: The breaker's permit for the attempt.
+            exc: The error raised by the attempt.
+            attempt: Zero-based number of the failed attempt.
+            expires: Monotonic time of the deadline.
+
+        Returns:
+            Seconds to sleep before the next attempt.
+
+        Raises:
+            UpstreamUnavailable: If the error is final.
+        """
+        timed_out = isinstance(exc, (TimeoutError, anthropic.APITimeoutError))
+        self.breaker.record_error(permit, exc)
+        reason = "timeout" if timed_out else "error"
+        if attempt >= self.config.max_retries or not is_retryable(exc):
+            raise UpstreamUnavailable(reason, str(exc)) from exc
+        # Full jitter: spread retries of concurrent callers apart.
+        config = self.config
+        cap = min(config.retry_max_delay, config.retry_base_delay * 2**attempt)
+        delay = random.uniform(0, cap)
+        if time.monotonic() + delay >= expires:
+            raise UpstreamUnavailable("timeout", str(exc)) from exc
+        self.retries += 1
+        return delay
+
+    def close(self) -> None:
+        """Close the synchronous client's connections."""
+        self.client.close()
+
+    async def aclose(self) -> None:
+        """Close both clients' connections."""
+        self.client.close()
+        await self.async_client.close()
@@ -0,0 +1,189 @@
+"""Tests for alert aggregation and dispatch."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from firebreak.alerts import AlertDispatcher, AlertSink, FileSink, WebhookSink
+from firebreak.models import (
+    Alert,
+    AuditLevel,
+    ClassificationResult,
+    Decision,
+    EvaluationResult,
+)
+
+
+def _alert_event(target: str = "trust_safety", category: str = "bulk_surveillance"):
+    """Build an alert event as emitted by the interceptor."""
+    classification = ClassificationResult(
+        intent_category=category, confidence=0.98, raw_prompt="x"
+    )
+    evaluation = EvaluationResult(
+        decision=Decision.BLOCK,
+        matched_rule_id="block-surveillance",
+        rule_description="Mass domestic surveillance",
+        audit_level=AuditLevel.CRITICAL,
+        alerts=(target,),
+        constraints=(),
+        color="red",
+        note="",
+        classification=classification,
+    )
+    return {"target": target, "evaluation": evaluation}
+
+
+class _RecordingSink(AlertSink):
+    """Sink that records batches and fails a set number of times first."""
+
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.batches: list[tuple[str, list[Alert]]] = []
+
+    def send(self, target: str, alerts: list[Alert]) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("unavailable")
+        self.batches.append((target, alerts))
+
+
+class TestAlertSink:
+    """Tests for the AlertSink base class."""
+
+    def test_send_is_abstract(self):
+        """A sink without send() cannot be instantiated."""
+
+        class Incomplete(AlertSink):
+            pass
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+
+class TestAlertDispatcher:
+    """Tests for AlertDispatcher."""
+
+    def test_storm_is_aggregated(self):
+        """Identical alerts in one window become one alert with a count."""
+        sink = _RecordingSink()
+        dispatcher = AlertDispatcher([sink], window=3600)
+        for _ in range(1000):
+            dispatcher.submit(_alert_event())
+
+        dispatcher.close()
+
+        assert dispatcher.received == 1000
+        [(target, alerts)] = sink.batches
+        assert target == "trust_safety"
+        assert len(alerts) == 1
+        assert alerts[0].count == 1000
+        assert alerts[0].first_seen <= alerts[0].last_seen
+
+    def test_batches_per_target(self):
+        """Each target gets one batch holding its distinct alerts."""
+        sink = _RecordingSink()
+        dispatcher = AlertDispatcher([sink], window=3600)
+        dispatcher.submit(_alert_event("trust_safety"))
+        dispatcher.submit(_alert_event("trust_safety", "autonomous_targeting"))
+        dispatcher.submit(_alert_event("legal_counsel"))
+
+        dispatcher.flush()
+        dispatcher.close()
+
+        by_target = {target: alerts for target, alerts in sink.batches}
+        assert len(by_target["trust_safety"]) == 2
+        assert len(by_target["legal_counsel"]) == 1
+
+    def test_retries_then_delivers(self):
+        """A failing sink is retried with backoff."""
+        sink = _RecordingSink(failures=2)
+        dispatcher = AlertDispatcher([sink], window=3600, backoff=0)
+        dispatcher.submit(_alert_event())
+
+        dispatcher.flush()
+
+        assert len(sink.batches) == 1
+        assert dispatcher.sent == 1
+        assert dispatcher.failed == 0
+        dispatcher.close()
+
+    def test_gives_up_after_max_retries(self):
+        """A batch that keeps failing is counted and dropped."""
+        sink = _RecordingSink(failures=10)
+        healthy = _RecordingSink()
+        dispatcher = AlertDispatcher([sink, healthy], max_retries=2, backoff=0)
+        dispatcher.submit(_alert_event())
+
+        dispatcher.flush()
+
+        assert dispatcher.failed == 1
+        assert sink.failures == 7
+        assert len(healthy.batches) == 1
+        dispatcher.close()
+
+    def test_sends_each_window(self):
+        """The sender thread flushes on its own once the window elapses."""
+        sink = _RecordingSink()
+        dispatcher = AlertDispatcher([sink], window=0.05)
+        dispatcher.submit(_alert_event())
+
+        deadline = time.monotonic() + 5
+        while not sink.batches and time.monotonic() < deadline:
+            time.sleep(0.01)
+        dispatcher.close()
+
+        assert len(sink.batches) == 1
+
+
+class TestSinks:
+    """Tests for the built-in sinks."""
+
+    def test_file_sink_appends_records(self, tmp_path):
+        """FileSink writes one JSON line per alert."""
+        path = tmp_path / "alerts.jsonl"
+        dispatcher = AlertDispatcher([FileSink(str(path))], window=3600)
+        for _ in range(3):
+            dispatcher.submit(_alert_event())
+        dispatcher.close()
+
+        [record] = [json.loads(line) for line in path.read_text().splitlines()]
+        assert record["target"] == "trust_safety"
+        assert record["decision"] == "BLOCK"
+        assert record["count"] == 3
+
+    def test_webhook_sink_posts_batch(self):
+        """WebhookSink POSTs the target and its alerts as JSON."""
+        received = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                received.append(json.loads(self.rfile.read(length)))
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = f"http://127.0.0.1:{server.server_port}/hook"
+            alert = Alert(
+                target="trust_safety",
+                rule_id="block-surveillance",
+                rule_description="Mass domestic surveillance",
+                intent_category="bulk_surveillance",
+                decision=Decision.BLOCK,
+                count=5,
+            )
+            WebhookSink(url).send("trust_safety", [alert])
+        finally:
+            server.shutdown()
+
+        assert received[0]["target"] == "trust_safety"
+        assert received[0]["alerts"][0]["count"] == 5
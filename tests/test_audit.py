@@ -0,0 +1,827 @@
+"""Tests for the durable audit log backends."""
+
+import gzip
+import json
+import sqlite3
+import time
+import tracemalloc
+import zlib
+from unittest.mock import patch
+
+import pytest
+
+from firebreak.audit import (
+    AuditLog,
+    AuditWriteError,
+    FileAuditLog,
+    entry_from_record,
+    entry_to_record,
+)
+from firebreak.audit_segments import (
+    SegmentSummary,
+    iter_log_lines,
+    open_segment,
+    segment_files,
+)
+from firebreak.blobs import BlobStore, blob_digest
+from firebreak.integrity import canonical_json, tombstone, verify_records
+from firebreak.models import (
+    AuditLevel,
+    ClassificationResult,
+    Decision,
+    EvaluationResult,
+)
+
+
+def _classification(prompt: str = "test") -> ClassificationResult:
+    """Build a ClassificationResult for audit tests."""
+    return ClassificationResult(
+        intent_category="summarization", confidence=0.9, raw_prompt=prompt
+    )
+
+
+def _evaluation(classification: ClassificationResult, **kwargs) -> EvaluationResult:
+    """Build an EvaluationResult for audit tests."""
+    fields = {
+        "decision": Decision.ALLOW,
+        "matched_rule_id": "allow-analysis",
+        "rule_description": "Allow analysis",
+        "audit_level": AuditLevel.STANDARD,
+        "alerts": (),
+        "constraints": (),
+        "color": "green",
+        "note": "",
+    }
+    fields.update(kwargs)
+    return EvaluationResult(classification=classification, **fields)
+
+
+def _tamper(path: str, digest: str, body: str) -> None:
+    """Overwrite a stored blob body behind the store's back."""
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "UPDATE blobs SET data = ? WHERE digest = ?",
+        (zlib.compress(body.encode()), digest),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _read_records(path) -> list[dict]:
+    """Read the entry records (not checkpoints) from an audit file."""
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    return [r for r in records if r["type"] == "entry"]
+
+
+class TestAuditLogRetention:
+    """Tests for the in-memory entry cap."""
+
+    def test_unbounded_by_default(self):
+        """Without max_entries every entry is kept."""
+        audit_log = AuditLog()
+        c = _classification()
+        for i in range(100):
+            audit_log.log(f"p{i}", c, _evaluation(c))
+
+        assert len(audit_log.entries) == 100
+
+    def test_trims_oldest_entries(self):
+        """Entries beyond max_entries (plus slack) are dropped oldest first."""
+        audit_log = AuditLog(max_entries=8)
+        c = _classification()
+        for i in range(50):
+            audit_log.log(f"p{i}", c, _evaluation(c))
+
+        assert len(audit_log.entries) <= 10
+        assert audit_log.entries[-1].prompt_text == "p49"
+
+
+class TestPromptSharing:
+    """Tests that audit entries keep one copy of repeated prompt text."""
+
+    def test_entry_reuses_classification_prompt(self):
+        """An equal prompt is stored as the classification's string."""
+        c = _classification("summarize the brief")
+        prompt = "".join(["summarize ", "the brief"])
+
+        entry = AuditLog().log(prompt, c, _evaluation(c))
+
+        assert entry.prompt_text is c.raw_prompt
+
+    def test_different_prompt_kept(self):
+        """A prompt that differs from the classification's is kept as is."""
+        c = _classification("Summarize the brief")
+
+        entry = AuditLog().log("summarize the brief", c, _evaluation(c))
+
+        assert entry.prompt_text == "summarize the brief"
+
+    def test_templated_prompts_footprint(self):
+        """Repeated large prompts cost far less than their text per entry."""
+        template = "Summarize the following threat briefing. " * 50
+        c = _classification(template)
+        evaluation = _evaluation(c)
+        audit_log = AuditLog()
+
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            for _ in range(1000):
+                audit_log.log(template[:-1] + template[-1], c, evaluation)
+            per_entry = (tracemalloc.get_traced_memory()[0] - before) / 1000
+        finally:
+            tracemalloc.stop()
+
+        assert per_entry < len(template) / 2
+
+
+class TestEntryToRecord:
+    """Tests for entry serialization."""
+
+    def test_round_trips_through_json(self):
+        """The record is JSON-serializable and carries the decision."""
+        c = _classification("hello")
+        evaluation = _evaluation(
+            c, decision=Decision.BLOCK, alerts=("security_team",), note="nope"
+        )
+        entry = AuditLog().log("hello", c, evaluation)
+
+        record = json.loads(json.dumps(entry_to_record(entry)))
+
+        assert record["id"] == entry.id
+        assert record["prompt"] == "hello"
+        assert record["classification"]["intent_category"] == "summarization"
+        assert record["evaluation"]["decision"] == "BLOCK"
+        assert record["evaluation"]["alerts"] == ["security_team"]
+
+
+class TestFileAuditLog:
+    """Tests for FileAuditLog."""
+
+    def test_entries_written_after_flush(self, tmp_path):
+        """flush() makes every logged entry durable on disk."""
+        path = tmp_path / "audit.jsonl"
+        audit_log = FileAuditLog(str(path), fsync_interval=60)
+        c = _classification()
+        first = audit_log.log("one", c, _evaluation(c))
+        audit_log.log("two", c, _evaluation(c))
+
+        audit_log.flush()
+
+        records = _read_records(path)
+        assert [r["prompt"] for r in records] == ["one", "two"]
+        assert records[0]["id"] == first.id
+        audit_log.close()
+
+    def test_close_drains_queue(self, tmp_path):
+        """close() writes queued entries before returning."""
+        path = tmp_path / "audit.jsonl"
+        audit_log = FileAuditLog(str(path), batch_size=2)
+        c = _classification()
+        for i in range(5):
+            audit_log.log(f"p{i}", c, _evaluation(c))
+
+        audit_log.close()
+        audit_log.close()
+
+        assert len(_read_records(path)) == 5
+
+    def test_write_failure_marks_log_unhealthy(self, tmp_path):
+        """An OSError in the writer fails flush() instead of hanging."""
+        audit_log = FileAuditLog(str(tmp_path / "audit.jsonl"), fsync_interval=60)
+        c = _classification()
+        with patch.object(audit_log, "_sync", side_effect=OSError("disk full")):
+            audit_log.log("one", c, _evaluation(c))
+            with pytest.raises(AuditWriteError):
+                audit_log.flush()
+
+            audit_log.log("two", c, _evaluation(c))
+
+            assert not audit_log.healthy
+            assert isinstance(audit_log.error, OSError)
+            assert audit_log._queue.empty()
+            with pytest.raises(AuditWriteError):
+                audit_log.flush()
+            audit_log.close()
+
+    def test_appends_across_reopen(self, tmp_path):
+        """A reopened log appends rather than truncating."""
+        path = tmp_path / "audit.jsonl"
+        c = _classification()
+        for prompt in ("first", "second"):
+            audit_log = FileAuditLog(str(path))
+            audit_log.log(prompt, c, _evaluation(c))
+            audit_log.close()
+
+        assert [r["prompt"] for r in _read_records(path)] == ["first", "second"]
+
+    def test_memory_is_bounded(self, tmp_path):
+        """Only the most recent entries stay in memory."""
+        audit_log = FileAuditLog(str(tmp_path / "audit.jsonl"), max_entries=4)
+        c = _classification()
+        for i in range(20):
+            audit_log.log(f"p{i}", c, _evaluation(c))
+        audit_log.close()
+
+        assert len(audit_log.entries) <= 5
+        assert len(_read_records(tmp_path / "audit.jsonl")) == 20
+
+
+class TestFileAuditLogChain:
+    """Tests for hash chaining in FileAuditLog."""
+
+    def test_log_verifies(self, tmp_path):
+        """A written log passes chain and checkpoint verification."""
+        path = tmp_path / "audit.jsonl"
+        audit_log = FileAuditLog(str(path), checkpoint_interval=3)
+        c = _classification()
+        for i in range(7):
+            audit_log.log(f"p{i}", c, _evaluation(c))
+        audit_log.close()
+
+        with open(path, encoding="utf-8") as f:
+            report = verify_records(f)
+
+        assert report.ok
+        assert report.records == 7
+        assert report.checkpoints == 3
+
+    def test_chain_continues_across_reopen(self, tmp_path):
+        """A reopened log extends the existing chain and sequence."""
+        path = tmp_path / "audit.jsonl"
+        c = _classification()
+        for prompt in ("first", "second"):
+            audit_log = FileAuditLog(str(path))
+            audit_log.log(prompt, c, _evaluation(c))
+            audit_log.close()
+
+        entries = _read_records(path)
+        with open(path, encoding="utf-8") as f:
+            assert verify_records(f).ok
+        assert [r["seq"] for r in entries] == [0, 1]
+
+    def test_torn_tail_truncated(self, tmp_path):
+        """A partial final line from a crash is dropped on reopen."""
+        path = tmp_path / "audit.jsonl"
+        c = _classification()
+        audit_log = FileAuditLog(str(path))
+        audit_log.log("kept", c, _evaluation(c))
+        audit_log.close()
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"type": "entry", "seq"')
+
+        audit_log = FileAuditLog(str(path))
+        audit_log.log("after", c, _evaluation(c))
+        audit_log.close()
+
+        with open(path, encoding="utf-8") as f:
+            assert verify_records(f).ok
+
+
+class TestAuditQuery:
+    """Tests for indexed audit queries."""
+
+    def _populated(self, audit_log: AuditLog) -> AuditLog:
+        """Log a mix of ALLOW and BLOCK entries across two categories."""
+        for i in range(30):
+            category = "pattern_of_life" if i % 3 == 0 else "summarization"
+            c = ClassificationResult(
+                intent_category=category, confidence=0.9, raw_prompt=f"p{i}"
+            )
+            if i % 3 == 0:
+                evaluation = _evaluation(
+                    c,
+                    decision=Decision.BLOCK,
+                    matched_rule_id="block-pol",
+                    alerts=("security_team",),
+                )
+            else:
+                evaluation = _evaluation(c)
+            audit_log.log(f"p{i}", c, evaluation)
+        return audit_log
+
+    def test_filters_combine(self):
+        """Every given filter must match."""
+        audit_log = self._populated(AuditLog())
+
+        page = audit_log.query(decision=Decision.BLOCK, category="pattern_of_life")
+
+        assert [e.prompt_text for e in page.entries] == [
+            f"p{i}" for i in range(0, 30, 3)
+        ]
+        assert page.next_cursor is None
+
+    def test_unknown_value_matches_nothing(self):
+        """A filter value never logged returns an empty page."""
+        audit_log = self._populated(AuditLog())
+
+        assert audit_log.query(rule_id="no-such-rule").entries == []
+
+    def test_cursor_pagination(self):
+        """Pages chain through next_cursor without overlap."""
+        audit_log = self._populated(AuditLog())
+        seen: list[str] = []
+        cursor = None
+        while True:
+            page = audit_log.query(alert="security_team", cursor=cursor, limit=4)
+            seen.extend(e.prompt_text for e in page.entries)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert seen == [f"p{i}" for i in range(0, 30, 3)]
+
+    def test_time_range(self):
+        """since is inclusive and until is exclusive."""
+        audit_log = AuditLog()
+        c = _classification()
+        entries = []
+        for i in range(5):
+            entries.append(audit_log.log(f"p{i}", c, _evaluation(c)))
+            time.sleep(0.002)
+
+        page = audit_log.query(since=entries[1].timestamp, until=entries[3].timestamp)
+
+        assert [e.prompt_text for e in page.entries] == ["p1", "p2"]
+
+    def test_time_range_over_out_of_order_entries(self):
+        """Relayed entries logged out of time order are still bounded."""
+        source = AuditLog()
+        c = _classification()
+        entries = []
+        for i in range(5):
+            entries.append(source.log(f"p{i}", c, _evaluation(c)))
+            time.sleep(0.002)
+        audit_log = AuditLog()
+        for i in (0, 3, 1, 4, 2):
+            audit_log.append(entries[i])
+
+        since, until = entries[1].timestamp, entries[3].timestamp
+        page = audit_log.query(since=since, until=until)
+        filtered = audit_log.query(category="summarization", since=since, until=until)
+
+        assert [e.prompt_text for e in page.entries] == ["p1", "p2"]
+        assert [e.prompt_text for e in filtered.entries] == ["p1", "p2"]
+
+    def test_invalid_limit(self):
+        """A limit below 1 is rejected."""
+        with pytest.raises(ValueError):
+            AuditLog().query(limit=0)
+
+    def test_trimmed_entries_leave_the_index(self):
+        """The in-memory log only answers for entries it still holds."""
+        audit_log = self._populated(AuditLog(max_entries=8))
+
+        page = audit_log.query(decision=Decision.BLOCK, limit=100)
+
+        held = {e.id for e in audit_log.entries}
+        assert page.entries
+        assert all(e.id in held for e in page.entries)
+        assert len(audit_log.get_alerts()) == len(page.entries)
+
+    def test_file_log_reads_trimmed_entries_from_disk(self, tmp_path):
+        """FileAuditLog answers for entries no longer held in memory."""
+        audit_log = self._populated(
+            FileAuditLog(str(tmp_path / "audit.jsonl"), max_entries=4)
+        )
+
+        page = audit_log.query(decision=Decision.BLOCK)
+        audit_log.close()
+
+        assert [e.prompt_text for e in page.entries] == [
+            f"p{i}" for i in range(0, 30, 3)
+        ]
+        assert page.entries[0].evaluation.alerts == ("security_team",)
+
+    def test_file_log_queries_entries_from_before_reopen(self, tmp_path):
+        """Entries written by an earlier process are found after a restart."""
+        path = str(tmp_path / "audit.jsonl")
+        self._populated(FileAuditLog(path)).close()
+        audit_log = self._populated(FileAuditLog(path))
+        seen: list[str] = []
+        cursor = None
+        while True:
+            page = audit_log.query(decision=Decision.BLOCK, cursor=cursor, limit=7)
+            seen.extend(e.prompt_text for e in page.entries)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        audit_log.close()
+
+        assert seen == [f"p{i}" for i in range(0, 30, 3)] * 2
+
+    def test_file_log_index_is_bounded(self, tmp_path):
+        """Only max_indexed entries stay indexed; older ones are scanned."""
+        audit_log = self._populated(
+            FileAuditLog(str(tmp_path / "audit.jsonl"), max_entries=4, max_indexed=8)
+        )
+        audit_log.flush()
+
+        page = audit_log.query(alert="security_team", limit=100)
+        everything = audit_log.query(limit=100).entries
+        since = everything[8].timestamp
+        later = audit_log.query(decision=Decision.ALLOW, since=since, limit=100)
+        indexed = len(audit_log._timestamps)
+        offsets = len(audit_log._offsets)
+        audit_log.close()
+
+        assert [e.prompt_text for e in page.entries] == [
+            f"p{i}" for i in range(0, 30, 3)
+        ]
+        assert len(everything) == 30
+        assert later.entries == [
+            e
+            for e in everything
+            if e.timestamp >= since and e.evaluation.decision == Decision.ALLOW
+        ]
+        assert indexed <= 10
+        assert offsets < 30
+
+
+class TestEntryFromRecord:
+    """Tests for record deserialization."""
+
+    def test_round_trip(self):
+        """entry_from_record() inverts entry_to_record()."""
+        c = _classification("hello")
+        entry = AuditLog().log("hello", c, _evaluation(c, note="n"))
+
+        restored = entry_from_record(entry_to_record(entry))
+
+        assert restored == entry
+
+
+class TestSegmentRotation:
+    """Tests for segment rotation, compression and retention."""
+
+    def _log(self, audit_log: FileAuditLog, n: int, level: AuditLevel) -> None:
+        """Log n entries at the given audit level."""
+        c = _classification()
+        for i in range(n):
+            audit_log.log(f"{level.value}-{i}", c, _evaluation(c, audit_level=level))
+            audit_log.flush()
+
+    def test_summary_spans_out_of_order_entries(self):
+        """A segment's time range covers entries written out of order."""
+        c = _classification()
+        source = AuditLog()
+        early = source.log("early", c, _evaluation(c))
+        time.sleep(0.002)
+        late = source.log("late", c, _evaluation(c))
+        summary = SegmentSummary()
+        for seq, entry in enumerate((late, early)):
+            summary.add({**entry_to_record(entry), "seq": seq})
+
+        assert summary.first_timestamp == early.timestamp.timestamp()
+        assert summary.last_timestamp == late.timestamp.timestamp()
+        level = summary.levels["standard"]
+        assert (level["oldest"], level["newest"]) == (
+            summary.first_timestamp,
+            summary.last_timestamp,
+        )
+
+    def test_rotates_into_compressed_segments(self, tmp_path):
+        """Full segments are footed, gzipped and listed in the manifest."""
+        path = tmp_path / "audit.jsonl"
+        audit_log = FileAuditLog(str(path), max_segment_bytes=2000)
+        self._log(audit_log, 12, AuditLevel.STANDARD)
+        audit_log.close()
+
+        sealed = segment_files(str(path))[:-1]
+        assert sealed and all(name.endswith(".gz") for name in sealed)
+        with open_segment(sealed[0]) as f:
+            footer = json.loads(f.readlines()[-1])
+        assert footer["type"] == "footer"
+        assert footer["levels"]["standard"]["count"] == footer["last_seq"] + 1
+        report = verify_records(iter_log_lines(str(path)))
+        assert report.ok
+        assert report.records == 12
+
+    def test_query_reads_sealed_segments(self, tmp_path):
+        """Trimmed entries in sealed segments are read back by query()."""
+        path = tmp_path / "audit.jsonl"
+        audit_log = FileAuditLog(str(path), max_entries=2, max_segment_bytes=2000)
+        self._log(audit_log, 12, AuditLevel.STANDARD)
+
+        page = audit_log.query(limit=100)
+        audit_log.close()
+
+        assert [e.prompt_text for e in page.entries] == [
+            f"standard-{i}" for i in range(12)
+        ]
+
+    def test_query_skips_segments_by_footer_keys(self, tmp_path, monkeypatch):
+        """Segments whose footer index lacks the value are never opened."""
+        path = tmp_path / "audit.jsonl"
+        audit_log = FileAuditLog(str(path), max_segment_bytes=2000)
+        self._log(audit_log, 12, AuditLevel.STANDARD)
+        c = ClassificationResult(
+            intent_category="pattern_of_life", confidence=0.9, raw_prompt="rare"
+        )
+        audit_log.log("rare", c, _evaluation(c))
+        self._log(audit_log, 12, AuditLevel.STANDARD)
+        audit_log.close()
+        opened = []
+
+        def tracking_open(name):
+            opened.append(name)
+            return open_segment(name)
+
+        monkeypatch.setattr("firebreak.audit.open_segment", tracking_open)
+        audit_log = FileAuditLog(str(path), max_segment_bytes=2000)
+        page = audit_log.query(category="pattern_of_life")
+        audit_log.close()
+
+        assert [e.prompt_text for e in page.entries] == ["rare"]
+        assert len(opened) == 1
+        assert len(segment_files(str(path))) > 2
+
+    def test_chain_continues_after_reopen(self, tmp_path):
+        """A reopened log resumes from the last sealed segment."""
+        path = tmp_path / "audit.jsonl"
+        for _ in range(2):
+            audit_log = FileAuditLog(str(path), max_segment_bytes=2000)
+            self._log(audit_log, 6, AuditLevel.STANDARD)
+            audit_log.close()
+
+        report = verify_records(iter_log_lines(str(path)))
+        assert report.ok
+        assert report.records == 12
+
+    def test_retention_redacts_expired_levels(self, tmp_path):
+        """Expired STANDARD entries become tombstones; CRITICAL is kept."""
+        path = tmp_path / "audit.jsonl"
+        audit_log = FileAuditLog(
+            str(path),
+            max_segment_bytes=4000,
+            retention={AuditLevel.STANDARD: 3600, AuditLevel.CRITICAL: None},
+        )
+        for i in range(8):
+            level = AuditLevel.CRITICAL if i % 2 else AuditLevel.STANDARD
+            self._log(audit_log, 1, level)
+        audit_log.close()
+
+        audit_log = FileAuditLog(
+            str(path),
+            retention={AuditLevel.STANDARD: 3600, AuditLevel.CRITICAL: None},
+        )
+        audit_log.apply_retention(now=time.time() + 7200)
+        audit_log.close()
+
+        report = verify_records(iter_log_lines(str(path)), now=time.time() + 7200)
+        assert report.ok
+        assert report.redacted > 0
+        sealed = []
+        for name in segment_files(str(path))[:-1]:
+            with open_segment(name) as f:
+                sealed.extend(json.loads(line) for line in f)
+        kept = [r for r in sealed if r["type"] == "entry"]
+        assert kept
+        assert all(r["evaluation"]["audit_level"] == "critical" for r in kept)
+
+    def _redacted_log(self, path) -> None:
+        """Write sealed STANDARD and CRITICAL entries, then redact STANDARD."""
+        retention = {AuditLevel.STANDARD: 3600, AuditLevel.CRITICAL: None}
+        audit_log = FileAuditLog(str(path), max_segment_bytes=4000, retention=retention)
+        for i in range(8):
+            level = AuditLevel.CRITICAL if i % 2 else AuditLevel.STANDARD
+            self._log(audit_log, 1, level)
+        audit_log.apply_retention(now=time.time() + 7200)
+        audit_log.close()
+
+    def _rewrite_first_segment(self, path, edit) -> None:
+        """Apply edit to the records of the first sealed segment."""
+        first = segment_files(str(path))[0]
+        with open_segment(first) as f:
+            records = [json.loads(line) for line in f]
+        records = [edit(record) for record in records]
+        with gzip.open(first, "wt", encoding="utf-8") as f:
+            f.writelines(canonical_json(record) + "\n" for record in records)
+
+    def test_forged_tombstone_rejected(self, tmp_path):
+        """Replacing a CRITICAL entry with a tombstone fails verification."""
+        path = tmp_path / "audit.jsonl"
+        self._redacted_log(path)
+
+        def edit(record):
+            critical = record.get("evaluation", {}).get("audit_level") == "critical"
+            return tombstone(record) if critical else record
+
+        self._rewrite_first_segment(path, edit)
+        report = verify_records(iter_log_lines(str(path)), now=time.time() + 7200)
+
+        assert report.error == "redacted record was not due for removal"
+
+    def test_tombstone_level_is_hashed(self, tmp_path):
+        """A tombstone's audit level cannot be changed to pass the check."""
+        path = tmp_path / "audit.jsonl"
+        self._redacted_log(path)
+
+        def edit(record):
+            if record["type"] == "redacted":
+                record["audit_level"] = "enhanced"
+            return record
+
+        self._rewrite_first_segment(path, edit)
+        report = verify_records(iter_log_lines(str(path)), now=time.time() + 7200)
+
+        assert report.error == "record hash mismatch"
+
+    def test_early_tombstone_rejected(self, tmp_path):
+        """Tombstones younger than their retention fail verification."""
+        path = tmp_path / "audit.jsonl"
+        self._redacted_log(path)
+
+        report = verify_records(iter_log_lines(str(path)))
+        override = verify_records(
+            iter_log_lines(str(path)), retention={"standard": 0.0}
+        )
+
+        assert report.error == "redacted record was not due for removal"
+        assert override.ok
+
+    def test_query_after_redaction(self, tmp_path):
+        """Rewritten segments are still readable and redacted entries unlisted."""
+        path = tmp_path / "audit.jsonl"
+        audit_log = FileAuditLog(
+            str(path),
+            max_entries=2,
+            max_segment_bytes=4000,
+            retention={AuditLevel.STANDARD: 3600},
+        )
+        for i in range(16):
+            level = AuditLevel.CRITICAL if i % 2 else AuditLevel.STANDARD
+            self._log(audit_log, 1, level)
+        sealed_up_to = audit_log._segments[-1]["last_seq"]
+        audit_log.apply_retention(now=time.time() + 7200)
+
+        page = audit_log.query(limit=3)
+        rest = audit_log.query(cursor=page.next_cursor, limit=100)
+        standard = audit_log.query(category="summarization", rule_id="allow-analysis")
+        audit_log.close()
+
+        seqs = [i for i in range(16) if i % 2 or i > sealed_up_to]
+        assert len(page.entries) == 3
+        assert len(page.entries) + len(rest.entries) == len(seqs)
+        assert all(
+            e.evaluation.audit_level == AuditLevel.CRITICAL for e in page.entries
+        )
+        assert len(standard.entries) == len(seqs)
+
+    def test_retention_deletes_fully_expired_segments(self, tmp_path):
+        """A segment with nothing left to keep is deleted."""
+        path = tmp_path / "audit.jsonl"
+        retention = {AuditLevel.STANDARD: 3600}
+        audit_log = FileAuditLog(str(path), max_segment_bytes=2000, retention=retention)
+        self._log(audit_log, 12, AuditLevel.STANDARD)
+        audit_log.close()
+        before = len(segment_files(str(path)))
+
+        audit_log = FileAuditLog(str(path), retention=retention)
+        self._log(audit_log, 1, AuditLevel.STANDARD)
+        audit_log.apply_retention(now=time.time() + 7200)
+        audit_log.close()
+
+        assert len(segment_files(str(path))) == before
+        assert before > 1
+        report = verify_records(iter_log_lines(str(path)), now=time.time() + 7200)
+        assert report.ok
+        assert report.records == 1
+        assert report.expired == 12
+        assert [e.prompt_text for e in audit_log.query().entries] == ["standard-0"]
+
+    def test_anchor_bridges_deleted_middle_segment(self, tmp_path):
+        """A deleted segment between kept ones still verifies from genesis."""
+        path = tmp_path / "audit.jsonl"
+        retention = {AuditLevel.STANDARD: 3600}
+        audit_log = FileAuditLog(str(path), max_segment_bytes=2000, retention=retention)
+        self._log(audit_log, 5, AuditLevel.CRITICAL)
+        self._log(audit_log, 10, AuditLevel.STANDARD)
+        self._log(audit_log, 10, AuditLevel.CRITICAL)
+        audit_log.apply_retention(now=time.time() + 7200)
+        audit_log.close()
+
+        report = verify_records(iter_log_lines(str(path)), now=time.time() + 7200)
+
+        assert report.ok
+        assert report.expired > 0
+        assert report.records + report.redacted + report.expired == 25
+
+    def test_forged_anchor_rejected(self, tmp_path):
+        """An anchor whose footer was altered does not bridge the gap."""
+        path = tmp_path / "audit.jsonl"
+        retention = {AuditLevel.STANDARD: 3600}
+        audit_log = FileAuditLog(str(path), max_segment_bytes=2000, retention=retention)
+        self._log(audit_log, 12, AuditLevel.STANDARD)
+        audit_log.apply_retention(now=time.time() + 7200)
+        audit_log.close()
+        first = segment_files(str(path))[0]
+        with open_segment(first) as f:
+            anchor = json.loads(f.read())
+        anchor["footer"]["levels"]["standard"]["newest"] = 0.0
+        with gzip.open(first, "wt", encoding="utf-8") as f:
+            f.write(json.dumps(anchor) + "\n")
+
+        report = verify_records(iter_log_lines(str(path)))
+
+        assert report.error == "anchor footer hash mismatch"
+
+
+class TestBlobStorage:
+    """Tests for content-addressed prompt and response bodies."""
+
+    def _log(self, audit_log: FileAuditLog, prompt: str, **kwargs) -> None:
+        """Log one entry and wait for it to be written."""
+        c = _classification(prompt)
+        audit_log.log(prompt, c, _evaluation(c, **kwargs))
+        audit_log.flush()
+
+    def test_large_bodies_stored_once(self, tmp_path):
+        """Repeated large prompts are written to the blob store once."""
+        path = tmp_path / "audit.jsonl"
+        blobs = BlobStore(str(tmp_path / "blobs.db"))
+        audit_log = FileAuditLog(str(path), blobs=blobs, blob_threshold=100)
+        prompt = "x" * 5000
+        for _ in range(5):
+            self._log(audit_log, prompt, llm_response="y" * 5000)
+        self._log(audit_log, "short")
+
+        records = _read_records(path)
+        assert len(blobs) == 2
+        audit_log.close()
+
+        assert all(r["prompt_blob"] == blob_digest(prompt) for r in records[:5])
+        assert all("prompt" not in r for r in records[:5])
+        assert all("llm_response_blob" in r["evaluation"] for r in records[:5])
+        assert records[5]["prompt"] == "short"
+        assert path.stat().st_size < 5000
+        assert verify_records(iter_log_lines(str(path))).ok
+
+    def test_query_restores_bodies(self, tmp_path):
+        """Entries read back from disk carry the full bodies."""
+        path = tmp_path / "audit.jsonl"
+        audit_log = FileAuditLog(
+            str(path),
+            max_entries=1,
+            blobs=BlobStore(str(tmp_path / "blobs.db")),
+            blob_threshold=10,
+        )
+        prompt = "summarize " * 20
+        self._log(audit_log, prompt, llm_response="summary " * 20)
+        self._log(audit_log, "short")
+
+        page = audit_log.query(limit=10)
+        audit_log.close()
+
+        assert page.entries[0].prompt_text == prompt
+        assert page.entries[0].classification.raw_prompt == prompt
+        assert page.entries[0].evaluation.llm_response == "summary " * 20
+
+    def test_altered_body_not_returned(self, tmp_path):
+        """Entries whose stored body was edited are left out of queries."""
+        path = tmp_path / "audit.jsonl"
+        db = str(tmp_path / "blobs.db")
+        audit_log = FileAuditLog(
+            str(path), max_entries=1, blobs=BlobStore(db), blob_threshold=10
+        )
+        prompt = "summarize " * 20
+        self._log(audit_log, prompt)
+        for i in range(3):
+            self._log(audit_log, f"short {i}")
+        _tamper(db, blob_digest(prompt), "forged " * 20)
+
+        page = audit_log.query(limit=10)
+        audit_log.close()
+
+        assert [e.prompt_text for e in page.entries] == [f"short {i}" for i in range(3)]
+        assert audit_log.corrupt_blobs == 1
+
+    def test_retention_releases_bodies(self, tmp_path):
+        """Bodies of expired entries are deleted from the blob store."""
+        path = tmp_path / "audit.jsonl"
+        db = str(tmp_path / "blobs.db")
+        retention = {AuditLevel.STANDARD: 3600}
+        audit_log = FileAuditLog(
+            str(path),
+            max_segment_bytes=2000,
+            retention=retention,
+            blobs=BlobStore(db),
+            blob_threshold=10,
+        )
+        for i in range(12):
+            self._log(audit_log, f"prompt number {i} " * 10)
+        audit_log.close()
+
+        audit_log = FileAuditLog(
+            str(path), retention=retention, blobs=BlobStore(db), blob_threshold=10
+        )
+        self._log(audit_log, "prompt kept after retention")
+        audit_log.apply_retention(now=time.time() + 7200)
+        audit_log.close()
+
+        blobs = BlobStore(db)
+        remaining = len(blobs)
+        blobs.close()
+        assert remaining == 1
+        assert verify_records(iter_log_lines(str(path)), now=time.time() + 7200).ok
@@ -0,0 +1,143 @@
+"""Tests for the firebreak-audit command."""
+
+import json
+import sqlite3
+import time
+import zlib
+
+from firebreak.audit import FileAuditLog
+from firebreak.audit_cli import main
+from firebreak.blobs import BlobStore, blob_digest
+from firebreak.models import (
+    AuditLevel,
+    ClassificationResult,
+    Decision,
+    EvaluationResult,
+)
+
+
+def _tamper(path: str, digest: str, body: str) -> None:
+    """Overwrite a stored blob body behind the store's back."""
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "UPDATE blobs SET data = ? WHERE digest = ?",
+        (zlib.compress(body.encode()), digest),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _write_log(path, n: int = 5) -> None:
+    """Write n chained entries to an audit log."""
+    audit_log = FileAuditLog(str(path), checkpoint_interval=2)
+    c = ClassificationResult(
+        intent_category="summarization", confidence=0.9, raw_prompt="p"
+    )
+    evaluation = EvaluationResult(
+        decision=Decision.ALLOW,
+        matched_rule_id="allow-analysis",
+        rule_description="Allow analysis",
+        audit_level=AuditLevel.STANDARD,
+        alerts=(),
+        constraints=(),
+        color="green",
+        note="",
+        classification=c,
+    )
+    for i in range(n):
+        audit_log.log(f"p{i}", c, evaluation)
+    audit_log.close()
+
+
+class TestAuditCli:
+    """Tests for firebreak-audit subcommands."""
+
+    def test_verify_ok(self, tmp_path, capsys):
+        """verify exits 0 for an intact log."""
+        path = tmp_path / "audit.jsonl"
+        _write_log(path)
+
+        assert main(["verify", str(path)]) == 0
+        assert "OK: 5 records" in capsys.readouterr().out
+
+    def test_verify_retain_override(self, tmp_path, capsys):
+        """--retain checks removals against the given policy."""
+        path = tmp_path / "audit.jsonl"
+        audit_log = FileAuditLog(
+            str(path), max_segment_bytes=1500, retention={AuditLevel.STANDARD: 0}
+        )
+        c = ClassificationResult(
+            intent_category="summarization", confidence=0.9, raw_prompt="p"
+        )
+        evaluation = EvaluationResult(
+            decision=Decision.ALLOW,
+            matched_rule_id="allow-analysis",
+            rule_description="Allow analysis",
+            audit_level=AuditLevel.STANDARD,
+            alerts=(),
+            constraints=(),
+            color="green",
+            note="",
+            classification=c,
+        )
+        for i in range(8):
+            audit_log.log(f"p{i}", c, evaluation)
+            audit_log.flush()
+        audit_log.apply_retention(now=time.time() + 1)
+        audit_log.close()
+
+        assert main(["verify", str(path)]) == 0
+        assert "expired" in capsys.readouterr().out
+        assert main(["verify", str(path), "--retain", "standard=forever"]) == 1
+
+    def test_verify_blobs(self, tmp_path, capsys):
+        """verify --blobs detects an edited body in the blob store."""
+        path = tmp_path / "audit.jsonl"
+        db = str(tmp_path / "blobs.db")
+        audit_log = FileAuditLog(str(path), blobs=BlobStore(db), blob_threshold=10)
+        prompt = "summarize " * 20
+        c = ClassificationResult(
+            intent_category="summarization", confidence=0.9, raw_prompt=prompt
+        )
+        evaluation = EvaluationResult(
+            decision=Decision.ALLOW,
+            matched_rule_id="allow-analysis",
+            rule_description="Allow analysis",
+            audit_level=AuditLevel.STANDARD,
+            alerts=(),
+            constraints=(),
+            color="green",
+            note="",
+            classification=c,
+        )
+        audit_log.log(prompt, c, evaluation)
+        audit_log.close()
+
+        assert main(["verify", str(path), "--blobs", db]) == 0
+        _tamper(db, blob_digest(prompt), "forged " * 20)
+        assert main(["verify", str(path), "--blobs", db]) == 1
+        assert "does not match its digest" in capsys.readouterr().err
+
+    def test_verify_tampered(self, tmp_path, capsys):
+        """verify exits 1 and names the failing line."""
+        path = tmp_path / "audit.jsonl"
+        _write_log(path)
+        lines = path.read_text().splitlines(keepends=True)
+        lines[0] = lines[0].replace('"p0"', '"px"')
+        path.write_text("".join(lines))
+
+        assert main(["verify", str(path)]) == 1
+        assert "line 1" in capsys.readouterr().err
+
+    def test_prove(self, tmp_path, capsys):
+        """prove prints a JSON inclusion proof."""
+        path = tmp_path / "audit.jsonl"
+        _write_log(path)
+
+        assert main(["prove", str(path), "3"]) == 0
+        proof = json.loads(capsys.readouterr().out)
+        assert proof["seq"] == 3
+
+    def test_missing_file(self, tmp_path, capsys):
+        """An unreadable file exits 2."""
+        assert main(["verify", str(tmp_path / "nope.jsonl")]) == 2
@@ -0,0 +1,207 @@
+"""Tests for relaying audit entries from worker processes."""
+
+import json
+import socket
+import time
+
+import pytest
+
+from firebreak.audit import AuditLog, FileAuditLog
+from firebreak.audit_relay import AuditRelay, RemoteAuditLog
+from firebreak.integrity import verify_records
+from firebreak.models import (
+    AuditLevel,
+    ClassificationResult,
+    Decision,
+    EvaluationResult,
+)
+
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    """Poll until condition() is true or the timeout passes."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def _log(audit_log: AuditLog, prompt: str, decision: Decision = Decision.ALLOW):
+    """Log one entry for a prompt."""
+    classification = ClassificationResult(
+        intent_category="summarization", confidence=0.9, raw_prompt=prompt
+    )
+    evaluation = EvaluationResult(
+        classification=classification,
+        decision=decision,
+        matched_rule_id="rule",
+        rule_description="Rule",
+        audit_level=AuditLevel.STANDARD,
+        alerts=(),
+        constraints=(),
+        color="green",
+        note="",
+    )
+    audit_log.log(prompt, classification, evaluation)
+
+
+@pytest.fixture
+def socket_path(tmp_path_factory):
+    """A Unix socket path short enough for AF_UNIX."""
+    return str(tmp_path_factory.mktemp("relay") / "audit.sock")
+
+
+class TestAuditRelay:
+    """Tests for AuditRelay and RemoteAuditLog."""
+
+    def test_workers_share_one_sequence(self, socket_path):
+        """Entries from every worker land in one log, each in order."""
+        audit_log = AuditLog()
+        relay = AuditRelay(audit_log, socket_path)
+        first = RemoteAuditLog(socket_path)
+        second = RemoteAuditLog(socket_path)
+        for i in range(5):
+            _log(first, f"a{i}")
+            _log(second, f"b{i}")
+        first.flush()
+        second.flush()
+
+        prompts = [entry.prompt_text for entry in audit_log.entries]
+        assert len(prompts) == 10
+        assert [p for p in prompts if p.startswith("a")] == [f"a{i}" for i in range(5)]
+        assert [p for p in prompts if p.startswith("b")] == [f"b{i}" for i in range(5)]
+        first.close()
+        second.close()
+        relay.close()
+
+    def test_query_sees_every_worker(self, socket_path):
+        """A worker's query is answered from the shared log."""
+        relay = AuditRelay(AuditLog(), socket_path)
+        first = RemoteAuditLog(socket_path)
+        second = RemoteAuditLog(socket_path)
+        _log(first, "allowed")
+        _log(second, "blocked", Decision.BLOCK)
+        second.flush()
+
+        page = first.query(decision=Decision.BLOCK)
+
+        assert [entry.prompt_text for entry in page.entries] == ["blocked"]
+        assert page.entries[0].evaluation.decision == Decision.BLOCK
+        assert len(first.query(limit=1).entries) == 1
+        first.close()
+        second.close()
+        relay.close()
+
+    def test_query_after_own_entries(self, socket_path):
+        """A worker's query sees the entries it logged just before."""
+        relay = AuditRelay(AuditLog(), socket_path)
+        remote = RemoteAuditLog(socket_path)
+        for i in range(20):
+            _log(remote, f"p{i}")
+
+        assert len(remote.query(limit=100).entries) == 20
+        remote.close()
+        relay.close()
+
+    def test_file_log_keeps_one_chain(self, socket_path, tmp_path):
+        """Relayed entries form a single verifiable hash chain."""
+        path = tmp_path / "audit.jsonl"
+        audit_log = FileAuditLog(str(path))
+        relay = AuditRelay(audit_log, socket_path)
+        workers = [RemoteAuditLog(socket_path) for _ in range(3)]
+        for i in range(4):
+            for n, worker in enumerate(workers):
+                _log(worker, f"w{n}-{i}")
+        for worker in workers:
+            worker.close()
+        relay.close()
+        audit_log.close()
+
+        with open(path, encoding="utf-8") as f:
+            report = verify_records(f, anchor=None)
+        assert report.ok
+        assert report.records == 12
+
+    def test_close_delivers_queued_entries(self, socket_path):
+        """close() sends what is queued before disconnecting."""
+        audit_log = AuditLog()
+        relay = AuditRelay(audit_log, socket_path)
+        remote = RemoteAuditLog(socket_path)
+        _log(remote, "last")
+        remote.close()
+        relay.close()
+
+        assert [entry.prompt_text for entry in audit_log.entries] == ["last"]
+
+    def test_invalid_limit(self, socket_path):
+        """Queries validate their limit locally."""
+        relay = AuditRelay(AuditLog(), socket_path)
+        remote = RemoteAuditLog(socket_path)
+
+        with pytest.raises(ValueError):
+            remote.query(limit=0)
+        remote.close()
+        relay.close()
+
+    def test_bad_log_line_gets_no_reply(self, socket_path):
+        """A rejected entry is counted without a reply that would desync."""
+        relay = AuditRelay(AuditLog(), socket_path)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            reader = sock.makefile("rb")
+            sock.sendall(b'{"op": "log", "record": {}}\n{"op": "sync"}\n')
+
+            assert json.loads(reader.readline()) == {}
+            reader.close()
+        assert relay.rejected == 1
+        relay.close()
+
+    def test_reconnects_after_broken_connection(self, socket_path):
+        """Entries logged after the connection breaks are resent."""
+        audit_log = AuditLog()
+        relay = AuditRelay(audit_log, socket_path)
+        remote = RemoteAuditLog(socket_path)
+        _log(remote, "before")
+        remote.flush()
+        remote._socket.shutdown(socket.SHUT_RDWR)
+
+        _log(remote, "after")
+        remote.flush()
+
+        assert [e.prompt_text for e in audit_log.entries] == ["before", "after"]
+        assert remote.reconnects == 1
+        assert remote.failed == 0
+        remote.close()
+        relay.close()
+
+    def test_unhealthy_until_relay_returns(self, socket_path):
+        """Delivery resumes, in order, once the relay is back."""
+        relay = AuditRelay(AuditLog(), socket_path)
+        remote = RemoteAuditLog(socket_path)
+        relay.close(timeout=0)
+        remote._socket.shutdown(socket.SHUT_RDWR)
+
+        _log(remote, "queued")
+        assert _wait_for(lambda: not remote.healthy)
+
+        audit_log = AuditLog()
+        relay = AuditRelay(audit_log, socket_path)
+        assert _wait_for(lambda: remote.healthy)
+        remote.flush()
+        assert [e.prompt_text for e in audit_log.entries] == ["queued"]
+        remote.close()
+        relay.close()
+
+    def test_close_gives_up_without_relay(self, socket_path):
+        """close() stops retrying after its timeout and counts the loss."""
+        relay = AuditRelay(AuditLog(), socket_path)
+        remote = RemoteAuditLog(socket_path, timeout=0.2)
+        relay.close(timeout=0)
+        remote._socket.shutdown(socket.SHUT_RDWR)
+
+        _log(remote, "lost")
+        remote.close()
+
+        assert remote.failed == 1
+        assert not remote.healthy
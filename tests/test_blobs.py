@@ -0,0 +1,80 @@
+"""Tests for the content-addressed blob store."""
+
+import sqlite3
+import zlib
+
+import pytest
+
+from firebreak.blobs import BlobIntegrityError, BlobStore, blob_digest
+
+
+def _tamper(path: str, digest: str, body: str) -> None:
+    """Overwrite a stored body behind the store's back."""
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "UPDATE blobs SET data = ? WHERE digest = ?",
+        (zlib.compress(body.encode()), digest),
+    )
+    conn.commit()
+    conn.close()
+
+
+class TestBlobStore:
+    """Tests for BlobStore."""
+
+    def test_put_and_get(self, tmp_path):
+        """A stored body is returned by its digest."""
+        store = BlobStore(str(tmp_path / "blobs.db"))
+
+        [digest] = store.put_many(["hello world"])
+
+        assert digest == blob_digest("hello world")
+        assert store.get(digest) == "hello world"
+        store.close()
+
+    def test_duplicates_stored_once(self, tmp_path):
+        """Repeated bodies share one row."""
+        store = BlobStore(str(tmp_path / "blobs.db"))
+
+        store.put_many(["same", "same", "other"])
+        store.put_many(["same"])
+
+        assert len(store) == 2
+        store.close()
+
+    def test_release_deletes_unreferenced(self, tmp_path):
+        """A body is deleted once its last reference is released."""
+        store = BlobStore(str(tmp_path / "blobs.db"))
+        digest, _ = store.put_many(["body", "body"])
+
+        store.release([digest])
+        assert store.get(digest) == "body"
+        store.release([digest])
+
+        assert store.get(digest) is None
+        assert len(store) == 0
+        store.close()
+
+    def test_persists_across_reopen(self, tmp_path):
+        """Bodies survive closing and reopening the database."""
+        path = str(tmp_path / "blobs.db")
+        store = BlobStore(path)
+        [digest] = store.put_many(["durable"])
+        store.close()
+
+        store = BlobStore(path)
+
+        assert store.get(digest) == "durable"
+        store.close()
+
+    def test_altered_body_rejected(self, tmp_path):
+        """A body edited in the database no longer reads back."""
+        path = str(tmp_path / "blobs.db")
+        store = BlobStore(path)
+        [digest] = store.put_many(["original"])
+
+        _tamper(path, digest, "altered")
+
+        with pytest.raises(BlobIntegrityError):
+            store.get(digest)
+        store.close()
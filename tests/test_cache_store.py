@@ -0,0 +1,172 @@
+"""Tests for the persistent classifier cache store."""
+
+import sqlite3
+import threading
+import time
+
+from firebreak.cache_store import SQLiteCacheStore
+from firebreak.classifier import ClassifierCache, cache_namespace
+from firebreak.models import ClassificationResult
+
+CATEGORIES = ["summarization", "translation"]
+MODEL = "claude-sonnet-4-6"
+
+
+def _result(prompt: str, category: str = "summarization") -> ClassificationResult:
+    """Build a ClassificationResult for store tests."""
+    return ClassificationResult(
+        intent_category=category, confidence=0.9, raw_prompt=prompt
+    )
+
+
+class TestSQLiteCacheStore:
+    """Tests for SQLiteCacheStore."""
+
+    def test_pending_write_is_readable(self, tmp_path):
+        """A queued row is visible before it is committed."""
+        store = SQLiteCacheStore(str(tmp_path / "cache.db"), flush_interval=60)
+        store.put("k1", "translation", 0.8)
+
+        row = store.get("k1")
+
+        assert row[:2] == ("translation", 0.8)
+        store.close()
+
+    def test_rows_survive_reopen(self, tmp_path):
+        """Committed rows are read back by a new store instance."""
+        path = str(tmp_path / "cache.db")
+        store = SQLiteCacheStore(path)
+        store.put("k1", "summarization", 0.75)
+        store.close()
+
+        reopened = SQLiteCacheStore(path)
+        row = reopened.get("k1")
+        reopened.close()
+
+        assert row[:2] == ("summarization", 0.75)
+
+    def test_flush_commits_queued_rows(self, tmp_path):
+        """flush() returns only once queued rows are committed."""
+        store = SQLiteCacheStore(str(tmp_path / "cache.db"), flush_interval=60)
+        store.put("k1", "summarization", 0.9)
+        store.flush()
+
+        assert store._pending == {}
+        assert store.get("k1") is not None
+        store.close()
+
+    def test_missing_key(self, tmp_path):
+        """Unknown keys return None."""
+        store = SQLiteCacheStore(str(tmp_path / "cache.db"))
+        assert store.get("nope") is None
+        store.close()
+
+    def test_flush_after_close_returns(self, tmp_path):
+        """flush() on a closed store does not wait for the stopped writer."""
+        store = SQLiteCacheStore(str(tmp_path / "cache.db"))
+        store.put("k1", "summarization", 0.9)
+        store.close()
+
+        store.flush()
+        store.put("k2", "summarization", 0.9)
+        store.flush()
+
+    def test_reads_do_not_wait_for_commits(self, tmp_path):
+        """get() answers while the writer is inside a commit."""
+        store = SQLiteCacheStore(str(tmp_path / "cache.db"))
+        store.put("k1", "summarization", 0.9)
+        store.flush()
+        entered, release = threading.Event(), threading.Event()
+        conn = store._conn
+
+        class _SlowConnection:
+            def executemany(self, *args):
+                entered.set()
+                release.wait()
+                return conn.executemany(*args)
+
+            def __getattr__(self, name):
+                return getattr(conn, name)
+
+        store._conn = _SlowConnection()
+        store.put("k2", "translation", 0.8)
+        entered.wait()
+
+        row = store.get("k1")
+        pending = store.get("k2")
+        release.set()
+        store.close()
+
+        assert row[:2] == ("summarization", 0.9)
+        assert pending[:2] == ("translation", 0.8)
+
+    def test_prunes_old_and_excess_rows(self, tmp_path):
+        """Rows past max_age go first, then the oldest beyond max_rows."""
+        path = str(tmp_path / "cache.db")
+        store = SQLiteCacheStore(path)
+        for i in range(5):
+            store.put(f"k{i}", "summarization", 0.9)
+        store.flush()
+        store.close()
+        with sqlite3.connect(path) as conn:
+            conn.execute("UPDATE classifications SET created_at = 0 WHERE key = 'k0'")
+            conn.execute("UPDATE classifications SET created_at = 1e9 WHERE key = 'k1'")
+            for i in range(2, 5):
+                conn.execute(
+                    "UPDATE classifications SET created_at = ? WHERE key = ?",
+                    (time.time() + i, f"k{i}"),
+                )
+
+        store = SQLiteCacheStore(path, max_age=86400, max_rows=2)
+        store.flush()
+        kept = [key for key in ("k0", "k1", "k2", "k3", "k4") if store.get(key)]
+        store.close()
+
+        assert kept == ["k3", "k4"]
+
+
+class TestClassifierCacheWriteBack:
+    """Tests for ClassifierCache backed by a persistent store."""
+
+    def test_results_survive_restart(self, tmp_path):
+        """A result set before a restart is read through afterwards."""
+        path = str(tmp_path / "cache.db")
+        namespace = cache_namespace("1.0", CATEGORIES, MODEL)
+        cache = ClassifierCache(store=SQLiteCacheStore(path), namespace=namespace)
+        cache.set("Summarize the brief", _result("Summarize the brief"))
+        cache.close()
+
+        restarted = ClassifierCache(store=SQLiteCacheStore(path), namespace=namespace)
+        result = restarted.get("summarize the brief")
+        restarted.close()
+
+        assert result is not None
+        assert result.intent_category == "summarization"
+        assert result.raw_prompt == "summarize the brief"
+        assert restarted.hits == 1
+
+    def test_policy_change_misses(self, tmp_path):
+        """Entries are not reused after the policy version changes."""
+        path = str(tmp_path / "cache.db")
+        cache = ClassifierCache(
+            store=SQLiteCacheStore(path),
+            namespace=cache_namespace("1.0", CATEGORIES, MODEL),
+        )
+        cache.set("Summarize the brief", _result("Summarize the brief"))
+        cache.close()
+
+        updated = ClassifierCache(
+            store=SQLiteCacheStore(path),
+            namespace=cache_namespace("2.0", CATEGORIES, MODEL),
+        )
+        assert updated.get("Summarize the brief") is None
+        updated.close()
+
+    def test_category_change_changes_namespace(self):
+        """Adding a category produces a different namespace."""
+        assert cache_namespace("1.0", CATEGORIES, MODEL) != cache_namespace(
+            "1.0", [*CATEGORIES, "pattern_of_life"], MODEL
+        )
+        assert cache_namespace("1.0", CATEGORIES, MODEL) == cache_namespace(
+            "1.0", list(reversed(CATEGORIES)), MODEL
+        )
@@ -1,11 +1,24 @@
 """Tests for the intent classifier."""
 
+import asyncio
 import json
 import tempfile
-from unittest.mock import MagicMock, patch
-
-from firebreak.classifier import ClassifierCache, IntentClassifier
-from firebreak.models import ClassificationResult
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from firebreak.cache_store import SQLiteCacheStore
+from firebreak.classifier import (
+    ClassifierCache,
+    IntentClassifier,
+    RuleClassifier,
+    cache_namespace,
+    make_cache_key,
+)
+from firebreak.models import ClassificationResult, FastPathRule
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -109,6 +122,83 @@ class TestClassifierCache:
         assert cache.get("anything") is None
 
 
+def _result(prompt: str, category: str = "summarization") -> ClassificationResult:
+    """Build a ClassificationResult for cache tests."""
+    return ClassificationResult(
+        intent_category=category, confidence=0.9, raw_prompt=prompt
+    )
+
+
+class TestClassifierCacheBounds:
+    """Tests for LRU, size and TTL limits on ClassifierCache."""
+
+    def test_lru_eviction_by_entry_count(self):
+        """The least recently used entry is evicted first."""
+        cache = ClassifierCache(max_entries=2)
+        cache.set("a", _result("a"))
+        cache.set("b", _result("b"))
+        cache.get("a")
+        cache.set("c", _result("c"))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert len(cache) == 2
+        assert cache.evictions == 1
+
+    def test_eviction_by_bytes(self):
+        """Entries are evicted once the estimated size exceeds max_bytes."""
+        probe = ClassifierCache()
+        probe.set("x" * 100, _result("x" * 100))
+        limit = probe.size_bytes * 2
+
+        cache = ClassifierCache(max_bytes=limit)
+        for i in range(5):
+            prompt = f"{i}" * 100
+            cache.set(prompt, _result(prompt))
+
+        assert len(cache) == 2
+        assert cache.size_bytes <= limit
+        assert cache.evictions == 3
+
+    def test_ttl_expiry(self, monkeypatch):
+        """Entries older than the TTL are treated as misses."""
+        now = [1000.0]
+        monkeypatch.setattr("firebreak.classifier.time.monotonic", lambda: now[0])
+        cache = ClassifierCache(ttl=60)
+        cache.set("prompt", _result("prompt"))
+
+        now[0] += 30
+        assert cache.get("prompt") is not None
+        now[0] += 31
+        assert cache.get("prompt") is None
+        assert cache.expirations == 1
+        assert len(cache) == 0
+
+    def test_hit_miss_counters(self):
+        """Hits and misses are counted per lookup."""
+        cache = ClassifierCache()
+        cache.set("known", _result("known"))
+
+        cache.get("known")
+        cache.get("unknown")
+        cache.get("KNOWN ")
+
+        assert cache.hits == 2
+        assert cache.misses == 1
+
+    def test_overwrite_does_not_grow(self):
+        """Re-setting a key replaces it without double-counting size."""
+        cache = ClassifierCache()
+        cache.set("same", _result("same"))
+        size = cache.size_bytes
+        cache.set("same", _result("same", "translation"))
+
+        assert len(cache) == 1
+        assert cache.size_bytes == size
+        assert cache.get("same").intent_category == "translation"
+
+
 # ---------------------------------------------------------------------------
 # IntentClassifier tests
 # ---------------------------------------------------------------------------
@@ -124,7 +214,7 @@ CATEGORIES = [
 class TestIntentClassifier:
     """Tests for IntentClassifier."""
 
-    @patch("firebreak.classifier.anthropic.Anthropic")
+    @patch("firebreak.upstream.anthropic.Anthropic")
     def test_successful_classification(self, mock_anthropic_cls):
         """Classifier returns a correct result from the API."""
         mock_client = MagicMock()
@@ -141,7 +231,7 @@ class TestIntentClassifier:
         assert result.raw_prompt == "Summarize this briefing."
         mock_client.messages.create.assert_called_once()
 
-    @patch("firebreak.classifier.anthropic.Anthropic")
+    @patch("firebreak.upstream.anthropic.Anthropic")
     def test_cache_hit_skips_api_call(self, mock_anthropic_cls):
         """When the cache has a hit, the API is never called."""
         mock_client = MagicMock()
@@ -161,7 +251,7 @@ class TestIntentClassifier:
         assert result is cached_result
         mock_client.messages.create.assert_not_called()
 
-    @patch("firebreak.classifier.anthropic.Anthropic")
+    @patch("firebreak.upstream.anthropic.Anthropic")
     def test_api_error_returns_unclassified(self, mock_anthropic_cls):
         """An API error results in an unclassified fallback."""
         mock_client = MagicMock()
@@ -174,8 +264,9 @@ class TestIntentClassifier:
         assert result.intent_category == "unclassified"
         assert result.confidence == 0.0
         assert result.raw_prompt == "Some prompt text"
+        assert result.error == "error"
 
-    @patch("firebreak.classifier.anthropic.Anthropic")
+    @patch("firebreak.upstream.anthropic.Anthropic")
     def test_invalid_category_returns_unclassified(self, mock_anthropic_cls):
         """A category not in the valid list is treated as failure."""
         mock_client = MagicMock()
@@ -191,7 +282,7 @@ class TestIntentClassifier:
         assert result.confidence == 0.0
         assert result.raw_prompt == "Do something unexpected"
 
-    @patch("firebreak.classifier.anthropic.Anthropic")
+    @patch("firebreak.upstream.anthropic.Anthropic")
     def test_malformed_json_returns_unclassified(self, mock_anthropic_cls):
         """Malformed JSON from API results in unclassified fallback."""
         mock_client = MagicMock()
@@ -205,8 +296,9 @@ class TestIntentClassifier:
 
         assert result.intent_category == "unclassified"
         assert result.confidence == 0.0
+        assert result.error is None
 
-    @patch("firebreak.classifier.anthropic.Anthropic")
+    @patch("firebreak.upstream.anthropic.Anthropic")
     def test_successful_result_is_cached(self, mock_anthropic_cls):
         """A successful classification is stored in the cache."""
         mock_client = MagicMock()
@@ -221,7 +313,543 @@ class TestIntentClassifier:
 
         assert result.intent_category == "threat_assessment"
 
-        cached = cache.get("Assess threat level")
+        cached = cache.get("Assess threat level", classifier.namespace)
         assert cached is not None
         assert cached.intent_category == "threat_assessment"
         assert cached.confidence == 0.91
+
+
+class TestIntentClassifierAsync:
+    """Tests for IntentClassifier.classify_async."""
+
+    @pytest.mark.asyncio
+    @patch("firebreak.upstream.anthropic.AsyncAnthropic")
+    async def test_successful_classification(self, mock_async_cls):
+        """The async path returns the same result as the sync path."""
+        mock_client = MagicMock()
+        mock_async_cls.return_value = mock_client
+        mock_client.messages.create = AsyncMock(
+            return_value=mock_classify_response("translation", 0.93)
+        )
+
+        classifier = IntentClassifier(categories=CATEGORIES)
+        result = await classifier.classify_async("Translate this cable.")
+
+        assert result.intent_category == "translation"
+        assert result.confidence == 0.93
+        mock_client.messages.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch("firebreak.upstream.anthropic.AsyncAnthropic")
+    async def test_store_read_off_event_loop(self, mock_async_cls, tmp_path):
+        """A memory miss reads the SQLite store on a worker thread."""
+        mock_async_cls.return_value = MagicMock()
+        path = str(tmp_path / "cache.db")
+        namespace = cache_namespace("", CATEGORIES, "claude-sonnet-4-6")
+        seeded = ClassifierCache(store=SQLiteCacheStore(path), namespace=namespace)
+        seeded.set(
+            "Translate this cable.",
+            ClassificationResult(
+                intent_category="translation",
+                confidence=0.9,
+                raw_prompt="Translate this cable.",
+            ),
+        )
+        seeded.close()
+        store = SQLiteCacheStore(path)
+        readers = []
+        get = store.get
+
+        def recording_get(key):
+            readers.append(threading.current_thread())
+            return get(key)
+
+        store.get = recording_get
+        classifier = IntentClassifier(
+            categories=CATEGORIES, cache=ClassifierCache(store=store)
+        )
+
+        first = await classifier.classify_async("Translate this cable.")
+        second = await classifier.classify_async("Translate this cable.")
+        classifier.cache.close()
+
+        assert first.intent_category == second.intent_category == "translation"
+        assert len(readers) == 1
+        assert readers[0] is not threading.main_thread()
+
+    @pytest.mark.asyncio
+    @patch("firebreak.upstream.anthropic.AsyncAnthropic")
+    async def test_cache_hit_skips_api_call(self, mock_async_cls):
+        """A cache hit never awaits the upstream client."""
+        mock_client = MagicMock()
+        mock_async_cls.return_value = mock_client
+        mock_client.messages.create = AsyncMock()
+
+        cache = ClassifierCache()
+        cached_result = ClassificationResult(
+            intent_category="summarization",
+            confidence=0.85,
+            raw_prompt="summarize this",
+        )
+        cache.set("summarize this", cached_result)
+
+        classifier = IntentClassifier(categories=CATEGORIES, cache=cache)
+        result = await classifier.classify_async("summarize this")
+
+        assert result is cached_result
+        mock_client.messages.create.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    @patch("firebreak.upstream.anthropic.AsyncAnthropic")
+    async def test_api_error_returns_unclassified(self, mock_async_cls):
+        """An async API error results in an unclassified fallback."""
+        mock_client = MagicMock()
+        mock_async_cls.return_value = mock_client
+        mock_client.messages.create = AsyncMock(side_effect=Exception("down"))
+
+        classifier = IntentClassifier(categories=CATEGORIES)
+        result = await classifier.classify_async("Some prompt text")
+
+        assert result.intent_category == "unclassified"
+        assert result.confidence == 0.0
+
+
+# ---------------------------------------------------------------------------
+# Fast-path tier tests
+# ---------------------------------------------------------------------------
+
+FAST_PATH_RULES = [
+    FastPathRule(category="translation", patterns=[r"\btranslate\b"]),
+    FastPathRule(
+        category="summarization", patterns=[r"\bsummari[sz]e\b"], confidence=0.7
+    ),
+    FastPathRule(category="autonomous_targeting", patterns=[r"strike coordinates"]),
+]
+
+
+class TestRuleClassifier:
+    """Tests for the local RuleClassifier."""
+
+    def test_single_category_match(self):
+        """A prompt matching one category is classified locally."""
+        result = RuleClassifier(FAST_PATH_RULES).classify("Please TRANSLATE this")
+
+        assert result is not None
+        assert result.intent_category == "translation"
+        assert result.confidence == 0.95
+
+    def test_no_match_returns_none(self):
+        """A prompt matching nothing is left for the LLM."""
+        assert RuleClassifier(FAST_PATH_RULES).classify("Hello there") is None
+
+    def test_ambiguous_match_returns_none(self):
+        """A prompt matching several categories is left for the LLM."""
+        result = RuleClassifier(FAST_PATH_RULES).classify(
+            "Translate the strike coordinates"
+        )
+        assert result is None
+
+
+class TestTieredClassification:
+    """Tests for tier ordering and per-tier stats in IntentClassifier."""
+
+    @patch("firebreak.upstream.anthropic.Anthropic")
+    def test_confident_fast_path_skips_api(self, mock_anthropic_cls):
+        """A fast-path hit above threshold never calls the API."""
+        mock_client = MagicMock()
+        mock_anthropic_cls.return_value = mock_client
+
+        classifier = IntentClassifier(
+            categories=CATEGORIES, fast_path=RuleClassifier(FAST_PATH_RULES)
+        )
+        result = classifier.classify("Translate this message")
+
+        assert result.intent_category == "translation"
+        mock_client.messages.create.assert_not_called()
+        assert classifier.stats["local"].hits == 1
+        assert classifier.stats["llm"].lookups == 0
+
+    @patch("firebreak.upstream.anthropic.Anthropic")
+    def test_low_confidence_falls_through(self, mock_anthropic_cls):
+        """A fast-path match below threshold falls through to the LLM."""
+        mock_client = MagicMock()
+        mock_anthropic_cls.return_value = mock_client
+        mock_client.messages.create.return_value = mock_classify_response(
+            "threat_assessment", 0.9
+        )
+
+        classifier = IntentClassifier(
+            categories=CATEGORIES,
+            fast_path=RuleClassifier(FAST_PATH_RULES),
+            fast_path_threshold=0.9,
+        )
+        result = classifier.classify("Summarize and assess the threat")
+
+        assert result.intent_category == "threat_assessment"
+        mock_client.messages.create.assert_called_once()
+        assert classifier.stats["local"].lookups == 1
+        assert classifier.stats["local"].hits == 0
+        assert classifier.stats["llm"].hits == 1
+
+    @patch("firebreak.upstream.anthropic.Anthropic")
+    def test_stats_hit_rate(self, mock_anthropic_cls):
+        """Cache stats report hit rate across lookups."""
+        mock_anthropic_cls.return_value = MagicMock()
+        cache = ClassifierCache()
+        cache.set(
+            "cached prompt",
+            ClassificationResult(
+                intent_category="summarization",
+                confidence=0.9,
+                raw_prompt="cached prompt",
+            ),
+        )
+        classifier = IntentClassifier(
+            categories=CATEGORIES,
+            cache=cache,
+            fast_path=RuleClassifier(FAST_PATH_RULES),
+        )
+
+        classifier.classify("cached prompt")
+        classifier.classify("translate this")
+
+        assert classifier.stats["cache"].lookups == 2
+        assert classifier.stats["cache"].hit_rate == 0.5
+        assert classifier.stats["local"].hit_rate == 1.0
+
+
+class TestCacheNamespaces:
+    """Tests for policy-scoped cache keys."""
+
+    @patch("firebreak.upstream.anthropic.Anthropic")
+    def test_policies_share_cache_without_collisions(self, mock_anthropic_cls):
+        """Two policy versions keep separate entries in one cache."""
+        mock_client = MagicMock()
+        mock_anthropic_cls.return_value = mock_client
+        mock_client.messages.create.side_effect = [
+            mock_classify_response("summarization"),
+            mock_classify_response("threat_assessment"),
+        ]
+
+        cache = ClassifierCache()
+        v1 = IntentClassifier(categories=CATEGORIES, cache=cache, policy_version="1")
+        v2 = IntentClassifier(categories=CATEGORIES, cache=cache, policy_version="2")
+
+        assert v1.classify("Brief me").intent_category == "summarization"
+        assert v2.classify("Brief me").intent_category == "threat_assessment"
+        assert v1.classify("Brief me").intent_category == "summarization"
+        assert mock_client.messages.create.call_count == 2
+        assert len(cache) == 2
+
+    @patch("firebreak.upstream.anthropic.Anthropic")
+    def test_model_is_part_of_namespace(self, mock_anthropic_cls):
+        """Changing the classifier model changes the namespace."""
+        mock_anthropic_cls.return_value = MagicMock()
+        a = IntentClassifier(categories=CATEGORIES, model="model-a")
+        b = IntentClassifier(categories=CATEGORIES, model="model-b")
+
+        assert a.namespace != b.namespace
+
+    @patch("firebreak.upstream.anthropic.Anthropic")
+    def test_seeded_entry_outside_categories_is_ignored(self, mock_anthropic_cls):
+        """A default-namespace entry for an unknown category is a miss."""
+        mock_client = MagicMock()
+        mock_anthropic_cls.return_value = mock_client
+        mock_client.messages.create.return_value = mock_classify_response("translation")
+
+        cache = ClassifierCache()
+        cache.set("Translate this", _result("Translate this", "pattern_of_life"))
+        classifier = IntentClassifier(categories=CATEGORIES, cache=cache)
+
+        result = classifier.classify("Translate this")
+
+        assert result.intent_category == "translation"
+        mock_client.messages.create.assert_called_once()
+
+    @patch("firebreak.upstream.anthropic.Anthropic")
+    def test_fallback_miss_counted_once(self, mock_anthropic_cls, tmp_path):
+        """A miss in both namespaces is one miss and one store read."""
+        mock_client = MagicMock()
+        mock_anthropic_cls.return_value = mock_client
+        mock_client.messages.create.return_value = mock_classify_response("translation")
+        store = SQLiteCacheStore(str(tmp_path / "cache.db"))
+        cache = ClassifierCache(store=store)
+        classifier = IntentClassifier(categories=CATEGORIES, cache=cache)
+
+        with patch.object(store, "get", wraps=store.get) as store_get:
+            assert classifier._classify_locally("Translate this") is None
+
+        assert cache.misses == 1
+        assert cache.hits == 0
+        assert store_get.call_count == 1
+        assert classifier.stats["cache"].lookups == 1
+        cache.close()
+
+    def test_seeded_entry_answers_in_one_lookup(self):
+        """A default-namespace entry is a single hit for a policy namespace."""
+        cache = ClassifierCache()
+        cache.set("Translate this", _result("Translate this", "translation"))
+
+        result = cache.get("Translate this", "2.0:abc", CATEGORIES)
+
+        assert result.intent_category == "translation"
+        assert (cache.hits, cache.misses) == (1, 0)
+
+    def test_keys_are_compact_hashes(self):
+        """Cache keys are fixed-length digests of prompt and namespace."""
+        key = make_cache_key("  Some Prompt " * 500, "2.0:abc")
+
+        assert len(key) == 32
+        assert make_cache_key("  Some Prompt  ", "ns") == make_cache_key(
+            "some prompt", "ns"
+        )
+        assert make_cache_key("some prompt", "ns") != make_cache_key(
+            "some prompt", "other"
+        )
+
+
+class TestSingleFlight:
+    """Tests for coalescing identical concurrent classifications."""
+
+    @patch("firebreak.upstream.anthropic.Anthropic")
+    def test_concurrent_threads_share_one_call(self, mock_anthropic_cls):
+        """Threads classifying the same prompt make one upstream call."""
+        release = threading.Event()
+
+        def create(**kwargs):
+            release.wait(timeout=5)
+            return mock_classify_response("summarization")
+
+        mock_client = MagicMock()
+        mock_anthropic_cls.return_value = mock_client
+        mock_client.messages.create.side_effect = create
+
+        classifier = IntentClassifier(categories=CATEGORIES)
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            futures = [
+                pool.submit(classifier.classify, "Summarize the cable")
+                for _ in range(5)
+            ]
+            deadline = time.monotonic() + 5
+            while classifier.coalesced < 4 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            release.set()
+            results = [f.result() for f in futures]
+
+        assert mock_client.messages.create.call_count == 1
+        assert classifier.coalesced == 4
+        assert all(r is results[0] for r in results)
+
+    @pytest.mark.asyncio
+    @patch("firebreak.upstream.anthropic.AsyncAnthropic")
+    async def test_concurrent_tasks_share_one_call(self, mock_async_cls):
+        """Tasks classifying the same prompt await one upstream call."""
+
+        async def create(**kwargs):
+            await asyncio.sleep(0.01)
+            return mock_classify_response("translation")
+
+        mock_client = MagicMock()
+        mock_async_cls.return_value = mock_client
+        mock_client.messages.create = AsyncMock(side_effect=create)
+
+        classifier = IntentClassifier(categories=CATEGORIES)
+        results = await asyncio.gather(
+            *(classifier.classify_async("Translate this") for _ in range(10)),
+            classifier.classify_async("A different prompt"),
+        )
+
+        assert mock_client.messages.create.await_count == 2
+        assert classifier.coalesced == 9
+        assert all(r is results[0] for r in results[:10])
+        assert classifier._inflight_async == {}
+
+    @pytest.mark.asyncio
+    @patch("firebreak.upstream.anthropic.AsyncAnthropic")
+    async def test_cancelled_caller_does_not_cancel_others(self, mock_async_cls):
+        """Cancelling the first caller leaves the shared call running."""
+
+        async def create(**kwargs):
+            await asyncio.sleep(0.02)
+            return mock_classify_response("translation")
+
+        mock_client = MagicMock()
+        mock_async_cls.return_value = mock_client
+        mock_client.messages.create = AsyncMock(side_effect=create)
+
+        classifier = IntentClassifier(categories=CATEGORIES)
+        first = asyncio.ensure_future(classifier.classify_async("Translate this"))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(classifier.classify_async("Translate this"))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        result = await second
+
+        assert result.intent_category == "translation"
+        assert mock_client.messages.create.await_count == 1
+
+
+class TestMicroBatching:
+    """Tests for batched classification in classify_async."""
+
+    @pytest.mark.asyncio
+    @patch("firebreak.upstream.anthropic.AsyncAnthropic")
+    async def test_prompts_in_window_share_one_request(self, mock_async_cls):
+        """Prompts arriving within the window are classified together."""
+        mock_client = MagicMock()
+        mock_async_cls.return_value = mock_client
+        mock_client.messages.create = AsyncMock(
+            return_value=MagicMock(
+                content=[
+                    MagicMock(
+                        text=json.dumps(
+                            [
+                                {
+                                    "index": 1,
+                                    "category": "translation",
+                                    "confidence": 0.8,
+                                },
+                                {
+                                    "index": 0,
+                                    "category": "summarization",
+                                    "confidence": 0.9,
+                                },
+                                {"index": 2, "category": "made_up", "confidence": 0.9},
+                            ]
+                        )
+                    )
+                ]
+            )
+        )
+
+        classifier = IntentClassifier(categories=CATEGORIES, batch_window=0.01)
+        results = await asyncio.gather(
+            classifier.classify_async("Summarize this"),
+            classifier.classify_async("Translate this"),
+            classifier.classify_async("Do something odd"),
+        )
+
+        assert [r.intent_category for r in results] == [
+            "summarization",
+            "translation",
+            "unclassified",
+        ]
+        assert results[1].raw_prompt == "Translate this"
+        assert classifier.upstream_calls == 1
+        sent = mock_client.messages.create.call_args.kwargs["messages"][0]["content"]
+        assert json.loads(sent) == [
+            "Summarize this",
+            "Translate this",
+            "Do something odd",
+        ]
+
+    @pytest.mark.asyncio
+    @patch("firebreak.upstream.anthropic.AsyncAnthropic")
+    async def test_max_batch_size_flushes_early(self, mock_async_cls):
+        """A full batch is sent without waiting for the window."""
+
+        async def create(**kwargs):
+            prompts = json.loads(kwargs["messages"][0]["content"])
+            return MagicMock(
+                content=[
+                    MagicMock(
+                        text=json.dumps(
+                            [
+                                {"category": "summarization", "confidence": 0.9}
+                                for _ in prompts
+                            ]
+                        )
+                    )
+                ]
+            )
+
+        mock_client = MagicMock()
+        mock_async_cls.return_value = mock_client
+        mock_client.messages.create = AsyncMock(side_effect=create)
+
+        classifier = IntentClassifier(
+            categories=CATEGORIES, batch_window=10, max_batch_size=2
+        )
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                classifier.classify_async("first"),
+                classifier.classify_async("second"),
+            ),
+            timeout=1,
+        )
+
+        assert all(r.intent_category == "summarization" for r in results)
+        assert classifier.upstream_calls == 1
+
+    @pytest.mark.asyncio
+    @patch("firebreak.upstream.anthropic.AsyncAnthropic")
+    async def test_batch_failure_returns_unclassified(self, mock_async_cls):
+        """A failed batch request resolves every prompt as unclassified."""
+        mock_client = MagicMock()
+        mock_async_cls.return_value = mock_client
+        mock_client.messages.create = AsyncMock(side_effect=Exception("down"))
+
+        classifier = IntentClassifier(categories=CATEGORIES, batch_window=0.01)
+        results = await asyncio.gather(
+            classifier.classify_async("one"),
+            classifier.classify_async("two"),
+        )
+
+        assert [r.intent_category for r in results] == ["unclassified"] * 2
+
+    @pytest.mark.asyncio
+    @patch("firebreak.upstream.anthropic.AsyncAnthropic")
+    async def test_malformed_batch_item_fails_only_its_prompt(self, mock_async_cls):
+        """A non-object item in the reply leaves the other prompts classified."""
+        mock_client = MagicMock()
+        mock_async_cls.return_value = mock_client
+        mock_client.messages.create = AsyncMock(
+            return_value=MagicMock(
+                content=[
+                    MagicMock(
+                        text=json.dumps(
+                            [
+                                "summarization",
+                                {
+                                    "index": 1,
+                                    "category": "translation",
+                                    "confidence": 0.8,
+                                },
+                            ]
+                        )
+                    )
+                ]
+            )
+        )
+
+        classifier = IntentClassifier(categories=CATEGORIES, batch_window=0.01)
+        results = await asyncio.gather(
+            classifier.classify_async("one"),
+            classifier.classify_async("two"),
+        )
+
+        assert [r.intent_category for r in results] == [
+            "unclassified",
+            "translation",
+        ]
+
+    @pytest.mark.asyncio
+    @patch("firebreak.upstream.anthropic.AsyncAnthropic")
+    async def test_interrupted_batch_resolves_every_prompt(self, mock_async_cls):
+        """An exception outside Exception still resolves each waiting prompt."""
+
+        class Interrupted(BaseException):
+            pass
+
+        mock_client = MagicMock()
+        mock_async_cls.return_value = mock_client
+        mock_client.messages.create = AsyncMock(side_effect=Interrupted())
+
+        classifier = IntentClassifier(categories=CATEGORIES, batch_window=0.01)
+        first = asyncio.ensure_future(classifier.classify_async("one"))
+        second = asyncio.ensure_future(classifier.classify_async("two"))
+
+        for waiter in (first, second):
+            with pytest.raises(Interrupted):
+                await asyncio.wait_for(waiter, timeout=1)
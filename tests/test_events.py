@@ -0,0 +1,98 @@
+"""Tests for the interceptor event bus."""
+
+import threading
+
+from firebreak.events import EventBus, Overflow
+
+
+class TestEventBus:
+    """Tests for EventBus delivery, ordering and overflow."""
+
+    def test_delivers_on_background_thread(self):
+        """Callbacks run on the subscriber's thread, not the publisher's."""
+        bus = EventBus()
+        threads = []
+        bus.on("evaluated", lambda _: threads.append(threading.current_thread()))
+
+        bus.publish("evaluated", 1)
+        bus.flush()
+        bus.close()
+
+        assert threads and threads[0] is not threading.current_thread()
+
+    def test_subscriber_sees_events_in_order(self):
+        """Callbacks sharing a subscriber observe publish order."""
+        bus = EventBus()
+        seen = []
+        bus.on("a", lambda d: seen.append(("a", d)), "ui")
+        bus.on("b", lambda d: seen.append(("b", d)), "ui")
+
+        for i in range(50):
+            bus.publish("a", i)
+            bus.publish("b", i)
+        bus.close()
+
+        assert seen == [(name, i) for i in range(50) for name in ("a", "b")]
+
+    def test_unhandled_events_are_not_queued(self):
+        """Events nobody listens to cost nothing and count as nothing."""
+        bus = EventBus()
+        bus.on("a", lambda _: None)
+
+        bus.publish("other", 1)
+        bus.flush()
+
+        assert bus.stats()["default"]["delivered"] == 0
+        bus.close()
+
+    def test_drop_policy_counts_dropped_events(self):
+        """A full queue drops new events instead of waiting."""
+        bus = EventBus(max_queue=2)
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow(_):
+            started.set()
+            release.wait(5)
+
+        bus.on("e", slow)
+        bus.publish("e", 0)
+        started.wait(5)
+        for i in range(1, 6):
+            bus.publish("e", i)
+        release.set()
+        bus.close()
+
+        assert bus.dropped == 3
+
+    def test_block_policy_waits_for_room(self):
+        """A blocking subscriber receives every event."""
+        bus = EventBus()
+        sub = bus.subscriber("audit", max_queue=1, overflow=Overflow.BLOCK)
+        seen = []
+        sub.handlers["e"].append(seen.append)
+
+        for i in range(20):
+            bus.publish("e", i)
+        bus.close()
+
+        assert seen == list(range(20))
+        assert sub.dropped == 0
+
+    def test_errors_are_isolated(self):
+        """A failing callback does not stop later callbacks or events."""
+        bus = EventBus()
+        seen = []
+
+        def fail(_):
+            raise ValueError("boom")
+
+        bus.on("e", fail)
+        bus.on("e", seen.append)
+        bus.publish("e", 1)
+        bus.publish("e", 2)
+        bus.flush()
+
+        assert seen == [1, 2]
+        assert bus.stats()["default"]["errors"] == 2
+        bus.close()
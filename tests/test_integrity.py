@@ -0,0 +1,136 @@
+"""Tests for audit hash chaining and Merkle checkpoints."""
+
+import hashlib
+import json
+
+import pytest
+
+from firebreak.integrity import (
+    GENESIS_HASH,
+    chain_record,
+    merkle_proof,
+    merkle_root,
+    prove_record,
+    verify_merkle_proof,
+    verify_records,
+)
+
+
+def _leaves(n: int) -> list[str]:
+    """Build n distinct hex leaf hashes."""
+    return [hashlib.sha256(str(i).encode()).hexdigest() for i in range(n)]
+
+
+def _log(n: int, checkpoint_every: int = 4) -> list[str]:
+    """Build a chained JSON Lines log of n entries with checkpoints."""
+    lines: list[str] = []
+    prev = GENESIS_HASH
+    pending: list[str] = []
+    for seq in range(n):
+        record = {
+            "type": "entry",
+            "seq": seq,
+            "timestamp": "2026-10-01T12:00:00",
+            "prompt": f"p{seq}",
+            "evaluation": {"audit_level": "standard"},
+        }
+        lines.append(chain_record(record, prev) + "\n")
+        prev = record["hash"]
+        pending.append(prev)
+        if len(pending) == checkpoint_every or seq == n - 1:
+            checkpoint = {
+                "type": "checkpoint",
+                "first_seq": seq - len(pending) + 1,
+                "last_seq": seq,
+                "merkle_root": merkle_root(pending),
+            }
+            lines.append(chain_record(checkpoint, prev) + "\n")
+            prev = checkpoint["hash"]
+            pending = []
+    return lines
+
+
+class TestMerkle:
+    """Tests for Merkle roots and inclusion proofs."""
+
+    def test_empty_leaves_rejected(self):
+        """A root over no leaves is an error."""
+        with pytest.raises(ValueError):
+            merkle_root([])
+
+    @pytest.mark.parametrize("n", [1, 2, 3, 7, 8, 13])
+    def test_every_leaf_proves(self, n):
+        """Each leaf's proof verifies against the root, odd sizes included."""
+        leaves = _leaves(n)
+        root = merkle_root(leaves)
+
+        for i, leaf in enumerate(leaves):
+            assert verify_merkle_proof(leaf, merkle_proof(leaves, i), root)
+
+    def test_proof_is_logarithmic(self):
+        """A proof over 1024 leaves has 10 steps."""
+        assert len(merkle_proof(_leaves(1024), 500)) == 10
+
+    def test_wrong_leaf_fails(self):
+        """A proof does not verify a different leaf."""
+        leaves = _leaves(8)
+        proof = merkle_proof(leaves, 3)
+
+        assert not verify_merkle_proof(leaves[4], proof, merkle_root(leaves))
+
+
+class TestVerifyRecords:
+    """Tests for streaming chain verification."""
+
+    def test_valid_log(self):
+        """An untouched log verifies."""
+        report = verify_records(_log(10))
+
+        assert report.ok
+        assert report.records == 10
+        assert report.checkpoints == 3
+
+    def test_edited_record_detected(self):
+        """Changing a field without rehashing fails the record hash."""
+        lines = _log(6)
+        record = json.loads(lines[2])
+        record["prompt"] = "tampered"
+        lines[2] = json.dumps(record) + "\n"
+
+        report = verify_records(lines)
+
+        assert not report.ok
+        assert report.line == 3
+        assert "hash mismatch" in report.error
+
+    def test_deleted_record_detected(self):
+        """Removing a record breaks the chain."""
+        lines = _log(6)
+        del lines[1]
+
+        report = verify_records(lines)
+
+        assert not report.ok
+        assert "chain broken" in report.error
+
+    def test_invalid_json_reported(self):
+        """A corrupt line is reported rather than raised."""
+        report = verify_records(_log(2) + ["{not json\n"])
+
+        assert not report.ok
+        assert "invalid JSON" in report.error
+
+
+class TestProveRecord:
+    """Tests for building inclusion proofs from a log."""
+
+    def test_proof_verifies_against_checkpoint(self):
+        """The returned proof links the record to its checkpoint root."""
+        proof = prove_record(_log(10), 6)
+
+        assert proof["seq"] == 6
+        assert verify_merkle_proof(proof["hash"], proof["proof"], proof["merkle_root"])
+
+    def test_uncovered_record(self):
+        """A sequence number past every checkpoint returns None."""
+        assert prove_record(_log(4), 99) is None
@@ -1,7 +1,13 @@
 """Tests for the request interceptor and audit log."""
 
+import asyncio
+import threading
+import time
 from datetime import datetime
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import yaml
 
 from firebreak.audit import AuditLog
 from firebreak.classifier import ClassifierCache, IntentClassifier
@@ -10,7 +16,7 @@ from firebreak.models import (
     ClassificationResult,
     Decision,
 )
-from firebreak.policy import PolicyEngine
+from firebreak.policy import PolicyEngine, PolicyError
 
 # Path to the real policy file
 POLICY_PATH = "policies/defense-standard.yaml"
@@ -44,6 +50,30 @@ def _make_interceptor_with_cache(prompt: str, category: str, confidence: float =
     return interceptor, audit_log
 
 
+class _FakeStream:
+    """Async context manager mimicking ``AsyncMessages.stream``."""
+
+    def __init__(self, *parts: str, error: Exception | None = None):
+        self._parts = parts
+        self._error = error
+        self.current_message_snapshot = MagicMock(
+            usage=MagicMock(input_tokens=12, output_tokens=len(parts))
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    @property
+    async def text_stream(self):
+        for part in self._parts:
+            yield part
+        if self._error is not None:
+            raise self._error
+
+
 class TestAuditLog:
     """Tests for the AuditLog class."""
 
@@ -138,6 +168,7 @@ class TestFirebreakInterceptor:
         interceptor.on("response", lambda d: events.append(("response", d)))
 
         result = interceptor.evaluate_request(prompt)
+        interceptor.events.flush()
 
         assert result.decision == Decision.ALLOW
         assert result.llm_response == "Here is the summary."
@@ -164,6 +195,7 @@ class TestFirebreakInterceptor:
         interceptor.on("alert", lambda d: events.append(("alert", d)))
 
         result = interceptor.evaluate_request(prompt)
+        interceptor.events.flush()
 
         assert result.decision == Decision.BLOCK
         assert result.llm_response is None
@@ -202,6 +234,7 @@ class TestFirebreakInterceptor:
         interceptor.on("alert", lambda d: alert_targets.append(d["target"]))
 
         interceptor.evaluate_request(prompt)
+        interceptor.events.flush()
 
         assert "trust_safety" in alert_targets
         assert "inspector_general" in alert_targets
@@ -224,3 +257,460 @@ class TestFirebreakInterceptor:
         assert result.decision == Decision.ALLOW_CONSTRAINED
         assert result.llm_response == "Defensive analysis."
         mock_client.messages.create.assert_called_once()
+
+
+class TestFirebreakInterceptorAsync:
+    """Tests for the non-blocking evaluate_request_async pipeline."""
+
+    @pytest.mark.asyncio
+    @patch("firebreak.interceptor.anthropic.AsyncAnthropic")
+    async def test_allow_pipeline(self, mock_async_anthropic):
+        """An allowed prompt is forwarded with the async client."""
+        mock_client = MagicMock()
+        mock_async_anthropic.return_value = mock_client
+        mock_client.messages.create = AsyncMock(
+            return_value=MagicMock(
+                content=[MagicMock(text="Async summary.")],
+                usage=MagicMock(input_tokens=40, output_tokens=8),
+            )
+        )
+
+        prompt = "Summarize the briefing."
+        interceptor, audit_log = _make_interceptor_with_cache(prompt, "summarization")
+
+        events = []
+        interceptor.on("response", lambda d: events.append(("response", d)))
+
+        result = await interceptor.evaluate_request_async(prompt)
+        interceptor.events.flush()
+
+        assert result.decision == Decision.ALLOW
+        assert result.llm_response == "Async summary."
+        assert result.upstream_tokens == 48
+        assert len(audit_log.entries) == 1
+        assert [e[0] for e in events] == ["response"]
+        mock_client.messages.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch("firebreak.interceptor.anthropic.AsyncAnthropic")
+    async def test_block_pipeline(self, mock_async_anthropic):
+        """A blocked prompt never reaches the async LLM client."""
+        mock_client = MagicMock()
+        mock_async_anthropic.return_value = mock_client
+        mock_client.messages.create = AsyncMock()
+
+        prompt = "Cross-reference phone records"
+        interceptor, audit_log = _make_interceptor_with_cache(
+            prompt, "bulk_surveillance"
+        )
+
+        result = await interceptor.evaluate_request_async(prompt)
+
+        assert result.decision == Decision.BLOCK
+        assert result.llm_response is None
+        mock_client.messages.create.assert_not_awaited()
+        assert len(audit_log.entries) == 1
+
+    @pytest.mark.asyncio
+    @patch("firebreak.interceptor.anthropic.AsyncAnthropic")
+    async def test_llm_error_marks_response(self, mock_async_anthropic):
+        """An async LLM failure is recorded like the sync path."""
+        mock_client = MagicMock()
+        mock_async_anthropic.return_value = mock_client
+        mock_client.messages.create = AsyncMock(side_effect=Exception("timeout"))
+
+        prompt = "Translate this cable"
+        interceptor, _ = _make_interceptor_with_cache(prompt, "translation")
+
+        result = await interceptor.evaluate_request_async(prompt)
+
+        assert result.llm_response == "[LLM call failed]"
+        assert result.upstream_error == "error"
+
+
+class TestFirebreakInterceptorStreaming:
+    """Tests for stream_request_async."""
+
+    @pytest.mark.asyncio
+    @patch("firebreak.interceptor.anthropic.AsyncAnthropic")
+    async def test_allow_streams_and_audits_on_completion(self, mock_async_anthropic):
+        """Deltas are relayed and the full text is audited at the end."""
+        mock_client = MagicMock()
+        mock_async_anthropic.return_value = mock_client
+        mock_client.messages.stream.return_value = _FakeStream("Here ", "it is.")
+
+        prompt = "Summarize the briefing."
+        interceptor, audit_log = _make_interceptor_with_cache(prompt, "summarization")
+
+        evaluation, chunks = await interceptor.stream_request_async(prompt)
+
+        assert evaluation.decision == Decision.ALLOW
+        assert len(audit_log.entries) == 0
+
+        received = [text async for text in chunks]
+
+        assert received == ["Here ", "it is."]
+        assert evaluation.llm_response == "Here it is."
+        assert evaluation.upstream_error is None
+        assert evaluation.upstream_tokens == 14
+        assert len(audit_log.entries) == 1
+        assert audit_log.entries[0].evaluation.llm_response == "Here it is."
+
+    @pytest.mark.asyncio
+    @patch("firebreak.interceptor.anthropic.AsyncAnthropic")
+    async def test_closed_before_first_chunk_is_audited(self, mock_async_anthropic):
+        """A stream closed before it was read still writes its audit entry."""
+        mock_client = MagicMock()
+        mock_async_anthropic.return_value = mock_client
+        mock_client.messages.stream.return_value = _FakeStream("unsent")
+
+        prompt = "Summarize the briefing."
+        interceptor, audit_log = _make_interceptor_with_cache(prompt, "summarization")
+
+        evaluation, chunks = await interceptor.stream_request_async(prompt)
+        await chunks.aclose()
+        await chunks.aclose()
+
+        assert len(audit_log.entries) == 1
+        assert audit_log.entries[0].evaluation.decision == Decision.ALLOW
+        assert evaluation.llm_response == ""
+        mock_client.messages.stream.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("firebreak.interceptor.anthropic.AsyncAnthropic")
+    async def test_block_returns_no_stream(self, mock_async_anthropic):
+        """A blocked prompt is audited immediately and never streamed."""
+        mock_client = MagicMock()
+        mock_async_anthropic.return_value = mock_client
+
+        prompt = "Strike coordinates"
+        interceptor, audit_log = _make_interceptor_with_cache(
+            prompt, "autonomous_targeting"
+        )
+
+        evaluation, chunks = await interceptor.stream_request_async(prompt)
+
+        assert evaluation.decision == Decision.BLOCK
+        assert chunks is None
+        mock_client.messages.stream.assert_not_called()
+        assert len(audit_log.entries) == 1
+
+    @pytest.mark.asyncio
+    @patch("firebreak.interceptor.anthropic.AsyncAnthropic")
+    async def test_stream_error_yields_failure_marker(self, mock_async_anthropic):
+        """An upstream error before any output yields the failure marker."""
+        mock_client = MagicMock()
+        mock_async_anthropic.return_value = mock_client
+        mock_client.messages.stream.return_value = _FakeStream(
+            error=Exception("connection reset")
+        )
+
+        prompt = "Translate this cable"
+        interceptor, audit_log = _make_interceptor_with_cache(prompt, "translation")
+
+        evaluation, chunks = await interceptor.stream_request_async(prompt)
+        received = [text async for text in chunks]
+
+        assert received == ["[LLM call failed]"]
+        assert evaluation.llm_response == "[LLM call failed]"
+        assert evaluation.upstream_error == "error"
+        assert len(audit_log.entries) == 1
+
+    @pytest.mark.asyncio
+    @patch("firebreak.interceptor.anthropic.AsyncAnthropic")
+    async def test_open_circuit_returns_no_stream(self, mock_async_anthropic):
+        """No stream is opened while the upstream circuit is open."""
+        mock_client = MagicMock()
+        mock_async_anthropic.return_value = mock_client
+
+        prompt = "Translate this cable"
+        interceptor, audit_log = _make_interceptor_with_cache(prompt, "translation")
+        breaker = interceptor.upstream.breaker
+        for _ in range(breaker.min_calls):
+            breaker.record(breaker.allow(), False)
+
+        evaluation, chunks = await interceptor.stream_request_async(prompt)
+
+        assert chunks is None
+        assert evaluation.upstream_error == "circuit_open"
+        mock_client.messages.stream.assert_not_called()
+        assert len(audit_log.entries) == 1
+
+    @pytest.mark.asyncio
+    @patch("firebreak.interceptor.anthropic.AsyncAnthropic")
+    async def test_half_open_circuit_streams_one_trial(self, mock_async_anthropic):
+        """A half-open circuit lets a single stream through as its trial."""
+        mock_client = MagicMock()
+        mock_async_anthropic.return_value = mock_client
+        mock_client.messages.stream.return_value = _FakeStream("ok")
+
+        prompt = "Translate this cable"
+        interceptor, _ = _make_interceptor_with_cache(prompt, "translation")
+        breaker = interceptor.upstream.breaker
+        for _ in range(breaker.min_calls):
+            breaker.record(breaker.allow(), False)
+        breaker.cooldown = 0
+
+        _, trial = await interceptor.stream_request_async(prompt)
+        second, refused = await interceptor.stream_request_async(prompt)
+        received = [text async for text in trial]
+
+        assert refused is None
+        assert second.upstream_error == "circuit_open"
+        assert received == ["ok"]
+        assert breaker.state == "closed"
+
+    @pytest.mark.asyncio
+    @patch("firebreak.interceptor.anthropic.AsyncAnthropic")
+    async def test_unread_trial_stream_frees_breaker(self, mock_async_anthropic):
+        """A trial stream closed before its first chunk gives the trial back."""
+        mock_client = MagicMock()
+        mock_async_anthropic.return_value = mock_client
+
+        prompt = "Translate this cable"
+        interceptor, _ = _make_interceptor_with_cache(prompt, "translation")
+        breaker = interceptor.upstream.breaker
+        for _ in range(breaker.min_calls):
+            breaker.record(breaker.allow(), False)
+        breaker.cooldown = 0
+
+        _, trial = await interceptor.stream_request_async(prompt)
+        await trial.aclose()
+
+        assert breaker.state == "half_open"
+        assert breaker.allow() is not None
+
+
+class TestSpeculativeForwarding:
+    """Tests for the opt-in speculative async pipeline."""
+
+    @pytest.mark.asyncio
+    @patch("firebreak.interceptor.anthropic.AsyncAnthropic")
+    async def test_allow_overlaps_classification(self, mock_async_anthropic):
+        """The LLM call starts before classification finishes."""
+        order = []
+
+        async def create(**kwargs):
+            order.append("forward_started")
+            return MagicMock(content=[MagicMock(text="Speculated answer.")])
+
+        mock_client = MagicMock()
+        mock_async_anthropic.return_value = mock_client
+        mock_client.messages.create = AsyncMock(side_effect=create)
+
+        prompt = "Summarize the briefing."
+        interceptor, audit_log = _make_interceptor_with_cache(prompt, "summarization")
+        interceptor.speculative = True
+        classify = interceptor.classifier.classify_async
+
+        async def slow_classify(text):
+            await asyncio.sleep(0.01)
+            order.append("classified")
+            return await classify(text)
+
+        interceptor.classifier.classify_async = slow_classify
+
+        result = await interceptor.evaluate_request_async(prompt)
+
+        assert order == ["forward_started", "classified"]
+        assert result.decision == Decision.ALLOW
+        assert result.llm_response == "Speculated answer."
+        assert result.speculative is True
+        assert audit_log.entries[0].evaluation.speculative is True
+
+    @pytest.mark.asyncio
+    @patch("firebreak.interceptor.anthropic.AsyncAnthropic")
+    async def test_block_cancels_upstream_call(self, mock_async_anthropic):
+        """A BLOCK decision cancels the in-flight LLM call."""
+        cancelled = asyncio.Event()
+
+        async def create(**kwargs):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        mock_client = MagicMock()
+        mock_async_anthropic.return_value = mock_client
+        mock_client.messages.create = AsyncMock(side_effect=create)
+
+        prompt = "Cross-reference phone records"
+        interceptor, audit_log = _make_interceptor_with_cache(
+            prompt, "bulk_surveillance"
+        )
+        interceptor.speculative = True
+        classify = interceptor.classifier.classify_async
+
+        async def slow_classify(text):
+            await asyncio.sleep(0.01)
+            return await classify(text)
+
+        interceptor.classifier.classify_async = slow_classify
+
+        result = await asyncio.wait_for(
+            interceptor.evaluate_request_async(prompt), timeout=1
+        )
+
+        assert result.decision == Decision.BLOCK
+        assert result.llm_response is None
+        assert cancelled.is_set()
+        assert audit_log.entries[0].evaluation.speculative is True
+
+    @pytest.mark.asyncio
+    @patch("firebreak.interceptor.anthropic.AsyncAnthropic")
+    async def test_non_speculative_is_default(self, mock_async_anthropic):
+        """Without opting in, results are not marked speculative."""
+        mock_client = MagicMock()
+        mock_async_anthropic.return_value = mock_client
+
+        prompt = "Strike coordinates"
+        interceptor, _ = _make_interceptor_with_cache(prompt, "autonomous_targeting")
+
+        result = await interceptor.evaluate_request_async(prompt)
+
+        assert result.speculative is False
+
+
+class TestNonBlockingEvents:
+    """Tests that callbacks run off the request path."""
+
+    def test_slow_callback_does_not_delay_request(self):
+        """A blocked subscriber adds no latency to evaluate_request()."""
+        prompt = "Cross-reference phone records"
+        interceptor, audit_log = _make_interceptor_with_cache(
+            prompt, "bulk_surveillance"
+        )
+        release = threading.Event()
+        interceptor.on("evaluated", lambda _: release.wait(5))
+
+        started = time.monotonic()
+        result = interceptor.evaluate_request(prompt)
+        elapsed = time.monotonic() - started
+        release.set()
+        interceptor.events.close()
+
+        assert result.decision == Decision.BLOCK
+        assert elapsed < 1
+        assert len(audit_log.entries) == 1
+
+    def test_failing_callback_does_not_abort_request(self):
+        """A callback that raises is counted and the request completes."""
+        prompt = "Cross-reference phone records"
+        interceptor, audit_log = _make_interceptor_with_cache(
+            prompt, "bulk_surveillance"
+        )
+
+        def fail(_):
+            raise RuntimeError("subscriber bug")
+
+        interceptor.on("blocked", fail)
+
+        result = interceptor.evaluate_request(prompt)
+        interceptor.events.flush()
+
+        assert result.decision == Decision.BLOCK
+        assert len(audit_log.entries) == 1
+        assert interceptor.events.stats()["default"]["errors"] == 1
+
+
+class TestPolicyReload:
+    """Tests for FirebreakInterceptor.reload_policy."""
+
+    def test_reload_swaps_policy_and_classifier_context(self, tmp_path):
+        """A reload updates the engine, the classifier and emits an event."""
+        prompt = "Summarize the briefing."
+        interceptor, _ = _make_interceptor_with_cache(prompt, "summarization")
+        old_namespace = interceptor.classifier.namespace
+
+        with open(POLICY_PATH) as f:
+            data = yaml.safe_load(f)
+        data["policy"]["version"] = "2.1"
+        data["rules"][0]["decision"] = "BLOCK"
+        path = tmp_path / "policy.yaml"
+        path.write_text(yaml.dump(data))
+
+        events = []
+        interceptor.on("policy_reloaded", events.append)
+        policy = interceptor.reload_policy(str(path))
+        interceptor.events.flush()
+
+        assert policy.version == "2.1"
+        assert interceptor.policy_engine.policy is policy
+        assert interceptor.classifier.policy_version == "2.1"
+        assert interceptor.classifier.namespace != old_namespace
+        assert events == [policy]
+        result = interceptor.evaluate_request(prompt)
+        assert result.decision == Decision.BLOCK
+
+    def test_reload_publishes_classifier_before_engine(self, tmp_path):
+        """The swap is two steps: classifier view first, then the engine."""
+        interceptor, _ = _make_interceptor_with_cache("x", "summarization")
+        with open(POLICY_PATH) as f:
+            data = yaml.safe_load(f)
+        data["policy"]["version"] = "2.1"
+        path = tmp_path / "policy.yaml"
+        path.write_text(yaml.dump(data))
+        engine = interceptor.policy_engine
+        install = engine.install
+        seen = []
+
+        def observe(compiled):
+            seen.append((interceptor.classifier.policy_version, engine.policy.version))
+            install(compiled)
+
+        with patch.object(engine, "install", side_effect=observe):
+            interceptor.reload_policy(str(path))
+
+        assert seen == [("2.1", "2.0")]
+        assert engine.policy.version == "2.1"
+
+    def test_invalid_reload_keeps_running_policy(self, tmp_path):
+        """An invalid file raises and leaves everything unchanged."""
+        interceptor, _ = _make_interceptor_with_cache("x", "summarization")
+        namespace = interceptor.classifier.namespace
+        path = tmp_path / "policy.yaml"
+        path.write_text("policy: {name: broken}\n")
+
+        with pytest.raises(PolicyError):
+            interceptor.reload_policy(str(path))
+
+        assert interceptor.policy_engine.policy.version == "2.0"
+        assert interceptor.classifier.namespace == namespace
+
+    def test_compile_failure_leaves_classifier_unchanged(self, tmp_path):
+        """A policy that parses but fails to compile changes nothing."""
+        interceptor, _ = _make_interceptor_with_cache("x", "summarization")
+        namespace = interceptor.classifier.namespace
+        with open(POLICY_PATH) as f:
+            data = yaml.safe_load(f)
+        data["policy"]["version"] = "2.1"
+        data["rules"][0]["constraints"] = 5
+        path = tmp_path / "policy.yaml"
+        path.write_text(yaml.dump(data))
+
+        with pytest.raises(PolicyError):
+            interceptor.reload_policy(str(path))
+
+        assert interceptor.policy_engine.policy.version == "2.0"
+        assert interceptor.classifier.namespace == namespace
+        assert interceptor.classifier.policy_version == ""
+
+    def test_reload_turns_on_fast_path(self, tmp_path):
+        """Fast-path rules added by a reload take effect."""
+        interceptor, _ = _make_interceptor_with_cache("x", "summarization")
+        assert interceptor.classifier.fast_path is None
+        with open(POLICY_PATH) as f:
+            data = yaml.safe_load(f)
+        data["fast_path"] = {
+            "rules": [{"category": "summarization", "patterns": ["(?i)summari[sz]e"]}]
+        }
+        path = tmp_path / "policy.yaml"
+        path.write_text(yaml.dump(data))
+
+        interceptor.reload_policy(str(path))
+        result = interceptor.classifier.classify("Summarize the report.")
+
+        assert interceptor.classifier.fast_path is not None
+        assert result.intent_category == "summarization"
+        assert interceptor.classifier.stats["local"].hits == 1
@@ -0,0 +1,131 @@
+"""Tests for the adaptive concurrency limiter."""
+
+import asyncio
+
+import pytest
+
+from firebreak.limiter import ConcurrencyLimiter, Overloaded
+
+
+class TestAdmission:
+    """Tests for acquire() and release()."""
+
+    @pytest.mark.asyncio
+    async def test_admits_up_to_limit(self):
+        """Requests within the limit get a slot at once."""
+        limiter = ConcurrencyLimiter(initial_limit=2)
+
+        await limiter.acquire()
+        await limiter.acquire()
+
+        assert limiter.in_flight == 2
+        assert limiter.admitted == 2
+
+    @pytest.mark.asyncio
+    async def test_queued_request_gets_freed_slot(self):
+        """A waiting request is admitted when a slot is released."""
+        limiter = ConcurrencyLimiter(initial_limit=1)
+        await limiter.acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.queued == 1
+
+        limiter.release()
+        await waiter
+
+        assert limiter.in_flight == 1
+        assert limiter.queued == 0
+
+    @pytest.mark.asyncio
+    async def test_sheds_when_queue_full(self):
+        """A request beyond the queue bound is rejected immediately."""
+        limiter = ConcurrencyLimiter(initial_limit=1, max_queue=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(Overloaded) as info:
+            await limiter.acquire()
+
+        assert info.value.reason == "queue_full"
+        assert info.value.retry_after >= 1
+        assert limiter.rejected == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    @pytest.mark.asyncio
+    async def test_sheds_after_queue_timeout(self):
+        """A request that waits too long is rejected and dequeued."""
+        limiter = ConcurrencyLimiter(initial_limit=1, queue_timeout=0.01)
+        await limiter.acquire()
+
+        with pytest.raises(Overloaded) as info:
+            await limiter.acquire()
+
+        assert info.value.reason == "queue_timeout"
+        assert limiter.queued == 0
+        assert limiter.in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        """A waiter cancelled by its client gives up its place."""
+        limiter = ConcurrencyLimiter(initial_limit=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limiter.release()
+
+        assert limiter.in_flight == 0
+        assert limiter.queued == 0
+
+
+class TestAdaptation:
+    """Tests for how the limit follows latency and failures."""
+
+    def _run(self, limiter: ConcurrencyLimiter, latency: float, times: int):
+        """Complete requests with a latency while the limiter is full."""
+        for _ in range(times):
+            limiter.in_flight = int(limiter.limit)
+            limiter.release(latency)
+
+    def test_grows_while_healthy_and_saturated(self):
+        """Steady latency at full utilization raises the limit."""
+        limiter = ConcurrencyLimiter(initial_limit=4, max_limit=10)
+
+        self._run(limiter, 1.0, 40)
+
+        assert limiter.limit > 4
+
+    def test_does_not_grow_when_underused(self):
+        """The limit only grows when it is actually being hit."""
+        limiter = ConcurrencyLimiter(initial_limit=4)
+        for _ in range(40):
+            limiter.in_flight = 1
+            limiter.release(1.0)
+
+        assert limiter.limit == 4
+
+    def test_shrinks_when_latency_climbs(self):
+        """A sustained latency rise cuts the limit."""
+        limiter = ConcurrencyLimiter(initial_limit=20)
+        self._run(limiter, 1.0, 20)
+        before = limiter.limit
+
+        self._run(limiter, 5.0, 10)
+
+        assert limiter.limit < before
+
+    def test_shrinks_on_failure(self):
+        """An upstream failure cuts the limit, down to min_limit."""
+        limiter = ConcurrencyLimiter(initial_limit=10, min_limit=2, backoff=0.5)
+        for _ in range(5):
+            limiter.in_flight = 1
+            limiter.release(failed=True)
+
+        assert limiter.limit == 2
@@ -205,8 +205,8 @@ class TestEvaluationResult:
             matched_rule_id="block-surveillance",
             rule_description="Mass domestic surveillance — hard block",
             audit_level=AuditLevel.CRITICAL,
-            alerts=["trust_safety", "inspector_general"],
-            constraints=[],
+            alerts=("trust_safety", "inspector_general"),
+            constraints=(),
             color="red",
             note="",
             classification=classification,
@@ -228,8 +228,8 @@ class TestEvaluationResult:
             matched_rule_id="allow-analysis",
             rule_description="Intelligence summarization",
             audit_level=AuditLevel.STANDARD,
-            alerts=[],
-            constraints=[],
+            alerts=(),
+            constraints=(),
             color="green",
             note="",
             classification=classification,
@@ -247,8 +247,8 @@ class TestEvaluationResult:
             matched_rule_id="allow-analysis",
             rule_description="Intelligence summarization",
             audit_level=AuditLevel.STANDARD,
-            alerts=[],
-            constraints=[],
+            alerts=(),
+            constraints=(),
             color="green",
             note="",
             classification=classification,
@@ -271,8 +271,8 @@ class TestAuditEntry:
             matched_rule_id="allow-analysis",
             rule_description="d",
             audit_level=AuditLevel.STANDARD,
-            alerts=[],
-            constraints=[],
+            alerts=(),
+            constraints=(),
             color="green",
             note="",
             classification=classification,
@@ -298,8 +298,8 @@ class TestAuditEntry:
             matched_rule_id="allow-analysis",
             rule_description="d",
             audit_level=AuditLevel.STANDARD,
-            alerts=[],
-            constraints=[],
+            alerts=(),
+            constraints=(),
             color="green",
             note="",
             classification=classification,
@@ -327,8 +327,8 @@ class TestAuditEntry:
             matched_rule_id="allow-analysis",
             rule_description="d",
             audit_level=AuditLevel.STANDARD,
-            alerts=[],
-            constraints=[],
+            alerts=(),
+            constraints=(),
             color="green",
             note="",
             classification=classification,
@@ -342,6 +342,31 @@ class TestAuditEntry:
         after = datetime.now()
         assert before <= entry.timestamp <= after
 
+    def test_slots(self):
+        classification = ClassificationResult(
+            intent_category="summarization",
+            confidence=0.95,
+            raw_prompt="test",
+        )
+        evaluation = EvaluationResult(
+            decision=Decision.ALLOW,
+            matched_rule_id="allow-analysis",
+            rule_description="d",
+            audit_level=AuditLevel.STANDARD,
+            alerts=(),
+            constraints=(),
+            color="green",
+            note="",
+            classification=classification,
+        )
+        entry = AuditEntry(
+            prompt_text="test",
+            classification=classification,
+            evaluation=evaluation,
+        )
+        for obj in (classification, evaluation, entry):
+            assert not hasattr(obj, "__dict__")
+
 
 class TestDemoScenario:
     """Tests for the DemoScenario dataclass."""
@@ -0,0 +1,99 @@
+"""Tests for the command-line options shared by the runners."""
+
+import argparse
+
+from firebreak.models import AuditLevel
+from firebreak.options import (
+    add_alert_options,
+    add_audit_options,
+    add_upstream_options,
+    alert_dispatcher,
+    alert_sinks,
+    open_audit_log,
+    upstream_config,
+)
+from firebreak.upstream import UpstreamConfig
+
+
+def _parse(*argv: str) -> argparse.Namespace:
+    """Parse argv with every shared option group registered."""
+    parser = argparse.ArgumentParser()
+    add_audit_options(parser)
+    add_upstream_options(parser)
+    add_alert_options(parser)
+    return parser.parse_args(list(argv))
+
+
+class TestAuditOptions:
+    """Tests for add_audit_options() and open_audit_log()."""
+
+    def test_no_log_without_path(self):
+        assert open_audit_log(_parse()) is None
+
+    def test_options_reach_the_log(self, tmp_path):
+        """Rotation, retention, fsync and blob flags configure the log."""
+        args = _parse(
+            "--audit-log",
+            str(tmp_path / "audit.jsonl"),
+            "--audit-fsync-interval",
+            "0.25",
+            "--audit-segment-mb",
+            "2",
+            "--audit-segment-hours",
+            "12",
+            "--audit-retain",
+            "standard=30",
+            "--audit-blobs",
+            str(tmp_path / "blobs.db"),
+        )
+
+        audit_log = open_audit_log(args)
+        try:
+            assert audit_log.fsync_interval == 0.25
+            assert audit_log.max_segment_bytes == 2 * 1024 * 1024
+            assert audit_log.max_segment_age == 12 * 3600
+            assert audit_log.retention == {AuditLevel.STANDARD: 30 * 86400}
+            assert audit_log.blobs is not None
+        finally:
+            audit_log.close()
+
+
+class TestUpstreamOptions:
+    """Tests for add_upstream_options() and upstream_config()."""
+
+    def test_defaults_match_config(self):
+        assert upstream_config(_parse()) == UpstreamConfig()
+
+    def test_breaker_flags(self):
+        config = upstream_config(
+            _parse("--breaker-threshold", "0.25", "--breaker-min-calls", "4")
+        )
+
+        assert (config.breaker_threshold, config.breaker_min_calls) == (0.25, 4)
+
+
+class TestAlertOptions:
+    """Tests for add_alert_options() and the sink builders."""
+
+    def test_no_dispatcher_without_sinks(self):
+        assert alert_dispatcher(_parse()) is None
+
+    def test_sinks(self, tmp_path):
+        sinks = alert_sinks(
+            _parse(
+                "--alert-log",
+                str(tmp_path / "alerts.jsonl"),
+                "--alert-webhook",
+                "http://hooks.example/a",
+                "--alert-webhook",
+                "http://hooks.example/b",
+            )
+        )
+
+        assert [type(sink).__name__ for sink in sinks] == [
+            "FileSink",
+            "WebhookSink",
+            "WebhookSink",
+        ]
+        for sink in sinks:
+            sink.close()
@@ -11,8 +11,10 @@ from firebreak.models import (
     AuditLevel,
     ClassificationResult,
     Decision,
+    Policy,
+    PolicyRule,
 )
-from firebreak.policy import PolicyEngine
+from firebreak.policy import PolicyEngine, PolicyError, PolicyWatcher
 
 # Path to the real policy file
 POLICY_PATH = str(
@@ -254,6 +256,20 @@ class TestNoMatchDefault:
         result = engine.evaluate("unknown_thing", classification)
         assert result.classification is classification
 
+    def test_upstream_error_blocks(self, engine: PolicyEngine) -> None:
+        """A classifier that could not reach its model fails closed."""
+        classification = ClassificationResult(
+            intent_category="unclassified",
+            confidence=0.0,
+            raw_prompt="Summarize this",
+            error="timeout",
+        )
+        result = engine.evaluate("unclassified", classification)
+        assert result.decision == Decision.BLOCK
+        assert result.matched_rule_id == "upstream-unavailable"
+        assert result.upstream_error == "timeout"
+        assert result.alerts == ()
+
 
 # --------------------------------------------------------------------------- #
 # Classification preserved on result
@@ -281,6 +297,87 @@ class TestEvaluationResultFields:
         assert result.llm_response is None
 
 
+# --------------------------------------------------------------------------- #
+# Compiled category index
+# --------------------------------------------------------------------------- #
+
+
+def _rule(rule_id: str, categories: list[str], decision: Decision) -> PolicyRule:
+    """Build a minimal PolicyRule."""
+    return PolicyRule(
+        id=rule_id,
+        description=f"Rule {rule_id}",
+        match_categories=categories,
+        decision=decision,
+        audit=AuditLevel.STANDARD,
+    )
+
+
+def _policy(rules: list[PolicyRule]) -> Policy:
+    """Build a minimal Policy around a list of rules."""
+    return Policy(
+        name="test",
+        version="1.0",
+        effective="",
+        signatories={},
+        rules=rules,
+        categories=sorted({c for r in rules for c in r.match_categories}),
+    )
+
+
+class TestCompiledIndex:
+    """Tests for the precomputed category-to-rule index."""
+
+    def test_first_match_wins_for_overlapping_rules(self, make_classification):
+        """A category listed by several rules resolves to the first."""
+        eng = PolicyEngine()
+        eng.policy = _policy(
+            [
+                _rule("first", ["a", "b"], Decision.ALLOW),
+                _rule("second", ["b", "c"], Decision.BLOCK),
+            ]
+        )
+
+        assert eng.evaluate("b", make_classification("b")).matched_rule_id == "first"
+        assert eng.evaluate("c", make_classification("c")).matched_rule_id == "second"
+
+    def test_assigning_policy_recompiles(self, make_classification):
+        """Replacing engine.policy rebuilds the index."""
+        eng = PolicyEngine()
+        eng.policy = _policy([_rule("old", ["a"], Decision.ALLOW)])
+        eng.policy = _policy([_rule("new", ["a"], Decision.BLOCK)])
+
+        result = eng.evaluate("a", make_classification("a"))
+
+        assert result.matched_rule_id == "new"
+        assert result.decision == Decision.BLOCK
+
+    def test_large_policy(self, make_classification):
+        """Hundreds of rules resolve to the right rule."""
+        rules = [
+            _rule(f"rule-{i}", [f"cat-{i}", f"alias-{i}"], Decision.ALLOW)
+            for i in range(500)
+        ]
+        eng = PolicyEngine()
+        eng.policy = _policy(rules)
+
+        result = eng.evaluate("alias-499", make_classification("alias-499"))
+
+        assert result.matched_rule_id == "rule-499"
+
+    def test_results_share_only_immutable_state(self, engine, make_classification):
+        """Results share the rule's tuples; per-request fields stay separate."""
+        first = engine.evaluate("bulk_surveillance", make_classification("x"))
+        first.llm_response = "tampered"
+
+        second = engine.evaluate("bulk_surveillance", make_classification("x"))
+
+        assert isinstance(first.alerts, tuple)
+        assert second.alerts is first.alerts
+        assert second.constraints is first.constraints
+        assert second.llm_response is None
+
+
 # --------------------------------------------------------------------------- #
 # Invalid YAML raises ValueError
 # --------------------------------------------------------------------------- #
@@ -406,6 +503,215 @@ class TestInvalidYaml:
             eng.load(path)
 
 
+# --------------------------------------------------------------------------- #
+# Fast-path classifier rules
+# --------------------------------------------------------------------------- #
+
+
+class TestFastPath:
+    """Tests for parsing the optional fast_path section."""
+
+    @staticmethod
+    def _write_policy(fast_path: object) -> str:
+        """Write a minimal policy with the given fast_path section."""
+        data = {
+            "policy": {"name": "test", "version": "1.0"},
+            "categories": ["summarization", "bulk_surveillance"],
+            "rules": [
+                {
+                    "id": "r1",
+                    "decision": "ALLOW",
+                    "match_categories": ["summarization"],
+                }
+            ],
+            "fast_path": fast_path,
+        }
+        return TestInvalidYaml._write_yaml(data)
+
+    def test_absent_section_has_no_rules(self, engine: PolicyEngine) -> None:
+        """A policy without fast_path has no fast-path rules."""
+        assert engine.policy.fast_path_rules == []
+        assert engine.policy.fast_path_threshold == 0.9
+
+    def test_parses_rules_and_threshold(self) -> None:
+        """Rules, confidences and threshold are loaded."""
+        path = self._write_policy(
+            {
+                "threshold": 0.8,
+                "rules": [
+                    {
+                        "category": "summarization",
+                        "patterns": [r"\bsummari[sz]e\b"],
+                        "confidence": 0.85,
+                    }
+                ],
+            }
+        )
+        policy = PolicyEngine().load(path)
+
+        assert policy.fast_path_threshold == 0.8
+        assert len(policy.fast_path_rules) == 1
+        rule = policy.fast_path_rules[0]
+        assert rule.category == "summarization"
+        assert rule.patterns == [r"\bsummari[sz]e\b"]
+        assert rule.confidence == 0.85
+
+    def test_unknown_category_raises(self) -> None:
+        """A fast-path rule for an undeclared category raises ValueError."""
+        path = self._write_policy(
+            {"rules": [{"category": "made_up", "patterns": ["x"]}]}
+        )
+        with pytest.raises(ValueError, match="unknown category"):
+            PolicyEngine().load(path)
+
+    def test_invalid_pattern_raises(self) -> None:
+        """A malformed regular expression raises ValueError."""
+        path = self._write_policy(
+            {"rules": [{"category": "summarization", "patterns": ["(unclosed"]}]}
+        )
+        with pytest.raises(ValueError, match="invalid pattern"):
+            PolicyEngine().load(path)
+
+
+# --------------------------------------------------------------------------- #
+# Hot reload
+# --------------------------------------------------------------------------- #
+
+
+def _policy_yaml(version: str, decision: str = "ALLOW") -> dict:
+    """Build a minimal policy document."""
+    return {
+        "policy": {"name": "test", "version": version},
+        "categories": ["summarization"],
+        "rules": [
+            {
+                "id": f"rule-{version}",
+                "decision": decision,
+                "match_categories": ["summarization"],
+            }
+        ],
+    }
+
+
+class TestReload:
+    """Tests for reloading a policy on a running engine."""
+
+    def test_compile_does_not_replace_policy(self, engine: PolicyEngine) -> None:
+        """compile() validates a file without swapping it in."""
+        path = TestInvalidYaml._write_yaml(_policy_yaml("9.9"))
+
+        compiled = engine.compile(path)
+
+        assert compiled.policy.version == "9.9"
+        assert engine.policy.version == "2.0"
+
+    def test_failed_load_keeps_current_policy(
+        self, engine: PolicyEngine, make_classification
+    ) -> None:
+        """An invalid file leaves the running policy in place."""
+        path = TestInvalidYaml._write_yaml({"policy": {"name": "broken"}})
+
+        with pytest.raises(ValueError):
+            engine.load(path)
+
+        assert engine.policy.version == "2.0"
+        result = engine.evaluate("summarization", make_classification("x"))
+        assert result.matched_rule_id == "allow-analysis"
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "rules: [",
+            yaml.dump({**_policy_yaml("1.1"), "rules": 5}),
+            yaml.dump(
+                {
+                    **_policy_yaml("1.1"),
+                    "rules": [{"id": "r", "decision": "ALLOW", "match_categories": 5}],
+                }
+            ),
+            yaml.dump(
+                {
+                    **_policy_yaml("1.1"),
+                    "rules": [
+                        {
+                            "id": "r",
+                            "decision": "ALLOW",
+                            "match_categories": ["summarization"],
+                            "constraints": 5,
+                        }
+                    ],
+                }
+            ),
+        ],
+        ids=["yaml", "rules", "match-categories", "compile"],
+    )
+    def test_every_failure_is_policy_error(
+        self, engine: PolicyEngine, tmp_path: Path, text: str
+    ) -> None:
+        """Syntax, validation and compile failures all raise PolicyError."""
+        path = tmp_path / "policy.yaml"
+        path.write_text(text)
+
+        with pytest.raises(PolicyError):
+            engine.load(str(path))
+
+        assert engine.policy.version == "2.0"
+
+    def test_missing_file_is_policy_error(self, engine: PolicyEngine) -> None:
+        """An unreadable file raises PolicyError."""
+        with pytest.raises(PolicyError):
+            engine.compile("/nonexistent/policy.yaml")
+
+    def test_watcher_reloads_on_change(self, tmp_path: Path) -> None:
+        """The watcher calls on_change once the file is modified."""
+        path = tmp_path / "policy.yaml"
+        path.write_text(yaml.dump(_policy_yaml("1.0")))
+        eng = PolicyEngine()
+        eng.load(str(path))
+        watcher = PolicyWatcher(str(path), eng.load)
+
+        assert watcher.check() is False
+
+        path.write_text(yaml.dump(_policy_yaml("1.1", "BLOCK")))
+        watcher._mtime = 0.0
+        assert watcher.check() is True
+        assert eng.policy.version == "1.1"
+
+    def test_watcher_reports_invalid_file(self, tmp_path: Path) -> None:
+        """A broken file is reported and the old policy kept."""
+        path = tmp_path / "policy.yaml"
+        path.write_text(yaml.dump(_policy_yaml("1.0")))
+        eng = PolicyEngine()
+        eng.load(str(path))
+        errors = []
+        watcher = PolicyWatcher(str(path), eng.load, on_error=errors.append)
+
+        path.write_text("rules: [")
+        watcher._mtime = 0.0
+
+        assert watcher.check() is False
+        assert len(errors) == 1
+        assert watcher.last_error is errors[0]
+        assert eng.policy.version == "1.0"
+
+    def test_watcher_survives_compile_error(self, tmp_path: Path) -> None:
+        """A policy that fails to compile is reported, not raised."""
+        path = tmp_path / "policy.yaml"
+        path.write_text(yaml.dump(_policy_yaml("1.0")))
+        eng = PolicyEngine()
+        eng.load(str(path))
+        watcher = PolicyWatcher(str(path), eng.load)
+        data = _policy_yaml("1.1")
+        data["rules"][0]["alerts"] = 5
+
+        path.write_text(yaml.dump(data))
+        watcher._mtime = 0.0
+
+        assert watcher.check() is False
+        assert isinstance(watcher.last_error, PolicyError)
+        assert eng.policy.version == "1.0"
+
+
 # --------------------------------------------------------------------------- #
 # Engine state
 # --------------------------------------------------------------------------- #
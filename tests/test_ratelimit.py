@@ -0,0 +1,283 @@
+"""Tests for per-client rate limiting."""
+
+import asyncio
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from firebreak.ratelimit import (
+    ANONYMOUS,
+    ClientLimits,
+    RateLimited,
+    RateLimiter,
+    SQLiteRateStore,
+    UnknownClient,
+    load_clients,
+)
+
+
+def _at(seconds: float):
+    """Freeze the limiter's clock."""
+    return patch("firebreak.ratelimit.time.monotonic", return_value=seconds)
+
+
+class TestIdentify:
+    """Tests for RateLimiter.identify()."""
+
+    def test_registered_key(self):
+        """A registered key maps to its client id."""
+        limiter = RateLimiter(keys={"sk-a": "analytics"})
+
+        assert limiter.identify("Bearer sk-a") == "analytics"
+
+    def test_unregistered_key_refused(self):
+        """With a registry, unknown or missing keys are refused."""
+        limiter = RateLimiter(keys={"sk-a": "analytics"})
+
+        with pytest.raises(UnknownClient):
+            limiter.identify("Bearer sk-b")
+        with pytest.raises(UnknownClient):
+            limiter.identify(None)
+
+    def test_open_mode_buckets_by_address(self):
+        """Without a registry, unverifiable keys do not pick the bucket."""
+        limiter = RateLimiter()
+
+        first = limiter.identify("Bearer sk-secret", "10.0.0.7")
+
+        assert first == "addr-10.0.0.7"
+        assert first == limiter.identify("Bearer sk-other", "10.0.0.7")
+        assert first != limiter.identify("Bearer sk-secret", "10.0.0.8")
+        assert limiter.identify("Bearer sk-secret") == ANONYMOUS
+        assert limiter.identify(None) == ANONYMOUS
+
+    def test_rotating_keys_share_a_bucket(self):
+        """Minting a new key per request does not reset the limit."""
+        limiter = RateLimiter(default_limits=ClientLimits(request_burst=2))
+
+        with _at(0.0):
+            for i in range(2):
+                limiter.check(limiter.identify(f"Bearer sk-{i}", "10.0.0.7"))
+            with pytest.raises(RateLimited):
+                limiter.check(limiter.identify("Bearer sk-new", "10.0.0.7"))
+
+
+class TestRequestBucket:
+    """Tests for the requests-per-second bucket."""
+
+    def test_burst_then_refill(self):
+        """A client gets its burst, then waits for the refill."""
+        limiter = RateLimiter(
+            default_limits=ClientLimits(requests_per_second=2, request_burst=3)
+        )
+        with _at(0.0):
+            for _ in range(3):
+                limiter.check("a")
+            with pytest.raises(RateLimited) as info:
+                limiter.check("a")
+
+        assert info.value.limit == "requests"
+        assert info.value.retry_after == pytest.approx(0.5)
+        with _at(0.5):
+            limiter.check("a")
+
+    def test_clients_are_isolated(self):
+        """One client's burst does not use up another's."""
+        limiter = RateLimiter(default_limits=ClientLimits(request_burst=1))
+        with _at(0.0):
+            limiter.check("noisy")
+            with pytest.raises(RateLimited):
+                limiter.check("noisy")
+            limiter.check("quiet")
+
+    def test_per_client_limits(self):
+        """Clients with their own limits do not use the defaults."""
+        limiter = RateLimiter(
+            limits={"batch": ClientLimits(request_burst=5)},
+            default_limits=ClientLimits(request_burst=1),
+        )
+        with _at(0.0):
+            for _ in range(5):
+                limiter.check("batch")
+
+
+class TestTokenBudget:
+    """Tests for the upstream tokens-per-minute bucket."""
+
+    def test_debt_blocks_until_repaid(self):
+        """Tokens are charged after the call; debt blocks new requests."""
+        limiter = RateLimiter(
+            default_limits=ClientLimits(tokens_per_minute=600, request_burst=10)
+        )
+        with _at(0.0):
+            limiter.check("a")
+            limiter.charge("a", 700)
+            with pytest.raises(RateLimited) as info:
+                limiter.check("a")
+
+        assert info.value.limit == "tokens"
+        assert info.value.retry_after == pytest.approx(10.0)
+        with _at(10.0):
+            limiter.check("a")
+
+    def test_usage_counters(self):
+        """Usage reports admitted, rejected and token counts."""
+        limiter = RateLimiter(default_limits=ClientLimits(request_burst=1))
+        with _at(0.0):
+            limiter.check("a")
+            limiter.charge("a", 120)
+            with pytest.raises(RateLimited):
+                limiter.check("a")
+            usage = limiter.usage()["a"]
+
+        assert usage["admitted"] == 1
+        assert usage["rejected"] == 1
+        assert usage["tokens_used"] == 120
+
+
+class TestClientTable:
+    """Tests for the bounded client table."""
+
+    def test_least_recently_used_evicted(self):
+        """Beyond max_clients, the idlest client is forgotten."""
+        limiter = RateLimiter(max_clients=2)
+        for client in ("a", "b", "a", "c"):
+            limiter.check(client)
+
+        assert set(limiter.usage()) == {"a", "c"}
+
+
+class TestSQLiteRateStore:
+    """Tests for buckets shared through SQLite."""
+
+    def test_limiters_share_buckets(self, tmp_path):
+        """Two limiters on one database draw from the same budget."""
+        path = str(tmp_path / "rates.db")
+        limits = ClientLimits(request_burst=3, tokens_per_minute=600)
+        first = RateLimiter(default_limits=limits, store=SQLiteRateStore(path))
+        second = RateLimiter(default_limits=limits, store=SQLiteRateStore(path))
+        with _at(0.0):
+            first.check("a")
+            second.check("a")
+            first.check("a")
+            with pytest.raises(RateLimited):
+                second.check("a")
+            second.charge("a", 50)
+            usage = first.usage()["a"]
+        first.close()
+        second.close()
+
+        assert usage["admitted"] == 3
+        assert usage["rejected"] == 1
+        assert usage["tokens_used"] == 50
+        assert usage["tokens_available"] == 550
+
+    def test_state_survives_reopen(self, tmp_path):
+        """Budgets persist across limiter restarts."""
+        path = str(tmp_path / "rates.db")
+        limits = ClientLimits(request_burst=1)
+        limiter = RateLimiter(default_limits=limits, store=SQLiteRateStore(path))
+        with _at(0.0):
+            limiter.check("a")
+        limiter.close()
+
+        limiter = RateLimiter(default_limits=limits, store=SQLiteRateStore(path))
+        with _at(0.01), pytest.raises(RateLimited):
+            limiter.check("a")
+        limiter.close()
+
+    def test_refilled_idle_clients_pruned(self, tmp_path):
+        """Rows whose buckets have been full for idle_ttl are deleted."""
+        path = str(tmp_path / "rates.db")
+        limits = ClientLimits(requests_per_second=1, tokens_per_minute=600)
+        with _at(0.0):
+            store = SQLiteRateStore(path, idle_ttl=100, prune_interval=60)
+            limiter = RateLimiter(default_limits=limits, store=store)
+            limiter.check("idle")
+            limiter.check("indebted")
+            limiter.charge("indebted", 3000)
+        with _at(200.0):
+            limiter.check("active")
+            clients = set(limiter.usage())
+        limiter.close()
+
+        assert clients == {"indebted", "active"}
+        assert store.pruned == 1
+
+    def test_opens_table_without_full_at(self, tmp_path):
+        """A database written before rows recorded full_at still opens."""
+        path = str(tmp_path / "rates.db")
+        old = sqlite3.connect(path)
+        old.execute(
+            "CREATE TABLE rate_clients (client TEXT PRIMARY KEY,"
+            " requests REAL NOT NULL, requests_at REAL NOT NULL,"
+            " tokens REAL NOT NULL, tokens_at REAL NOT NULL,"
+            " admitted INTEGER NOT NULL, rejected INTEGER NOT NULL,"
+            " tokens_used INTEGER NOT NULL)"
+        )
+        old.execute("INSERT INTO rate_clients VALUES ('a', 1, 0, 10, 0, 4, 0, 0)")
+        old.commit()
+        old.close()
+
+        limiter = RateLimiter(store=SQLiteRateStore(path))
+        with _at(0.0):
+            limiter.check("a")
+            usage = limiter.usage()["a"]
+        limiter.close()
+
+        assert usage["admitted"] == 5
+
+    @pytest.mark.asyncio
+    async def test_waits_for_lock_off_event_loop(self, tmp_path):
+        """A check waiting on another worker's transaction leaves the loop free."""
+        path = str(tmp_path / "rates.db")
+        limiter = RateLimiter(store=SQLiteRateStore(path))
+        other = sqlite3.connect(path, isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+
+        task = asyncio.create_task(limiter.check_async("a"))
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+        waiting = not task.done()
+        other.execute("COMMIT")
+        await task
+        await limiter.charge_async("a", 10)
+        usage = limiter.usage()["a"]
+        other.close()
+        limiter.close()
+
+        assert waiting
+        assert usage["admitted"] == 1
+        assert usage["tokens_used"] == 10
+
+
+class TestLoadClients:
+    """Tests for load_clients()."""
+
+    def test_registry(self, tmp_path):
+        """Keys, defaults and overrides are read from YAML."""
+        path = tmp_path / "clients.yaml"
+        path.write_text(
+            "defaults:\n"
+            "  requests_per_second: 5\n"
+            "clients:\n"
+            "  analytics:\n"
+            "    keys: [sk-a1, sk-a2]\n"
+            "    tokens_per_minute: 20000\n"
+        )
+
+        limiter = load_clients(str(path))
+
+        assert limiter.identify("Bearer sk-a2") == "analytics"
+        limits = limiter.limits["analytics"]
+        assert limits.requests_per_second == 5
+        assert limits.tokens_per_minute == 20000
+
+    def test_unknown_field(self, tmp_path):
+        """A misspelled limit is reported."""
+        path = tmp_path / "clients.yaml"
+        path.write_text("clients:\n  a:\n    request_per_second: 5\n")
+
+        with pytest.raises(ValueError):
+            load_clients(str(path))
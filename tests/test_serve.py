@@ -0,0 +1,260 @@
+"""Tests for the multi-worker server runner."""
+
+import importlib
+import json
+import tomllib
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from starlette.testclient import TestClient
+
+from firebreak.audit import AuditLog
+from firebreak.audit_relay import AuditRelay
+from firebreak.interceptor import FirebreakInterceptor
+from firebreak.models import (
+    AuditLevel,
+    ClassificationResult,
+    Decision,
+    EvaluationResult,
+)
+from firebreak.options import DEFAULT_CACHE_MAX_ENTRIES
+from firebreak.serve import (
+    CONFIG_ENV,
+    DEFAULT_POLICY,
+    _parse_args,
+    _worker_config,
+    create_worker_app,
+    main,
+)
+from firebreak.server import ADMIN_KEY_ENV
+
+ADMIN_HEADERS = {"Authorization": "Bearer sk-admin"}
+
+PYPROJECT = Path(__file__).resolve().parent.parent / "pyproject.toml"
+
+
+def _evaluation(decision: Decision) -> EvaluationResult:
+    """Build a minimal evaluation for a summarization prompt."""
+    classification = ClassificationResult(
+        intent_category="summarization", confidence=0.9, raw_prompt="hello"
+    )
+    return EvaluationResult(
+        classification=classification,
+        decision=decision,
+        matched_rule_id="rule",
+        rule_description="Rule",
+        audit_level=AuditLevel.STANDARD,
+        alerts=(),
+        constraints=(),
+        color="green",
+        note="",
+    )
+
+
+def _start_worker(config: dict):
+    """Build one worker in-process behind its own audit relay.
+
+    Returns:
+        The worker's interceptor, and a function that runs its exit
+        handlers and stops the relay.
+    """
+    relay = AuditRelay(AuditLog(), config["audit_socket"])
+    built = []
+
+    def build(**kwargs):
+        built.append(FirebreakInterceptor(**kwargs))
+        return built[-1]
+
+    closers = []
+    with (
+        patch("firebreak.serve.atexit.register", side_effect=closers.append),
+        patch("firebreak.serve.FirebreakInterceptor", side_effect=build),
+    ):
+        create_worker_app()
+
+    def stop():
+        for close in reversed(closers):
+            close()
+        relay.close()
+
+    return built[0], stop
+
+
+@pytest.fixture
+def worker_config(tmp_path_factory, monkeypatch):
+    """Publish a worker configuration the way main() does."""
+    state_dir = tmp_path_factory.mktemp("state")
+    args = _parse_args(["--client-rps", "1", "--workers", "2"])
+    config = _worker_config(args, str(state_dir), str(state_dir / "audit.sock"))
+    monkeypatch.setenv(CONFIG_ENV, json.dumps(config))
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setenv(ADMIN_KEY_ENV, "sk-admin")
+    return config
+
+
+@pytest.fixture
+def workers(worker_config):
+    """Build two worker apps in-process, behind one audit relay."""
+    audit_log = AuditLog()
+    relay = AuditRelay(audit_log, worker_config["audit_socket"])
+    closers = []
+    with patch("firebreak.serve.atexit.register", side_effect=closers.append):
+        apps = [create_worker_app(), create_worker_app()]
+    yield [TestClient(app) for app in apps], audit_log
+    for close in reversed(closers):
+        close()
+    relay.close()
+
+
+class TestCreateWorkerApp:
+    """Tests for create_worker_app()."""
+
+    def test_requires_config(self, monkeypatch):
+        """Workers refuse to start without the supervisor's config."""
+        monkeypatch.delenv(CONFIG_ENV, raising=False)
+
+        with pytest.raises(RuntimeError):
+            create_worker_app()
+
+    def test_workers_share_rate_limits(self, workers):
+        """A client's request budget is spent across workers."""
+        (first, second), _ = workers
+        headers = {"Authorization": "Bearer sk-test"}
+
+        # --client-rps 1 allows a burst of two requests.
+        codes = [
+            client.post("/v1/chat/completions", json={}, headers=headers).status_code
+            for client in (first, second, first)
+        ]
+        usage = second.get("/admin/clients", headers=ADMIN_HEADERS).json()["data"]
+
+        assert codes == [400, 400, 429]
+        assert [client["admitted"] for client in usage.values()] == [2]
+
+    def test_audit_query_goes_to_relay(self, workers):
+        """/v1/audit on any worker reads the supervisor's log."""
+        (first, _), audit_log = workers
+        classification = ClassificationResult(
+            intent_category="summarization", confidence=0.9, raw_prompt="hello"
+        )
+        audit_log.log(
+            "hello",
+            classification,
+            EvaluationResult(
+                classification=classification,
+                decision=Decision.ALLOW,
+                matched_rule_id="allow",
+                rule_description="Allow",
+                audit_level=AuditLevel.STANDARD,
+                alerts=(),
+                constraints=(),
+                color="green",
+                note="",
+            ),
+        )
+
+        resp = first.get("/v1/audit", headers=ADMIN_HEADERS)
+
+        assert resp.status_code == 200
+        assert [r["prompt"] for r in resp.json()["data"]] == ["hello"]
+
+    def test_reload_endpoint_only_with_one_worker(self, worker_config, monkeypatch):
+        """A reload that would reach one worker of several is not offered."""
+        relay = AuditRelay(AuditLog(), worker_config["audit_socket"])
+        closers = []
+        with patch("firebreak.serve.atexit.register", side_effect=closers.append):
+            several = TestClient(create_worker_app())
+            monkeypatch.setenv(CONFIG_ENV, json.dumps({**worker_config, "workers": 1}))
+            single = TestClient(create_worker_app())
+
+        reload = several.post("/admin/policy/reload", headers=ADMIN_HEADERS)
+        assert reload.status_code == 404
+        reload = single.post("/admin/policy/reload", headers=ADMIN_HEADERS)
+        assert reload.status_code == 200
+        for close in reversed(closers):
+            close()
+        relay.close()
+
+    def test_worker_takes_upstream_batch_and_alert_options(self, tmp_path, monkeypatch):
+        """Pool, breaker, batching and alert flags reach every worker."""
+        args = _parse_args(
+            [
+                "--upstream-max-connections",
+                "7",
+                "--breaker-cooldown",
+                "3",
+                "--batch-window-ms",
+                "5",
+                "--alert-log",
+                str(tmp_path / "alerts.jsonl"),
+                "--alert-window",
+                "3600",
+            ]
+        )
+        config = _worker_config(args, str(tmp_path), str(tmp_path / "audit.sock"))
+        monkeypatch.setenv(CONFIG_ENV, json.dumps(config))
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        interceptor, stop = _start_worker(config)
+        interceptor._emit(
+            "alert",
+            {"target": "soc", "evaluation": _evaluation(Decision.BLOCK)},
+        )
+        stop()
+
+        assert interceptor.upstream.config.max_connections == 7
+        assert interceptor.upstream.breaker.cooldown == 3
+        assert interceptor.classifier.batch_window == 0.005
+        alerts = (tmp_path / "alerts.jsonl").read_text().splitlines()
+        assert [json.loads(line)["target"] for line in alerts] == ["soc"]
+
+    def test_worker_cache_is_bounded(self, tmp_path, monkeypatch):
+        """--cache-max-entries and --cache-ttl bound memory and the store."""
+        args = _parse_args(["--cache-max-entries", "50", "--cache-ttl", "600"])
+        config = _worker_config(args, str(tmp_path), str(tmp_path / "audit.sock"))
+        monkeypatch.setenv(CONFIG_ENV, json.dumps(config))
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        interceptor, stop = _start_worker(config)
+        cache = interceptor.classifier.cache
+        bounds = (cache.max_entries, cache.ttl, cache.store.max_age)
+        stop()
+
+        assert bounds == (50, 600, 600)
+
+    def test_cache_bounded_by_default(self):
+        """Without flags the worker cache still has an entry limit."""
+        assert _parse_args([]).cache_max_entries == DEFAULT_CACHE_MAX_ENTRIES
+
+
+class TestEntryPoint:
+    """Tests for the firebreak-serve command."""
+
+    def test_console_script(self):
+        """pyproject.toml installs firebreak-serve as serve.main()."""
+        scripts = tomllib.loads(PYPROJECT.read_text())["project"]["scripts"]
+
+        module, _, name = scripts["firebreak-serve"].partition(":")
+
+        assert getattr(importlib.import_module(module), name) is main
+
+    def test_prog_name(self, capsys):
+        """Usage and help name the installed command."""
+        with pytest.raises(SystemExit):
+            _parse_args(["--help"])
+
+        assert capsys.readouterr().out.startswith("usage: firebreak-serve")
+
+    def test_defaults(self):
+        """Without flags the server listens locally with the standard policy."""
+        args = _parse_args([])
+
+        assert (args.host, args.port) == ("127.0.0.1", 8080)
+        assert args.policy == DEFAULT_POLICY
+        assert args.workers >= 1
+
+    def test_audit_options(self):
+        """The supervisor's audit log takes the shared --audit-* flags."""
+        args = _parse_args(["--audit-log", "a.jsonl", "--audit-retain", "standard=1"])
+
+        assert args.audit_log == "a.jsonl"
+        assert args.audit_retain == [(AuditLevel.STANDARD, 86400.0)]
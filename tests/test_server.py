@@ -1,15 +1,24 @@
 """Tests for the OpenAI-compatible proxy server."""
 
-from unittest.mock import MagicMock
+import asyncio
+import inspect
+import json
+from unittest.mock import AsyncMock, MagicMock
 
+import pytest
 from starlette.testclient import TestClient
 
+from firebreak.audit import AuditLog
+from firebreak.interceptor import ResponseStream
+from firebreak.limiter import ConcurrencyLimiter
 from firebreak.models import (
     AuditLevel,
     ClassificationResult,
     Decision,
     EvaluationResult,
 )
+from firebreak.policy import PolicyError
+from firebreak.ratelimit import ClientLimits, RateLimiter
 from firebreak.server import create_app
 
 
@@ -17,7 +26,7 @@ def _make_evaluation(
     decision: Decision,
     rule_id: str = "test-rule",
     llm_response: str | None = None,
-    constraints: list[str] | None = None,
+    constraints: tuple[str, ...] = (),
 ) -> EvaluationResult:
     """Build a minimal EvaluationResult for testing."""
     return EvaluationResult(
@@ -25,8 +34,8 @@ def _make_evaluation(
         matched_rule_id=rule_id,
         rule_description="Test rule description",
         audit_level=AuditLevel.STANDARD,
-        alerts=[],
-        constraints=constraints or [],
+        alerts=(),
+        constraints=constraints,
         color="green",
         note="",
         classification=ClassificationResult(
@@ -38,6 +47,37 @@ def _make_evaluation(
     )
 
 
+ADMIN_KEY = "sk-admin"
+ADMIN_HEADERS = {"Authorization": f"Bearer {ADMIN_KEY}"}
+
+
+def _make_interceptor(evaluation: EvaluationResult | None = None) -> MagicMock:
+    """Build a mock interceptor whose async pipeline returns ``evaluation``."""
+    interceptor = MagicMock()
+    interceptor.evaluate_request_async = AsyncMock(return_value=evaluation)
+    return interceptor
+
+
+class TestCreateApp:
+    def test_serves_without_dashboard(self):
+        """The app needs no dashboard or Live display to serve requests."""
+        params = inspect.signature(create_app).parameters
+        evaluation = _make_evaluation(Decision.ALLOW, llm_response="Summary")
+        interceptor = _make_interceptor(evaluation)
+        client = TestClient(create_app(interceptor))
+
+        resp = client.post(
+            "/v1/chat/completions",
+            json={"messages": [{"role": "user", "content": "Summarize"}]},
+        )
+
+        assert "dashboard" not in params
+        assert "live" not in params
+        assert resp.status_code == 200
+        assert resp.json()["choices"][0]["message"]["content"] == "Summary"
+        interceptor.evaluate_request_async.assert_awaited_once_with("Summarize")
+
+
 class TestHealthEndpoint:
     def test_health_returns_ok(self):
         interceptor = MagicMock()
@@ -49,6 +89,30 @@ class TestHealthEndpoint:
         assert resp.status_code == 200
         assert resp.json() == {"status": "ok"}
 
+    def test_health_reports_audit_outage(self):
+        interceptor = MagicMock()
+        interceptor.audit_log.healthy = False
+        client = TestClient(create_app(interceptor))
+
+        resp = client.get("/health")
+
+        assert resp.status_code == 503
+        assert resp.json() == {"status": "audit_unavailable"}
+
+    def test_requests_fail_closed_without_audit(self):
+        interceptor = _make_interceptor()
+        interceptor.audit_log.healthy = False
+        client = TestClient(create_app(interceptor))
+
+        resp = client.post(
+            "/v1/chat/completions",
+            json={"messages": [{"role": "user", "content": "hello"}]},
+        )
+
+        assert resp.status_code == 503
+        assert resp.json()["error"]["code"] == "audit_unavailable"
+        interceptor.evaluate_request_async.assert_not_called()
+
 
 class TestModelsEndpoint:
     def test_list_models(self):
@@ -67,9 +131,8 @@ class TestModelsEndpoint:
 
 class TestChatCompletions:
     def test_allow_returns_200_with_response(self):
-        interceptor = MagicMock()
-        interceptor.evaluate_request.return_value = _make_evaluation(
-            Decision.ALLOW, llm_response="Hello, world!"
+        interceptor = _make_interceptor(
+            _make_evaluation(Decision.ALLOW, llm_response="Hello, world!")
         )
         client = TestClient(create_app(interceptor))
 
@@ -89,12 +152,13 @@ class TestChatCompletions:
         assert data["choices"][0]["finish_reason"] == "stop"
 
     def test_allow_constrained_returns_200(self):
-        interceptor = MagicMock()
-        interceptor.evaluate_request.return_value = _make_evaluation(
-            Decision.ALLOW_CONSTRAINED,
-            rule_id="allow-warranted",
-            llm_response="Constrained response",
-            constraints=["Warrant required"],
+        interceptor = _make_interceptor(
+            _make_evaluation(
+                Decision.ALLOW_CONSTRAINED,
+                rule_id="allow-warranted",
+                llm_response="Constrained response",
+                constraints=("Warrant required",),
+            )
         )
         client = TestClient(create_app(interceptor))
 
@@ -111,9 +175,8 @@ class TestChatCompletions:
         assert content == "Constrained response"
 
     def test_block_returns_400_with_error(self):
-        interceptor = MagicMock()
-        interceptor.evaluate_request.return_value = _make_evaluation(
-            Decision.BLOCK, rule_id="block-surveillance"
+        interceptor = _make_interceptor(
+            _make_evaluation(Decision.BLOCK, rule_id="block-surveillance")
         )
         client = TestClient(create_app(interceptor))
 
@@ -131,8 +194,27 @@ class TestChatCompletions:
         assert error["code"] == "content_policy_violation"
         assert "block-surveillance" in error["message"]
 
+    def test_upstream_errors_map_to_5xx(self):
+        for reason, status in (("circuit_open", 503), ("timeout", 504), ("error", 502)):
+            evaluation = _make_evaluation(Decision.BLOCK, "upstream-unavailable")
+            evaluation.upstream_error = reason
+            client = TestClient(create_app(_make_interceptor(evaluation)))
+
+            resp = client.post(
+                "/v1/chat/completions",
+                json={
+                    "model": "firebreak-proxy",
+                    "messages": [{"role": "user", "content": "Summarize this"}],
+                },
+            )
+
+            assert resp.status_code == status
+            error = resp.json()["error"]
+            assert error["type"] == "server_error"
+            assert error["code"] == "upstream_unavailable"
+
     def test_missing_messages_returns_400(self):
-        interceptor = MagicMock()
+        interceptor = _make_interceptor()
         client = TestClient(create_app(interceptor))
 
         resp = client.post(
@@ -142,10 +224,10 @@ class TestChatCompletions:
 
         assert resp.status_code == 400
         assert resp.json()["error"]["code"] == "invalid_request"
-        interceptor.evaluate_request.assert_not_called()
+        interceptor.evaluate_request_async.assert_not_called()
 
     def test_empty_messages_returns_400(self):
-        interceptor = MagicMock()
+        interceptor = _make_interceptor()
         client = TestClient(create_app(interceptor))
 
         resp = client.post(
@@ -154,10 +236,10 @@ class TestChatCompletions:
         )
 
         assert resp.status_code == 400
-        interceptor.evaluate_request.assert_not_called()
+        interceptor.evaluate_request_async.assert_not_called()
 
     def test_no_user_message_returns_400(self):
-        interceptor = MagicMock()
+        interceptor = _make_interceptor()
         client = TestClient(create_app(interceptor))
 
         resp = client.post(
@@ -170,12 +252,11 @@ class TestChatCompletions:
 
         assert resp.status_code == 400
         assert "No user message" in resp.json()["error"]["message"]
-        interceptor.evaluate_request.assert_not_called()
+        interceptor.evaluate_request_async.assert_not_called()
 
     def test_extracts_last_user_message(self):
-        interceptor = MagicMock()
-        interceptor.evaluate_request.return_value = _make_evaluation(
-            Decision.ALLOW, llm_response="OK"
+        interceptor = _make_interceptor(
+            _make_evaluation(Decision.ALLOW, llm_response="OK")
         )
         client = TestClient(create_app(interceptor))
 
@@ -191,4 +272,342 @@ class TestChatCompletions:
             },
         )
 
-        interceptor.evaluate_request.assert_called_once_with("Second message")
+        interceptor.evaluate_request_async.assert_called_once_with("Second message")
+
+
+class TestStreamingChatCompletions:
+    @staticmethod
+    async def _chunks(*parts: str):
+        for part in parts:
+            yield part
+
+    def test_stream_returns_sse_chunks(self):
+        interceptor = _make_interceptor()
+        interceptor.stream_request_async = AsyncMock(
+            return_value=(
+                _make_evaluation(Decision.ALLOW),
+                self._chunks("Hello, ", "world!"),
+            )
+        )
+        client = TestClient(create_app(interceptor))
+
+        resp = client.post(
+            "/v1/chat/completions",
+            json={
+                "model": "firebreak-proxy",
+                "stream": True,
+                "messages": [{"role": "user", "content": "Summarize this"}],
+            },
+        )
+
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        frames = [
+            line[len("data: ") :]
+            for line in resp.text.splitlines()
+            if line.startswith("data: ")
+        ]
+        assert frames[-1] == "[DONE]"
+        chunks = [json.loads(f) for f in frames[:-1]]
+        assert all(c["object"] == "chat.completion.chunk" for c in chunks)
+        assert chunks[0]["choices"][0]["delta"] == {"role": "assistant"}
+        content = "".join(c["choices"][0]["delta"].get("content", "") for c in chunks)
+        assert content == "Hello, world!"
+        assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
+        interceptor.evaluate_request_async.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_disconnect_before_first_chunk_finishes_request(self):
+        """A client gone before the body is sent still ends the stream."""
+        finished = []
+        stream = ResponseStream(self._chunks("unsent"), lambda: finished.append(1))
+        interceptor = _make_interceptor()
+        interceptor.stream_request_async = AsyncMock(
+            return_value=(_make_evaluation(Decision.ALLOW), stream)
+        )
+        app = create_app(interceptor)
+        body = json.dumps(
+            {"stream": True, "messages": [{"role": "user", "content": "Hi"}]}
+        ).encode()
+        scope = {
+            "type": "http",
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": "/v1/chat/completions",
+            "raw_path": b"/v1/chat/completions",
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"content-type", b"application/json")],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        requests = [{"type": "http.request", "body": body, "more_body": False}]
+
+        async def receive():
+            if requests:
+                return requests.pop()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            raise OSError("client went away")
+
+        with pytest.raises(OSError):
+            await app(scope, receive, send)
+
+        assert finished == [1]
+
+    def test_stream_block_returns_400(self):
+        interceptor = _make_interceptor()
+        interceptor.stream_request_async = AsyncMock(
+            return_value=(
+                _make_evaluation(Decision.BLOCK, rule_id="block-surveillance"),
+                None,
+            )
+        )
+        client = TestClient(create_app(interceptor))
+
+        resp = client.post(
+            "/v1/chat/completions",
+            json={
+                "model": "firebreak-proxy",
+                "stream": True,
+                "messages": [{"role": "user", "content": "Track citizens"}],
+            },
+        )
+
+        assert resp.status_code == 400
+        assert resp.json()["error"]["code"] == "content_policy_violation"
+
+
+class TestConcurrencyLimit:
+    _BODY = {
+        "model": "firebreak-proxy",
+        "messages": [{"role": "user", "content": "Summarize this"}],
+    }
+
+    def test_admitted_request_frees_its_slot(self):
+        limiter = ConcurrencyLimiter(initial_limit=1)
+        interceptor = _make_interceptor(
+            _make_evaluation(Decision.ALLOW, llm_response="Summary")
+        )
+        client = TestClient(create_app(interceptor, limiter=limiter))
+
+        resp = client.post("/v1/chat/completions", json=self._BODY)
+
+        assert resp.status_code == 200
+        assert limiter.in_flight == 0
+        assert limiter.admitted == 1
+        assert limiter.latency is not None
+
+    def test_saturated_returns_503_with_retry_after(self):
+        limiter = ConcurrencyLimiter(initial_limit=1, max_queue=0)
+        asyncio.run(limiter.acquire())
+        interceptor = _make_interceptor()
+        client = TestClient(create_app(interceptor, limiter=limiter))
+
+        resp = client.post("/v1/chat/completions", json=self._BODY)
+
+        assert resp.status_code == 503
+        assert int(resp.headers["Retry-After"]) >= 1
+        assert resp.json()["error"]["code"] == "overloaded"
+        interceptor.evaluate_request_async.assert_not_called()
+
+    def test_health_reports_limiter(self):
+        limiter = ConcurrencyLimiter(initial_limit=7)
+        client = TestClient(create_app(_make_interceptor(), limiter=limiter))
+
+        resp = client.get("/health")
+
+        assert resp.json()["concurrency"]["limit"] == 7
+
+
+class TestClientRateLimits:
+    _BODY = {
+        "model": "firebreak-proxy",
+        "messages": [{"role": "user", "content": "Summarize this"}],
+    }
+
+    def test_unknown_key_returns_401(self):
+        rate_limiter = RateLimiter(keys={"sk-a": "analytics"})
+        interceptor = _make_interceptor()
+        client = TestClient(create_app(interceptor, rate_limiter=rate_limiter))
+
+        resp = client.post(
+            "/v1/chat/completions",
+            json=self._BODY,
+            headers={"Authorization": "Bearer sk-wrong"},
+        )
+
+        assert resp.status_code == 401
+        assert resp.json()["error"]["code"] == "invalid_api_key"
+        interceptor.evaluate_request_async.assert_not_called()
+
+    def test_over_limit_returns_429(self):
+        rate_limiter = RateLimiter(default_limits=ClientLimits(request_burst=1))
+        evaluation = _make_evaluation(Decision.ALLOW, llm_response="Summary")
+        client = TestClient(
+            create_app(_make_interceptor(evaluation), rate_limiter=rate_limiter)
+        )
+        headers = {"Authorization": "Bearer sk-a"}
+
+        first = client.post("/v1/chat/completions", json=self._BODY, headers=headers)
+        second = client.post("/v1/chat/completions", json=self._BODY, headers=headers)
+        other = client.post(
+            "/v1/chat/completions",
+            json=self._BODY,
+            headers={"Authorization": "Bearer sk-b"},
+        )
+
+        assert first.status_code == 200
+        assert second.status_code == 429
+        assert int(second.headers["Retry-After"]) >= 1
+        assert second.json()["error"]["code"] == "rate_limit_exceeded"
+        # Without a registry a fresh key is the same caller.
+        assert other.status_code == 429
+
+    def test_charges_upstream_tokens(self):
+        rate_limiter = RateLimiter(keys={"sk-a": "analytics"})
+        evaluation = _make_evaluation(Decision.ALLOW, llm_response="Summary")
+        evaluation.upstream_tokens = 321
+        client = TestClient(
+            create_app(
+                _make_interceptor(evaluation),
+                rate_limiter=rate_limiter,
+                admin_key=ADMIN_KEY,
+            )
+        )
+
+        client.post(
+            "/v1/chat/completions",
+            json=self._BODY,
+            headers={"Authorization": "Bearer sk-a"},
+        )
+        resp = client.get("/admin/clients", headers=ADMIN_HEADERS)
+
+        usage = resp.json()["data"]["analytics"]
+        assert usage["admitted"] == 1
+        assert usage["tokens_used"] == 321
+
+
+class TestPolicyReloadEndpoint:
+    def test_reload_returns_new_version(self):
+        interceptor = _make_interceptor()
+        interceptor.reload_policy.return_value = MagicMock(version="2.1")
+        interceptor.reload_policy.return_value.name = "defense-standard"
+        client = TestClient(
+            create_app(interceptor, policy_path="policy.yaml", admin_key=ADMIN_KEY)
+        )
+
+        resp = client.post("/admin/policy/reload", headers=ADMIN_HEADERS)
+
+        assert resp.status_code == 200
+        assert resp.json() == {
+            "status": "reloaded",
+            "policy": "defense-standard",
+            "version": "2.1",
+        }
+        interceptor.reload_policy.assert_called_once_with("policy.yaml")
+
+    def test_invalid_policy_returns_400(self):
+        interceptor = _make_interceptor()
+        interceptor.reload_policy.side_effect = PolicyError("missing policy.version")
+        client = TestClient(
+            create_app(interceptor, policy_path="policy.yaml", admin_key=ADMIN_KEY)
+        )
+
+        resp = client.post("/admin/policy/reload", headers=ADMIN_HEADERS)
+
+        assert resp.status_code == 400
+        assert resp.json()["error"]["code"] == "invalid_policy"
+        assert "policy.version" in resp.json()["error"]["message"]
+
+    def test_not_mounted_without_policy_path(self):
+        client = TestClient(create_app(_make_interceptor(), admin_key=ADMIN_KEY))
+
+        resp = client.post("/admin/policy/reload", headers=ADMIN_HEADERS)
+
+        assert resp.status_code == 404
+
+    def test_not_mounted_without_admin_key(self):
+        interceptor = _make_interceptor()
+        client = TestClient(create_app(interceptor, policy_path="policy.yaml"))
+
+        resp = client.post("/admin/policy/reload")
+
+        assert resp.status_code == 404
+        interceptor.reload_policy.assert_not_called()
+
+    def test_wrong_admin_key_returns_401(self):
+        interceptor = _make_interceptor()
+        client = TestClient(
+            create_app(interceptor, policy_path="policy.yaml", admin_key=ADMIN_KEY)
+        )
+
+        missing = client.post("/admin/policy/reload")
+        wrong = client.post(
+            "/admin/policy/reload", headers={"Authorization": "Bearer sk-a"}
+        )
+
+        assert missing.status_code == 401
+        assert wrong.status_code == 401
+        assert wrong.json()["error"]["code"] == "invalid_api_key"
+        interceptor.reload_policy.assert_not_called()
+
+
+class TestAuditEndpoint:
+    def _client(self) -> TestClient:
+        interceptor = MagicMock()
+        interceptor.audit_log = AuditLog()
+        for decision in (Decision.ALLOW, Decision.BLOCK, Decision.BLOCK):
+            evaluation = _make_evaluation(decision)
+            interceptor.audit_log.log("prompt", evaluation.classification, evaluation)
+        return TestClient(
+            create_app(interceptor, admin_key=ADMIN_KEY), headers=ADMIN_HEADERS
+        )
+
+    def test_requires_admin_key(self):
+        client = self._client()
+
+        resp = client.get("/v1/audit", headers={"Authorization": "Bearer sk-a"})
+
+        assert resp.status_code == 401
+
+    def test_not_mounted_without_admin_key(self):
+        interceptor = MagicMock()
+        interceptor.audit_log = AuditLog()
+        client = TestClient(create_app(interceptor))
+
+        assert client.get("/v1/audit").status_code == 404
+
+    def test_filters_by_decision(self):
+        resp = self._client().get("/v1/audit", params={"decision": "block"})
+
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["object"] == "list"
+        assert [r["evaluation"]["decision"] for r in data["data"]] == [
+            "BLOCK",
+            "BLOCK",
+        ]
+        assert data["next_cursor"] is None
+
+    def test_cursor_pagination(self):
+        client = self._client()
+
+        first = client.get("/v1/audit", params={"limit": 2}).json()
+        second = client.get(
+            "/v1/audit", params={"limit": 2, "cursor": first["next_cursor"]}
+        ).json()
+
+        assert len(first["data"]) == 2
+        assert len(second["data"]) == 1
+        assert second["next_cursor"] is None
+
+    def test_invalid_parameter(self):
+        resp = self._client().get("/v1/audit", params={"since": "last week"})
+
+        assert resp.status_code == 400
+        error = resp.json()["error"]
+        assert error["code"] == "invalid_query"
+        assert error["param"] == "since"
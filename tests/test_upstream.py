@@ -0,0 +1,337 @@
+"""Tests for the shared upstream client layer."""
+
+import asyncio
+from unittest.mock import patch
+
+import anthropic
+import httpx
+import pytest
+
+from firebreak.audit import AuditLog
+from firebreak.classifier import IntentClassifier
+from firebreak.interceptor import FirebreakInterceptor
+from firebreak.policy import PolicyEngine
+from firebreak.upstream import (
+    CircuitBreaker,
+    UpstreamClients,
+    UpstreamConfig,
+    UpstreamUnavailable,
+    is_retryable,
+)
+
+POLICY_PATH = "policies/defense-standard.yaml"
+
+_REQUEST = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+
+
+def _status_error(status: int) -> anthropic.APIStatusError:
+    """Build the SDK error for an HTTP status."""
+    return anthropic.APIStatusError(
+        f"status {status}",
+        response=httpx.Response(status, request=_REQUEST),
+        body=None,
+    )
+
+
+def _fails(*errors: Exception):
+    """Build a request that raises each error in turn, then returns "ok"."""
+    pending = list(errors)
+    calls = []
+
+    def request(timeout: float) -> str:
+        calls.append(timeout)
+        if pending:
+            raise pending.pop(0)
+        return "ok"
+
+    request.calls = calls
+    return request
+
+
+def _clients(**config) -> UpstreamClients:
+    """Build clients that retry without waiting."""
+    config.setdefault("retry_base_delay", 0.0)
+    return UpstreamClients(UpstreamConfig(**config))
+
+
+class TestUpstreamConfig:
+    """Tests for UpstreamConfig."""
+
+    def test_timeout(self):
+        """Connect, read and pool timeouts are applied separately."""
+        timeout = UpstreamConfig(connect_timeout=2, read_timeout=30).timeout()
+
+        assert timeout.connect == 2
+        assert timeout.read == 30
+        assert timeout.pool == 10
+
+    def test_limits(self):
+        """Pool size and keep-alive settings are carried over."""
+        limits = UpstreamConfig(
+            max_connections=8, max_keepalive_connections=4, keepalive_expiry=15
+        ).limits()
+
+        assert limits.max_connections == 8
+        assert limits.max_keepalive_connections == 4
+        assert limits.keepalive_expiry == 15
+
+
+class TestUpstreamClients:
+    """Tests for UpstreamClients."""
+
+    def test_clients_use_configured_timeout(self):
+        """Both clients are built with the configured timeout."""
+        clients = UpstreamClients(UpstreamConfig(connect_timeout=1.5))
+
+        assert clients.client.timeout.connect == 1.5
+        assert clients.async_client.timeout.connect == 1.5
+        clients.close()
+
+    def test_shared_by_classifier_and_interceptor(self):
+        """Injected clients are used by both pipeline stages."""
+        engine = PolicyEngine()
+        engine.load(POLICY_PATH)
+        clients = UpstreamClients()
+        classifier = IntentClassifier(
+            categories=engine.policy.categories, clients=clients
+        )
+        interceptor = FirebreakInterceptor(
+            policy_engine=engine,
+            classifier=classifier,
+            audit_log=AuditLog(),
+            clients=clients,
+        )
+
+        assert classifier._client is interceptor._client is clients.client
+        assert (
+            classifier._async_client
+            is interceptor._async_client
+            is clients.async_client
+        )
+        clients.close()
+
+
+class TestIsRetryable:
+    """Tests for is_retryable()."""
+
+    def test_transient_errors(self):
+        """Connection errors, rate limits and 5xx are retried."""
+        assert is_retryable(anthropic.APIConnectionError(request=_REQUEST))
+        assert is_retryable(_status_error(429))
+        assert is_retryable(_status_error(529))
+
+    def test_client_errors(self):
+        """Bad requests and unknown exceptions are not retried."""
+        assert not is_retryable(_status_error(400))
+        assert not is_retryable(ValueError("bad"))
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker."""
+
+    def test_opens_at_failure_threshold(self):
+        """The breaker opens once enough calls failed."""
+        breaker = CircuitBreaker(failure_threshold=0.5, min_calls=4)
+        for ok in (True, False, True):
+            breaker.record(breaker.allow(), ok)
+        assert breaker.state == "closed"
+
+        breaker.record(breaker.allow(), False)
+
+        assert breaker.state == "open"
+        assert breaker.allow() is None
+        assert breaker.opened == 1
+
+    def test_single_trial_after_cooldown(self):
+        """After the cooldown one call is let through to probe."""
+        breaker = CircuitBreaker(min_calls=1, cooldown=0)
+        breaker.record(breaker.allow(), False)
+
+        trial = breaker.allow()
+        assert trial is not None and trial.trial
+        assert breaker.allow() is None
+        breaker.record(trial, True)
+
+        assert breaker.state == "closed"
+        assert breaker.allow() is not None
+
+    def test_failed_trial_reopens(self):
+        """A failed trial call opens the breaker again."""
+        breaker = CircuitBreaker(min_calls=1, cooldown=60)
+        breaker.record(breaker.allow(), False)
+        breaker.cooldown = 0
+        trial = breaker.allow()
+        breaker.cooldown = 60
+
+        breaker.record(trial, False)
+
+        assert breaker.state == "open"
+
+    def test_only_trial_settles_open_breaker(self):
+        """Calls admitted before the breaker opened cannot close it."""
+        breaker = CircuitBreaker(min_calls=1, cooldown=0)
+        late = breaker.allow()
+        breaker.record(breaker.allow(), False)
+        trial = breaker.allow()
+
+        breaker.record(late, True)
+        breaker.release(late)
+
+        assert breaker.allow() is None
+        breaker.record(trial, True)
+        assert breaker.state == "closed"
+
+    def test_release_frees_trial(self):
+        """A cancelled trial call lets the next one probe."""
+        breaker = CircuitBreaker(min_calls=1, cooldown=0)
+        breaker.record(breaker.allow(), False)
+        trial = breaker.allow()
+
+        breaker.release(trial)
+
+        assert breaker.allow() is not None
+
+    def test_client_error_is_neutral(self):
+        """A 4xx on the trial call neither closes nor reopens the breaker."""
+        breaker = CircuitBreaker(min_calls=1, cooldown=10)
+        with patch("firebreak.upstream.time.monotonic", return_value=0.0):
+            breaker.record(breaker.allow(), False)
+        with patch("firebreak.upstream.time.monotonic", return_value=20.0):
+            breaker.record_error(breaker.allow(), _status_error(400))
+
+            assert breaker.state == "half_open"
+            assert breaker.allow() is not None
+
+    def test_old_outcomes_expire(self):
+        """Failures older than the window no longer count."""
+        breaker = CircuitBreaker(failure_threshold=0.3, min_calls=2, window=10)
+        with patch("firebreak.upstream.time.monotonic", return_value=0.0):
+            breaker.record(breaker.allow(), False)
+        with patch("firebreak.upstream.time.monotonic", return_value=20.0):
+            breaker.record(breaker.allow(), True)
+            breaker.record(breaker.allow(), True)
+
+        assert breaker.state == "closed"
+
+
+class TestCall:
+    """Tests for UpstreamClients.call() and acall()."""
+
+    def test_retries_transient_errors(self):
+        """Transient errors are retried until the call succeeds."""
+        clients = _clients(max_retries=2)
+        request = _fails(_status_error(503), _status_error(429))
+
+        assert clients.call(request, 10) == "ok"
+        assert len(request.calls) == 3
+        assert clients.retries == 2
+
+    def test_gives_up_after_max_retries(self):
+        """The last error is reported once retries are used up."""
+        clients = _clients(max_retries=1)
+        request = _fails(*[_status_error(500)] * 3)
+
+        with pytest.raises(UpstreamUnavailable) as info:
+            clients.call(request, 10)
+
+        assert info.value.reason == "error"
+        assert len(request.calls) == 2
+
+    def test_does_not_retry_client_errors(self):
+        """A 400 fails at once and does not count against the breaker."""
+        clients = _clients(breaker_min_calls=1)
+        request = _fails(_status_error(400))
+
+        with pytest.raises(UpstreamUnavailable):
+            clients.call(request, 10)
+
+        assert len(request.calls) == 1
+        assert clients.breaker.state == "closed"
+
+    def test_timeout_reason(self):
+        """An SDK timeout is reported as a timeout."""
+        clients = _clients(max_retries=0)
+        request = _fails(anthropic.APITimeoutError(request=_REQUEST))
+
+        with pytest.raises(UpstreamUnavailable) as info:
+            clients.call(request, 10)
+
+        assert info.value.reason == "timeout"
+
+    def test_passes_remaining_deadline(self):
+        """Each attempt gets the time left as its timeout."""
+        clients = _clients()
+        request = _fails()
+
+        clients.call(request, 5)
+
+        assert 0 < request.calls[0] <= 5
+
+    def test_retry_delay_stays_within_deadline(self):
+        """A retry that would outlive the deadline is not attempted."""
+        clients = _clients(retry_base_delay=60, retry_max_delay=60)
+        request = _fails(_status_error(503))
+
+        with (
+            patch("firebreak.upstream.random.uniform", return_value=30.0),
+            pytest.raises(UpstreamUnavailable) as info,
+        ):
+            clients.call(request, 1)
+
+        assert info.value.reason == "timeout"
+        assert len(request.calls) == 1
+
+    def test_jitter_is_capped(self):
+        """Retry delays are drawn up to an exponentially growing cap."""
+        clients = _clients(retry_base_delay=1, retry_max_delay=3, max_retries=3)
+        caps = []
+
+        def uniform(low, high):
+            caps.append(high)
+            return 0.0
+
+        request = _fails(*[_status_error(503)] * 3)
+        with patch("firebreak.upstream.random.uniform", side_effect=uniform):
+            clients.call(request, 60)
+
+        assert caps == [1, 2, 3]
+
+    def test_open_circuit_fails_fast(self):
+        """Once the breaker opens, requests are not attempted."""
+        clients = _clients(max_retries=0, breaker_min_calls=2)
+        for _ in range(2):
+            with pytest.raises(UpstreamUnavailable):
+                clients.call(_fails(_status_error(500)), 10)
+
+        request = _fails()
+        with pytest.raises(UpstreamUnavailable) as info:
+            clients.call(request, 10)
+
+        assert info.value.reason == "circuit_open"
+        assert request.calls == []
+
+    @pytest.mark.asyncio
+    async def test_acall_enforces_deadline(self):
+        """A hung async attempt is cancelled at the deadline."""
+        clients = _clients(max_retries=0)
+
+        async def request(timeout: float) -> str:
+            await asyncio.sleep(10)
+            return "late"
+
+        with pytest.raises(UpstreamUnavailable) as info:
+            await clients.acall(request, 0.05)
+
+        assert info.value.reason == "timeout"
+
+    @pytest.mark.asyncio
+    async def test_acall_retries(self):
+        """Async calls are retried like sync ones."""
+        clients = _clients()
+        failing = _fails(anthropic.APIConnectionError(request=_REQUEST))
+
+        async def request(timeout: float) -> str:
+            return failing(timeout)
+
+        assert await clients.acall(request, 10) == "ok"
+        assert clients.retries == 1